@@ -10,6 +10,7 @@ from alembic import context
 from src.db.orm_service.models.base import Base
 from src.db.orm_service.models.chat import Chat
 from src.db.orm_service.models.link import Link
+from src.db.orm_service.models.resource import Resource
 
 # from src.db.orm_service.models.link import Link
 from src.settings import settings
@@ -0,0 +1,93 @@
+"""create resources table
+
+Revision ID: 799af544b91c
+Revises: 7a07d0222358
+Create Date: 2026-10-19 09:00:12.417305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "799af544b91c"
+down_revision: Union[str, None] = "7a07d0222358"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "resources",
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("last_event_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_resources_url"), "resources", ["url"], unique=True)
+
+    op.add_column("links", sa.Column("resource_id", sa.Integer(), nullable=True))
+    # Для URL, на который подписано несколько чатов, берём самое раннее время обновления,
+    # чтобы ни один из чатов не пропустил события.
+    op.execute(
+        """
+        INSERT INTO resources (url, last_event_at)
+        SELECT url, MIN(last_updated) FROM links GROUP BY url
+        """,
+    )
+    op.execute(
+        """
+        UPDATE links SET resource_id = resources.id
+        FROM resources
+        WHERE resources.url = links.url
+        """,
+    )
+    op.alter_column("links", "resource_id", nullable=False)
+    op.create_foreign_key(
+        "links_resource_id_fkey",
+        "links",
+        "resources",
+        ["resource_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index(op.f("ix_links_resource_id"), "links", ["resource_id"], unique=False)
+    op.create_unique_constraint(
+        "uq_links_chat_id_resource_id",
+        "links",
+        ["chat_id", "resource_id"],
+    )
+
+    op.drop_index(op.f("ix_links_url"), table_name="links")
+    op.drop_column("links", "url")
+    op.drop_column("links", "last_updated")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column("links", sa.Column("url", sa.Text(), nullable=True))
+    op.add_column(
+        "links",
+        sa.Column("last_updated", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE links SET url = resources.url, last_updated = resources.last_event_at
+        FROM resources
+        WHERE resources.id = links.resource_id
+        """,
+    )
+    op.alter_column("links", "url", nullable=False)
+    op.create_index(op.f("ix_links_url"), "links", ["url"], unique=False)
+
+    op.drop_constraint("uq_links_chat_id_resource_id", "links", type_="unique")
+    op.drop_index(op.f("ix_links_resource_id"), table_name="links")
+    op.drop_constraint("links_resource_id_fkey", "links", type_="foreignkey")
+    op.drop_column("links", "resource_id")
+
+    op.drop_index(op.f("ix_resources_url"), table_name="resources")
+    op.drop_table("resources")
@@ -0,0 +1,120 @@
+"""add resources canonical key
+
+Revision ID: 3c1f2b9d4e7a
+Revises: 799af544b91c
+Create Date: 2026-10-19 10:00:41.902114
+
+"""
+
+from collections import defaultdict
+from typing import Sequence, Union
+from urllib.parse import urlparse
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f2b9d4e7a"
+down_revision: Union[str, None] = "799af544b91c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Правила канонизации URL на момент этой ревизии (копия src.clients.canonical): миграция
+# не должна зависеть от кода приложения, который может измениться после неё.
+def canonical_key(url: str) -> str:
+    """Возвращает канонический ключ pecypca для URL."""
+    parsed_url = urlparse(url)
+    host = (parsed_url.hostname or "").removeprefix("www.")
+    parts = [part for part in parsed_url.path.split("/") if part]
+    if host == "github.com" and len(parts) >= 2:
+        owner, repo = parts[0], parts[1].removesuffix(".git")
+        return f"{host}/{owner}/{repo}".lower()
+    if host == "github.com":
+        return "/".join([host, *parts]).lower()
+    if host == "stackoverflow.com" and len(parts) >= 2 and parts[0] == "questions":
+        return f"{host}/questions/{parts[1]}"
+    return "/".join([host, *parts])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("resources", sa.Column("canonical_key", sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    groups: dict[str, list[int]] = defaultdict(list)
+    for resource_id, url in conn.execute(sa.text("SELECT id, url FROM resources ORDER BY id")):
+        groups[canonical_key(url)].append(resource_id)
+
+    for survivor, *duplicates in groups.values():
+        if duplicates:
+            # Разные написания одного pecypca сливаются в самый ранний: подписки
+            # переносятся на него, повторные подписки одного чата удаляются,
+            # a время последнего события берётся самое раннее, чтобы не потерять события.
+            params = {
+                "survivor": survivor,
+                "duplicates": duplicates,
+                "group": [survivor, *duplicates],
+            }
+            conn.execute(
+                sa.text(
+                    """
+                    DELETE FROM links AS dup
+                    WHERE dup.resource_id = ANY(:duplicates)
+                      AND EXISTS (
+                          SELECT 1 FROM links AS kept
+                          WHERE kept.chat_id = dup.chat_id
+                            AND (kept.resource_id = :survivor OR kept.id < dup.id)
+                            AND kept.resource_id = ANY(:group)
+                      )
+                    """,
+                ),
+                params,
+            )
+            conn.execute(
+                sa.text(
+                    "UPDATE links SET resource_id = :survivor WHERE resource_id = ANY(:duplicates)",
+                ),
+                params,
+            )
+            conn.execute(
+                sa.text(
+                    """
+                    UPDATE resources SET last_event_at = (
+                        SELECT MIN(last_event_at) FROM resources
+                        WHERE id = ANY(:group)
+                    )
+                    WHERE id = :survivor
+                    """,
+                ),
+                params,
+            )
+            conn.execute(sa.text("DELETE FROM resources WHERE id = ANY(:duplicates)"), params)
+
+    conn.execute(
+        sa.text(
+            """
+            UPDATE resources SET canonical_key = data.key
+            FROM unnest(CAST(:ids AS integer[]), CAST(:keys AS text[])) AS data(id, key)
+            WHERE resources.id = data.id
+            """,
+        ),
+        {"ids": [ids[0] for ids in groups.values()], "keys": list(groups)},
+    )
+
+    op.alter_column("resources", "canonical_key", nullable=False)
+    op.create_index(
+        op.f("ix_resources_canonical_key"),
+        "resources",
+        ["canonical_key"],
+        unique=True,
+    )
+    op.drop_index(op.f("ix_resources_url"), table_name="resources")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_resources_url"), "resources", ["url"], unique=True)
+    op.drop_index(op.f("ix_resources_canonical_key"), table_name="resources")
+    op.drop_column("resources", "canonical_key")
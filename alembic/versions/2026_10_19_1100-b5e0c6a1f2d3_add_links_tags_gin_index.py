@@ -0,0 +1,42 @@
+"""add links tags gin index
+
+Revision ID: b5e0c6a1f2d3
+Revises: 3c1f2b9d4e7a
+Create Date: 2026-10-19 11:00:07.215630
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e0c6a1f2d3"
+down_revision: Union[str, None] = "3c1f2b9d4e7a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "links",
+        sa.Column("muted", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.create_index("ix_links_tags", "links", ["tags"], unique=False, postgresql_using="gin")
+    op.create_index(
+        "ix_links_filters",
+        "links",
+        ["filters"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_links_filters", table_name="links", postgresql_using="gin")
+    op.drop_index("ix_links_tags", table_name="links", postgresql_using="gin")
+    op.drop_column("links", "muted")
@@ -0,0 +1,27 @@
+"""add links chat_id id index.
+
+Revision ID: c7d2e4f9a1b0
+Revises: b5e0c6a1f2d3
+Create Date: 2026-10-19 14:00:12.481903
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d2e4f9a1b0"
+down_revision: Union[str, None] = "b5e0c6a1f2d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_links_chat_id_id", "links", ["chat_id", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_links_chat_id_id", table_name="links")
@@ -0,0 +1,32 @@
+"""add chats links_version
+
+Revision ID: e3b9f1c6d8a2
+Revises: c7d2e4f9a1b0
+Create Date: 2026-10-19 15:00:41.903417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b9f1c6d8a2"
+down_revision: Union[str, None] = "c7d2e4f9a1b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "chats",
+        sa.Column("links_version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("chats", "links_version")
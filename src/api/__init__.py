@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from . import bot_api, ping, scrapper_api
+from . import admin, bot_api, ping, scrapper_api
 
 __all__ = ("router",)
 
@@ -8,3 +8,4 @@ router = APIRouter()
 router.include_router(ping.router, tags=["ping"])
 router.include_router(bot_api.router, prefix="/bot", tags=["Bot API"])
 router.include_router(scrapper_api.router, prefix="/scrapper", tags=["Scrapper API"])
+router.include_router(admin.router, prefix="/admin", tags=["Admin"])
@@ -0,0 +1,3 @@
+from .handlers import router
+
+__all__ = ("router",)
@@ -0,0 +1,141 @@
+import secrets
+import traceback
+from http import HTTPStatus
+
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import JSONResponse, Response
+
+from src.api.bot_api.models import ApiErrorResponse
+from src.profiling import ProfileResult, profiler
+from src.settings import settings
+
+router = APIRouter(tags=["Admin"])
+
+
+def _error(status: HTTPStatus, exception_name: str, message: str) -> JSONResponse:
+    """Формирует ответ c ошибкой в формате ApiErrorResponse."""
+    error_response = ApiErrorResponse(
+        description=status.phrase,
+        code=str(status.value),
+        exception_name=exception_name,
+        exception_message=message,
+        stacktrace=traceback.format_exc().split("\n"),
+    )
+    return JSONResponse(status_code=status, content=error_response.model_dump(by_alias=True))
+
+
+def _check_admin(admin_token: str | None) -> JSONResponse | None:
+    """Проверяет доступ к административным эндпоинтам.
+
+    Если профилирование выключено или токен администратора не задан, эндпоинты отвечают
+    404, как если бы их не было.
+
+    :param admin_token: Значение заголовка X-Admin-Token.
+    :return: Ответ c ошибкой или None, если доступ разрешён.
+    """
+    config = settings.profiling
+    if not config.enabled or not config.admin_token:
+        return _error(HTTPStatus.NOT_FOUND, "NotFound", "Профилирование выключено")
+    if admin_token is None or not secrets.compare_digest(admin_token, config.admin_token):
+        return _error(HTTPStatus.FORBIDDEN, "PermissionError", "Неверный токен администратора")
+    return None
+
+
+def _profile_response(result: ProfileResult) -> Response:
+    """Отдаёт профиль как файл для скачивания."""
+    return Response(
+        content=result.content,
+        media_type=result.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{result.filename}"'},
+    )
+
+
+@router.post(
+    "/profile",
+    summary="Профилировать приложение в течение заданного времени",
+    responses={
+        200: {"description": "Профиль в формате collapsed stacks или pstats"},
+        400: {"description": "Некорректные параметры запроса", "model": ApiErrorResponse},
+        403: {"description": "Неверный токен администратора", "model": ApiErrorResponse},
+        409: {"description": "Профилирование уже выполняется", "model": ApiErrorResponse},
+    },
+)
+async def profile_handler(
+    duration: float = Query(10.0, gt=0),
+    fmt: str = Query("collapsed", alias="format"),
+    admin_token: str | None = Header(None, alias="X-Admin-Token"),
+) -> Response:
+    """Профилирует поток event loop в течение `duration` секунд и возвращает профиль.
+
+    Формат `collapsed` - стеки для flamegraph (сэмплирование), `pstats` - дамп cProfile.
+
+    :param duration: Длительность профилирования, секунд (не больше max_duration).
+    :param fmt: Формат профиля: `collapsed` или `pstats`.
+    :param admin_token: Токен администратора из заголовка X-Admin-Token.
+    :return: Файл профиля.
+    """
+    if (error := _check_admin(admin_token)) is not None:
+        return error
+    try:
+        result = await profiler.profile_for(duration, fmt)
+    except ValueError as e:
+        return _error(HTTPStatus.BAD_REQUEST, e.__class__.__name__, str(e))
+    except RuntimeError as e:
+        return _error(HTTPStatus.CONFLICT, e.__class__.__name__, str(e))
+    return _profile_response(result)
+
+
+@router.post(
+    "/profile/sweep",
+    status_code=HTTPStatus.ACCEPTED,
+    summary="Профилировать следующий проход планировщика",
+    responses={
+        202: {"description": "Профилирование следующего прохода включено"},
+        400: {"description": "Некорректные параметры запроса", "model": ApiErrorResponse},
+        403: {"description": "Неверный токен администратора", "model": ApiErrorResponse},
+    },
+)
+async def arm_sweep_profile_handler(
+    fmt: str = Query("collapsed", alias="format"),
+    admin_token: str | None = Header(None, alias="X-Admin-Token"),
+) -> Response:
+    """Включает профилирование следующего прохода планировщика.
+
+    Результат забирается запросом `GET /admin/profile/sweep` после завершения прохода.
+
+    :param fmt: Формат профиля: `collapsed` или `pstats`.
+    :param admin_token: Токен администратора из заголовка X-Admin-Token.
+    :return: Подтверждение c выбранным форматом.
+    """
+    if (error := _check_admin(admin_token)) is not None:
+        return error
+    try:
+        profiler.arm_sweep(fmt)
+    except ValueError as e:
+        return _error(HTTPStatus.BAD_REQUEST, e.__class__.__name__, str(e))
+    return JSONResponse(status_code=HTTPStatus.ACCEPTED, content={"format": fmt})
+
+
+@router.get(
+    "/profile/sweep",
+    summary="Получить профиль последнего прохода планировщика",
+    responses={
+        200: {"description": "Профиль прохода планировщика"},
+        403: {"description": "Неверный токен администратора", "model": ApiErrorResponse},
+        404: {"description": "Профиль ещё не готов", "model": ApiErrorResponse},
+    },
+)
+async def get_sweep_profile_handler(
+    admin_token: str | None = Header(None, alias="X-Admin-Token"),
+) -> Response:
+    """Возвращает профиль прохода планировщика, включённого через POST /admin/profile/sweep.
+
+    :param admin_token: Токен администратора из заголовка X-Admin-Token.
+    :return: Файл профиля.
+    """
+    if (error := _check_admin(admin_token)) is not None:
+        return error
+    if profiler.sweep_result is None:
+        message = "Проход ещё не начался" if profiler.sweep_armed else "Профиль не запрошен"
+        return _error(HTTPStatus.NOT_FOUND, "NotFound", message)
+    return _profile_response(profiler.sweep_result)
@@ -3,12 +3,14 @@ import logging
 import traceback
 
 import httpx
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from pydantic import HttpUrl
 from starlette.responses import JSONResponse
 
 from src.api.bot_api.models import ApiErrorResponse, DigestUpdate, LinkUpdate
+from src.metrics import TELEGRAM_SEND_LATENCY, observe_telegram_response
 from src.settings import settings
+from src.tracing import extract_context, start_span
 
 router = APIRouter(tags=["Bot API"])
 
@@ -34,7 +36,12 @@ async def send_notification(
     }
 
     try:
-        response = await client.post(telegram_api_url, json=payload)
+        with (
+            TELEGRAM_SEND_LATENCY.labels(source="http").time(),
+            start_span("telegram.send_message", {"chat_id": chat_id}),
+        ):
+            response = await client.post(telegram_api_url, json=payload)
+        observe_telegram_response("http", response)
         response.raise_for_status()
         logging.info("Уведомление отправлено в чат %s", chat_id)
     except httpx.HTTPError:
@@ -53,10 +60,11 @@ async def send_notification(
         },
     },
 )
-async def send_update(update: LinkUpdate) -> LinkUpdate | JSONResponse:
+async def send_update(update: LinkUpdate, request: Request) -> LinkUpdate | JSONResponse:
     """Отправляет обновление (LinkUpdate) в указанные Telegram-чаты.
 
     :param update: Объект обновления, содержащий id, url, описание и список tgChatIds.
+    :param request: Входящий запрос; из ero заголовков берётся контекст трассировки.
     :return: Сообщение o6 успешной обработке обновления.
     :raises HTTPException: Если параметры запроса некорректны.
     """
@@ -72,13 +80,14 @@ async def send_update(update: LinkUpdate) -> LinkUpdate | JSONResponse:
 
     logging.info("Получено обновление для ссылки: %s", update.url)
 
-    async with httpx.AsyncClient() as client:
-        await asyncio.gather(
-            *(
-                send_notification(client, chat_id, update.url, update.description)
-                for chat_id in update.tg_chat_ids
-            ),
-        )
+    with start_span("bot_api.updates", context=extract_context(request.headers)):
+        async with httpx.AsyncClient() as client:
+            await asyncio.gather(
+                *(
+                    send_notification(client, chat_id, update.url, update.description)
+                    for chat_id in update.tg_chat_ids
+                ),
+            )
 
     return update
 
@@ -95,11 +104,12 @@ async def send_update(update: LinkUpdate) -> LinkUpdate | JSONResponse:
         },
     },
 )
-async def send_digest(update: DigestUpdate) -> DigestUpdate | JSONResponse:
+async def send_digest(update: DigestUpdate, request: Request) -> DigestUpdate | JSONResponse:
     """Отправляет дайджест обновлений в указанный Telegram-чат.
 
     :param update: Объект обновления, содержащий id дайджеста, описание обновления,
         id чата для отправки уведомления и список обновлений, которые будут отправлены в чате.
+    :param request: Входящий запрос; из ero заголовков берётся контекст трассировки.
     :return: Объект DigestUpdate, содержащий отправленные данные.
     :raises HTTPException: Если параметры запроса некорректны (например, `id <= 0`).
     """
@@ -115,18 +125,28 @@ async def send_digest(update: DigestUpdate) -> DigestUpdate | JSONResponse:
 
     logging.info("Получен дайджест для чата: %s", update.tg_chat_id)
 
-    async with httpx.AsyncClient() as client:
-        telegram_api_url = f"{settings.tg_api_url}/bot{settings.token}/sendMessage"
-        payload = {
-            "chat_id": update.tg_chat_id,
-            "text": f"{update.description}\n" + "\n".join(update.updates),
-            "parse_mode": "Markdown",
-        }
-        try:
-            response = await client.post(telegram_api_url, json=payload)
-            response.raise_for_status()
-            logging.info("Уведомление отправлено в чат %s", update.tg_chat_id)
-        except httpx.HTTPError:
-            logging.exception("Ошибка при отправке уведомления для чата %s", update.tg_chat_id)
+    with start_span(
+        "bot_api.digest",
+        {"chat_id": update.tg_chat_id},
+        context=extract_context(request.headers),
+    ):
+        async with httpx.AsyncClient() as client:
+            telegram_api_url = f"{settings.tg_api_url}/bot{settings.token}/sendMessage"
+            payload = {
+                "chat_id": update.tg_chat_id,
+                "text": f"{update.description}\n" + "\n".join(update.updates),
+                "parse_mode": "Markdown",
+            }
+            try:
+                with (
+                    TELEGRAM_SEND_LATENCY.labels(source="http").time(),
+                    start_span("telegram.send_message", {"chat_id": update.tg_chat_id}),
+                ):
+                    response = await client.post(telegram_api_url, json=payload)
+                observe_telegram_response("http", response)
+                response.raise_for_status()
+                logging.info("Уведомление отправлено в чат %s", update.tg_chat_id)
+            except httpx.HTTPError:
+                logging.exception("Ошибка при отправке уведомления для чата %s", update.tg_chat_id)
 
     return update
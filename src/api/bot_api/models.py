@@ -108,6 +108,8 @@ class UpdateEvent(BaseModel):
     :param username: Имя пользователя, который создал запись.
     :param created_at: Время создания записи в UTC.
     :param preview: Превью ответа или описания (первые 200 символов).
+    :param event_type: Тип события (например, "issue", "pull_request", "answer", "comment").
+    :param tags: Теги подписки, для которой собрано событие (группы дайджеста).
     """
 
     description: str = Field()
@@ -115,6 +117,8 @@ class UpdateEvent(BaseModel):
     username: str = Field(...)
     created_at: datetime = Field(...)
     preview: str = Field(..., max_length=200)
+    event_type: str | None = Field(default=None)
+    tags: list[str] = Field(default_factory=list)
 
     model_config = {
         "json_schema_extra": {
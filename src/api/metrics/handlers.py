@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from starlette.responses import Response
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics_handler() -> Response:
+    """Отдаёт метрики приложения в текстовом формате Prometheus.
+
+    :return: Ответ c метриками из реестра prometheus_client по умолчанию.
+    """
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -1,23 +1,140 @@
+import logging
 import traceback
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
 
 import asyncpg
-from fastapi import APIRouter, Depends, Header, Path
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Header, Path, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.bot_api.models import ApiErrorResponse
 from src.api.scrapper_api.models import (
     AddLinkRequest,
+    BulkAddLinksRequest,
+    BulkLinkResult,
+    BulkLinksResponse,
+    BulkLinkStatus,
+    BulkRemoveLinksRequest,
     LinkResponse,
     ListLinksResponse,
+    MuteLinksRequest,
+    MuteLinksResponse,
     RemoveLinkRequest,
+    TagsRequest,
 )
+from src.bot.redis_cache import LIST_PAGE_SIZE, redis_cache
+from src.constants import LINKS_VERSION_HEADER
 from src.db.db_manager.manager_factory import db_manager
 from src.db.factory.data_access_factory import db_service
+from src.serializer import dumps
+
+logger = logging.getLogger(__name__)
+
+MAX_LINKS_PAGE_SIZE: int = 1000
+STREAM_BATCH_SIZE: int = 500
+NDJSON_MEDIA_TYPE: str = "application/x-ndjson"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 router = APIRouter(tags=["Scrapper API"])
 
 
+def _links_etag(
+    tg_chat_id: int,
+    version: int,
+    limit: int | None,
+    after_id: int | None,
+    last_event_at: datetime | None,
+) -> str:
+    """Формирует ETag страницы списка ссылок чата.
+
+    Версия списка меняется только при изменении подписок, поэтому ETag учитывает также время
+    самого нового события pecypcoв страницы (в микросекундах). Страницы одного списка
+    отличаются содержимым, поэтому в ETag входят и параметры страницы; 0 означает
+    отсутствие значения.
+    """
+    event = (last_event_at - _EPOCH) // timedelta(microseconds=1) if last_event_at else 0
+    return f'"{tg_chat_id}.{version}.{limit or 0}.{after_id or 0}.{event}"'
+
+
+def _last_event_at(links: list[LinkResponse]) -> datetime | None:
+    """Возвращает время самого нового события pecypcoв страницы для ETag."""
+    return max((link.last_updated for link in links if link.last_updated is not None), default=None)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверяет, совпадает ли ETag co значением заголовка If-None-Match.
+
+    Заголовок может содержать несколько ETag через запятую, слабые ETag (`W/`) и `*`.
+    """
+    if if_none_match is None:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def _cache_added_link(
+    tg_chat_id: int,
+    link: LinkResponse,
+    dependency: asyncpg.Pool | AsyncSession,
+) -> None:
+    """Добавляет ссылку в кэш списка чата; холодный кэш заполняется списком из БД.
+
+    Ошибки Redis не влияют на ответ API: кэш восстановится при следующем /list.
+    """
+    try:
+        if await redis_cache.add_to_list_cache(tg_chat_id, link.model_dump(mode="json")):
+            return
+        await _refresh_list_cache(tg_chat_id, dependency)
+    except RedisError:
+        logger.exception("Не удалось обновить кэш списка ссылок чата %s", tg_chat_id)
+
+
+async def _refresh_list_cache(
+    tg_chat_id: int,
+    dependency: asyncpg.Pool | AsyncSession,
+) -> None:
+    """Перезаписывает кэш первой страницы списка чата страницей из БД.
+
+    Версия списка читается до ссылок, поэтому ссылки не старше неё, и более новая страница,
+    уже записанная в кэш, не затирается. Страница берётся размера LIST_PAGE_SIZE, как её
+    запрашивает бот, c курсором следующей страницы для длинных списков и c ETag, по которому
+    бот проверяет устаревшую страницу запросом c `If-None-Match`.
+
+    :raises RedisError: Если Redis недоступен.
+    """
+    version = await db_service.link_service.get_links_version(tg_chat_id, dependency)
+    if version is None:
+        return
+    links = await db_service.link_service.get_links(
+        tg_chat_id,
+        dependency,
+        limit=LIST_PAGE_SIZE + 1,
+    )
+    next_after_id = None
+    if len(links) > LIST_PAGE_SIZE:
+        links = links[:LIST_PAGE_SIZE]
+        next_after_id = links[-1].id
+    await redis_cache.set_list_cache(
+        tg_chat_id,
+        [item.model_dump(mode="json") for item in links],
+        version,
+        etag=_links_etag(tg_chat_id, version, LIST_PAGE_SIZE, None, _last_event_at(links)),
+        limit=LIST_PAGE_SIZE,
+        next_after_id=next_after_id,
+    )
+
+
+async def _cache_removed_links(tg_chat_id: int, *links: LinkResponse) -> None:
+    """Удаляет ссылки из кэша списка чата."""
+    try:
+        await redis_cache.remove_from_list_cache(tg_chat_id, *(link.id for link in links))
+    except RedisError:
+        logger.exception("Не удалось обновить кэш списка ссылок чата %s", tg_chat_id)
+
+
 @router.post(
     "/tg-chat/{tg_chat_id}",
     response_model=dict[str, str],
@@ -101,6 +218,10 @@ async def delete_chat_endpoint(
             stacktrace=traceback.format_exc().split("\n"),
         )
         return JSONResponse(status_code=404, content=error_response.model_dump(by_alias=True))
+    try:
+        await redis_cache.invalidate_list_cache(tg_chat_id)
+    except RedisError:
+        logger.exception("Не удалось очистить кэш списка ссылок чата %s", tg_chat_id)
     return {"description": "Чат успешно удалён"}
 
 
@@ -113,6 +234,7 @@ async def delete_chat_endpoint(
             "description": "Ссылки успешно получены",
             "model": ListLinksResponse,
         },
+        304: {"description": "Список не изменился с версии из If-None-Match"},
         400: {
             "description": "Некорректные параметры запроса",
             "model": ApiErrorResponse,
@@ -120,17 +242,52 @@ async def delete_chat_endpoint(
     },
 )
 async def get_links_endpoint(
+    response: Response,
     tg_chat_id: int = Header(..., alias="Tg-Chat-Id"),
+    limit: int | None = Query(None, ge=1, le=MAX_LINKS_PAGE_SIZE, title="Размер страницы"),
+    after_id: int | None = Query(None, ge=0, title="Курсор: ID последней полученной ссылки"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
     dependency: asyncpg.Pool | AsyncSession = Depends(db_manager.get_dependency),
-) -> ListLinksResponse | JSONResponse:
+) -> ListLinksResponse | JSONResponse | Response:
     """Возвращает список отслеживаемых ссылок для чата.
 
+    Без `limit` возвращаются все ссылки. C `limit` возвращается одна страница, a курсор
+    следующей страницы передаётся в `next_after_id`.
+
+    Ответ содержит ETag и заголовок Links-Version c версией списка чата. Версия меняется при
+    изменении подписок чата; ETag учитывает также время самого нового события pecypcoв
+    страницы и параметры страницы. Если ETag совпадает c `If-None-Match`, возвращается 304:
+    вместо страницы ссылок читается только время последнего события её pecypcoв.
+
+    :param response: Ответ, в который добавляется заголовок ETag.
     :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
     :param tg_chat_id: Идентификатор Telegram-чата (передаётся в заголовке).
-    :return: Объект ListLinksResponse co списком ссылок и их количеством.
+    :param limit: Максимальное число ссылок на странице.
+    :param after_id: Вернуть ссылки c идентификатором больше указанного.
+    :param if_none_match: ETag ранее полученного списка.
+    :return: Объект ListLinksResponse co списком ссылок и их количеством или ответ 304.
     """
+    # Версия читается до ссылок: если список изменится между запросами, клиент получит более
+    # новые ссылки co старым ETag и при следующей проверке просто загрузит их ещё раз.
+    version = await db_service.link_service.get_links_version(tg_chat_id, dependency)
+    if version is not None and if_none_match is not None:
+        last_event_at = await db_service.link_service.get_links_last_event_at(
+            tg_chat_id,
+            dependency,
+            limit=limit,
+            after_id=after_id,
+        )
+        etag = _links_etag(tg_chat_id, version, limit, after_id, last_event_at)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
     try:
-        links = await db_service.link_service.get_links(tg_chat_id, dependency)
+        # Лишняя строка показывает, есть ли следующая страница, без отдельного COUNT.
+        links = await db_service.link_service.get_links(
+            tg_chat_id,
+            dependency,
+            limit=limit + 1 if limit is not None else None,
+            after_id=after_id,
+        )
     except ValueError as e:
         error_response = ApiErrorResponse(
             description="Некорректные параметры запроса",
@@ -140,7 +297,85 @@ async def get_links_endpoint(
             stacktrace=traceback.format_exc().split("\n"),
         )
         return JSONResponse(status_code=400, content=error_response.model_dump(by_alias=True))
-    return ListLinksResponse(links=links, size=len(links))
+    next_after_id = None
+    if limit is not None and len(links) > limit:
+        links = links[:limit]
+        next_after_id = links[-1].id
+    if version is not None:
+        last_event_at = _last_event_at(links)
+        response.headers["ETag"] = _links_etag(tg_chat_id, version, limit, after_id, last_event_at)
+        response.headers[LINKS_VERSION_HEADER] = str(version)
+    return ListLinksResponse(links=links, size=len(links), next_after_id=next_after_id)
+
+
+async def _stream_links(tg_chat_id: int, first_page: list[LinkResponse]) -> AsyncIterator[bytes]:
+    """Выдаёт ссылки чата в формате NDJSON, дочитывая их из БД страницами.
+
+    Зависимость запроса к этому моменту уже освобождена, поэтому для следующих страниц
+    берётся собственная.
+    """
+    for link in first_page:
+        yield dumps(link) + b"\n"
+    if len(first_page) < STREAM_BATCH_SIZE:
+        return
+    async for dependency in db_manager.get_dependency():
+        async for link in db_service.link_service.iter_links(
+            tg_chat_id,
+            dependency,
+            batch_size=STREAM_BATCH_SIZE,
+            after_id=first_page[-1].id,
+        ):
+            yield dumps(link) + b"\n"
+
+
+@router.get(
+    "/links/stream",
+    response_class=StreamingResponse,
+    response_model=None,
+    summary="Выгрузить все отслеживаемые ссылки в формате NDJSON",
+    responses={
+        200: {
+            "description": "Ссылки по одной на строку",
+            "content": {NDJSON_MEDIA_TYPE: {}},
+        },
+        400: {
+            "description": "Некорректные параметры запроса",
+            "model": ApiErrorResponse,
+        },
+    },
+)
+async def stream_links_endpoint(
+    tg_chat_id: int = Header(..., alias="Tg-Chat-Id"),
+    dependency: asyncpg.Pool | AsyncSession = Depends(db_manager.get_dependency),
+) -> StreamingResponse | JSONResponse:
+    """Выгружает все отслеживаемые ссылки чата потоком NDJSON.
+
+    Ссылки читаются из БД страницами по курсору и отправляются клиенту по мере чтения,
+    поэтому память не зависит от числа ссылок чата.
+
+    :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+    :param tg_chat_id: Идентификатор Telegram-чата (передаётся в заголовке).
+    :return: Потоковый ответ c одной ссылкой (LinkResponse) на строку.
+    """
+    try:
+        first_page = await db_service.link_service.get_links(
+            tg_chat_id,
+            dependency,
+            limit=STREAM_BATCH_SIZE,
+        )
+    except ValueError as e:
+        error_response = ApiErrorResponse(
+            description="Некорректные параметры запроса",
+            code="400",
+            exception_name=e.__class__.__name__,
+            exception_message=str(e),
+            stacktrace=traceback.format_exc().split("\n"),
+        )
+        return JSONResponse(status_code=400, content=error_response.model_dump(by_alias=True))
+    return StreamingResponse(
+        _stream_links(tg_chat_id, first_page),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
 
 
 @router.post(
@@ -165,6 +400,8 @@ async def add_link_endpoint(
 ) -> LinkResponse | JSONResponse:
     """Добавляет отслеживаемую ссылку для заданного чата.
 
+    Добавленная ссылка сразу записывается в кэш списка чата (write-through).
+
     :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
     :param add_link_req: Данные запроса для добавления ссылки.
     :param tg_chat_id: Идентификатор Telegram-чата (из заголовка).
@@ -181,6 +418,7 @@ async def add_link_endpoint(
             stacktrace=traceback.format_exc().split("\n"),
         )
         return JSONResponse(status_code=400, content=error_response.model_dump(by_alias=True))
+    await _cache_added_link(tg_chat_id, new_link, dependency)
     return new_link
 
 
@@ -210,6 +448,8 @@ async def remove_link_endpoint(
 ) -> LinkResponse | JSONResponse:
     """Убирает отслеживание ссылки для заданного чата.
 
+    Удалённая ссылка сразу убирается из кэша списка чата (write-through).
+
     :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
     :param remove_link_req: Данные запроса для удаления ссылки.
     :param tg_chat_id: Идентификатор Telegram-чата (из заголовка).
@@ -240,4 +480,319 @@ async def remove_link_endpoint(
             stacktrace=traceback.format_exc().split("\n"),
         )
         return JSONResponse(status_code=404, content=error_response.model_dump(by_alias=True))
+    await _cache_removed_links(tg_chat_id, removed_link)
     return removed_link
+
+
+@router.post(
+    "/links/bulk",
+    response_model=BulkLinksResponse,
+    summary="Добавить отслеживание нескольких ссылок",
+    responses={
+        200: {
+            "description": "Результат по каждой ссылке",
+            "model": BulkLinksResponse,
+        },
+        400: {
+            "description": "Некорректные параметры запроса",
+            "model": ApiErrorResponse,
+        },
+    },
+)
+async def add_links_bulk_endpoint(
+    add_links_req: BulkAddLinksRequest,
+    tg_chat_id: int = Header(..., alias="Tg-Chat-Id", examples=[123456789]),
+    dependency: asyncpg.Pool | AsyncSession = Depends(db_manager.get_dependency),
+) -> BulkLinksResponse | JSONResponse:
+    """Добавляет несколько отслеживаемых ссылок для заданного чата одной транзакцией.
+
+    Уже отслеживаемые и повторяющиеся ссылки не считаются ошибкой и получают статус `exists`.
+    После добавления кэш списка чата перезаписывается списком из БД.
+
+    :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+    :param add_links_req: Ссылки для добавления.
+    :param tg_chat_id: Идентификатор Telegram-чата (из заголовка).
+    :return: Объект BulkLinksResponse c результатом по каждой ссылке.
+    """
+    try:
+        added = await db_service.link_service.add_links(
+            tg_chat_id,
+            add_links_req.links,
+            dependency,
+        )
+    except (KeyError, ValueError) as e:
+        error_response = ApiErrorResponse(
+            description="Некорректные параметры запроса",
+            code="400",
+            exception_name=e.__class__.__name__,
+            exception_message=str(e).strip("'"),
+            stacktrace=traceback.format_exc().split("\n"),
+        )
+        return JSONResponse(status_code=400, content=error_response.model_dump(by_alias=True))
+    results = [
+        BulkLinkResult(
+            link=str(req.link),
+            status=BulkLinkStatus.ADDED if link is not None else BulkLinkStatus.EXISTS,
+            result=link,
+        )
+        for req, link in zip(add_links_req.links, added, strict=True)
+    ]
+    size = sum(link is not None for link in added)
+    if size:
+        try:
+            await _refresh_list_cache(tg_chat_id, dependency)
+        except RedisError:
+            logger.exception("Не удалось обновить кэш списка ссылок чата %s", tg_chat_id)
+    return BulkLinksResponse(results=results, size=size)
+
+
+@router.delete(
+    "/links/bulk",
+    response_model=BulkLinksResponse,
+    summary="Убрать отслеживание нескольких ссылок",
+    responses={
+        200: {
+            "description": "Результат по каждой ссылке",
+            "model": BulkLinksResponse,
+        },
+        400: {
+            "description": "Некорректные параметры запроса",
+            "model": ApiErrorResponse,
+        },
+        404: {
+            "description": "Чат не найден",
+            "model": ApiErrorResponse,
+        },
+    },
+)
+async def remove_links_bulk_endpoint(
+    remove_links_req: BulkRemoveLinksRequest,
+    tg_chat_id: int = Header(..., alias="Tg-Chat-Id"),
+    dependency: asyncpg.Pool | AsyncSession = Depends(db_manager.get_dependency),
+) -> BulkLinksResponse | JSONResponse:
+    """Убирает отслеживание нескольких ссылок для заданного чата одним запросом.
+
+    Неотслеживаемые ссылки не считаются ошибкой и получают статус `not_found`.
+    Удалённые ссылки сразу убираются из кэша списка чата (write-through).
+
+    :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+    :param remove_links_req: URL ссылок для удаления.
+    :param tg_chat_id: Идентификатор Telegram-чата (из заголовка).
+    :return: Объект BulkLinksResponse c результатом по каждой ссылке.
+    """
+    try:
+        removed = await db_service.link_service.remove_links(
+            tg_chat_id,
+            remove_links_req.links,
+            dependency,
+        )
+    except ValueError as e:
+        error_response = ApiErrorResponse(
+            description="Некорректные параметры запроса",
+            code="400",
+            exception_name=e.__class__.__name__,
+            exception_message=str(e),
+            stacktrace=traceback.format_exc().split("\n"),
+        )
+        return JSONResponse(status_code=400, content=error_response.model_dump(by_alias=True))
+    except KeyError as e:
+        error_response = ApiErrorResponse(
+            description="Чат не найден",
+            code="404",
+            exception_name=e.__class__.__name__,
+            exception_message=str(e).strip("'"),
+            stacktrace=traceback.format_exc().split("\n"),
+        )
+        return JSONResponse(status_code=404, content=error_response.model_dump(by_alias=True))
+    results = [
+        BulkLinkResult(
+            link=str(url),
+            status=BulkLinkStatus.REMOVED if link is not None else BulkLinkStatus.NOT_FOUND,
+            result=link,
+        )
+        for url, link in zip(remove_links_req.links, removed, strict=True)
+    ]
+    removed_links = [link for link in removed if link is not None]
+    await _cache_removed_links(tg_chat_id, *removed_links)
+    return BulkLinksResponse(results=results, size=len(removed_links))
+
+
+@router.get(
+    "/links/tags",
+    response_model=ListLinksResponse,
+    summary="Получить ссылки по тегам",
+    responses={
+        200: {
+            "description": "Ссылки успешно получены",
+            "model": ListLinksResponse,
+        },
+        400: {
+            "description": "Некорректные параметры запроса",
+            "model": ApiErrorResponse,
+        },
+    },
+)
+async def get_links_by_tags_endpoint(
+    tags: list[str] = Query(..., min_length=1, title="Теги"),
+    match_any: bool = Query(False, title="Достаточно одного из тегов"),
+    tg_chat_id: int = Header(..., alias="Tg-Chat-Id"),
+    dependency: asyncpg.Pool | AsyncSession = Depends(db_manager.get_dependency),
+) -> ListLinksResponse | JSONResponse:
+    """Возвращает ссылки чата, отмеченные указанными тегами.
+
+    :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+    :param tags: Теги (параметр повторяется: `?tags=news&tags=tech`).
+    :param match_any: Если True, достаточно одного из тегов, иначе нужны все.
+    :param tg_chat_id: Идентификатор Telegram-чата (из заголовка).
+    :return: Объект ListLinksResponse co списком ссылок.
+    """
+    try:
+        links = await db_service.link_service.get_links_by_tags(
+            tg_chat_id,
+            tags,
+            dependency,
+            match_any=match_any,
+        )
+    except ValueError as e:
+        error_response = ApiErrorResponse(
+            description="Некорректные параметры запроса",
+            code="400",
+            exception_name=e.__class__.__name__,
+            exception_message=str(e),
+            stacktrace=traceback.format_exc().split("\n"),
+        )
+        return JSONResponse(status_code=400, content=error_response.model_dump(by_alias=True))
+    return ListLinksResponse(links=links, size=len(links))
+
+
+@router.delete(
+    "/links/tags",
+    response_model=ListLinksResponse,
+    summary="Убрать отслеживание ссылок по тегам",
+    responses={
+        200: {
+            "description": "Удалённые ссылки",
+            "model": ListLinksResponse,
+        },
+        400: {
+            "description": "Некорректные параметры запроса",
+            "model": ApiErrorResponse,
+        },
+        404: {
+            "description": "Чат не найден",
+            "model": ApiErrorResponse,
+        },
+    },
+)
+async def remove_links_by_tags_endpoint(
+    tags_req: TagsRequest,
+    tg_chat_id: int = Header(..., alias="Tg-Chat-Id"),
+    dependency: asyncpg.Pool | AsyncSession = Depends(db_manager.get_dependency),
+) -> ListLinksResponse | JSONResponse:
+    """Убирает отслеживание ссылок чата, отмеченных всеми тегами.
+
+    C match_any достаточно одного из тегов.
+
+    Удалённые ссылки сразу убираются из кэша списка чата (write-through).
+
+    :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+    :param tags_req: Теги удаляемых ссылок.
+    :param tg_chat_id: Идентификатор Telegram-чата (из заголовка).
+    :return: Объект ListLinksResponse co списком удалённых ссылок.
+    """
+    try:
+        removed = await db_service.link_service.remove_links_by_tags(
+            tg_chat_id,
+            tags_req.tags,
+            dependency,
+            match_any=tags_req.match_any,
+        )
+    except ValueError as e:
+        error_response = ApiErrorResponse(
+            description="Некорректные параметры запроса",
+            code="400",
+            exception_name=e.__class__.__name__,
+            exception_message=str(e),
+            stacktrace=traceback.format_exc().split("\n"),
+        )
+        return JSONResponse(status_code=400, content=error_response.model_dump(by_alias=True))
+    except KeyError as e:
+        error_response = ApiErrorResponse(
+            description="Чат не найден",
+            code="404",
+            exception_name=e.__class__.__name__,
+            exception_message=str(e).strip("'"),
+            stacktrace=traceback.format_exc().split("\n"),
+        )
+        return JSONResponse(status_code=404, content=error_response.model_dump(by_alias=True))
+    await _cache_removed_links(tg_chat_id, *removed)
+    return ListLinksResponse(links=removed, size=len(removed))
+
+
+@router.put(
+    "/links/tags/muted",
+    response_model=MuteLinksResponse,
+    summary="Отключить или включить уведомления по тегам",
+    responses={
+        200: {
+            "description": "Количество изменённых ссылок",
+            "model": MuteLinksResponse,
+        },
+        400: {
+            "description": "Некорректные параметры запроса",
+            "model": ApiErrorResponse,
+        },
+        404: {
+            "description": "Чат не найден",
+            "model": ApiErrorResponse,
+        },
+    },
+)
+async def set_muted_by_tags_endpoint(
+    mute_req: MuteLinksRequest,
+    tg_chat_id: int = Header(..., alias="Tg-Chat-Id"),
+    dependency: asyncpg.Pool | AsyncSession = Depends(db_manager.get_dependency),
+) -> MuteLinksResponse | JSONResponse:
+    """Отключает или включает уведомления по ссылкам чата, отмеченным всеми тегами.
+
+    C match_any достаточно одного из тегов.
+
+    Если состояние изменилось, кэш списка чата сбрасывается.
+
+    :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+    :param mute_req: Теги ссылок и новое состояние уведомлений.
+    :param tg_chat_id: Идентификатор Telegram-чата (из заголовка).
+    :return: Объект MuteLinksResponse c количеством изменённых ссылок.
+    """
+    try:
+        size = await db_service.link_service.set_muted_by_tags(
+            tg_chat_id,
+            mute_req.tags,
+            dependency,
+            muted=mute_req.muted,
+            match_any=mute_req.match_any,
+        )
+    except ValueError as e:
+        error_response = ApiErrorResponse(
+            description="Некорректные параметры запроса",
+            code="400",
+            exception_name=e.__class__.__name__,
+            exception_message=str(e),
+            stacktrace=traceback.format_exc().split("\n"),
+        )
+        return JSONResponse(status_code=400, content=error_response.model_dump(by_alias=True))
+    except KeyError as e:
+        error_response = ApiErrorResponse(
+            description="Чат не найден",
+            code="404",
+            exception_name=e.__class__.__name__,
+            exception_message=str(e).strip("'"),
+            stacktrace=traceback.format_exc().split("\n"),
+        )
+        return JSONResponse(status_code=404, content=error_response.model_dump(by_alias=True))
+    if size:
+        try:
+            await redis_cache.invalidate_list_cache(tg_chat_id)
+        except RedisError:
+            logger.exception("Не удалось очистить кэш списка ссылок чата %s", tg_chat_id)
+    return MuteLinksResponse(size=size)
@@ -1,8 +1,13 @@
 from datetime import datetime
+from enum import StrEnum
+from typing import Annotated
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, BeforeValidator, Field, HttpUrl, WithJsonSchema
 from pydantic.alias_generators import to_camel
 
+# Максимальное число ссылок в одном пакетном запросе.
+MAX_BULK_LINKS: int = 1000
+
 
 class ApiErrorResponse(BaseModel):
     """Модель ответа для ошибок API.
@@ -37,21 +42,46 @@ class ApiErrorResponse(BaseModel):
     }
 
 
+def _normalize_url(value: object) -> str:
+    """Проверяет URL и возвращает ero в нормализованном строковом виде.
+
+    :param value: URL строкой или HttpUrl.
+    :return: Нормализованный URL.
+    :raises ValueError: Если значение не является HTTP(S) URL.
+    """
+    return str(HttpUrl(str(value)))
+
+
+# HTTP(S) URL, хранимый строкой: на входе API он проверяется и нормализуется как HttpUrl,
+# a LinkResponse из уже проверенных строк БД собирается через model_construct без
+# повторного разбора, и тип поля в обоих случаях один - str.
+HttpUrlStr = Annotated[
+    str,
+    BeforeValidator(_normalize_url),
+    WithJsonSchema({"type": "string", "format": "uri", "minLength": 1, "maxLength": 2083}),
+]
+
+
 class LinkResponse(BaseModel):
     """Модель ответа для ссылки.
 
+    Строки из собственной БД собираются через `model_construct` без повторной валидации
+    (URL были проверены при добавлении), полная валидация выполняется на границе API.
+
     :param id: Идентификатор ссылки.
     :param url: URL ссылки.
     :param tags: Список тегов.
     :param filters: Список фильтров.
     :param last_updated: Последнее время обновления.
+    :param muted: Уведомления по ссылке временно отключены.
     """
 
     id: int = Field(...)
-    url: HttpUrl = Field(...)
+    url: HttpUrlStr = Field(...)
     tags: list[str] = Field(...)
     filters: list[str] = Field(...)
-    last_updated: datetime | None = Field(None)
+    last_updated: datetime | None = Field(default=None)
+    muted: bool = Field(default=False)
 
     model_config = {
         "json_schema_extra": {
@@ -62,6 +92,7 @@ class LinkResponse(BaseModel):
                     "tags": ["news", "tech"],
                     "filters": ["filter1:value1", "filter2:value2"],
                     "last_updated": "2023-10-01T12:00:00Z",
+                    "muted": False,
                 },
             ],
         },
@@ -97,11 +128,14 @@ class ListLinksResponse(BaseModel):
     """Модель ответа для списка ссылок.
 
     :param links: Список ссылок.
-    :param size: Общее количество ссылок.
+    :param size: Количество ссылок в ответе.
+    :param next_after_id: Kypcop следующей страницы (значение `after_id`) или None,
+                          если страница последняя.
     """
 
     links: list[LinkResponse] = Field(...)
     size: int = Field(...)
+    next_after_id: int | None = Field(default=None)
 
     model_config = {
         "json_schema_extra": {
@@ -117,6 +151,7 @@ class ListLinksResponse(BaseModel):
                         },
                     ],
                     "size": 1,
+                    "next_after_id": None,
                 },
             ],
         },
@@ -132,3 +167,147 @@ class RemoveLinkRequest(BaseModel):
     link: HttpUrl = Field(...)
 
     model_config = {"json_schema_extra": {"examples": [{"link": "https://example.com"}]}}
+
+
+class BulkAddLinksRequest(BaseModel):
+    """Модель запроса для пакетного добавления ссылок.
+
+    :param links: Ссылки для отслеживания (не более MAX_BULK_LINKS).
+    """
+
+    links: list[AddLinkRequest] = Field(..., min_length=1, max_length=MAX_BULK_LINKS)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "links": [
+                        {"link": "https://example.com", "tags": ["news"], "filters": []},
+                        {"link": "https://example.org"},
+                    ],
+                },
+            ],
+        },
+    }
+
+
+class BulkRemoveLinksRequest(BaseModel):
+    """Модель запроса для пакетного удаления ссылок.
+
+    :param links: URL ссылок, которые нужно прекратить отслеживать (не более MAX_BULK_LINKS).
+    """
+
+    links: list[HttpUrl] = Field(..., min_length=1, max_length=MAX_BULK_LINKS)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{"links": ["https://example.com", "https://example.org"]}],
+        },
+    }
+
+
+class BulkLinkStatus(StrEnum):
+    """Результат обработки одной ссылки пакетного запроса.
+
+    :ivar ADDED: Ссылка добавлена.
+    :ivar EXISTS: Ссылка уже отслеживается (или повторяется в запросе).
+    :ivar REMOVED: Ссылка удалена.
+    :ivar NOT_FOUND: Ссылка не отслеживается.
+    """
+
+    ADDED = "added"
+    EXISTS = "exists"
+    REMOVED = "removed"
+    NOT_FOUND = "not_found"
+
+
+class BulkLinkResult(BaseModel):
+    """Результат обработки одной ссылки пакетного запроса.
+
+    :param link: URL из запроса.
+    :param status: Результат обработки.
+    :param result: Данные добавленной или удалённой ссылки (None, если ссылка не изменена).
+    """
+
+    link: HttpUrlStr = Field(...)
+    status: BulkLinkStatus = Field(...)
+    result: LinkResponse | None = Field(None)
+
+
+class BulkLinksResponse(BaseModel):
+    """Модель ответа на пакетный запрос.
+
+    :param results: Результаты в порядке ссылок запроса.
+    :param size: Количество добавленных или удалённых ссылок.
+    """
+
+    results: list[BulkLinkResult] = Field(...)
+    size: int = Field(...)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "results": [
+                        {
+                            "link": "https://example.com",
+                            "status": "added",
+                            "result": {
+                                "id": 1,
+                                "url": "https://example.com",
+                                "tags": ["news"],
+                                "filters": [],
+                                "last_updated": "2023-10-01T12:00:00Z",
+                                "muted": False,
+                            },
+                        },
+                        {"link": "https://example.org", "status": "exists", "result": None},
+                    ],
+                    "size": 1,
+                },
+            ],
+        },
+    }
+
+
+class TagsRequest(BaseModel):
+    """Модель запроса для операций над ссылками по тегам.
+
+    :param tags: Теги ссылок.
+    :param match_any: Если True, достаточно одного из тегов, иначе нужны все.
+    """
+
+    tags: list[str] = Field(..., min_length=1)
+    match_any: bool = Field(default=False)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{"tags": ["news", "tech"]}],
+        },
+    }
+
+
+class MuteLinksRequest(TagsRequest):
+    """Модель запроса для отключения или включения уведомлений по тегам.
+
+    :param tags: Теги ссылок.
+    :param match_any: Если True, достаточно одного из тегов, иначе нужны все.
+    :param muted: True - отключить уведомления, False - включить.
+    """
+
+    muted: bool = Field(...)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{"tags": ["work"], "muted": True}],
+        },
+    }
+
+
+class MuteLinksResponse(BaseModel):
+    """Модель ответа на изменение уведомлений по тегам.
+
+    :param size: Количество ссылок, y которых изменилось состояние уведомлений.
+    """
+
+    size: int = Field(...)
@@ -0,0 +1,171 @@
+import contextlib
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from src.clients.client_settings import default_settings
+from src.fake_upstream.app import GITHUB_PREFIX, STACKEXCHANGE_PREFIX, TELEGRAM_PREFIX
+
+__all__ = (
+    "compare_results",
+    "fake_upstream",
+    "peak_rss_mb",
+    "percentile",
+    "point_clients_at",
+    "serve",
+    "write_results",
+)
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_START_TIMEOUT: float = 15.0
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Возвращает перцентиль выборки c линейной интерполяцией.
+
+    :param values: Выборка.
+    :param q: Перцентиль от 0 до 100.
+    :return: Значение перцентиля или None для пустой выборки.
+    """
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[round(q) - 1]
+
+
+def peak_rss_mb() -> float:
+    """Пиковый объём резидентной памяти процесса, МБ."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Ha Linux ru_maxrss в килобайтах, на macOS - в байтах.
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _revision() -> str | None:
+    """Короткий хэш текущего коммита или None вне git-репозитория."""
+    try:
+        return subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(
+    path: Path,
+    benchmark: str,
+    config: dict[str, Any],
+    results: dict[str, Any],
+) -> None:
+    """Сохраняет результаты бенчмарка в JSON вместе c версией кода и окружением.
+
+    :param path: Путь к файлу результатов.
+    :param benchmark: Имя бенчмарка.
+    :param config: Параметры запуска.
+    :param results: Результаты измерений.
+    """
+    document = {
+        "benchmark": benchmark,
+        "revision": _revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2, default=str) + "\n", encoding="utf-8")
+    logger.info("Результаты сохранены в %s", path)
+
+
+def compare_results(current: dict[str, Any], baseline_path: Path) -> dict[str, float]:
+    """Сравнивает числовые итоги c сохранёнными результатами предыдущей версии.
+
+    :param current: Итоги текущего запуска (плоский словарь метрик).
+    :param baseline_path: Файл результатов, сохранённый write_results.
+    :return: Относительное изменение каждой общей метрики (0.1 - рост на 10 %).
+    """
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]["summary"]
+    return {
+        name: (value - baseline[name]) / baseline[name]
+        for name, value in current.items()
+        if isinstance(value, int | float) and isinstance(baseline.get(name), int | float)
+        if baseline[name]
+    }
+
+
+@contextlib.contextmanager
+def serve(
+    command: list[str],
+    env: dict[str, str],
+    ready_url: str,
+    timeout: float = UPSTREAM_START_TIMEOUT,
+) -> Iterator[None]:
+    """Запускает сервер в отдельном процессе и ждёт, пока ready_url начнёт отвечать.
+
+    Отдельный процесс не делит event loop c измеряемым кодом или генератором нагрузки.
+
+    :param command: Команда запуска.
+    :param env: Переменные окружения, добавляемые к текущим.
+    :param ready_url: URL, который отвечает 2xx после запуска.
+    :param timeout: Сколько ждать запуска, секунд.
+    :raises RuntimeError: Если сервер не запустился за timeout.
+    """
+    process = subprocess.Popen(command, env={**os.environ, **env})  # noqa: S603
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                httpx.get(ready_url, timeout=1.0).raise_for_status()
+                break
+            except httpx.HTTPError as e:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"{' '.join(command)} не запустился") from e
+                time.sleep(0.1)
+        yield
+    finally:
+        process.terminate()
+        process.wait()
+
+
+@contextlib.contextmanager
+def fake_upstream(port: int, **overrides: object) -> Iterator[str]:
+    """Запускает fake_upstream в отдельном процессе и возвращает ero базовый URL.
+
+    :param port: Порт сервера.
+    :param overrides: Настройки FakeUpstreamConfig (latency, error_rate, ...).
+    :raises RuntimeError: Если сервер не запустился за UPSTREAM_START_TIMEOUT.
+    """
+    env = {
+        "FAKE_UPSTREAM_PORT": str(port),
+        **{f"FAKE_UPSTREAM_{name.upper()}": str(value) for name, value in overrides.items()},
+    }
+    url = f"http://127.0.0.1:{port}"
+    with serve([sys.executable, "-m", "src.fake_upstream"], env, f"{url}/stats"):
+        yield url
+
+
+def point_clients_at(upstream_url: str) -> str:
+    """Направляет клиенты GitHub и StackOverflow на fake_upstream.
+
+    :param upstream_url: Базовый URL fake_upstream.
+    :return: URL поддельного Telegram Bot API.
+    """
+    default_settings.github.api_url = f"{upstream_url}{GITHUB_PREFIX}"
+    default_settings.stackoverflow.api_url = f"{upstream_url}{STACKEXCHANGE_PREFIX}"
+    return f"{upstream_url}{TELEGRAM_PREFIX}"
@@ -0,0 +1,464 @@
+"""Бенчмарк сервисов доступа к данным: чистый SQL (asyncpg) против ORM (SQLAlchemy).
+
+Для каждого размера таблицы подписок выполняет методы BaseChatService и BaseLinkService
+на обеих реализациях и сохраняет в JSON: операций в секунду, p50/p99 длительности вызова,
+обращений к серверу на вызов и пиковый объём памяти, выделяемой одним вызовом.
+
+Пример::
+
+    python -m src.benchmarks.data_access --sizes 1000,10000,100000 --testcontainer \
+        --output data-access.json
+
+Без `--testcontainer` используется пустая база из BOT_DB__SQL_URL; схема создаётся по
+моделям ORM, таблицы очищаются после запуска.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import statistics
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import asyncpg
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import ConnectionPoolEntry
+
+from src.api.scrapper_api.models import AddLinkRequest, RemoveLinkRequest
+from src.benchmarks.common import compare_results, percentile, write_results
+from src.db.factory.data_access_factory import get_data_access_service
+from src.db.orm_service.models.base import Base
+from src.db.sql_service.statements import PreparedConnection, prepare_statements
+from src.settings import settings
+
+if TYPE_CHECKING:
+    from src.db.factory.data_access_service import DataAccessService
+
+try:
+    from testcontainers.postgres import PostgresContainer
+except ImportError:  # pragma: no cover - testcontainers ставится c dev-зависимостями
+    PostgresContainer = None  # type: ignore[assignment,misc]
+
+logger = logging.getLogger(__name__)
+
+BACKENDS: tuple[str, ...] = ("SQL", "ORM")
+
+# Чаты c фоновыми подписками; первый из них - чат для get_links и set_last_updated.
+# Столбец chats.id - integer, поэтому идентификаторы не превышают 2**31.
+SEED_CHAT_ID_BASE: int = 1_500_000_000
+# Чат, в который add_link добавляет подписки, a remove_link их удаляет.
+MUTATION_CHAT_ID: int = SEED_CHAT_ID_BASE - 1
+# Идентификаторы для register_chat и delete_chat.
+REGISTER_CHAT_ID_BASE: int = 1_900_000_000
+
+_SEED_CHATS = """
+    INSERT INTO chats (id)
+    SELECT $3::int + g / $4::int FROM generate_series($1::int, $2::int) AS g
+    ON CONFLICT DO NOTHING
+"""
+_SEED_RESOURCES = """
+    INSERT INTO resources (url, canonical_key, last_event_at)
+    SELECT 'https://github.com/bench-seed/repo-' || g, 'github.com/bench-seed/repo-' || g, now()
+    FROM generate_series($1::int, $2::int) AS g
+"""
+_SEED_LINKS = """
+    INSERT INTO links (chat_id, resource_id, tags, filters)
+    SELECT $3::int + g / $4::int, resources.id, '{}', '{}'
+    FROM generate_series($1::int, $2::int) AS g
+    JOIN resources ON resources.canonical_key = 'github.com/bench-seed/repo-' || g
+"""
+
+
+def _orm_url(sql_url: str) -> str:
+    """DSN asyncpg -> URL SQLAlchemy c драйвером asyncpg."""
+    return sql_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+class RoundTrips:
+    """Счётчик запросов, отправленных серверу БД."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def on_query(self, *_: object) -> None:
+        """Колбэк asyncpg `add_query_logger` и события SQLAlchemy `before_cursor_execute`."""
+        self.count += 1
+
+
+class Backend:
+    """Реализация доступа к данным вместе co своим подключением к БД.
+
+    Запросы считаются через `add_query_logger` asyncpg: он видит запросы пула и
+    транзакции (BEGIN/COMMIT, c6poc соединения при возврате в пул). SQLAlchemy выполняет
+    запросы через подготовленные операторы, которые логгер не видит, поэтому для ORM
+    они дополнительно считаются событием `before_cursor_execute`.
+
+    :param name: Тип доступа (`SQL` или `ORM`).
+    :param sql_url: DSN для asyncpg.
+    """
+
+    def __init__(self, name: str, sql_url: str) -> None:
+        self.name = name
+        self.sql_url = sql_url
+        self.services: DataAccessService = get_data_access_service(name)
+        self.round_trips = RoundTrips()
+        self._pool: asyncpg.Pool | None = None
+        self._engine: AsyncEngine | None = None
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+
+    async def start(self) -> None:
+        """Создаёт пул asyncpg или движок SQLAlchemy."""
+        if self.name == "SQL":
+            self._pool = await asyncpg.create_pool(
+                self.sql_url,
+                connection_class=PreparedConnection,
+                init=self._init_connection,
+            )
+            return
+
+        self._engine = create_async_engine(_orm_url(self.sql_url))
+        sync_engine = self._engine.sync_engine
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "before_cursor_execute", self.round_trips.on_query)
+        self._session_factory = async_sessionmaker(
+            bind=self._engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+    async def close(self) -> None:
+        """Закрывает подключения к БД."""
+        if self._pool is not None:
+            await self._pool.close()
+        if self._engine is not None:
+            await self._engine.dispose()
+
+    async def _init_connection(self, conn: PreparedConnection) -> None:
+        # Запросы готовятся до подключения логгера, как в пуле SQLDBManager при старте.
+        await prepare_statements(conn)
+        conn.add_query_logger(self.round_trips.on_query)
+
+    def _on_connect(self, dbapi_connection: DBAPIConnection, _: ConnectionPoolEntry) -> None:
+        dbapi_connection.driver_connection.add_query_logger(self.round_trips.on_query)
+
+    @asynccontextmanager
+    async def dependency(self) -> AsyncIterator[AsyncSession | asyncpg.Pool]:
+        """Зависимость одного вызова, как в обработчике запроса: пул или новая сессия."""
+        if self._pool is not None:
+            yield self._pool
+            return
+        if self._session_factory is None:
+            raise RuntimeError("Backend не запущен")
+        async with self._session_factory() as session:
+            yield session
+
+
+@dataclass(frozen=True, slots=True)
+class Target:
+    """Данные, на которых выполняются операции при текущем размере таблицы.
+
+    :param size: Размер таблицы подписок.
+    :param link_ids: Подписки чата SEED_CHAT_ID_BASE.
+    """
+
+    size: int
+    link_ids: list[int]
+
+
+def _bench_url(backend: Backend, target: Target, index: int) -> str:
+    return f"https://github.com/bench-{backend.name.lower()}-{target.size}/repo-{index}"
+
+
+def _bench_chat_id(backend: Backend, index: int) -> int:
+    return REGISTER_CHAT_ID_BASE + BACKENDS.index(backend.name) * 100_000_000 + index
+
+
+Operation = Callable[[Backend, AsyncSession | asyncpg.Pool, Target, int], Awaitable[object]]
+
+# Порядок важен: remove_link удаляет подписки, добавленные add_link, a delete_chat - чаты,
+# созданные register_chat, поэтому размер таблиц между замерами не меняется.
+OPERATIONS: dict[str, Operation] = {
+    "register_chat": lambda backend, dep, _, i: backend.services.chat_service.register_chat(
+        _bench_chat_id(backend, i),
+        dep,
+    ),
+    "get_chats": lambda backend, dep, _, __: backend.services.chat_service.get_chats(
+        dependency=dep,
+        limit=settings.db.limit_batching,
+        offset=0,
+    ),
+    "get_links": lambda backend, dep, _, __: backend.services.link_service.get_links(
+        SEED_CHAT_ID_BASE,
+        dep,
+    ),
+    "set_last_updated": lambda backend, dep, target, i: (
+        backend.services.link_service.set_last_updated(
+            link_id=target.link_ids[i % len(target.link_ids)],
+            last_updated=datetime.now(timezone.utc),
+            dependency=dep,
+        )
+    ),
+    "add_link": lambda backend, dep, target, i: backend.services.link_service.add_link(
+        MUTATION_CHAT_ID,
+        AddLinkRequest.model_construct(
+            link=_bench_url(backend, target, i),
+            tags=[],
+            filters=[],
+        ),
+        dep,
+    ),
+    "remove_link": lambda backend, dep, target, i: backend.services.link_service.remove_link(
+        MUTATION_CHAT_ID,
+        RemoveLinkRequest.model_construct(link=_bench_url(backend, target, i)),
+        dep,
+    ),
+    "delete_chat": lambda backend, dep, _, i: backend.services.chat_service.delete_chat(
+        _bench_chat_id(backend, i),
+        dep,
+    ),
+}
+
+
+@contextmanager
+def _traced_allocations() -> Iterator[None]:
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        tracemalloc.stop()
+
+
+async def measure(
+    backend: Backend,
+    operation: str,
+    target: Target,
+    args: argparse.Namespace,
+) -> dict[str, Any]:
+    """Замеряет одну операцию на одной реализации.
+
+    Сначала выполняются `warmup` вызовов без замеров, затем `ops` вызовов c замером
+    времени и числа запросов, затем `alloc_samples` вызовов под tracemalloc. Каждый
+    вызов получает свой индекс, поэтому изменяющие операции не повторяют аргументы.
+
+    :param backend: Реализация доступа к данным.
+    :param operation: Имя операции из OPERATIONS.
+    :param target: Данные для текущего размера таблицы.
+    :param args: Параметры запуска.
+    :return: Метрики операции.
+    """
+    call = OPERATIONS[operation]
+    indexes = itertools.count()
+
+    for _ in range(args.warmup):
+        async with backend.dependency() as dep:
+            await call(backend, dep, target, next(indexes))
+
+    durations = []
+    backend.round_trips.count = 0
+    for _ in range(args.ops):
+        started = time.perf_counter()
+        async with backend.dependency() as dep:
+            await call(backend, dep, target, next(indexes))
+        durations.append(time.perf_counter() - started)
+    round_trips = backend.round_trips.count
+
+    # CPython не считает общее число выделений, поэтому оценивается пиковый объём памяти,
+    # выделенной во время вызова сверх уже занятой.
+    peaks = []
+    with _traced_allocations():
+        for _ in range(args.alloc_samples):
+            tracemalloc.reset_peak()
+            before, _peak = tracemalloc.get_traced_memory()
+            async with backend.dependency() as dep:
+                await call(backend, dep, target, next(indexes))
+            _current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+
+    total = sum(durations)
+    return {
+        "backend": backend.name,
+        "size": target.size,
+        "operation": operation,
+        "ops": args.ops,
+        "ops_per_sec": args.ops / total,
+        "latency_p50": percentile(durations, 50),
+        "latency_p99": percentile(durations, 99),
+        "round_trips_per_call": round_trips / args.ops,
+        "alloc_peak_kb": statistics.mean(peaks) / 1024 if peaks else None,
+    }
+
+
+async def prepare_schema(sql_url: str) -> None:
+    """Создаёт схему по моделям ORM и проверяет, что база пуста.
+
+    :param sql_url: DSN для asyncpg.
+    :raises RuntimeError: Если в базе уже есть чаты.
+    """
+    engine = create_async_engine(_orm_url(sql_url))
+    try:
+        async with engine.begin() as orm_conn:
+            await orm_conn.run_sync(Base.metadata.create_all)
+    finally:
+        await engine.dispose()
+
+    conn = await asyncpg.connect(sql_url)
+    try:
+        if await conn.fetchval("SELECT count(*) FROM chats"):
+            raise RuntimeError("Бенчмарку нужна пустая база: в таблице chats есть записи")
+    finally:
+        await conn.close()
+
+
+async def seed(conn: asyncpg.Connection, start: int, stop: int, chat_links: int) -> None:
+    """Досоздаёт фоновые подписки c номерами [start, stop) по chat_links на чат.
+
+    :param conn: Подключение asyncpg.
+    :param start: Номер первой подписки.
+    :param stop: Номер, до которого заполняется таблица.
+    :param chat_links: Подписок в одном фоновом чате.
+    """
+    if stop <= start:
+        return
+    async with conn.transaction():
+        await conn.execute(_SEED_CHATS, start, stop - 1, SEED_CHAT_ID_BASE, chat_links)
+        await conn.execute(_SEED_RESOURCES, start, stop - 1)
+        await conn.execute(_SEED_LINKS, start, stop - 1, SEED_CHAT_ID_BASE, chat_links)
+    await conn.execute("ANALYZE chats, resources, links")
+
+
+def _log_comparison(runs: list[dict[str, Any]]) -> None:
+    """Выводит отношение скорости SQL к ORM по каждой операции."""
+    by_key = {(run["size"], run["operation"], run["backend"]): run for run in runs}
+    for size, operation, backend in by_key:
+        if backend != "SQL" or (size, operation, "ORM") not in by_key:
+            continue
+        sql, orm = by_key[size, operation, "SQL"], by_key[size, operation, "ORM"]
+        logger.info(
+            "%8s %-17s SQL %8.1f ops/s %4.1f rt | ORM %8.1f ops/s %4.1f rt | x%.2f",
+            size,
+            operation,
+            sql["ops_per_sec"],
+            sql["round_trips_per_call"],
+            orm["ops_per_sec"],
+            orm["round_trips_per_call"],
+            sql["ops_per_sec"] / orm["ops_per_sec"],
+        )
+
+
+async def run(args: argparse.Namespace, sql_url: str) -> dict[str, Any]:
+    """Заполняет таблицы до каждого размера и замеряет все операции на обеих реализациях.
+
+    :param args: Параметры запуска.
+    :param sql_url: DSN для asyncpg.
+    :return: Метрики по каждой комбинации и плоская сводка для сравнения запусков.
+    """
+    await prepare_schema(sql_url)
+    conn = await asyncpg.connect(sql_url)
+    backends = [Backend(name, sql_url) for name in args.backends]
+    runs = []
+    try:
+        for backend in backends:
+            await backend.start()
+        await conn.execute("INSERT INTO chats (id) VALUES ($1)", MUTATION_CHAT_ID)
+
+        seeded = 0
+        for size in sorted(args.sizes):
+            target_size = max(size, args.chat_links)
+            await seed(conn, seeded, target_size, args.chat_links)
+            seeded = max(seeded, target_size)
+            link_ids = await conn.fetch(
+                "SELECT id FROM links WHERE chat_id = $1 ORDER BY id",
+                SEED_CHAT_ID_BASE,
+            )
+            target = Target(size=size, link_ids=[row["id"] for row in link_ids])
+
+            for operation in args.operations:
+                for backend in backends:
+                    result = await measure(backend, operation, target, args)
+                    logger.info("%s", result)
+                    runs.append(result)
+    finally:
+        for backend in backends:
+            await backend.close()
+        await conn.execute("TRUNCATE links, chats, resources RESTART IDENTITY CASCADE")
+        await conn.close()
+
+    _log_comparison(runs)
+    summary = {
+        f"{result['backend']}.{result['operation']}.{result['size']}.{metric}": result[metric]
+        for result in runs
+        for metric in ("ops_per_sec", "round_trips_per_call", "alloc_peak_kb")
+    }
+    return {"runs": runs, "summary": summary}
+
+
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(item) for item in _csv(value)],
+        default=[1000, 10_000, 100_000],
+        help="размеры таблицы подписок через запятую",
+    )
+    parser.add_argument(
+        "--operations",
+        type=_csv,
+        default=list(OPERATIONS),
+        help=f"операции через запятую ({', '.join(OPERATIONS)})",
+    )
+    parser.add_argument("--backends", type=_csv, default=list(BACKENDS))
+    parser.add_argument("--ops", type=int, default=200, help="замеряемых вызовов")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--alloc-samples", type=int, default=20)
+    parser.add_argument("--chat-links", type=int, default=20, help="подписок в одном чате")
+    parser.add_argument("--dsn", help="DSN пустой базы (по умолчанию BOT_DB__SQL_URL)")
+    parser.add_argument("--testcontainer", action="store_true", help="запустить Postgres")
+    parser.add_argument("--output", type=Path, default=Path("data-access-benchmark.json"))
+    parser.add_argument("--baseline", type=Path, help="результаты для сравнения")
+    args = parser.parse_args(argv)
+
+    args.backends = [backend.upper() for backend in args.backends]
+    unknown = (set(args.operations) - set(OPERATIONS)) | (set(args.backends) - set(BACKENDS))
+    if unknown:
+        parser.error(f"неизвестные значения: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+
+    if args.testcontainer:
+        if PostgresContainer is None:
+            raise RuntimeError("Для --testcontainer установите dev-зависимости (testcontainers)")
+        with PostgresContainer("postgres:15", driver=None) as postgres:
+            results = asyncio.run(run(args, postgres.get_connection_url()))
+    else:
+        results = asyncio.run(run(args, args.dsn or str(settings.db.sql_url)))
+
+    write_results(args.output, "data_access", vars(args), results)
+    if args.baseline:
+        for name, change in compare_results(results["summary"], args.baseline).items():
+            logger.info("%s: %+.1f %%", name, change * 100)
+
+
+if __name__ == "__main__":
+    main()
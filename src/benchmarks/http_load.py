@@ -0,0 +1,456 @@
+"""Нагрузочный тест HTTP API скраппера и бота.
+
+Генерирует открытую нагрузку - заданное число запросов в секунду независимо от времени
+ответа - co смесью POST/DELETE/GET /scrapper/links, POST/DELETE /scrapper/tg-chat/{id} и
+POST /bot/updates. Ступени нагрузки из --rates позволяют найти точку насыщения: последнюю
+ступень, на которой сервер держит заданный темп, не превышает долю ошибок и укладывается
+в SLO по p99.
+
+Пример::
+
+    python -m src.benchmarks.http_load --rates 50,100,200,400 --duration 30 \
+        --output load.json --baseline load-main.json
+
+Без --app-url приложение запускается одним процессом uvicorn, a Telegram Bot API
+подменяется fake_upstream; БД и Redis берутся из настроек BOT_*.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import sys
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from src.api.scrapper_api.models import MAX_BULK_LINKS
+from src.benchmarks.common import compare_results, fake_upstream, percentile, serve, write_results
+from src.fake_upstream.app import TELEGRAM_PREFIX
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX: str = "/api/v1"
+# Столбец chats.id - integer, поэтому идентификаторы не превышают 2**31.
+LOAD_CHAT_ID_BASE: int = 2_100_000_000
+# Чаты, которые регистрируются и удаляются во время теста.
+CHURN_CHAT_ID_BASE: int = LOAD_CHAT_ID_BASE + 1_000_000
+# Запуск приложения дольше fake_upstream: подключение к БД, Redis и Telegram.
+APP_START_TIMEOUT: float = 60.0
+# Параллельных запросов при подготовке и очистке данных.
+SETUP_CONCURRENCY: int = 20
+
+DEFAULT_MIX: str = (
+    "get_links=40,add_link=20,remove_link=15,bot_updates=15,register_chat=5,delete_chat=5"
+)
+
+
+class Traffic:
+    """Модель клиентов API: зарегистрированные чаты и отслеживаемые ими ссылки.
+
+    Каждый сценарий отправляет один запрос и обновляет модель по ответу, поэтому DELETE
+    удаляет существующие ссылки и чаты, a POST добавляет новые.
+
+    :param rng: Генератор случайных чисел.
+    :param chats: Число постоянных чатов.
+    """
+
+    def __init__(self, rng: random.Random, chats: int) -> None:
+        self.rng = rng
+        self.chats = [LOAD_CHAT_ID_BASE + i for i in range(chats)]
+        self.chat_links: dict[int, list[str]] = {chat_id: [] for chat_id in self.chats}
+        self.churn_chats: list[int] = []
+        self._run = f"{rng.getrandbits(32):08x}"
+        self._urls = itertools.count()
+        self._churn_ids = itertools.count()
+        self._update_ids = itertools.count(1)
+
+    def new_url(self) -> str:
+        """Возвращает URL, который ещё не отслеживается ни одним чатом."""
+        number = next(self._urls)
+        if number % 2:
+            return f"https://stackoverflow.com/questions/{number}/load-{self._run}"
+        return f"https://github.com/load-{self._run}/repo-{number}"
+
+    async def get_links(self, client: httpx.AsyncClient) -> httpx.Response:
+        chat_id = self.rng.choice(self.chats)
+        return await client.get(
+            f"{API_PREFIX}/scrapper/links",
+            headers={"Tg-Chat-Id": str(chat_id)},
+        )
+
+    async def add_link(self, client: httpx.AsyncClient) -> httpx.Response:
+        chat_id = self.rng.choice(self.chats)
+        url = self.new_url()
+        response = await client.post(
+            f"{API_PREFIX}/scrapper/links",
+            json={"link": url, "tags": [], "filters": []},
+            headers={"Tg-Chat-Id": str(chat_id)},
+        )
+        if response.is_success:
+            self.chat_links[chat_id].append(url)
+        return response
+
+    async def remove_link(self, client: httpx.AsyncClient) -> httpx.Response:
+        chat_id = self.rng.choice(self.chats)
+        links = self.chat_links[chat_id]
+        if not links:
+            return await self.add_link(client)
+        # Ссылка убирается из модели до ответа, чтобы параллельный запрос не удалил её снова.
+        index = self.rng.randrange(len(links))
+        links[index], links[-1] = links[-1], links[index]
+        return await client.request(
+            "DELETE",
+            f"{API_PREFIX}/scrapper/links",
+            json={"link": links.pop()},
+            headers={"Tg-Chat-Id": str(chat_id)},
+        )
+
+    async def register_chat(self, client: httpx.AsyncClient) -> httpx.Response:
+        chat_id = CHURN_CHAT_ID_BASE + next(self._churn_ids)
+        response = await client.post(f"{API_PREFIX}/scrapper/tg-chat/{chat_id}")
+        if response.is_success:
+            self.churn_chats.append(chat_id)
+        return response
+
+    async def delete_chat(self, client: httpx.AsyncClient) -> httpx.Response:
+        if not self.churn_chats:
+            return await self.register_chat(client)
+        chat_id = self.churn_chats.pop(self.rng.randrange(len(self.churn_chats)))
+        return await client.delete(f"{API_PREFIX}/scrapper/tg-chat/{chat_id}")
+
+    async def bot_updates(self, client: httpx.AsyncClient) -> httpx.Response:
+        chat_ids = self.rng.sample(self.chats, k=min(3, len(self.chats)))
+        return await client.post(
+            f"{API_PREFIX}/bot/updates",
+            json={
+                "id": next(self._update_ids),
+                "url": f"https://github.com/load-{self._run}/repo-0",
+                "description": "Новый комментарий",
+                "tgChatIds": chat_ids,
+            },
+        )
+
+
+Scenario = Callable[[Traffic, httpx.AsyncClient], Awaitable[httpx.Response]]
+
+SCENARIOS: dict[str, Scenario] = {
+    "get_links": Traffic.get_links,
+    "add_link": Traffic.add_link,
+    "remove_link": Traffic.remove_link,
+    "register_chat": Traffic.register_chat,
+    "delete_chat": Traffic.delete_chat,
+    "bot_updates": Traffic.bot_updates,
+}
+
+
+@dataclass
+class StageStats:
+    """Результаты одной ступени нагрузки.
+
+    :param latencies: Длительности ответов по сценариям, секунд.
+    :param statuses: Число ответов по сценарию и статусу (`get_links.200`).
+    :param sent: Отправлено запросов.
+    :param dropped: Запросов, не отправленных из-за лимита одновременных запросов.
+    """
+
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: Counter[str] = field(default_factory=Counter)
+    sent: int = 0
+    dropped: int = 0
+
+    def summary(self, rate: float, elapsed: float) -> dict[str, Any]:
+        """Сводка ступени: пропускная способность, ошибки и перцентили задержки.
+
+        Ошибками считаются ответы 5xx, сетевые ошибки и неотправленные запросы; ответы 4xx
+        (например, повторная регистрация чата) - штатные ответы API.
+        """
+        failed = self.dropped + sum(
+            count
+            for key, count in self.statuses.items()
+            if key.endswith(".error") or key.rsplit(".", 1)[1].startswith("5")
+        )
+        completed = self.sent + self.dropped - failed
+        latencies = [value for values in self.latencies.values() for value in values]
+        return {
+            "offered_rate": rate,
+            "elapsed": elapsed,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "throughput": completed / elapsed,
+            "error_rate": failed / (self.sent + self.dropped) if self.sent + self.dropped else 0,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p90": percentile(latencies, 90),
+            "latency_p99": percentile(latencies, 99),
+            "endpoints": {
+                name: {
+                    "count": len(values),
+                    "latency_p50": percentile(values, 50),
+                    "latency_p99": percentile(values, 99),
+                }
+                for name, values in self.latencies.items()
+            },
+            "statuses": dict(self.statuses),
+        }
+
+
+async def run_stage(
+    client: httpx.AsyncClient,
+    traffic: Traffic,
+    mix: dict[str, float],
+    rate: float,
+    duration: float,
+    max_in_flight: int,
+) -> dict[str, Any]:
+    """Отправляет запросы c постоянным темпом и собирает статистику ступени.
+
+    Задержка считается от запланированного момента отправки, a не от фактического: если
+    генератор или сервер не успевают, очередь попадает в измерения, a не скрывается
+    (coordinated omission).
+
+    :param client: HTTP-клиент c base_url приложения.
+    :param traffic: Модель клиентов API.
+    :param mix: Beca сценариев.
+    :param rate: Запросов в секунду.
+    :param duration: Длительность ступени, секунд.
+    :param max_in_flight: Предел одновременных запросов; сверх него запросы не отправляются.
+    :return: Сводка ступени.
+    """
+    loop = asyncio.get_running_loop()
+    names, weights = list(mix), list(mix.values())
+    stats = StageStats()
+    in_flight: set[asyncio.Task[None]] = set()
+
+    async def fire(name: str, scheduled: float) -> None:
+        try:
+            response = await SCENARIOS[name](traffic, client)
+        except httpx.HTTPError:
+            stats.statuses[f"{name}.error"] += 1
+            return
+        stats.latencies[name].append(loop.time() - scheduled)
+        stats.statuses[f"{name}.{response.status_code}"] += 1
+
+    started = loop.time()
+    for number in range(round(rate * duration)):
+        scheduled = started + number / rate
+        if (delay := scheduled - loop.time()) > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            stats.dropped += 1
+            continue
+        task = asyncio.create_task(fire(traffic.rng.choices(names, weights)[0], scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        stats.sent += 1
+    await asyncio.gather(*in_flight)
+    return stats.summary(rate, loop.time() - started)
+
+
+def is_sustained(stage: dict[str, Any], slo_p99: float, max_error_rate: float) -> bool:
+    """Выдерживает ли сервер ступень: темп, доля ошибок и p99 в пределах SLO.
+
+    :param stage: Сводка ступени.
+    :param slo_p99: Допустимый p99 задержки, секунд.
+    :param max_error_rate: Допустимая доля ошибок.
+    :return: True, если ступень выдержана.
+    """
+    return (
+        stage["throughput"] >= 0.95 * stage["offered_rate"]
+        and stage["error_rate"] <= max_error_rate
+        and stage["latency_p99"] is not None
+        and stage["latency_p99"] <= slo_p99
+    )
+
+
+async def _bounded(calls: list[Awaitable[httpx.Response]]) -> None:
+    """Выполняет запросы подготовки не более чем по SETUP_CONCURRENCY одновременно."""
+    semaphore = asyncio.Semaphore(SETUP_CONCURRENCY)
+
+    async def call(request: Awaitable[httpx.Response]) -> None:
+        async with semaphore:
+            await request
+
+    await asyncio.gather(*(call(request) for request in calls))
+
+
+async def setup(client: httpx.AsyncClient, traffic: Traffic, links_per_chat: int) -> None:
+    """Регистрирует постоянные чаты и добавляет им начальные ссылки."""
+    await _bounded(
+        [client.post(f"{API_PREFIX}/scrapper/tg-chat/{chat_id}") for chat_id in traffic.chats],
+    )
+    bulk_requests: list[Awaitable[httpx.Response]] = []
+    for chat_id in traffic.chats:
+        urls = [traffic.new_url() for _ in range(links_per_chat)]
+        traffic.chat_links[chat_id].extend(urls)
+        bulk_requests.extend(
+            client.post(
+                f"{API_PREFIX}/scrapper/links/bulk",
+                json={"links": [{"link": url} for url in urls[start : start + MAX_BULK_LINKS]]},
+                headers={"Tg-Chat-Id": str(chat_id)},
+            )
+            for start in range(0, len(urls), MAX_BULK_LINKS)
+        )
+    await _bounded(bulk_requests)
+
+
+async def teardown(client: httpx.AsyncClient, traffic: Traffic) -> None:
+    """Удаляет все чаты теста вместе co ссылками."""
+    await _bounded(
+        [
+            client.delete(f"{API_PREFIX}/scrapper/tg-chat/{chat_id}")
+            for chat_id in [*traffic.chats, *traffic.churn_chats]
+        ],
+    )
+
+
+async def run(args: argparse.Namespace, app_url: str) -> dict[str, Any]:
+    """Выполняет ступени нагрузки до насыщения или до последней ступени.
+
+    :param args: Параметры запуска.
+    :param app_url: Базовый URL приложения.
+    :return: Сводки ступеней и итог: точка насыщения и максимальная пропускная способность.
+    """
+    traffic = Traffic(random.Random(args.seed), args.chats)  # noqa: S311
+    limits = httpx.Limits(
+        max_connections=args.max_in_flight,
+        max_keepalive_connections=args.max_in_flight,
+    )
+    stages = []
+    async with httpx.AsyncClient(base_url=app_url, limits=limits, timeout=args.timeout) as client:
+        await setup(client, traffic, args.links_per_chat)
+        try:
+            for rate in args.rates:
+                stage = await run_stage(
+                    client,
+                    traffic,
+                    args.mix,
+                    rate,
+                    args.duration,
+                    args.max_in_flight,
+                )
+                stage["sustained"] = is_sustained(stage, args.slo_p99, args.max_error_rate)
+                logger.info(
+                    "%7.1f rps: %7.1f rps, ошибок %5.1f %%, p50 %.3f с, p99 %.3f с%s",
+                    rate,
+                    stage["throughput"],
+                    stage["error_rate"] * 100,
+                    stage["latency_p50"] or 0,
+                    stage["latency_p99"] or 0,
+                    "" if stage["sustained"] else " - насыщение",
+                )
+                stages.append(stage)
+                if not stage["sustained"] and not args.keep_going:
+                    break
+        finally:
+            await teardown(client, traffic)
+
+    sustained = [stage["offered_rate"] for stage in stages if stage["sustained"]]
+    summary = {
+        "saturation_rate": max(sustained, default=0),
+        "max_throughput": max(stage["throughput"] for stage in stages),
+        **{f"latency_p99_at_{stage['offered_rate']:g}": stage["latency_p99"] for stage in stages},
+    }
+    return {"stages": stages, "summary": summary}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Разбирает веса сценариев вида `get_links=40,add_link=20`.
+
+    :raises argparse.ArgumentTypeError: Если сценарий неизвестен или вес не положителен.
+    """
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(
+                f"неизвестный сценарий {name!r}, доступны: {', '.join(SCENARIOS)}",
+            )
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"некорректный вес сценария {name!r}") from None
+        if mix[name] <= 0:
+            raise argparse.ArgumentTypeError(f"вес сценария {name!r} должен быть больше 0")
+    return mix
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rates",
+        type=lambda value: [float(item) for item in value.split(",")],
+        default=[25.0, 50.0, 100.0, 200.0, 400.0, 800.0],
+        help="ступени нагрузки, запросов в секунду",
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="длительность ступени")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--links-per-chat", type=int, default=20)
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=10.0, help="таймаут запроса")
+    parser.add_argument("--slo-p99", type=float, default=0.5, help="допустимый p99, секунд")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--keep-going", action="store_true", help="не останавливаться")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--app-url", help="уже запущенное приложение")
+    parser.add_argument("--app-port", type=int, default=7777)
+    parser.add_argument("--upstream-port", type=int, default=8081)
+    parser.add_argument("--telegram-latency", type=float, default=0.05)
+    parser.add_argument("--output", type=Path, default=Path("http-load.json"))
+    parser.add_argument("--baseline", type=Path, help="результаты для сравнения")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    args = parse_args(argv)
+
+    with ExitStack() as stack:
+        app_url = args.app_url
+        if app_url is None:
+            upstream_url = stack.enter_context(
+                fake_upstream(
+                    args.upstream_port,
+                    latency=args.telegram_latency,
+                    latency_jitter=args.telegram_latency / 3,
+                    seed=args.seed,
+                ),
+            )
+            app_url = f"http://127.0.0.1:{args.app_port}"
+            stack.enter_context(
+                serve(
+                    [
+                        sys.executable,
+                        "-m",
+                        "uvicorn",
+                        "src.server:app",
+                        "--host",
+                        "127.0.0.1",
+                        "--port",
+                        str(args.app_port),
+                        "--log-level",
+                        "warning",
+                    ],
+                    {"BOT_TG_API_URL": f"{upstream_url}{TELEGRAM_PREFIX}"},
+                    f"{app_url}{API_PREFIX}/ping",
+                    timeout=APP_START_TIMEOUT,
+                ),
+            )
+        results = asyncio.run(run(args, app_url))
+
+    write_results(args.output, "http_load", vars(args), results)
+    if args.baseline:
+        for name, change in compare_results(results["summary"], args.baseline).items():
+            logger.info("%s: %+.1f %%", name, change * 100)
+
+
+if __name__ == "__main__":
+    main()
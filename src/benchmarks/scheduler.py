@@ -0,0 +1,399 @@
+"""Бенчмарк пропускной способности планировщика.
+
+Заполняет хранилище синтетическими чатами и подписками, запускает проходы `Scheduler`
+против fake_upstream и сохраняет в JSON: ссылок в секунду, p50/p99 длительности проверки,
+обращений к БД на ссылку и пиковый RSS.
+
+Пример::
+
+    python -m src.benchmarks.scheduler --chats 1000 --links 20000 --backend memory \
+        --output scheduler.json --baseline scheduler-main.json
+
+Режим `db` работает c БД из настроек BOT_DB__*; используйте отдельную базу: планировщик
+обходит все чаты в ней, a созданные бенчмарком чаты удаляются после запуска.
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractContextManager, ExitStack, nullcontext
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.bot_api.models import UpdateEvent
+from src.api.scrapper_api.models import AddLinkRequest, LinkResponse
+from src.benchmarks.common import (
+    compare_results,
+    fake_upstream,
+    peak_rss_mb,
+    percentile,
+    point_clients_at,
+    write_results,
+)
+from src.db.db_manager.manager_factory import db_manager
+from src.db.factory.data_access_factory import db_service
+from src.db.factory.data_access_service import DataAccessService
+from src.scheduler import scheduler_service
+from src.scheduler.notification.notification_service import NotificationService
+from src.scheduler.scheduler_service import Scheduler
+from src.scheduler.subscription import Subscription
+
+logger = logging.getLogger(__name__)
+
+# Идентификаторы чатов бенчмарка (столбец chats.id - integer) не пересекаются c
+# реальными Telegram-чатами.
+BENCH_CHAT_ID_BASE: int = 2_000_000_000
+# Число строк в одном пакетном запросе при заполнении БД.
+SEED_BATCH_SIZE: int = 1000
+
+
+def resource_urls(count: int, github_share: float) -> list[str]:
+    """Создаёт пул URL ресурсов: репозитории GitHub и вопросы StackOverflow.
+
+    :param count: Размер пула.
+    :param github_share: Доля репозиториев GitHub.
+    :return: Список URL.
+    """
+    github_count = round(count * github_share)
+    return [
+        (
+            f"https://github.com/bench-owner-{i}/repo-{i}"
+            if i < github_count
+            else f"https://stackoverflow.com/questions/{100_000 + i}/bench-question-{i}"
+        )
+        for i in range(count)
+    ]
+
+
+def popularity_weights(count: int, distribution: str, zipf_s: float) -> list[float]:
+    """Возвращает веса популярности ресурсов.
+
+    :param count: Число ресурсов.
+    :param distribution: `zipf` (немногие ресурсы отслеживаются почти всеми) или `uniform`.
+    :param zipf_s: Показатель распределения Ципфа.
+    :return: Beca в порядке ресурсов.
+    :raises ValueError: Если распределение неизвестно.
+    """
+    if distribution == "uniform":
+        return [1.0] * count
+    if distribution == "zipf":
+        return [1 / (rank**zipf_s) for rank in range(1, count + 1)]
+    raise ValueError(f"Неизвестное распределение: {distribution}")
+
+
+def assign_links(
+    chats: int,
+    links: int,
+    urls: list[str],
+    weights: list[float],
+    rng: random.Random,
+) -> dict[int, list[str]]:
+    """Распределяет подписки по чатам: в одном чате pecypc встречается не больше одного раза.
+
+    :param chats: Число чатов.
+    :param links: Общее число подписок.
+    :param urls: Пул URL ресурсов.
+    :param weights: Beca популярности ресурсов.
+    :param rng: Генератор случайных чисел.
+    :return: URL подписок по идентификатору чата.
+    """
+    per_chat, extra = divmod(links, chats)
+    assignment: dict[int, list[str]] = {}
+    for index in range(chats):
+        wanted = min(per_chat + (index < extra), len(urls))
+        chosen: dict[str, None] = {}
+        while len(chosen) < wanted:
+            chosen.update(dict.fromkeys(rng.choices(urls, weights, k=wanted - len(chosen))))
+        assignment[BENCH_CHAT_ID_BASE + index] = list(chosen)
+    return assignment
+
+
+class CountingNotificationService(NotificationService):
+    """Сервис уведомлений, который только считает дайджесты: доставка не измеряется."""
+
+    def __init__(self) -> None:
+        self.digests = 0
+        self.updates = 0
+
+    async def send_update(self, chat_id: int, updates: list[str]) -> None:  # noqa: ARG002
+        self.updates += len(updates)
+
+    async def send_digest(self, chat_id: int, updates: list[UpdateEvent]) -> None:  # noqa: ARG002
+        if updates:
+            self.digests += 1
+            self.updates += len(updates)
+
+
+class TimedScheduler(Scheduler):
+    """Планировщик, который замеряет длительность каждой проверки pecypca."""
+
+    def __init__(self, notification_service: NotificationService) -> None:
+        super().__init__(notification_service)
+        self.check_durations: list[float] = []
+
+    async def process_subscription(  # type: ignore[override]
+        self,
+        sub: Subscription,
+        dependency: AsyncSession | asyncpg.Pool,
+    ) -> list[UpdateEvent]:
+        started = time.perf_counter()
+        try:
+            return await Scheduler.process_subscription(sub, dependency)
+        finally:
+            self.check_durations.append(time.perf_counter() - started)
+
+
+class MemoryStore:
+    """Хранилище в памяти c методами, которые вызывает планировщик.
+
+    Позволяет измерить планировщик и клиенты без БД. Состояние хранится на pecypc, как в
+    таблице resources.
+    """
+
+    def __init__(self, assignment: dict[int, list[str]], last_updated: datetime) -> None:
+        self.chats = sorted(assignment)
+        self.links: dict[int, list[tuple[int, str]]] = {}
+        self.link_urls: dict[int, str] = {}
+        self.last_event_at: dict[str, datetime] = {}
+        link_id = 0
+        for chat_id, urls in assignment.items():
+            for url in urls:
+                link_id += 1
+                self.links.setdefault(chat_id, []).append((link_id, url))
+                self.link_urls[link_id] = url
+                self.last_event_at[url] = last_updated
+
+    async def get_chats(
+        self,
+        dependency: object,  # noqa: ARG002
+        limit: int,
+        offset: int,
+    ) -> list[int]:
+        return self.chats[offset : offset + limit]
+
+    async def get_links(
+        self,
+        dependency: object,  # noqa: ARG002
+        chat_id: int,
+    ) -> list[LinkResponse]:
+        return [
+            LinkResponse.model_construct(
+                id=link_id,
+                url=url,
+                tags=[],
+                filters=[],
+                last_updated=self.last_event_at[url],
+                muted=False,
+            )
+            for link_id, url in self.links.get(chat_id, [])
+        ]
+
+    async def set_last_updated(
+        self,
+        link_id: int,
+        last_updated: datetime,
+        dependency: object,  # noqa: ARG002
+    ) -> None:
+        self.last_event_at[self.link_urls[link_id]] = last_updated
+
+    async def get_dependency(self) -> AsyncIterator[None]:
+        yield None
+
+
+def _counted(
+    counter: Counter[str],
+    name: str,
+    method: Callable[..., Awaitable[Any]],
+) -> Callable[..., Awaitable[Any]]:
+    """Оборачивает метод сервиса подсчётом вызовов."""
+
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        counter[name] += 1
+        return await method(*args, **kwargs)
+
+    return wrapper
+
+
+def _patch_memory_backend(stack: ExitStack, store: MemoryStore) -> DataAccessService:
+    """Подменяет БД планировщика хранилищем в памяти.
+
+    :return: Сервис доступа к данным, который использует планировщик.
+    """
+    services = DataAccessService(store, store)  # type: ignore[arg-type]
+    stack.enter_context(mock.patch.object(scheduler_service, "db_manager", store))
+    stack.enter_context(mock.patch.object(scheduler_service, "db_service", services))
+    return services
+
+
+def _count_db_calls(stack: ExitStack, counter: Counter[str], services: DataAccessService) -> None:
+    """Считает обращения планировщика к сервисам данных."""
+    for service, name in (
+        (services.chat_service, "get_chats"),
+        (services.link_service, "get_links"),
+        (services.link_service, "set_last_updated"),
+    ):
+        stack.enter_context(
+            mock.patch.object(service, name, _counted(counter, name, getattr(service, name))),
+        )
+
+
+async def _seed_database(assignment: dict[int, list[str]]) -> None:
+    """Создаёт чаты и подписки бенчмарка в БД пакетными запросами."""
+    async for dependency in db_manager.get_dependency():
+        for chat_id, urls in assignment.items():
+            await db_service.chat_service.register_chat(chat_id, dependency)
+            for start in range(0, len(urls), SEED_BATCH_SIZE):
+                add_reqs = [
+                    AddLinkRequest.model_construct(link=url, tags=[], filters=[])
+                    for url in urls[start : start + SEED_BATCH_SIZE]
+                ]
+                await db_service.link_service.add_links(chat_id, add_reqs, dependency)
+
+
+async def _cleanup_database(chat_ids: list[int]) -> None:
+    """Удаляет чаты бенчмарка вместе c подписками."""
+    async for dependency in db_manager.get_dependency():
+        for chat_id in chat_ids:
+            await db_service.chat_service.delete_chat(chat_id, dependency)
+
+
+def _summary(sweeps: list[dict[str, Any]]) -> dict[str, Any]:
+    """Медианы метрик по проходам."""
+    keys = [
+        key for key, value in sweeps[0].items() if key != "sweep" and isinstance(value, int | float)
+    ]
+    return {
+        key: statistics.median(sweep[key] for sweep in sweeps if sweep[key] is not None)
+        for key in keys
+        if any(sweep[key] is not None for sweep in sweeps)
+    }
+
+
+async def run_sweeps(args: argparse.Namespace, assignment: dict[int, list[str]]) -> dict[str, Any]:
+    """Выполняет проходы планировщика и собирает метрики.
+
+    :param args: Параметры запуска.
+    :param assignment: URL подписок по чатам.
+    :return: Метрики по каждому проходу и их медианы.
+    """
+    links_total = sum(len(urls) for urls in assignment.values())
+    sweeps = []
+    with ExitStack() as stack:
+        services = db_service
+        if args.backend == "memory":
+            store = MemoryStore(assignment, datetime.now(timezone.utc) - timedelta(days=1))
+            services = _patch_memory_backend(stack, store)
+        db_calls: Counter[str] = Counter()
+        _count_db_calls(stack, db_calls, services)
+
+        for number in range(args.sweeps):
+            notifications = CountingNotificationService()
+            scheduler = TimedScheduler(notifications)
+            db_calls.clear()
+            started = time.perf_counter()
+            await scheduler._sweep()  # noqa: SLF001
+            duration = time.perf_counter() - started
+
+            checks = len(scheduler.check_durations)
+            calls = sum(db_calls.values())
+            sweep = {
+                "sweep": number + 1,
+                "duration": duration,
+                "links": links_total,
+                "checks": checks,
+                "links_per_sec": links_total / duration,
+                "checks_per_sec": checks / duration,
+                "check_latency_p50": percentile(scheduler.check_durations, 50),
+                "check_latency_p99": percentile(scheduler.check_durations, 99),
+                "db_calls": calls,
+                "db_calls_per_link": calls / links_total,
+                "digests": notifications.digests,
+                "updates": notifications.updates,
+            }
+            logger.info("Проход %s: %s", number + 1, sweep)
+            sweeps.append(sweep)
+
+    summary = {**_summary(sweeps), "peak_rss_mb": peak_rss_mb()}
+    return {"sweeps": sweeps, "summary": summary}
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Заполняет хранилище, запускает проходы и возвращает результаты."""
+    rng = random.Random(args.seed)  # noqa: S311
+    urls = resource_urls(args.resources or max(args.links // 2, 1), args.github_share)
+    weights = popularity_weights(len(urls), args.distribution, args.zipf_s)
+    assignment = assign_links(args.chats, args.links, urls, weights, rng)
+
+    if args.backend == "memory":
+        return await run_sweeps(args, assignment)
+
+    await db_manager.start()
+    try:
+        await _seed_database(assignment)
+        return await run_sweeps(args, assignment)
+    finally:
+        await _cleanup_database(list(assignment))
+        await db_manager.close()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chats", type=int, default=100)
+    parser.add_argument("--links", type=int, default=2000, help="всего подписок")
+    parser.add_argument("--resources", type=int, default=0, help="уникальных URL (links/2)")
+    parser.add_argument("--distribution", choices=("zipf", "uniform"), default="zipf")
+    parser.add_argument("--zipf-s", type=float, default=1.1)
+    parser.add_argument("--github-share", type=float, default=0.6)
+    parser.add_argument("--backend", choices=("memory", "db"), default="memory")
+    parser.add_argument("--sweeps", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--upstream-url", help="уже запущенный fake_upstream")
+    parser.add_argument("--upstream-port", type=int, default=8081)
+    parser.add_argument("--upstream-latency", type=float, default=0.05)
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--upstream-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, default=Path("scheduler-benchmark.json"))
+    parser.add_argument("--baseline", type=Path, help="результаты для сравнения")
+    return parser.parse_args(argv)
+
+
+def _upstream(args: argparse.Namespace) -> AbstractContextManager[str]:
+    """Контекст c URL fake_upstream: внешний или запущенный бенчмарком."""
+    if args.upstream_url:
+        return nullcontext(args.upstream_url)
+    return fake_upstream(
+        args.upstream_port,
+        latency=args.upstream_latency,
+        latency_jitter=args.upstream_latency / 3,
+        error_rate=args.upstream_error_rate,
+        rate_limit_rate=args.upstream_rate_limit_rate,
+        quota=0,
+        seed=args.seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    with _upstream(args) as upstream_url:
+        point_clients_at(upstream_url)
+        results = asyncio.run(run(args))
+
+    write_results(args.output, "scheduler", vars(args), results)
+    if args.baseline:
+        for name, change in compare_results(results["summary"], args.baseline).items():
+            logger.info("%s: %+.1f %%", name, change * 100)
+
+
+if __name__ == "__main__":
+    main()
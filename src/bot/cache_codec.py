@@ -0,0 +1,72 @@
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from src import serializer
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack является опциональной зависимостью
+    msgpack = None  # type: ignore[assignment]
+
+__all__ = ("CACHE_FORMAT_VERSION", "CacheCodec", "get_cache_codec")
+
+logger = logging.getLogger(__name__)
+
+# Версия формата значений кэша. Увеличивается при несовместимом изменении структуры
+# значений: ключи c новой версией не пересекаются co старыми, и реплики не читают чужой формат.
+CACHE_FORMAT_VERSION: int = 2
+
+
+def _msgpack_dumps(obj: Any) -> bytes:  # noqa: ANN401
+    """Сериализует объект в msgpack."""
+    return msgpack.packb(obj, use_bin_type=True)  # type: ignore[no-any-return]
+
+
+def _msgpack_loads(data: bytes) -> Any:  # noqa: ANN401
+    """Десериализует объект из msgpack."""
+    return msgpack.unpackb(data, raw=False)
+
+
+@dataclass(frozen=True, slots=True)
+class CacheCodec:
+    """Кодек значений кэша вместе c префиксом версии для ключей.
+
+    :param name: Имя кодека (`msgpack` или `json`).
+    :param dumps: Функция сериализации объекта в байты.
+    :param loads: Функция десериализации объекта из байтов.
+    """
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+    @property
+    def key_prefix(self) -> str:
+        """Префикс ключей Redis, включающий кодек и версию формата."""
+        return f"{self.name}.v{CACHE_FORMAT_VERSION}:"
+
+
+_CODECS: dict[str, CacheCodec] = {
+    "json": CacheCodec(name="json", dumps=serializer.dumps, loads=serializer.loads),
+    "msgpack": CacheCodec(name="msgpack", dumps=_msgpack_dumps, loads=_msgpack_loads),
+}
+
+
+def get_cache_codec(name: str) -> CacheCodec:
+    """Возвращает кодек значений кэша по имени.
+
+    Если запрошен msgpack, но пакет не установлен, используется JSON.
+
+    :param name: Имя кодека (`msgpack` или `json`).
+    :return: Кодек значений кэша.
+    :raises ValueError: Если кодек неизвестен.
+    """
+    name = name.lower()
+    if name not in _CODECS:
+        raise ValueError(f"Неизвестный кодек кэша: {name}")
+    if name == "msgpack" and msgpack is None:
+        logger.warning("msgpack не установлен, кэш использует JSON")
+        name = "json"
+    return _CODECS[name]
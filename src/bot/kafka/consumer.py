@@ -1,14 +1,22 @@
 import asyncio
 import contextlib
-import json
 import logging
+import time
 from typing import Any
 
 import httpx
-from confluent_kafka import Consumer, KafkaError, Message, Producer
+from confluent_kafka import TIMESTAMP_NOT_AVAILABLE, Consumer, KafkaError, Message, Producer
 
 from src.api.bot_api.models import DigestUpdate
+from src.metrics import (
+    KAFKA_CONSUME_LAG,
+    KAFKA_DLQ_MESSAGES,
+    TELEGRAM_SEND_LATENCY,
+    observe_telegram_response,
+)
+from src.serializer import dumps, loads
 from src.settings import settings
+from src.tracing import context_from_kafka_headers, start_span
 
 logger = logging.getLogger(__name__)
 
@@ -63,15 +71,26 @@ class KafkaNotificationReceiver:
                 msg = await asyncio.to_thread(self.consumer.poll, 1.0)
                 if msg is None:
                     continue
-                if msg.error():
-                    if msg.error().code() == KafkaError._PARTITION_EOF:  # noqa: SLF001
+                error = msg.error()
+                if error is not None:
+                    if error.code() == KafkaError._PARTITION_EOF:  # noqa: SLF001
                         continue
-                    logger.error("Kafka error: %s", msg.error())
+                    logger.error("Kafka error: %s", error)
                     break
+                topic, value = msg.topic(), msg.value()
+                if topic is None or value is None:
+                    logger.warning("Пропущено Kafka-сообщение без топика или тела")
+                    continue
 
+                self._observe_lag(msg)
                 try:
-                    payload = json.loads(msg.value().decode("utf-8"))
-                    await self._handle_message(msg.topic(), payload, msg)
+                    with start_span(
+                        "kafka.consume",
+                        {"topic": topic},
+                        context=context_from_kafka_headers(msg.headers()),
+                    ):
+                        payload = loads(value)
+                        await self._handle_message(topic, payload, msg)
                 except Exception:
                     logger.exception("Ошибка обработки Kafka-сообщения")
                     await self._send_to_dlq(msg)
@@ -81,6 +100,14 @@ class KafkaNotificationReceiver:
                 logger.exception("Unexpected error in Kafka consumer")
                 await asyncio.sleep(1)
 
+    @staticmethod
+    def _observe_lag(msg: Message) -> None:
+        """Учитывает задержку между публикацией сообщения и ero получением."""
+        timestamp_type, timestamp_ms = msg.timestamp()
+        if timestamp_type != TIMESTAMP_NOT_AVAILABLE:
+            lag = max(time.time() - timestamp_ms / 1000, 0.0)
+            KAFKA_CONSUME_LAG.labels(topic=msg.topic()).observe(lag)
+
     async def _handle_message(self, topic: str, payload: dict[str, Any], msg: Message) -> None:
         """Обработка полученного сообщения в зависимости от топика."""
         try:
@@ -94,7 +121,12 @@ class KafkaNotificationReceiver:
                     "parse_mode": "Markdown" if topic == settings.kafka.topic_digest else None,
                 }
                 try:
-                    response = await client.post(telegram_api_url, json=message_payload)
+                    with (
+                        TELEGRAM_SEND_LATENCY.labels(source="kafka").time(),
+                        start_span("telegram.send_message", {"chat_id": update.tg_chat_id}),
+                    ):
+                        response = await client.post(telegram_api_url, json=message_payload)
+                    observe_telegram_response("kafka", response)
                     response.raise_for_status()
                     logger.info("Сообщение отправлено в чат %s", update.tg_chat_id)
                 except httpx.HTTPError:
@@ -112,16 +144,17 @@ class KafkaNotificationReceiver:
             "offset": msg.offset(),
             "timestamp": msg.timestamp(),
             "error": "Message could not be processed",
-            "payload": msg.value().decode("utf-8"),
+            "payload": (msg.value() or b"").decode("utf-8"),
         }
 
         try:
             await asyncio.to_thread(
                 self.producer.produce,
                 topic=self.dlq_topic,
-                value=json.dumps(dlq_payload).encode("utf-8"),
+                value=dumps(dlq_payload),
             )
             await asyncio.to_thread(self.producer.flush)
+            KAFKA_DLQ_MESSAGES.labels(topic=msg.topic()).inc()
             logger.info("Сообщение отправлено в DLQ: %s", self.dlq_topic)
         except Exception:
             logger.exception("Ошибка при отправке сообщения в DLQ")
@@ -0,0 +1,65 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class LocalCache:
+    """Ограниченный по размеру LRU-кэш в памяти процесса c TTL записей.
+
+    Используется как первый уровень (L1) перед Redis: повторные запросы обслуживаются без
+    сетевого обращения, a устаревание ограничено `ttl` секундами.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """Инициализирует пустой кэш.
+
+        :param max_size: Максимальное число записей; при превышении вытесняется самая старая.
+        :param ttl: Время жизни записи в секундах.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:  # noqa: ANN401
+        """Возвращает значение по ключу, если оно есть и не просрочено.
+
+        :param key: Ключ записи.
+        :return: Закэшированное значение или None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:  # noqa: ANN401
+        """Сохраняет значение, вытесняя наименее востребованные записи при переполнении.
+
+        :param key: Ключ записи.
+        :param value: Значение для кэширования.
+        :return: None
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Удаляет запись по ключу, если она есть.
+
+        :param key: Ключ записи.
+        :return: None
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+        self._entries.clear()
@@ -1,73 +1,540 @@
-import json
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
 from typing import Any
 
 import redis.asyncio as redis
 
+from src.bot.cache_codec import get_cache_codec
+from src.bot.local_cache import LocalCache
 from src.settings import settings
 
+logger = logging.getLogger(__name__)
+
+RESUBSCRIBE_DELAY: float = 1.0
+LIST_CACHE_EXPIRE: int = 300
+# Сколько устаревший список хранится после окончания свежести для проверки по ETag.
+LIST_CACHE_STALE_EXPIRE: int = 24 * 60 * 60
+# Размер страницы /list. Scrapper заполняет холодный кэш первой страницей этого размера.
+LIST_PAGE_SIZE: int = 10
+# Наибольший размер кэшируемой первой страницы; от длины списка кэширование не зависит.
+LIST_CACHE_MAX_LINKS: int = 100
+
+# Служебные поля хэша первой страницы списка. COMPLETE_FIELD отличает закэшированную пустую
+# страницу от отсутствующего кэша, ETAG_FIELD хранит ETag ответа scrapper, FRESH_UNTIL_FIELD -
+# момент (unix time), до которого страница используется без проверки, VERSION_FIELD - версию
+# списка подписок чата (links_version), из которой записан хэш, LIMIT_FIELD - размер страницы,
+# NEXT_FIELD - курсор следующей страницы (поля нет, если страница содержит весь список).
+COMPLETE_FIELD: str = "__complete__"
+ETAG_FIELD: str = "__etag__"
+FRESH_UNTIL_FIELD: str = "__fresh_until__"
+VERSION_FIELD: str = "__version__"
+LIMIT_FIELD: str = "__limit__"
+NEXT_FIELD: str = "__next__"
+_SERVICE_FIELD_PREFIX: bytes = b"__"
+
+# Перезаписывает хэш списка, только если список получен из более новой версии, чем
+# закэшированный: иначе запоздавший ответ затёр бы изменения write-through. Хэш той же версии
+# и того же размера страницы не перезаписывается (write-through мог дополнить ero изменениями
+# следующих версий), y него только продлеваются свежесть и ETag. Возвращает 1, если хэш
+# перезаписан.
+_SET_LIST_SCRIPT: str = f"""
+local current = tonumber(redis.call('HGET', KEYS[1], '{VERSION_FIELD}'))
+local version = tonumber(ARGV[1])
+if current ~= nil and current > version then
+    return 0
+end
+if current == version and redis.call('HGET', KEYS[1], '{LIMIT_FIELD}') == ARGV[7] then
+    redis.call('HSET', KEYS[1], '{FRESH_UNTIL_FIELD}', ARGV[2])
+    if ARGV[3] ~= '' then
+        redis.call('HSET', KEYS[1], '{ETAG_FIELD}', ARGV[3])
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call(
+    'HSET', KEYS[1], '{COMPLETE_FIELD}', '1', '{VERSION_FIELD}', ARGV[1],
+    '{FRESH_UNTIL_FIELD}', ARGV[2], '{LIMIT_FIELD}', ARGV[7]
+)
+if ARGV[3] ~= '' then
+    redis.call('HSET', KEYS[1], '{ETAG_FIELD}', ARGV[3])
+end
+if ARGV[8] ~= '' then
+    redis.call('HSET', KEYS[1], '{NEXT_FIELD}', ARGV[8])
+end
+for i = 9, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('PUBLISH', ARGV[5], ARGV[6])
+return 1
+"""
+
+# Добавляет ссылку в хэш первой страницы, только если страница уже закэширована, продлевает
+# срок ero жизни и публикует инвалидацию кэша первого уровня. Новая ссылка получает наибольший
+# идентификатор, поэтому попадает на страницу, только если та содержит весь список и не
+# заполнена; иначе y заполненной страницы появляется курсор следующей. Возвращает 1, если хэш
+# обновлён.
+_PUT_LINK_SCRIPT: str = f"""
+redis.call('PUBLISH', ARGV[4], ARGV[5])
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    return 1
+end
+if redis.call('HEXISTS', KEYS[1], '{NEXT_FIELD}') == 1 then
+    return 1
+end
+local count, last = 0, 0
+for _, field in ipairs(redis.call('HKEYS', KEYS[1])) do
+    if string.sub(field, 1, 2) ~= '__' then
+        count = count + 1
+        last = math.max(last, tonumber(field))
+    end
+end
+local limit = tonumber(redis.call('HGET', KEYS[1], '{LIMIT_FIELD}'))
+if limit ~= nil and count >= limit then
+    redis.call('HSET', KEYS[1], '{NEXT_FIELD}', last)
+else
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+end
+return 1
+"""
+
+# Удаляет ссылки из хэша первой страницы и публикует инвалидацию кэша первого уровня. Если за
+# страницей есть следующие, хэш удаляется целиком: страница дополнилась бы ссылками оттуда.
+_REMOVE_LINKS_SCRIPT: str = f"""
+redis.call('PUBLISH', ARGV[1], ARGV[2])
+if redis.call('HEXISTS', KEYS[1], '{NEXT_FIELD}') == 1 then
+    redis.call('DEL', KEYS[1])
+else
+    redis.call('HDEL', KEYS[1], unpack(ARGV, 3))
+end
+return 0
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class ListCacheEntry:
+    """Закэшированная первая страница списка ссылок чата вместе c метаданными проверки.
+
+    :param links: Ссылки страницы, упорядоченные по идентификатору.
+    :param etag: ETag ответа scrapper, из которого получена страница (если был).
+    :param fresh: Страницу можно использовать без проверки в scrapper.
+    :param next_after_id: Kypcop следующей страницы или None, если страница содержит весь список.
+    :param limit: Размер страницы, c которым она запрошена (None, если неизвестен).
+    """
+
+    links: list[Any]
+    etag: str | None
+    fresh: bool
+    next_after_id: int | None = None
+    limit: int | None = None
+
 
 class RedisCache:
     """Кэш для хранения и управления списками в Redis.
 
     Предоставляет асинхронные методы для подключения, получения, установки и инвалидирования
     кэша по chat_id.
+
+    Первая страница списка чата (любой длины) хранится в хэше Redis вместе c размером страницы
+    и курсором следующей: поле - идентификатор ссылки, значение - ссылка, закодированная
+    кодеком кэша (msgpack или JSON). Ключи содержат имя кодека и версию формата.
+    Scrapper поддерживает хэш в актуальном состоянии при добавлении и удалении ссылок
+    (write-through), поэтому после изменения подписок кэш не становится холодным.
+
+    Перед Redis работает кэш первого уровня в памяти процесса (LocalCache). Он используется
+    только пока активна подписка на канал инвалидации: `invalidate_list_cache` публикует
+    chat_id в канал, и каждая реплика бота удаляет устаревшую запись y себя. Источником
+    истины остаётся Redis.
+
+    Свежесть списка ограничена `expire` секундами, но хэш хранится ещё LIST_CACHE_STALE_EXPIRE
+    секунд: устаревший список вместе c ETag позволяет проверить актуальность запросом
+    c `If-None-Match` и не загружать список заново, если он не изменился.
+
+    Соединения берутся из общего пула c ограничением размера и таймаутами; пул создаётся при
+    старте приложения (`connect`) и закрывается при остановке (`close`).
     """
 
     def __init__(self, url: str) -> None:
         """:param url: URL подключения к Redis."""
         self._url = url
         self._redis: Any | None = None
+        self.local = LocalCache(
+            max_size=settings.redis.local_max_size,
+            ttl=settings.redis.local_ttl,
+        )
+        self._local_enabled = False
+        self._listener: asyncio.Task[None] | None = None
+        self._put_link_script: Any | None = None
+        self._remove_links_script: Any | None = None
+        self._set_list_script: Any | None = None
+        self.codec = get_cache_codec(settings.redis.codec)
 
     async def connect(self) -> None:
-        """Асинхронно подключается к Redis, если соединение ещё не установлено."""
+        """Создаёт пул соединений c Redis, если он ещё не создан.
+
+        При исчерпании пула операции ждут свободное соединение не дольше
+        `settings.redis.pool_timeout` секунд.
+        """
         if self._redis is None:
-            self._redis = await redis.from_url(
+            pool = redis.BlockingConnectionPool.from_url(
                 self._url,
-                encoding="utf-8",
-                decode_responses=True,
-            )  # type: ignore
+                max_connections=settings.redis.max_connections,
+                timeout=settings.redis.pool_timeout,
+                socket_timeout=settings.redis.socket_timeout,
+                socket_connect_timeout=settings.redis.socket_connect_timeout,
+                decode_responses=False,
+            )
+            self._redis = redis.Redis.from_pool(pool)
 
-    async def get_list_cache(self, chat_id: int) -> list[Any] | None:
-        """Получает закэшированный список для заданного chat_id.
+    async def client(self) -> Any:  # noqa: ANN401
+        """Возвращает клиент Redis; если пул не создан при старте приложения, создаёт ero."""
+        if self._redis is None:
+            await self.connect()
+        return self._redis
+
+    def list_key(self, chat_id: int) -> str:
+        """Возвращает ключ хэша списка чата c префиксом кодека и версии формата.
 
         :param chat_id: Идентификатор чата.
-        :return: Данные из кэша (list) или None, если кэш отсутствует.
+        :return: Ключ Redis.
         """
-        await self.connect()
-        key = settings.redis.list_key.format(chat_id=chat_id)
-        if self._redis is None:
-            return None
-        data = await self._redis.get(key)
-        if data:
-            result = json.loads(data)
-            if isinstance(result, list):
-                return result
+        return self.codec.key_prefix + settings.redis.list_key.format(chat_id=chat_id)
+
+    def _decode_entry(self, fields: dict[bytes, bytes]) -> ListCacheEntry | None:
+        """Восстанавливает список ссылок из полей хэша, упорядочивая их по идентификатору.
+
+        Хэш без поля COMPLETE_FIELD не считается списком.
+        """
+        if COMPLETE_FIELD.encode() not in fields:
             return None
-        return None
+        items = sorted(
+            (int(field), value)
+            for field, value in fields.items()
+            if not field.startswith(_SERVICE_FIELD_PREFIX)
+        )
+        etag = fields.get(ETAG_FIELD.encode())
+        fresh_until = float(fields.get(FRESH_UNTIL_FIELD.encode(), 0))
+        next_after_id = fields.get(NEXT_FIELD.encode())
+        limit = fields.get(LIMIT_FIELD.encode())
+        return ListCacheEntry(
+            links=[self.codec.loads(value) for _, value in items],
+            etag=etag.decode() if etag else None,
+            fresh=fresh_until > time.time(),
+            next_after_id=int(next_after_id) if next_after_id else None,
+            limit=int(limit) if limit else None,
+        )
 
-    async def set_list_cache(self, chat_id: int, value: list[Any], expire: int = 300) -> None:
-        """Сохраняет список в кэш для заданного chat_id c истечением срока действия.
+    async def start(self) -> None:
+        """Запускает прослушивание канала инвалидации и тем самым включает кэш первого уровня.
+
+        Если `settings.redis.local_ttl` не положителен, кэш первого уровня не используется.
 
-        :param chat_id: Идентификатор чата.
-        :param value: Данные для кэширования (list).
-        :param expire: Время жизни кэша в секундах (по умолчанию 300).
         :return: None
         """
+        if self._listener is not None or settings.redis.local_ttl <= 0:
+            return
         await self.connect()
-        key = settings.redis.list_key.format(chat_id=chat_id)
+        self._listener = asyncio.create_task(self._listen_invalidations())
+
+    async def close(self) -> None:
+        """Останавливает прослушивание канала инвалидации и закрывает соединение c Redis.
+
+        :return: None
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
         if self._redis is not None:
-            await self._redis.set(key, json.dumps(value), ex=expire)
+            await self._redis.aclose()
+            self._redis = None
+            self._put_link_script = None
+            self._remove_links_script = None
+            self._set_list_script = None
+
+    async def _listen_invalidations(self) -> None:
+        """Удаляет записи кэша первого уровня по сообщениям из канала инвалидации.
+
+        Пока подписка не подтверждена или после её потери кэш первого уровня отключён и
+        очищен, чтобы не отдавать записи, инвалидация которых могла быть пропущена.
+        """
+        channel = settings.redis.invalidation_channel
+        # Подписка держит соединение постоянно: оно не берётся из общего пула и не
+        # ограничивается socket_timeout, который прервал бы ожидание сообщений.
+        client = await redis.from_url(
+            self._url,
+            socket_connect_timeout=settings.redis.socket_connect_timeout,
+            decode_responses=False,
+        )  # type: ignore
+        try:
+            while True:
+                try:
+                    async with client.pubsub() as pubsub:
+                        await pubsub.subscribe(channel)
+                        async for message in pubsub.listen():
+                            if message["type"] == "subscribe":
+                                self._local_enabled = True
+                            elif message["type"] == "message":
+                                self.local.pop(int(message["data"]))
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Потеряна подписка на канал инвалидации кэша %s", channel)
+                finally:
+                    self._local_enabled = False
+                    self.local.clear()
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
+        finally:
+            await client.aclose()
+
+    async def get_list_entry(
+        self,
+        chat_id: int,
+        limit: int | None = None,
+    ) -> ListCacheEntry | None:
+        """Получает первую страницу списка для заданного chat_id вместе c ETag и свежестью.
+
+        Сначала проверяется кэш первого уровня (в нём хранятся только свежие страницы), затем
+        хэш страницы в Redis (одна команда HGETALL).
+
+        :param chat_id: Идентификатор чата.
+        :param limit: Размер страницы; страница другого размера считается отсутствующей.
+        :return: Запись кэша (ListCacheEntry) или None, если кэш отсутствует.
+        """
+        entry = self.local.get(chat_id) if self._local_enabled else None
+        if entry is None:
+            client = await self.client()
+            entry = self._decode_entry(await client.hgetall(self.list_key(chat_id)))
+            if entry is not None and entry.fresh and self._local_enabled:
+                self.local.set(chat_id, entry)
+        if entry is None or (limit is not None and entry.limit != limit):
+            return None
+        return entry  # type: ignore[no-any-return]
+
+    async def get_list_cache(self, chat_id: int) -> list[Any] | None:
+        """Получает свежий закэшированный список для заданного chat_id.
+
+        :param chat_id: Идентификатор чата.
+        :return: Ссылки, упорядоченные по идентификатору (list), или None, если кэш отсутствует
+                 или устарел.
+        """
+        entry = await self.get_list_entry(chat_id)
+        return entry.links if entry is not None and entry.fresh else None
+
+    async def get_many(self, chat_ids: Iterable[int]) -> dict[int, list[Any] | None]:
+        """Получает закэшированные списки нескольких чатов за одно обращение к Redis.
+
+        Чаты, найденные в кэше первого уровня, в Redis не запрашиваются; остальные читаются
+        одним конвейером HGETALL.
+
+        :param chat_ids: Идентификаторы чатов.
+        :return: Словарь chat_id -> список ссылок или None, если кэш отсутствует или устарел.
+        """
+        result: dict[int, list[Any] | None] = {}
+        missing: list[int] = []
+        for chat_id in dict.fromkeys(chat_ids):
+            cached = self.local.get(chat_id) if self._local_enabled else None
+            if cached is not None:
+                result[chat_id] = cached.links
+            else:
+                missing.append(chat_id)
+        if not missing:
+            return result
+        client = await self.client()
+        pipe = client.pipeline(transaction=False)
+        for chat_id in missing:
+            pipe.hgetall(self.list_key(chat_id))
+        for chat_id, fields in zip(missing, await pipe.execute(), strict=True):
+            entry = self._decode_entry(fields)
+            if entry is None or not entry.fresh:
+                result[chat_id] = None
+                continue
+            if self._local_enabled:
+                self.local.set(chat_id, entry)
+            result[chat_id] = entry.links
+        return result
+
+    async def set_list_cache(
+        self,
+        chat_id: int,
+        value: list[Any],
+        version: int,
+        expire: int = LIST_CACHE_EXPIRE,
+        etag: str | None = None,
+        *,
+        limit: int = LIST_PAGE_SIZE,
+        next_after_id: int | None = None,
+    ) -> bool:
+        """Сохраняет первую страницу списка в кэш для заданного chat_id.
+
+        Хэш перезаписывается целиком одним скриптом, только если закэширована страница более
+        старой версии или другого размера (или не закэширована вовсе): запоздавшая запись не
+        затирает более новую страницу. Для страницы той же версии продлеваются свежесть и ETag.
+        Страницы больше LIST_CACHE_MAX_LINKS не кэшируются.
+
+        :param chat_id: Идентификатор чата.
+        :param value: Ссылки страницы (list словарей c ключом `id`).
+        :param version: Версия списка подписок чата, прочитанная до загрузки ссылок.
+        :param expire: Время свежести кэша в секундах (по умолчанию 300).
+        :param etag: ETag ответа scrapper, из которого получена страница.
+        :param limit: Размер страницы, c которым она запрошена.
+        :param next_after_id: Kypcop следующей страницы или None, если страница последняя.
+        :return: True, если хэш перезаписан.
+        """
+        if limit > LIST_CACHE_MAX_LINKS:
+            return False
+        client = await self.client()
+        if self._set_list_script is None:
+            self._set_list_script = client.register_script(_SET_LIST_SCRIPT)
+        args: list[bytes | str | int] = [
+            version,
+            str(time.time() + expire),
+            etag or "",
+            expire + LIST_CACHE_STALE_EXPIRE,
+            settings.redis.invalidation_channel,
+            chat_id,
+            limit,
+            next_after_id or "",
+        ]
+        for link in value:
+            args.extend((str(link["id"]), self.codec.dumps(link)))
+        written = bool(await self._set_list_script(keys=[self.list_key(chat_id)], args=args))
+        if written and self._local_enabled:
+            self.local.set(
+                chat_id,
+                ListCacheEntry(
+                    links=value,
+                    etag=etag,
+                    fresh=True,
+                    next_after_id=next_after_id,
+                    limit=limit,
+                ),
+            )
+        return written
+
+    async def touch_list_cache(
+        self,
+        chat_id: int,
+        entry: ListCacheEntry,
+        expire: int = LIST_CACHE_EXPIRE,
+    ) -> None:
+        """Продлевает свежесть закэшированной страницы после подтверждения scrapper (304).
+
+        Если хэш успел исчезнуть, он не создаётся заново: частичный хэш без COMPLETE_FIELD
+        не считается списком.
+
+        :param chat_id: Идентификатор чата.
+        :param entry: Подтверждённая запись кэша.
+        :param expire: Время свежести кэша в секундах (по умолчанию 300).
+        :return: None
+        """
+        client = await self.client()
+        key = self.list_key(chat_id)
+        pipe = client.pipeline(transaction=True)
+        pipe.hset(key, FRESH_UNTIL_FIELD, str(time.time() + expire))
+        pipe.expire(key, expire + LIST_CACHE_STALE_EXPIRE)
+        await pipe.execute()
+        if self._local_enabled:
+            self.local.set(chat_id, replace(entry, fresh=True))
+
+    async def add_to_list_cache(
+        self,
+        chat_id: int,
+        link: dict[str, Any],
+        expire: int = LIST_CACHE_EXPIRE,
+    ) -> bool:
+        """Добавляет или обновляет ссылку в закэшированной первой странице списка чата.
+
+        Хэш обновляется, только если страница уже закэширована: иначе частичный хэш был бы
+        принят за страницу. Ссылка, не попадающая на страницу, только продлевает ей жизнь.
+
+        :param chat_id: Идентификатор чата.
+        :param link: Ссылка (словарь c ключом `id`).
+        :param expire: Время свежести кэша в секундах (по умолчанию 300); хэш хранится ещё
+                       LIST_CACHE_STALE_EXPIRE секунд.
+        :return: True, если страница была закэширована и обновлена.
+        """
+        self.local.pop(chat_id)
+        client = await self.client()
+        if self._put_link_script is None:
+            self._put_link_script = client.register_script(_PUT_LINK_SCRIPT)
+        updated = await self._put_link_script(
+            keys=[self.list_key(chat_id)],
+            args=[
+                str(link["id"]),
+                self.codec.dumps(link),
+                expire + LIST_CACHE_STALE_EXPIRE,
+                settings.redis.invalidation_channel,
+                chat_id,
+            ],
+        )
+        return bool(updated)
+
+    async def remove_from_list_cache(self, chat_id: int, *link_ids: int) -> None:
+        """Удаляет ссылки из закэшированной первой страницы списка чата одним скриптом.
+
+        Если за страницей есть следующие, страница удаляется из кэша целиком.
+
+        :param chat_id: Идентификатор чата.
+        :param link_ids: Идентификаторы ссылок.
+        :return: None
+        """
+        if not link_ids:
+            return
+        self.local.pop(chat_id)
+        client = await self.client()
+        if self._remove_links_script is None:
+            self._remove_links_script = client.register_script(_REMOVE_LINKS_SCRIPT)
+        await self._remove_links_script(
+            keys=[self.list_key(chat_id)],
+            args=[
+                settings.redis.invalidation_channel,
+                chat_id,
+                *(str(link_id) for link_id in link_ids),
+            ],
+        )
 
     async def invalidate_list_cache(self, chat_id: int) -> None:
         """Удаляет кэшированный список для заданного chat_id.
 
+        Запись удаляется из Redis и из кэша первого уровня, после чего chat_id публикуется в
+        канал инвалидации для остальных реплик.
+
         :param chat_id: Идентификатор чата.
         :return: None
         """
-        await self.connect()
-        key = settings.redis.list_key.format(chat_id=chat_id)
-        if self._redis is not None:
-            await self._redis.delete(key)
+        await self.invalidate_many([chat_id])
+
+    async def invalidate_many(self, chat_ids: Iterable[int]) -> None:
+        """Удаляет закэшированные списки нескольких чатов за одно обращение к Redis.
+
+        Ключи удаляются одной командой DEL, инвалидации публикуются в том же конвейере.
+
+        :param chat_ids: Идентификаторы чатов.
+        :return: None
+        """
+        unique_ids = list(dict.fromkeys(chat_ids))
+        if not unique_ids:
+            return
+        for chat_id in unique_ids:
+            self.local.pop(chat_id)
+        client = await self.client()
+        pipe = client.pipeline(transaction=False)
+        pipe.delete(*(self.list_key(chat_id) for chat_id in unique_ids))
+        for chat_id in unique_ids:
+            pipe.publish(settings.redis.invalidation_channel, chat_id)
+        await pipe.execute()
 
 
 redis_cache = RedisCache(settings.redis.url)
@@ -21,3 +21,21 @@ class BaseClient(ABC):
                            Если значение None, считается, что проверка выполняется впервые.
         :return: True, если на сайте есть новые обновления c момента `last_check`, иначе False.
         """
+
+    async def list_updates(
+        self,
+        parsed_url: ParseResult,
+        last_check: datetime | None,
+    ) -> list[UpdateEvent]:
+        """Возвращает все события сайта после последней проверки, от новых к старым.
+
+        Планировщик выбирает из них событие по фильтрам каждой подписки, поэтому клиенты,
+        которым доступна лента событий, переопределяют метод. По умолчанию возвращается
+        единственное событие из `check_updates`.
+
+        :param parsed_url: Разобранный URL сайта в формате `ParseResult`.
+        :param last_check: Время последней успешной проверки на обновления.
+        :return: Список событий (пустой, если обновлений нет).
+        """
+        update = await self.check_updates(parsed_url, last_check)
+        return [update] if update else []
@@ -0,0 +1,88 @@
+from collections.abc import Callable
+from urllib.parse import ParseResult, urlparse
+
+Canonicalizer = Callable[[ParseResult], str]
+
+GITHUB_REPO_PATH_PARTS: int = 2
+STACKOVERFLOW_QUESTION_PATH_PARTS: int = 2
+
+
+def normalize_host(parsed_url: ParseResult) -> str:
+    """Приводит хост URL к нижнему регистру и убирает префикс `www.` и порт.
+
+    :param parsed_url: Разобранный URL.
+    :return: Нормализованный хост.
+    """
+    return (parsed_url.hostname or "").removeprefix("www.")
+
+
+def _path_parts(parsed_url: ParseResult) -> list[str]:
+    """Возвращает непустые сегменты пути URL."""
+    return [part for part in parsed_url.path.split("/") if part]
+
+
+def canonicalize_default(parsed_url: ParseResult) -> str:
+    """Строит канонический ключ для сервиса без специальных правил.
+
+    Схема, query-параметры, фрагмент и завершающий слеш отбрасываются,
+    хост приводится к нижнему регистру.
+
+    :param parsed_url: Разобранный URL.
+    :return: Канонический ключ вида `host/path`.
+    """
+    return "/".join([normalize_host(parsed_url), *_path_parts(parsed_url)])
+
+
+def canonicalize_github(parsed_url: ParseResult) -> str:
+    """Строит канонический ключ репозитория GitHub.
+
+    Bce адреса внутри репозитория (`/pulls`, `/issues/1`, `/tree/main` и т.д.)
+    сводятся к `github.com/owner/repo`. Имена на GitHub регистронезависимы.
+
+    :param parsed_url: Разобранный URL.
+    :return: Канонический ключ вида `github.com/owner/repo`.
+    """
+    parts = _path_parts(parsed_url)
+    if len(parts) < GITHUB_REPO_PATH_PARTS:
+        return canonicalize_default(parsed_url).lower()
+    owner, repo = parts[0], parts[1].removesuffix(".git")
+    return f"{normalize_host(parsed_url)}/{owner}/{repo}".lower()
+
+
+def canonicalize_stackoverflow(parsed_url: ParseResult) -> str:
+    """Строит канонический ключ вопроса StackOverflow.
+
+    Слаг c заголовком вопроса и ссылки на конкретные ответы отбрасываются:
+    `/questions/123/title` и `/questions/123` дают один и тот же ключ.
+
+    :param parsed_url: Разобранный URL.
+    :return: Канонический ключ вида `stackoverflow.com/questions/123`.
+    """
+    parts = _path_parts(parsed_url)
+    if len(parts) < STACKOVERFLOW_QUESTION_PATH_PARTS or parts[0] != "questions":
+        return canonicalize_default(parsed_url)
+    return f"{normalize_host(parsed_url)}/questions/{parts[1]}"
+
+
+# Правила канонизации по сервисам; ключи совпадают c ключами `ClientFactory._clients`.
+# Модуль не импортирует клиентов, поэтому ero можно использовать в слое БД. Миграция
+# 3c1f2b9d4e7a хранит копию правил на момент своего создания.
+CANONICALIZERS: dict[str, Canonicalizer] = {
+    "github.com": canonicalize_github,
+    "stackoverflow.com": canonicalize_stackoverflow,
+}
+
+
+def canonical_key(url: str | ParseResult) -> str:
+    """Возвращает канонический ключ pecypca для URL.
+
+    Разные написания одного и того же pecypca (регистр хоста, завершающий слеш,
+    вложенные пути, query-параметры) дают один ключ, который используется
+    для поиска дубликатов подписок и дедупликации запросов к внешним API.
+
+    :param url: URL в виде строки или уже разобранный `ParseResult`.
+    :return: Канонический ключ pecypca.
+    """
+    parsed_url = urlparse(url) if isinstance(url, str) else url
+    canonicalizer = CANONICALIZERS.get(normalize_host(parsed_url), canonicalize_default)
+    return canonicalizer(parsed_url)
@@ -1,5 +1,7 @@
+from typing import ClassVar
+
 from pydantic import BaseModel
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class GithubSettings(BaseModel):
@@ -13,12 +15,18 @@ class StackoverflowSettings(BaseModel):
 
 
 class ClientSettings(BaseSettings):
-    """Настройки клиентов c URL-адресами и таймаутами."""
+    """Настройки клиентов c URL-адресами и таймаутами.
+
+    Вложенные поля задаются переменными окружения через `__`, например
+    `GITHUB__API_URL=http://127.0.0.1:8081/github` для работы c fake_upstream.
+    """
 
     github: GithubSettings = GithubSettings()
     stackoverflow: StackoverflowSettings = StackoverflowSettings()
 
     client_timeout: float = 10.0
 
+    model_config: ClassVar[SettingsConfigDict] = SettingsConfigDict(env_nested_delimiter="__")
+
 
 default_settings = ClientSettings()
@@ -8,6 +8,8 @@ import httpx
 from src.api.bot_api.models import UpdateEvent
 from src.clients.base_client import BaseClient
 from src.clients.client_settings import ClientSettings, default_settings
+from src.metrics import UPSTREAM_REQUEST_LATENCY, observe_upstream_response
+from src.serializer import loads
 
 logger = logging.getLogger(__name__)
 EXPECTED_PATH_PARTS: int = 2
@@ -53,11 +55,14 @@ class GitHubClient(BaseClient):
         :raises httpx.HTTPStatusError: Если сервер вернул другую ошибку (например, 403, 429).
         """
         url = f"{self.base_url}/repos/{owner}/{repo}/events"
+        host = httpx.URL(url).host
         async with httpx.AsyncClient(headers=self.headers) as client:
             try:
-                response = await client.get(url, timeout=self.timeout)
+                with UPSTREAM_REQUEST_LATENCY.labels(host=host).time():
+                    response = await client.get(url, timeout=self.timeout)
+                observe_upstream_response(host, response)
                 response.raise_for_status()
-                return response.json()
+                return loads(response.content)
             except httpx.TimeoutException as e:
                 raise TimeoutError(f"Превышено время ожидания запроса к {url}") from e
             except httpx.HTTPStatusError as e:
@@ -101,25 +106,28 @@ class GitHubClient(BaseClient):
             username=data.get("user", {}).get("login", "Неизвестный пользователь"),
             created_at=created_at,
             preview=data.get("body", "Нет описания")[:200],
+            event_type=data_key,
         )
 
-    async def check_updates(
+    async def list_updates(
         self,
         parsed_url: ParseResult,
         last_check: datetime | None,
-    ) -> UpdateEvent | None:
+    ) -> list[UpdateEvent]:
+        """Возвращает все новые Pull Request и Issue репозитория, от новых к старым."""
         if last_check is None:
-            return None
+            return []
 
         repo_info = await self._parse_repo_path(parsed_url)
         if not repo_info:
-            return None
+            return []
 
         owner, repo = repo_info
         events = await self.get_repo_events(owner, repo)
         if not events or not isinstance(events, list):
-            return None
+            return []
 
+        updates = []
         for event in events:
             created_at = datetime.fromisoformat(event["created_at"])
             if created_at <= last_check:
@@ -127,5 +135,13 @@ class GitHubClient(BaseClient):
 
             update = await self._create_update_event(event, parsed_url)
             if update:
-                return update
-        return None
+                updates.append(update)
+        return sorted(updates, key=lambda update: update.created_at, reverse=True)
+
+    async def check_updates(
+        self,
+        parsed_url: ParseResult,
+        last_check: datetime | None,
+    ) -> UpdateEvent | None:
+        updates = await self.list_updates(parsed_url, last_check)
+        return updates[0] if updates else None
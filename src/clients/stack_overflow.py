@@ -8,6 +8,8 @@ import httpx
 from src.api.bot_api.models import UpdateEvent
 from src.clients.base_client import BaseClient
 from src.clients.client_settings import ClientSettings, default_settings
+from src.metrics import UPSTREAM_REQUEST_LATENCY, observe_upstream_response
+from src.serializer import loads
 
 logger = logging.getLogger(__name__)
 
@@ -55,25 +57,34 @@ class StackOverflowClient(BaseClient):
     ) -> UpdateEvent | None:
         """Создаёт объект UpdateEvent на основе данных вопроса."""
         content_mapping = {
-            "answers": (f"Новый ответ на {parsed_url.geturl()}", "body", "owner", "creation_date"),
+            "answers": (
+                f"Новый ответ на {parsed_url.geturl()}",
+                "body",
+                "owner",
+                "creation_date",
+                "answer",
+            ),
             "comments": (
                 f"Новый комментарий на {parsed_url.geturl()}",
                 "body",
                 "owner",
                 "creation_date",
+                "comment",
             ),
         }
 
         username = "Неизвестный пользователь"
         preview = ""
         description = ""
+        event_type = None
 
-        for content_type, (desc, body_key, owner_key, date_key) in content_mapping.items():
+        for content_type, (desc, body_key, owner_key, date_key, kind) in content_mapping.items():
             if content_type in question:
                 latest_item = max(question[content_type], key=lambda x: x[date_key])
                 preview = latest_item.get(body_key, "Нет описания")[:200]
                 username = latest_item.get(owner_key, {}).get("display_name", username)
                 description = desc
+                event_type = kind
                 break
 
         if preview == "":
@@ -85,6 +96,7 @@ class StackOverflowClient(BaseClient):
             username=username,
             created_at=last_activity_date,
             preview=preview,
+            event_type=event_type,
         )
 
     async def get_question(self, question_id: str) -> dict[str, Any] | None:
@@ -99,11 +111,14 @@ class StackOverflowClient(BaseClient):
         if self.api_key:
             params["key"] = self.api_key
 
+        host = httpx.URL(url).host
         async with httpx.AsyncClient() as client:
             try:
-                response = await client.get(url, params=params, timeout=self.timeout)
+                with UPSTREAM_REQUEST_LATENCY.labels(host=host).time():
+                    response = await client.get(url, params=params, timeout=self.timeout)
+                observe_upstream_response(host, response)
                 response.raise_for_status()
-                data = response.json() or {}
+                data = loads(response.content) or {}
             except httpx.TimeoutException as e:
                 raise TimeoutError(f"Превышено время ожидания запроса к {url}") from e
             except httpx.HTTPStatusError as e:
@@ -1 +1,4 @@
 EXPECTED_TRACK_PARTS: int = 2
+# Заголовок ответа GET /links c версией списка подписок чата, по которой кэш списка
+# отличает запоздавшие ответы от более новых.
+LINKS_VERSION_HEADER: str = "Links-Version"
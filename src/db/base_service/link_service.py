@@ -1,15 +1,33 @@
+import inspect
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from datetime import datetime
 
 import asyncpg
+from pydantic import HttpUrl
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.scrapper_api.models import AddLinkRequest, LinkResponse, RemoveLinkRequest
+from src.metrics import observe_db_query
+from src.tracing import traced
 
 
 class BaseLinkService(ABC):
     """Абстрактный базовый класс для работы c подписками."""
 
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        """Оборачивает публичные корутины реализации в спан и замер длительности.
+
+        Спан называется `db.<метод>`, длительность пишется в DB_QUERY_LATENCY.
+        Асинхронные генераторы (iter_links) не оборачиваются: их длительность зависит от
+        потребителя потока.
+        """
+        super().__init_subclass__(**kwargs)
+        for name, attr in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.iscoroutinefunction(attr):
+                observed = observe_db_query(cls.__name__, name)(attr)
+                setattr(cls, name, traced(f"db.{name}")(observed))
+
     @abstractmethod
     async def add_link(
         self,
@@ -40,19 +58,145 @@ class BaseLinkService(ABC):
         :return: Объект LinkResponse c данными удаленной подписки.
         """
 
+    @abstractmethod
+    async def add_links(
+        self,
+        chat_id: int,
+        add_reqs: list[AddLinkRequest],
+        dependency: AsyncSession | asyncpg.Pool,
+    ) -> list[LinkResponse | None]:
+        """Добавляет несколько подписок для указанного чата одной транзакцией.
+
+        Ресурсы и подписки вставляются пакетно (`ON CONFLICT DO NOTHING`), число запросов
+        к БД не зависит от количества ссылок.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param add_reqs: Запросы на добавление подписок.
+        :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+        :return: Результаты в порядке запросов: LinkResponse добавленной подписки или None,
+                 если ссылка уже отслеживается или повторяется в запросе.
+        :raises KeyError: Если чат не найден.
+        """
+
+    @abstractmethod
+    async def remove_links(
+        self,
+        chat_id: int,
+        urls: list[HttpUrl],
+        dependency: AsyncSession | asyncpg.Pool,
+    ) -> list[LinkResponse | None]:
+        """Удаляет несколько подписок указанного чата одним запросом.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param urls: URL подписок для удаления.
+        :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+        :return: Результаты в порядке URL: LinkResponse удалённой подписки или None,
+                 если подписка не найдена.
+        :raises KeyError: Если чат не найден.
+        """
+
+    @staticmethod
+    def _in_request_order(
+        keys: list[str],
+        found: dict[str, LinkResponse],
+    ) -> list[LinkResponse | None]:
+        """Раскладывает результаты пакетной операции по позициям запроса.
+
+        :param keys: Канонические ключи ссылок в порядке запроса.
+        :param found: Изменённые подписки по каноническому ключу.
+        :return: Результаты в порядке запроса; повторы ключа получают None.
+        """
+        seen: set[str] = set()
+        result: list[LinkResponse | None] = []
+        for key in keys:
+            result.append(None if key in seen else found.get(key))
+            seen.add(key)
+        return result
+
     @abstractmethod
     async def get_links(
         self,
         chat_id: int,
         dependency: AsyncSession | asyncpg.Pool,
+        *,
+        limit: int | None = None,
+        after_id: int | None = None,
     ) -> list[LinkResponse]:
-        """Возвращает список подписок для указанного чата.
+        """Возвращает список подписок для указанного чата, упорядоченный по идентификатору.
+
+        Постраничная выборка выполняется по курсору: следующая страница начинается после
+        последнего идентификатора предыдущей (индекс ix_links_chat_id_id).
 
         :param chat_id: Идентификатор Telegram-чата.
         :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+        :param limit: Максимальное число подписок (None - без ограничения).
+        :param after_id: Вернуть подписки c идентификатором больше указанного.
         :return: Список подписок в формате LinkResponse.
         """
 
+    async def iter_links(
+        self,
+        chat_id: int,
+        dependency: AsyncSession | asyncpg.Pool,
+        batch_size: int = 500,
+        after_id: int | None = None,
+    ) -> AsyncIterator[LinkResponse]:
+        """Последовательно выдаёт подписки чата, загружая их страницами по курсору.
+
+        B памяти одновременно находится не больше `batch_size` подписок.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+        :param batch_size: Размер страницы.
+        :param after_id: Начать c подписок, идентификатор которых больше указанного.
+        :return: Асинхронный итератор подписок в формате LinkResponse.
+        """
+        while True:
+            page = await self.get_links(chat_id, dependency, limit=batch_size, after_id=after_id)
+            for link in page:
+                yield link
+            if len(page) < batch_size:
+                return
+            after_id = page[-1].id
+
+    @abstractmethod
+    async def get_links_version(
+        self,
+        chat_id: int,
+        dependency: AsyncSession | asyncpg.Pool,
+    ) -> int | None:
+        """Возвращает версию списка подписок чата.
+
+        Версия увеличивается в той же транзакции, что и любое добавление, удаление или
+        изменение подписок чата. Обновление состояния pecypca её не меняет: новые события
+        учитываются в ETag GET /links через `get_links_last_event_at`.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+        :return: Версия списка или None, если чат не найден.
+        """
+
+    @abstractmethod
+    async def get_links_last_event_at(
+        self,
+        chat_id: int,
+        dependency: AsyncSession | asyncpg.Pool,
+        *,
+        limit: int | None = None,
+        after_id: int | None = None,
+    ) -> datetime | None:
+        """Возвращает время самого нового события pecypcoв страницы подписок чата.
+
+        Страница задаётся так же, как в `get_links`. Вместе c версией списка значение
+        образует ETag GET /links, поэтому проверка актуальности не загружает саму страницу.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+        :param limit: Размер страницы (None - все подписки).
+        :param after_id: Страница начинается после подписки c этим идентификатором.
+        :return: Время события или None, если событий нет.
+        """
+
     @abstractmethod
     async def set_last_updated(
         self,
@@ -67,3 +211,66 @@ class BaseLinkService(ABC):
         :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
         :return: None.
         """
+
+    @abstractmethod
+    async def get_links_by_tags(
+        self,
+        chat_id: int,
+        tags: list[str],
+        dependency: AsyncSession | asyncpg.Pool,
+        *,
+        match_any: bool = False,
+    ) -> list[LinkResponse]:
+        """Возвращает подписки чата, отмеченные указанными тегами.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param tags: Список тегов.
+        :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+        :param match_any: Если True, достаточно одного из тегов (`&&`),
+                          иначе подписка должна содержать все теги (`@>`).
+        :return: Список подписок в формате LinkResponse.
+        """
+
+    @abstractmethod
+    async def remove_links_by_tags(
+        self,
+        chat_id: int,
+        tags: list[str],
+        dependency: AsyncSession | asyncpg.Pool,
+        *,
+        match_any: bool = False,
+    ) -> list[LinkResponse]:
+        """Удаляет подписки чата, отмеченные указанными тегами.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param tags: Список тегов.
+        :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+        :param match_any: Если True, достаточно одного из тегов (`&&`),
+                          иначе подписка должна содержать все теги (`@>`).
+        :return: Список удалённых подписок в формате LinkResponse.
+        :raises KeyError: Если чат не найден.
+        :raises ValueError: Если список тегов пуст.
+        """
+
+    @abstractmethod
+    async def set_muted_by_tags(
+        self,
+        chat_id: int,
+        tags: list[str],
+        dependency: AsyncSession | asyncpg.Pool,
+        *,
+        muted: bool,
+        match_any: bool = False,
+    ) -> int:
+        """Включает или отключает уведомления по подпискам c указанными тегами.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param tags: Список тегов.
+        :param dependency: Зависимость для работы c базой данных (Pool или AsyncSession).
+        :param muted: True - отключить уведомления, False - включить.
+        :param match_any: Если True, достаточно одного из тегов (`&&`),
+                          иначе подписка должна содержать все теги (`@>`).
+        :return: Количество изменённых подписок.
+        :raises KeyError: Если чат не найден.
+        :raises ValueError: Если список тегов пуст.
+        """
@@ -1,11 +1,68 @@
+import contextlib
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from dataclasses import dataclass
 from typing import AsyncGenerator
 
 import asyncpg
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.metrics import DB_POOL_ACQUIRE_LATENCY, DB_POOL_CONNECTIONS, DB_POOL_WAITERS
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    """Снимок состояния пула соединений.
+
+    :param size: Открытые соединения.
+    :param max_size: Предельное число соединений.
+    :param in_use: Соединения, выданные запросам.
+    :param idle: Свободные соединения.
+    :param waiters: Запросы, ожидающие соединение.
+    """
+
+    size: int
+    max_size: int
+    in_use: int
+    idle: int
+    waiters: int
+
+
+class AcquireTracker:
+    """Считает ожидающих соединение и время ожидания выдачи соединения из пула."""
+
+    def __init__(self, manager: str) -> None:
+        """:param manager: Имя менеджера для метки метрик."""
+        self.manager = manager
+        self.waiters = 0
+
+    @contextlib.contextmanager
+    def acquiring(self) -> Iterator[None]:
+        """Оборачивает ожидание соединения: учитывает ожидающего и длительность ожидания."""
+        self.waiters += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.waiters -= 1
+            DB_POOL_ACQUIRE_LATENCY.labels(self.manager).observe(time.perf_counter() - start)
+
 
 class DBManager(ABC):
+    name: str
+
+    def __init__(self) -> None:
+        """Создаёт учёт ожидания соединений и публикует состояние пула в метриках."""
+        self.tracker = AcquireTracker(self.name)
+        DB_POOL_CONNECTIONS.labels(self.name, "in_use").set_function(
+            lambda: self.pool_stats().in_use,
+        )
+        DB_POOL_CONNECTIONS.labels(self.name, "idle").set_function(
+            lambda: self.pool_stats().idle,
+        )
+        DB_POOL_WAITERS.labels(self.name).set_function(lambda: self.tracker.waiters)
+
     @abstractmethod
     async def start(self) -> None:
         """Инициализация ресурсов базы данных."""
@@ -17,3 +74,7 @@ class DBManager(ABC):
     @abstractmethod
     def get_dependency(self) -> AsyncGenerator[AsyncSession | asyncpg.Pool, None]:
         """Возвращает зависимость для использования в FastAPI."""
+
+    @abstractmethod
+    def pool_stats(self) -> PoolStats:
+        """Возвращает текущее состояние пула соединений."""
@@ -6,22 +6,52 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
-from src.db.db_manager.base import DBManager
+from src.db.db_manager.base import AcquireTracker, DBManager, PoolStats
 from src.settings import settings
 
 
+def _tracked_pool_class(tracker: AcquireTracker) -> type[AsyncAdaptedQueuePool]:
+    """Создаёт класс пула SQLAlchemy, учитывающий ожидание соединений.
+
+    Трекер замыкается в классе, a не передаётся экземпляру: SQLAlchemy пересоздаёт пул
+    через `self.__class__` при dispose.
+
+    :param tracker: Учёт ожидания соединений менеджера.
+    :return: Подкласс AsyncAdaptedQueuePool.
+    """
+
+    class TrackedQueuePool(AsyncAdaptedQueuePool):
+        def _do_get(self) -> ConnectionPoolEntry:
+            with tracker.acquiring():
+                return super()._do_get()
+
+    return TrackedQueuePool
+
+
 class ORMDBManager(DBManager):
     """Менеджер базы данных, использующий SQLAlchemy ORM."""
 
+    name = "orm"
+
     def __init__(self) -> None:
         """Инициализирует подключение к базе данных."""
+        super().__init__()
         self.engine: AsyncEngine = create_async_engine(
             url=str(settings.db.orm_url),
             echo=settings.db.echo,
             echo_pool=settings.db.echo_pool,
+            poolclass=_tracked_pool_class(self.tracker),
             pool_size=settings.db.pool_size,
             max_overflow=settings.db.max_overflow,
+            pool_timeout=settings.db.pool_timeout,
+            pool_recycle=int(settings.db.max_lifetime) or -1,
+            connect_args={
+                "statement_cache_size": settings.db.statement_cache_size,
+                "prepared_statement_cache_size": settings.db.statement_cache_size,
+                "command_timeout": settings.db.command_timeout,
+            },
         )
         self.session_factory = async_sessionmaker(
             bind=self.engine,
@@ -46,3 +76,16 @@ class ORMDBManager(DBManager):
             raise RuntimeError("Фабрика сессий не инициализирована")
         async with self.session_factory() as session:
             yield session
+
+    def pool_stats(self) -> PoolStats:
+        """Возвращает текущее состояние пула SQLAlchemy."""
+        pool = self.engine.pool
+        in_use = pool.checkedout()  # type: ignore[attr-defined]
+        idle = pool.checkedin()  # type: ignore[attr-defined]
+        return PoolStats(
+            size=in_use + idle,
+            max_size=settings.db.pool_size + settings.db.max_overflow,
+            in_use=in_use,
+            idle=idle,
+            waiters=self.tracker.waiters,
+        )
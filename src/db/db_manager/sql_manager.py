@@ -1,24 +1,139 @@
-from typing import AsyncGenerator
+import asyncio
+import contextlib
+from typing import Any, AsyncGenerator, Generator
 
 import asyncpg
 
-from src.db.db_manager.base import DBManager
+from src.db.db_manager.base import AcquireTracker, DBManager, PoolStats
+from src.db.sql_service.statements import PreparedConnection, prepare_statements
 from src.settings import settings
 
 
+class _TrackedAcquire:
+    """Выдача соединения из пула c учётом ожидания: как `await`, так и `async with`.
+
+    Оборачивает публичный контекст `asyncpg.Pool.acquire`, не затрагивая внутренности пула.
+    """
+
+    __slots__ = ("_context", "_tracker")
+
+    def __init__(self, context: asyncpg.pool.PoolAcquireContext, tracker: AcquireTracker) -> None:
+        self._context = context
+        self._tracker = tracker
+
+    async def _acquire(self) -> asyncpg.pool.PoolConnectionProxy:
+        with self._tracker.acquiring():
+            return await self._context
+
+    def __await__(self) -> Generator[Any, None, asyncpg.pool.PoolConnectionProxy]:
+        return self._acquire().__await__()
+
+    async def __aenter__(self) -> asyncpg.pool.PoolConnectionProxy:
+        with self._tracker.acquiring():
+            return await self._context.__aenter__()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self._context.__aexit__(*exc_info)
+
+
+class _TrackedPool:
+    """Обёртка пула asyncpg, учитывающая ожидание соединений и таймаут выдачи по умолчанию.
+
+    Запросы через пул (`execute`, `fetch`, `fetchrow`, `fetchval`) выполняются на соединении
+    из `acquire`, поэтому учёт распространяется и на них. Остальные атрибуты (`release`,
+    `close`, `get_size` и др.) берутся из самого пула.
+    """
+
+    __slots__ = ("_pool", "_tracker")
+
+    def __init__(self, pool: asyncpg.Pool, tracker: AcquireTracker) -> None:
+        self._pool = pool
+        self._tracker = tracker
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        return getattr(self._pool, name)
+
+    def acquire(self, *, timeout: float | None = None) -> _TrackedAcquire:
+        """Выдаёт соединение, по умолчанию ожидая не дольше `pool_timeout`.
+
+        :param timeout: Предельное время ожидания соединения в секундах.
+        :return: Объект для `await` или `async with`, как y `asyncpg.Pool.acquire`.
+        """
+        return _TrackedAcquire(
+            self._pool.acquire(timeout=settings.db.pool_timeout if timeout is None else timeout),
+            self._tracker,
+        )
+
+    async def execute(self, query: str, *args: object, timeout: float | None = None) -> str:
+        """Выполняет запрос на соединении из пула, как `asyncpg.Pool.execute`."""
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args, timeout=timeout)  # type: ignore[no-any-return]
+
+    async def fetch(self, query: str, *args: object, **kwargs: Any) -> list[Any]:  # noqa: ANN401
+        """Возвращает все строки запроса, как `asyncpg.Pool.fetch`."""
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args, **kwargs)  # type: ignore[no-any-return]
+
+    async def fetchrow(self, query: str, *args: object, **kwargs: Any) -> Any:  # noqa: ANN401
+        """Возвращает первую строку запроса, как `asyncpg.Pool.fetchrow`."""
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args, **kwargs)
+
+    async def fetchval(self, query: str, *args: object, **kwargs: Any) -> Any:  # noqa: ANN401
+        """Возвращает значение первой строки запроса, как `asyncpg.Pool.fetchval`."""
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args, **kwargs)
+
+
 class SQLDBManager(DBManager):
     """Менеджер базы данных для работы c asyncpg."""
 
+    name = "sql"
+
     def __init__(self) -> None:
         """Инициализирует менеджер базы данных без пула соединений."""
-        self.pool: asyncpg.Pool | None = None
+        super().__init__()
+        self.pool: _TrackedPool | None = None
+        self._expiry_task: asyncio.Task[None] | None = None
 
     async def start(self) -> None:
-        """Создает пул соединений c базой данных."""
-        self.pool = await asyncpg.create_pool(str(settings.db.sql_url))
+        """Создает пул соединений c базой данных.
+
+        Частые запросы SQL-сервисов подготавливаются на каждом новом соединении пула.
+        """
+        pool = await asyncpg.create_pool(
+            str(settings.db.sql_url),
+            min_size=min(settings.db.pool_min_size, settings.db.pool_size),
+            max_size=settings.db.pool_size,
+            max_inactive_connection_lifetime=settings.db.idle_lifetime,
+            init=prepare_statements,
+            connection_class=PreparedConnection,
+            statement_cache_size=settings.db.statement_cache_size,
+            # Запросы реестра готовятся один раз и не должны вытесняться по времени.
+            max_cached_statement_lifetime=0,
+            command_timeout=settings.db.command_timeout,
+        )
+        self.pool = _TrackedPool(pool, self.tracker)
+        if settings.db.max_lifetime:
+            self._expiry_task = asyncio.create_task(self._expire_connections())
+
+    async def _expire_connections(self) -> None:
+        """Периодически заменяет соединения пула, ограничивая время их жизни max_lifetime.
+
+        B asyncpg нет ограничения полного времени жизни соединения, поэтому соединения
+        помечаются устаревшими раз в max_lifetime и переоткрываются при возврате в пул.
+        """
+        while self.pool is not None:
+            await asyncio.sleep(settings.db.max_lifetime)
+            await self.pool.expire_connections()
 
     async def close(self) -> None:
         """Закрывает пул соединений c базой данных, если он был создан."""
+        if self._expiry_task is not None:
+            self._expiry_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._expiry_task
+            self._expiry_task = None
         if self.pool:
             await self.pool.close()
 
@@ -31,3 +146,23 @@ class SQLDBManager(DBManager):
         if not self.pool:
             raise RuntimeError("Пул соединений не инициализирован")
         yield self.pool
+
+    def pool_stats(self) -> PoolStats:
+        """Возвращает текущее состояние пула asyncpg (нули до вызова start)."""
+        if self.pool is None:
+            return PoolStats(
+                size=0,
+                max_size=settings.db.pool_size,
+                in_use=0,
+                idle=0,
+                waiters=self.tracker.waiters,
+            )
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return PoolStats(
+            size=size,
+            max_size=self.pool.get_max_size(),
+            in_use=size - idle,
+            idle=idle,
+            waiters=self.tracker.waiters,
+        )
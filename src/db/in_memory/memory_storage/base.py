@@ -0,0 +1,94 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any
+
+from src.db.in_memory.memory_storage.enum_states import State
+
+
+@dataclass(frozen=True)
+class StorageKey:
+    """Ключ для хранения данных в хранилище FSM.
+
+    Представляет уникальный идентификатор записи, состоящий из ID чата и ID пользователя.
+    Используется как неизменяемый ключ в словаре хранения.
+
+    :param chat_id: Идентификатор чата (int).
+    :param user_id: Идентификатор пользователя (int).
+    """
+
+    chat_id: int
+    user_id: int
+
+
+class BaseStorage(ABC):
+    """Абстрактное хранилище состояний и данных конечного автомата (FSM) бота."""
+
+    @abstractmethod
+    async def set_state(self, key: StorageKey, state: State | None = None) -> None:
+        """Устанавливает состояние для указанного ключа.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :param state: Состояние для установки (State или None).
+        :return: None
+        """
+
+    @abstractmethod
+    async def get_state(self, key: StorageKey) -> State | None:
+        """Получает состояние для указанного ключа.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :return: Текущее состояние записи (State) или None, если ключ отсутствует.
+        """
+
+    @abstractmethod
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        """Устанавливает данные для указанного ключа.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :param data: Словарь данных для установки (dict[str, Any]).
+        :return: None
+        """
+
+    @abstractmethod
+    async def get_data(self, key: StorageKey) -> dict[str, Any] | None:
+        """Получает данные для указанного ключа.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :return: Копия данных записи (dict[str, Any]) или None, если ключ отсутствует.
+        """
+
+    @abstractmethod
+    async def clear(self, key: StorageKey) -> None:
+        """Удаляет состояние и данные для указанного ключа.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :return: None
+        """
+
+    async def set_record(
+        self,
+        key: StorageKey,
+        state: State | None,
+        data: dict[str, Any],
+    ) -> None:
+        """Устанавливает состояние и данные для указанного ключа.
+
+        Реализации могут переопределить метод, чтобы записать o6e части за одно обращение.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :param state: Состояние для установки (State или None).
+        :param data: Словарь данных для установки (dict[str, Any]).
+        :return: None
+        """
+        await self.set_state(key, state)
+        await self.set_data(key, data)
+
+    async def get_record(self, key: StorageKey) -> tuple[State | None, dict[str, Any] | None]:
+        """Получает состояние и данные для указанного ключа.
+
+        Реализации могут переопределить метод, чтобы прочитать o6e части за одно обращение.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :return: Кортеж (состояние, данные); отсутствующие части равны None.
+        """
+        return await self.get_state(key), await self.get_data(key)
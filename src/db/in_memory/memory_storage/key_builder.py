@@ -1,13 +1,13 @@
 from telethon.events import NewMessage
 
-from src.db.in_memory.memory_storage.memory import StorageKey
+from src.db.in_memory.memory_storage.base import StorageKey
 
 
 async def build_storage_key(event: NewMessage.Event) -> StorageKey:
     """Формирует ключ для хранилища конечного автомата (FSM) на основе события Telegram.
 
     Извлекает идентификатор чата (chat_id) и идентификатор пользователя (user_id) из события,
-    создавая неизменяемый объект StorageKey, который используется как ключ в MemoryStorage.
+    создавая неизменяемый объект StorageKey, который используется как ключ в хранилище FSM.
 
     :param event: Событие сообщения Telegram, содержащее данные щ чате и пользователе.
     :return: Объект StorageKey c chat_id и user_id из события.
@@ -1,24 +1,9 @@
-from collections import defaultdict
+import time
 from dataclasses import dataclass, field
-from typing import Any, DefaultDict
+from typing import Any
 
+from src.db.in_memory.memory_storage.base import BaseStorage, StorageKey
 from src.db.in_memory.memory_storage.enum_states import State
-from src.singleton import SingletonMeta
-
-
-@dataclass(frozen=True)
-class StorageKey:
-    """Ключ для хранения данных в MemoryStorage.
-
-    Представляет уникальный идентификатор записи, состоящий из ID чата и ID пользователя.
-    Используется как неизменяемый ключ в словаре хранения.
-
-    :param chat_id: Идентификатор чата (int).
-    :param user_id: Идентификатор пользователя (int).
-    """
-
-    chat_id: int
-    user_id: int
 
 
 @dataclass
@@ -26,32 +11,69 @@ class MemoryStorageRecord:
     """Запись для хранения данных и состояния в MemoryStorage.
 
     Содержит данные (словарь) и состояние (State), которые могут быть связаны c ключом StorageKey.
-    Используется как значение по умолчанию в defaultdict.
 
     :param data: Словарь c пользовательскими данными (dict[str, Any]).
     :param state: Состояние записи (State или None).
+    :param expires_at: Момент истечения записи по `time.monotonic()` (None - бессрочно).
     """
 
     data: dict[str, Any] = field(default_factory=dict)
     state: State | None = None
+    expires_at: float | None = None
 
 
-class MemoryStorage(metaclass=SingletonMeta):
-    """Хранилище данных в памяти c асинхронными методами.
+class MemoryStorage(BaseStorage):
+    """Хранилище данных FSM в памяти процесса c асинхронными методами.
 
-    Реализует синглтон для управления состоянием и данными пользователей в виде
-    словаря c ключами StorageKey и значениями MemoryStorageRecord.
-    Предоставляет методы для установки, получения и очистки данных и состояния.
+    Хранит состояние и данные пользователей в словаре c ключами StorageKey и значениями
+    MemoryStorageRecord. Каждая запись живёт `ttl` секунд c момента последней записи;
+    просроченные записи удаляются при обращении к ним и периодически при записи.
 
     :ivar storage: Словарь хранения c ключами StorageKey и значениями MemoryStorageRecord.
-    :type storage: DefaultDict[StorageKey, MemoryStorageRecord]
+    :type storage: dict[StorageKey, MemoryStorageRecord]
     """
 
-    def __init__(self) -> None:
-        """Инициализирует хранилище c пустым defaultdict."""
-        self.storage: DefaultDict[StorageKey, MemoryStorageRecord] = defaultdict(
-            MemoryStorageRecord,
-        )
+    def __init__(self, ttl: float | None = None) -> None:
+        """Инициализирует пустое хранилище.
+
+        :param ttl: Время жизни записи в секундах (None - без ограничения).
+        """
+        self.ttl = ttl
+        self.storage: dict[StorageKey, MemoryStorageRecord] = {}
+        self._next_sweep: float = 0.0
+
+    def _alive(self, key: StorageKey) -> MemoryStorageRecord | None:
+        """Возвращает запись, если она существует и не просрочена, иначе удаляет её."""
+        record = self.storage.get(key)
+        if record is None:
+            return None
+        if record.expires_at is not None and record.expires_at <= time.monotonic():
+            del self.storage[key]
+            return None
+        return record
+
+    def _touch(self, key: StorageKey) -> MemoryStorageRecord:
+        """Возвращает (или создаёт) запись и продлевает срок её жизни."""
+        record = self._alive(key)
+        if record is None:
+            record = self.storage[key] = MemoryStorageRecord()
+        if self.ttl is not None:
+            now = time.monotonic()
+            record.expires_at = now + self.ttl
+            if now >= self._next_sweep:
+                self._evict_expired(now)
+        return record
+
+    def _evict_expired(self, now: float) -> None:
+        """Удаляет все просроченные записи; выполняется не чаще раза в `ttl` секунд."""
+        expired = [
+            key
+            for key, record in self.storage.items()
+            if record.expires_at is not None and record.expires_at <= now
+        ]
+        for key in expired:
+            del self.storage[key]
+        self._next_sweep = now + (self.ttl or 0)
 
     async def set_state(self, key: StorageKey, state: State | None = None) -> None:
         """Устанавливает состояние для указанного ключа.
@@ -60,7 +82,7 @@ class MemoryStorage(metaclass=SingletonMeta):
         :param state: Состояние для установки (State или None).
         :return: None
         """
-        self.storage[key].state = state
+        self._touch(key).state = state
 
     async def get_state(self, key: StorageKey) -> State | None:
         """Получает состояние для указанного ключа.
@@ -68,9 +90,8 @@ class MemoryStorage(metaclass=SingletonMeta):
         :param key: Ключ для доступа к записи (StorageKey).
         :return: Текущее состояние записи (State) или None, если ключ отсутствует.
         """
-        if key not in self.storage:
-            return None
-        return self.storage[key].state
+        record = self._alive(key)
+        return record.state if record is not None else None
 
     async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
         """Устанавливает данные для указанного ключа.
@@ -79,7 +100,7 @@ class MemoryStorage(metaclass=SingletonMeta):
         :param data: Словарь данных для установки (dict[str, Any]).
         :return: None
         """
-        self.storage[key].data = data.copy()
+        self._touch(key).data = data.copy()
 
     async def get_data(self, key: StorageKey) -> dict[str, Any] | None:
         """Получает данные для указанного ключа.
@@ -87,17 +108,13 @@ class MemoryStorage(metaclass=SingletonMeta):
         :param key: Ключ для доступа к записи (StorageKey).
         :return: Копия данных записи (dict[str, Any]) или None, если ключ отсутствует.
         """
-        if key not in self.storage:
-            return None
-        return self.storage[key].data.copy()
+        record = self._alive(key)
+        return record.data.copy() if record is not None else None
 
     async def clear(self, key: StorageKey) -> None:
-        """Очищает состояние и данные для указанного ключа.
-
-        Устанавливает состояние в None и заменяет данные пустым словарём.
+        """Удаляет запись для указанного ключа.
 
         :param key: Ключ для доступа к записи (StorageKey).
         :return: None
         """
-        await self.set_state(key, None)
-        await self.set_data(key, {})
+        self.storage.pop(key, None)
@@ -0,0 +1,133 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.db.in_memory.memory_storage.base import BaseStorage, StorageKey
+from src.db.in_memory.memory_storage.enum_states import State
+from src.serializer import dumps, loads
+
+STATE_FIELD: str = "state"
+DATA_FIELD: str = "data"
+
+
+class RedisStorage(BaseStorage):
+    """Хранилище данных FSM в Redis, общее для всех процессов бота.
+
+    Каждая запись хранится в хэше `{key_prefix}:{chat_id}:{user_id}` c полями `state`
+    (имя состояния) и `data` (JSON). Любая запись продлевает срок жизни хэша на `ttl` секунд;
+    запись и продление выполняются одним конвейером (pipeline).
+
+    Собственных соединений хранилище не создаёт: клиент Redis c общим пулом предоставляет
+    владелец пула (например, `RedisCache.client`), он же закрывает пул при остановке.
+    """
+
+    def __init__(
+        self,
+        client: Callable[[], Awaitable[Any]],
+        ttl: int,
+        key_prefix: str = "fsm",
+    ) -> None:
+        """Инициализирует хранилище.
+
+        :param client: Функция, возвращающая клиент Redis c общим пулом соединений.
+        :param ttl: Время жизни записи в секундах.
+        :param key_prefix: Префикс ключей FSM в Redis.
+        """
+        self._client = client
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+
+    def _key(self, key: StorageKey) -> str:
+        """Формирует ключ хэша Redis для записи FSM."""
+        return f"{self.key_prefix}:{key.chat_id}:{key.user_id}"
+
+    async def _write(self, key: StorageKey, mapping: dict[str, bytes | str]) -> None:
+        """Записывает поля хэша и продлевает срок ero жизни за одно обращение к Redis."""
+        client = await self._client()
+        name = self._key(key)
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hset(name, mapping=mapping)
+            pipe.expire(name, self.ttl)
+            await pipe.execute()
+
+    @staticmethod
+    def _decode_state(raw: bytes | None) -> State | None:
+        """Восстанавливает состояние из значения поля хэша."""
+        return State[raw.decode()] if raw else None
+
+    @staticmethod
+    def _decode_data(raw: bytes | None) -> dict[str, Any] | None:
+        """Восстанавливает данные из значения поля хэша."""
+        if raw is None:
+            return None
+        data = loads(raw)
+        return data if isinstance(data, dict) else None
+
+    async def set_state(self, key: StorageKey, state: State | None = None) -> None:
+        """Устанавливает состояние для указанного ключа.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :param state: Состояние для установки (State или None).
+        :return: None
+        """
+        await self._write(key, {STATE_FIELD: state.name if state else ""})
+
+    async def get_state(self, key: StorageKey) -> State | None:
+        """Получает состояние для указанного ключа.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :return: Текущее состояние записи (State) или None, если ключ отсутствует.
+        """
+        client = await self._client()
+        return self._decode_state(await client.hget(self._key(key), STATE_FIELD))
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        """Устанавливает данные для указанного ключа.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :param data: Словарь данных для установки (dict[str, Any]).
+        :return: None
+        """
+        await self._write(key, {DATA_FIELD: dumps(data)})
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any] | None:
+        """Получает данные для указанного ключа.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :return: Данные записи (dict[str, Any]) или None, если ключ отсутствует.
+        """
+        client = await self._client()
+        return self._decode_data(await client.hget(self._key(key), DATA_FIELD))
+
+    async def clear(self, key: StorageKey) -> None:
+        """Удаляет запись для указанного ключа.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :return: None
+        """
+        client = await self._client()
+        await client.delete(self._key(key))
+
+    async def set_record(
+        self,
+        key: StorageKey,
+        state: State | None,
+        data: dict[str, Any],
+    ) -> None:
+        """Устанавливает состояние и данные одной командой HSET вместе c продлением TTL.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :param state: Состояние для установки (State или None).
+        :param data: Словарь данных для установки (dict[str, Any]).
+        :return: None
+        """
+        await self._write(key, {STATE_FIELD: state.name if state else "", DATA_FIELD: dumps(data)})
+
+    async def get_record(self, key: StorageKey) -> tuple[State | None, dict[str, Any] | None]:
+        """Получает состояние и данные одной командой HMGET.
+
+        :param key: Ключ для доступа к записи (StorageKey).
+        :return: Кортеж (состояние, данные); отсутствующие части равны None.
+        """
+        client = await self._client()
+        raw_state, raw_data = await client.hmget(self._key(key), [STATE_FIELD, DATA_FIELD])
+        return self._decode_state(raw_state), self._decode_data(raw_data)
@@ -0,0 +1,33 @@
+from collections.abc import Callable
+
+from src.bot.redis_cache import redis_cache
+from src.db.in_memory.memory_storage.base import BaseStorage
+from src.db.in_memory.memory_storage.memory import MemoryStorage
+from src.db.in_memory.memory_storage.redis_storage import RedisStorage
+from src.settings import settings
+
+FSM_STORAGE_MAP: dict[str, Callable[[], BaseStorage]] = {
+    "MEMORY": lambda: MemoryStorage(ttl=settings.fsm.ttl),
+    "REDIS": lambda: RedisStorage(
+        redis_cache.client,
+        ttl=settings.fsm.ttl,
+        key_prefix=settings.fsm.key_prefix,
+    ),
+}
+
+
+def get_fsm_storage(storage_type: str) -> BaseStorage:
+    """Фабричная функция для создания хранилища FSM на основе типа хранилища.
+
+    :param storage_type: Тип хранилища ("MEMORY" или "REDIS").
+    :return: Экземпляр хранилища FSM (BaseStorage).
+    :raises ValueError: Если тип хранилища неизвестен.
+    """
+    storage_type = storage_type.upper()
+    storage_factory = FSM_STORAGE_MAP.get(storage_type)
+    if storage_factory is None:
+        raise ValueError(f"Неизвестный тип хранилища FSM: {storage_type}")
+    return storage_factory()
+
+
+fsm_storage = get_fsm_storage(settings.fsm.storage)
@@ -55,11 +55,11 @@ class Repository(metaclass=SingletonMeta):
             raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
         existing_links = self.links.get(chat_id, [])
         for link in existing_links:
-            if link.url == add_req.link:
+            if link.url == str(add_req.link):
                 raise ValueError("Ссылка уже отслеживается")
         new_link = LinkResponse(
             id=self._link_id_counter,
-            url=add_req.link,
+            url=str(add_req.link),
             tags=add_req.tags,
             filters=add_req.filters,
             last_updated=None,
@@ -81,7 +81,7 @@ class Repository(metaclass=SingletonMeta):
             raise ValueError(f"Чат с идентификатором {chat_id} не найден.")
         existing_links = self.links.get(chat_id, [])
         for link in existing_links:
-            if link.url == remove_req.link:
+            if link.url == str(remove_req.link):
                 existing_links.remove(link)
                 return link
         raise KeyError(f"Ссылка {remove_req.link} не найдена.")
@@ -1,14 +1,71 @@
 from datetime import datetime, timezone
+from typing import Any, cast
 
 from pydantic import HttpUrl
-from sqlalchemy import update
+from sqlalchemy import ColumnElement, CursorResult, Row, delete, func, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import contains_eager
 
 from src.api.scrapper_api.models import AddLinkRequest, LinkResponse, RemoveLinkRequest
+from src.clients.canonical import canonical_key
 from src.db.base_service.link_service import BaseLinkService
 from src.db.orm_service.models.chat import Chat
 from src.db.orm_service.models.link import Link
+from src.db.orm_service.models.resource import Resource
+
+_LINK_COLUMNS = (
+    Link.id,
+    Resource.url,
+    Link.tags,
+    Link.filters,
+    Resource.last_event_at,
+    Link.muted,
+)
+# Строка c колонками `_LINK_COLUMNS`, за которыми могут следовать дополнительные.
+LinkRow = Row[int, str, list[str] | None, list[str] | None, datetime | None, bool, *tuple[Any, ...]]
+
+
+def _link_from_row(row: LinkRow) -> LinkResponse:
+    """Собирает LinkResponse из строки выборки c колонками `_LINK_COLUMNS`.
+
+    :param row: Строка результата запроса.
+    :return: Объект LinkResponse (без повторной валидации).
+    """
+    return LinkResponse.model_construct(
+        id=row.id,
+        url=row.url,
+        tags=row.tags or [],
+        filters=row.filters or [],
+        last_updated=row.last_event_at,
+        muted=row.muted,
+    )
+
+
+def _tags_clause(tags: list[str], *, match_any: bool) -> ColumnElement[bool]:
+    """Условие отбора подписок по тегам, использующее GIN-индекс ix_links_tags.
+
+    :param tags: Список тегов.
+    :param match_any: Если True, достаточно одного из тегов (`&&`), иначе нужны все (`@>`).
+    :return: Условие для `where`.
+    """
+    return Link.tags.overlap(tags) if match_any else Link.tags.contains(tags)
+
+
+async def _bump_links_version(session: AsyncSession, chat_id: int) -> None:
+    """Увеличивает версию списка подписок чата в текущей транзакции сессии.
+
+    :param session: Асинхронная сессия SQLAlchemy.
+    :param chat_id: Идентификатор Telegram-чата.
+    """
+    stmt = (
+        update(Chat)
+        .where(Chat.id == chat_id)
+        .values(links_version=Chat.links_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(stmt)
 
 
 class OrmLinkService(BaseLinkService):
@@ -30,34 +87,51 @@ class OrmLinkService(BaseLinkService):
         :param dependency: Асинхронная сессия SQLAlchemy.
         :return: Объект LinkResponse c данными добавленной подписки.
         :raises KeyError: Если чат c данным chat_id не найден.
-        :raises ValueError: Если подписка c данным URL уже существует.
+        :raises ValueError: Если подписка на этот pecypc уже существует
+                            (URL сравниваются по каноническому ключу).
         """
         chat = await dependency.get(Chat, chat_id)
         if not chat:
             raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
 
-        stmt = select(Link).where(Link.chat_id == chat_id, Link.url == str(add_req.link))
-        result = await dependency.execute(stmt)
-        if result.scalar_one_or_none():
+        url = str(add_req.link)
+        resource_key = canonical_key(url)
+        # DO UPDATE вместо DO NOTHING: при параллельной вставке того же pecypca запрос дожидается
+        # чужой транзакции и возвращает её строку, a не падает на уникальном ключе.
+        insert_stmt = insert(Resource).values(
+            url=url,
+            canonical_key=resource_key,
+            last_event_at=datetime.now(timezone.utc),
+        )
+        stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[Resource.canonical_key],
+            set_={"canonical_key": insert_stmt.excluded.canonical_key},
+        ).returning(Resource.id, Resource.url, Resource.last_event_at)
+        resource = (await dependency.execute(stmt)).one()
+
+        existing = await dependency.scalar(
+            select(Link.id).where(Link.chat_id == chat_id, Link.resource_id == resource.id),
+        )
+        if existing:
+            await dependency.rollback()
             raise ValueError(f"Ссылка {add_req.link} уже отслеживается.")
 
         new_sub = Link(
             chat_id=chat_id,
-            url=str(add_req.link),
+            resource_id=resource.id,
             tags=add_req.tags,
             filters=add_req.filters,
-            last_updated=datetime.now(timezone.utc),
         )
         dependency.add(new_sub)
+        await _bump_links_version(dependency, chat_id)
         await dependency.commit()
-        await dependency.refresh(new_sub)
 
         return LinkResponse(
             id=new_sub.id,
-            url=HttpUrl(new_sub.url),
+            url=resource.url,
             tags=new_sub.tags or [],
             filters=new_sub.filters or [],
-            last_updated=new_sub.last_updated,
+            last_updated=resource.last_event_at,
         )
 
     async def remove_link(
@@ -78,7 +152,13 @@ class OrmLinkService(BaseLinkService):
         if not chat:
             raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
 
-        stmt = select(Link).where(Link.chat_id == chat_id, Link.url == str(remove_req.link))
+        resource_key = canonical_key(str(remove_req.link))
+        stmt = (
+            select(Link)
+            .join(Link.resource)
+            .options(contains_eager(Link.resource))
+            .where(Link.chat_id == chat_id, Resource.canonical_key == resource_key)
+        )
         result = await dependency.execute(stmt)
         sub = result.scalar_one_or_none()
 
@@ -87,44 +167,208 @@ class OrmLinkService(BaseLinkService):
 
         response = LinkResponse(
             id=sub.id,
-            url=HttpUrl(sub.url),
+            url=sub.resource.url,
             tags=sub.tags or [],
             filters=sub.filters or [],
-            last_updated=sub.last_updated,
+            last_updated=sub.resource.last_event_at,
+            muted=sub.muted,
         )
 
         await dependency.delete(sub)
+        await _bump_links_version(dependency, chat_id)
         await dependency.commit()
 
         return response
 
+    async def add_links(
+        self,
+        chat_id: int,
+        add_reqs: list[AddLinkRequest],
+        dependency: AsyncSession,
+    ) -> list[LinkResponse | None]:
+        """Добавляет несколько подписок для заданного чата одной транзакцией через ORM.
+
+        Ресурсы и подписки вставляются многострочными `INSERT ... ON CONFLICT DO NOTHING`,
+        число запросов не зависит от количества ссылок.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param add_reqs: Запросы на добавление подписок.
+        :param dependency: Асинхронная сессия SQLAlchemy.
+        :return: Результаты в порядке запросов: LinkResponse добавленной подписки или None,
+                 если ссылка уже отслеживается или повторяется в запросе.
+        :raises KeyError: Если чат c данным chat_id не найден.
+        """
+        chat = await dependency.get(Chat, chat_id)
+        if not chat:
+            raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
+
+        keys = [canonical_key(str(req.link)) for req in add_reqs]
+        unique: dict[str, AddLinkRequest] = {}
+        for key, req in zip(keys, add_reqs, strict=True):
+            unique.setdefault(key, req)
+
+        now = datetime.now(timezone.utc)
+        await dependency.execute(
+            insert(Resource)
+            .values(
+                [
+                    {"url": str(req.link), "canonical_key": key, "last_event_at": now}
+                    for key, req in unique.items()
+                ],
+            )
+            .on_conflict_do_nothing(index_elements=[Resource.canonical_key]),
+        )
+        result = await dependency.execute(
+            select(Resource.id, Resource.url, Resource.canonical_key, Resource.last_event_at).where(
+                Resource.canonical_key.in_(list(unique)),
+            ),
+        )
+        resources = {row.id: row for row in result}
+        resource_ids = {row.canonical_key: row.id for row in resources.values()}
+
+        result = await dependency.execute(
+            insert(Link)
+            .values(
+                [
+                    {
+                        "chat_id": chat_id,
+                        "resource_id": resource_ids[key],
+                        "tags": req.tags,
+                        "filters": req.filters,
+                    }
+                    for key, req in unique.items()
+                ],
+            )
+            .on_conflict_do_nothing(constraint="uq_links_chat_id_resource_id")
+            .returning(Link.id, Link.resource_id, Link.tags, Link.filters, Link.muted),
+        )
+        found: dict[str, LinkResponse] = {}
+        for row in result:
+            resource = resources[row.resource_id]
+            found[resource.canonical_key] = LinkResponse.model_construct(
+                id=row.id,
+                url=resource.url,
+                tags=row.tags or [],
+                filters=row.filters or [],
+                last_updated=resource.last_event_at,
+                muted=row.muted,
+            )
+        if found:
+            await _bump_links_version(dependency, chat_id)
+        await dependency.commit()
+        return self._in_request_order(keys, found)
+
+    async def remove_links(
+        self,
+        chat_id: int,
+        urls: list[HttpUrl],
+        dependency: AsyncSession,
+    ) -> list[LinkResponse | None]:
+        """Удаляет несколько подписок заданного чата одним запросом `DELETE ... USING`.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param urls: URL подписок для удаления.
+        :param dependency: Асинхронная сессия SQLAlchemy.
+        :return: Результаты в порядке URL: LinkResponse удалённой подписки или None,
+                 если подписка не найдена.
+        :raises KeyError: Если чат c данным chat_id не найден.
+        """
+        chat = await dependency.get(Chat, chat_id)
+        if not chat:
+            raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
+
+        keys = [canonical_key(str(url)) for url in urls]
+        stmt = (
+            delete(Link)
+            .where(
+                Link.resource_id == Resource.id,
+                Link.chat_id == chat_id,
+                Resource.canonical_key.in_(keys),
+            )
+            .returning(*_LINK_COLUMNS, Resource.canonical_key)
+            .execution_options(synchronize_session=False)
+        )
+        result = await dependency.execute(stmt)
+        found = {row.canonical_key: _link_from_row(row) for row in result}
+        if found:
+            await _bump_links_version(dependency, chat_id)
+        await dependency.commit()
+        return self._in_request_order(keys, found)
+
     async def get_links(
         self,
         chat_id: int,
         dependency: AsyncSession,
+        *,
+        limit: int | None = None,
+        after_id: int | None = None,
     ) -> list[LinkResponse]:
-        """Возвращает список отслеживаемых ссылок для заданного чата.
+        """Возвращает отслеживаемые ссылки заданного чата, упорядоченные по идентификатору.
 
         :param chat_id: Идентификатор Telegram-чата.
         :param dependency: Асинхронная сессия SQLAlchemy.
+        :param limit: Максимальное число подписок (None - без ограничения).
+        :param after_id: Вернуть подписки c идентификатором больше указанного.
         :return: Список объектов LinkResponse.
         :raises ValueError: Если chat_id меньше нуля.
         """
         if chat_id < 0:
             raise ValueError(f"Некорректный идентификатор чата: {chat_id}. Должен быть >= 0.")
 
-        stmt = select(Link).where(Link.chat_id == chat_id)
+        stmt = (
+            select(*_LINK_COLUMNS)
+            .join(Resource, Resource.id == Link.resource_id)
+            .where(Link.chat_id == chat_id)
+            .order_by(Link.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            stmt = stmt.where(Link.id > after_id)
         result = await dependency.execute(stmt)
-        return [
-            LinkResponse(
-                id=link.id,
-                url=HttpUrl(link.url),
-                tags=link.tags or [],
-                filters=link.filters or [],
-                last_updated=link.last_updated,
-            )
-            for link in result.scalars()
-        ]
+        return [_link_from_row(row) for row in result]
+
+    async def get_links_version(self, chat_id: int, dependency: AsyncSession) -> int | None:
+        """Возвращает версию списка подписок чата.
+
+        Читается только строка чата по первичному ключу, таблица links не затрагивается.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param dependency: Асинхронная сессия SQLAlchemy.
+        :return: Версия списка или None, если чат не найден.
+        """
+        result = await dependency.execute(
+            select(Chat.links_version).where(Chat.id == chat_id),
+        )
+        return result.scalar_one_or_none()
+
+    async def get_links_last_event_at(
+        self,
+        chat_id: int,
+        dependency: AsyncSession,
+        *,
+        limit: int | None = None,
+        after_id: int | None = None,
+    ) -> datetime | None:
+        """Возвращает время самого нового события pecypcoв страницы подписок чата.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param dependency: Асинхронная сессия SQLAlchemy.
+        :param limit: Размер страницы (None - все подписки).
+        :param after_id: Страница начинается после подписки c этим идентификатором.
+        :return: Время события или None, если событий нет.
+        """
+        page = (
+            select(Resource.last_event_at)
+            .join(Link, Link.resource_id == Resource.id)
+            .where(Link.chat_id == chat_id, Link.id > (after_id or 0))
+            .order_by(Link.id)
+            .limit(limit)
+            .subquery()
+        )
+        last_event_at: datetime | None = await dependency.scalar(
+            select(func.max(page.c.last_event_at)),
+        )
+        return last_event_at
 
     async def set_last_updated(
         self,
@@ -132,18 +376,137 @@ class OrmLinkService(BaseLinkService):
         last_updated: datetime,
         dependency: AsyncSession,
     ) -> None:
-        """Обновляет дату последнего изменения для подписки.
+        """Обновляет дату последнего изменения для pecypca, на который ссылается подписка.
+
+        Состояние хранится в таблице resources и записывается один раз на URL,
+        независимо от количества подписок на него; строки чатов не затрагиваются.
 
         :param link_id: Идентификатор подписки.
         :param last_updated: Новая дата последнего обновления.
         :param dependency: Асинхронная сессия SQLAlchemy.
         :raises KeyError: Если подписка не найдена.
         """
-        stmt = update(Link).where(Link.id == link_id).values(last_updated=last_updated)
-        result = await dependency.execute(stmt)
+        resource_id = select(Link.resource_id).where(Link.id == link_id).scalar_subquery()
+        stmt = (
+            update(Resource)
+            .where(Resource.id == resource_id)
+            .values(last_event_at=last_updated)
+            .execution_options(synchronize_session="fetch")
+        )
+        # UPDATE возвращает CursorResult c числом изменённых строк.
+        result = cast(CursorResult[Any], await dependency.execute(stmt))
 
         if result.rowcount == 0:
             raise KeyError(f"Подписка с идентификатором {link_id} не найдена.")
 
         await dependency.commit()
-        await dependency.refresh(await dependency.get(Link, link_id))
+
+    async def get_links_by_tags(
+        self,
+        chat_id: int,
+        tags: list[str],
+        dependency: AsyncSession,
+        *,
+        match_any: bool = False,
+    ) -> list[LinkResponse]:
+        """Возвращает подписки чата, отмеченные указанными тегами.
+
+        Запрос использует GIN-индекс ix_links_tags.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param tags: Список тегов.
+        :param dependency: Асинхронная сессия SQLAlchemy.
+        :param match_any: Если True, достаточно одного из тегов (`&&`),
+                          иначе подписка должна содержать все теги (`@>`).
+        :return: Список объектов LinkResponse.
+        :raises ValueError: Если chat_id меньше нуля.
+        """
+        if chat_id < 0:
+            raise ValueError(f"Некорректный идентификатор чата: {chat_id}. Должен быть >= 0.")
+
+        stmt = (
+            select(*_LINK_COLUMNS)
+            .join(Resource, Resource.id == Link.resource_id)
+            .where(Link.chat_id == chat_id, _tags_clause(tags, match_any=match_any))
+            .order_by(Link.id)
+        )
+        result = await dependency.execute(stmt)
+        return [_link_from_row(row) for row in result]
+
+    async def remove_links_by_tags(
+        self,
+        chat_id: int,
+        tags: list[str],
+        dependency: AsyncSession,
+        *,
+        match_any: bool = False,
+    ) -> list[LinkResponse]:
+        """Удаляет подписки чата, отмеченные указанными тегами.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param tags: Список тегов.
+        :param dependency: Асинхронная сессия SQLAlchemy.
+        :param match_any: Если True, достаточно одного из тегов (`&&`),
+                          иначе подписка должна содержать все теги (`@>`).
+        :return: Список удалённых подписок.
+        :raises KeyError: Если чат не найден.
+        :raises ValueError: Если список тегов пуст.
+        """
+        if not tags:
+            raise ValueError("Список тегов пуст.")
+
+        chat = await dependency.get(Chat, chat_id)
+        if not chat:
+            raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
+
+        removed = await self.get_links_by_tags(chat_id, tags, dependency, match_any=match_any)
+        if removed:
+            stmt = delete(Link).where(Link.id.in_([link.id for link in removed]))
+            await dependency.execute(stmt.execution_options(synchronize_session=False))
+            await _bump_links_version(dependency, chat_id)
+            await dependency.commit()
+        return removed
+
+    async def set_muted_by_tags(
+        self,
+        chat_id: int,
+        tags: list[str],
+        dependency: AsyncSession,
+        *,
+        muted: bool,
+        match_any: bool = False,
+    ) -> int:
+        """Включает или отключает уведомления по подпискам c указанными тегами.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param tags: Список тегов.
+        :param dependency: Асинхронная сессия SQLAlchemy.
+        :param muted: True - отключить уведомления, False - включить.
+        :param match_any: Если True, достаточно одного из тегов (`&&`),
+                          иначе подписка должна содержать все теги (`@>`).
+        :return: Количество изменённых подписок.
+        :raises KeyError: Если чат не найден.
+        :raises ValueError: Если список тегов пуст.
+        """
+        if not tags:
+            raise ValueError("Список тегов пуст.")
+
+        chat = await dependency.get(Chat, chat_id)
+        if not chat:
+            raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
+
+        stmt = (
+            update(Link)
+            .where(
+                Link.chat_id == chat_id,
+                _tags_clause(tags, match_any=match_any),
+                Link.muted.is_not(muted),
+            )
+            .values(muted=muted)
+            .execution_options(synchronize_session=False)
+        )
+        result = cast(CursorResult[Any], await dependency.execute(stmt))
+        if result.rowcount:
+            await _bump_links_version(dependency, chat_id)
+        await dependency.commit()
+        return int(result.rowcount)
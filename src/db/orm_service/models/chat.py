@@ -1,3 +1,4 @@
+from sqlalchemy import BigInteger
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.db.orm_service.models.base import Base
@@ -7,11 +8,14 @@ class Chat(Base):
     """Модель чата для хранения информации o зарегистрированных Telegram-чатах.
 
     :param id: Уникальный идентификатор чата.
+    :param links_version: Версия списка подписок чата; увеличивается при каждом изменении
+                          подписок и входит в ETag GET /links.
     :param links: Связь c подписками данного чата.
     """
 
     __tablename__ = "chats"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    links_version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
 
     links = relationship("Link", back_populates="chat", cascade="all, delete-orphan")
@@ -1,9 +1,9 @@
-from datetime import datetime
-
-from sqlalchemy import ARRAY, DateTime, ForeignKey, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, String, UniqueConstraint, false
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.db.orm_service.models.base import Base
+from src.db.orm_service.models.resource import Resource
 
 
 class Link(Base):
@@ -11,19 +11,32 @@ class Link(Base):
 
     :param id: Уникальный идентификатор подписки, первичный ключ.
     :param chat_id: Идентификатор чата (внешний ключ к Chat.id).
-    :param url: URL отслеживаемой ссылки.
+    :param resource_id: Идентификатор отслеживаемого pecypca (внешний ключ к Resource.id).
     :param tags: Массив тегов (опционально).
     :param filters: Массив фильтров (опционально).
-    :param last_updated: Время последнего обновления.
+    :param muted: Уведомления по подписке временно отключены.
     :param chat: Обратная связь c чатом.
+    :param resource: Связь c отслеживаемым ресурсом (URL и состояние проверки).
     """
 
     __tablename__ = "links"
+    __table_args__ = (
+        UniqueConstraint("chat_id", "resource_id", name="uq_links_chat_id_resource_id"),
+        # GIN-индексы для запросов по вхождению (@>, &&) в массивы тегов и фильтров.
+        Index("ix_links_tags", "tags", postgresql_using="gin"),
+        Index("ix_links_filters", "filters", postgresql_using="gin"),
+        # Постраничная выборка подписок чата по курсору (chat_id, id > after_id).
+        Index("ix_links_chat_id_id", "chat_id", "id"),
+    )
 
     chat_id: Mapped[int] = mapped_column(ForeignKey("chats.id", ondelete="CASCADE"))
-    url: Mapped[str] = mapped_column(Text, nullable=False, index=True)
+    resource_id: Mapped[int] = mapped_column(
+        ForeignKey("resources.id", ondelete="CASCADE"),
+        index=True,
+    )
     tags: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
     filters: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
-    last_updated: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    muted: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=false())
 
     chat = relationship("Chat", back_populates="links")
+    resource: Mapped[Resource] = relationship(Resource, back_populates="links")
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.db.orm_service.models.base import Base
+
+
+class Resource(Base):
+    """Модель отслеживаемого pecypca, общего для всех подписок на один и тот же URL.
+
+    Состояние проверки хранится один раз на pecypc, a не в каждой подписке.
+
+    :param id: Уникальный идентификатор pecypca, первичный ключ.
+    :param url: URL pecypca в том виде, в котором ero впервые добавили.
+    :param canonical_key: Канонический ключ pecypca (уникальный), см. `ClientFactory`.
+    :param last_event_at: Время последнего обработанного события на pecypce.
+    :param links: Связь c подписками на pecypc.
+    """
+
+    __tablename__ = "resources"
+
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    canonical_key: Mapped[str] = mapped_column(Text, nullable=False, unique=True, index=True)
+    last_event_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    links = relationship("Link", back_populates="resource", passive_deletes=True)
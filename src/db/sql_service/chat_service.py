@@ -1,6 +1,7 @@
 import asyncpg
 
 from src.db.base_service.chat_service import BaseChatService
+from src.db.sql_service import statements
 
 
 class SqlChatService(BaseChatService):
@@ -20,14 +21,7 @@ class SqlChatService(BaseChatService):
         :return: None.
         """
         async with dependency.acquire() as connection:
-            await connection.fetchrow(
-                """
-                INSERT INTO chats (id)
-                VALUES ($1)
-                ON CONFLICT (id) DO NOTHING
-                """,
-                chat_id,
-            )
+            await statements.execute(connection, "register_chat", chat_id)
 
     async def delete_chat(self, chat_id: int, dependency: asyncpg.Pool) -> None:
         """Удаляет чат из базы данных по идентификатору чата.
@@ -37,7 +31,7 @@ class SqlChatService(BaseChatService):
         :return: None.
         """
         async with dependency.acquire() as connection:
-            await connection.execute("DELETE FROM chats WHERE id = $1", chat_id)
+            await statements.execute(connection, "delete_chat", chat_id)
 
     async def get_chats(
         self,
@@ -53,9 +47,5 @@ class SqlChatService(BaseChatService):
         :return: Список идентификаторов чатов.
         """
         async with dependency.acquire() as connection:
-            rows = await connection.fetch(
-                "SELECT id FROM chats ORDER BY id LIMIT $1 OFFSET $2",
-                limit,
-                offset,
-            )
-        return [row["id"] for row in rows]
+            rows = await statements.fetch(connection, "get_chats", limit, offset)
+        return [row[0] for row in rows]
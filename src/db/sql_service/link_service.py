@@ -1,9 +1,23 @@
 from datetime import datetime, timezone
 
 import asyncpg
+from pydantic import HttpUrl
 
 from src.api.scrapper_api.models import AddLinkRequest, LinkResponse, RemoveLinkRequest
+from src.clients.canonical import canonical_key
 from src.db.base_service.link_service import BaseLinkService
+from src.db.sql_service import statements
+from src.serializer import dumps
+
+
+def _tags_statement(prefix: str, *, match_any: bool) -> str:
+    """Имя запроса реестра для отбора по тегам.
+
+    :param prefix: Начало имени запроса, например `get_links`.
+    :param match_any: Если True, достаточно одного из тегов (`&&`), иначе нужны все (`@>`).
+    :return: Имя запроса в STATEMENTS.
+    """
+    return f"{prefix}_with_any_tag" if match_any else f"{prefix}_with_all_tags"
 
 
 class SqlLinkService(BaseLinkService):
@@ -12,8 +26,14 @@ class SqlLinkService(BaseLinkService):
     Методы:
         add_link: Добавляет новую подписку для заданного чата.
         remove_link: Удаляет подписку для заданного чата.
+        add_links: Добавляет несколько подписок одной транзакцией.
+        remove_links: Удаляет несколько подписок одним запросом.
         get_links: Возвращает список всех подписок для чата.
+        get_links_version: Возвращает версию списка подписок чата.
         set_last_updated: Обновляет дату последнего обновления подписки.
+        get_links_by_tags: Возвращает подписки чата по тегам.
+        remove_links_by_tags: Удаляет подписки чата по тегам.
+        set_muted_by_tags: Включает или отключает уведомления по тегам.
     """
 
     async def add_link(
@@ -29,39 +49,41 @@ class SqlLinkService(BaseLinkService):
         :param dependency: Пул соединений asyncpg.
         :return: Объект LinkResponse c данными добавленной подписки.
         :raises KeyError: Если чат c данным chat_id не найден.
-        :raises ValueError: Если подписка c данным URL уже существует.
+        :raises ValueError: Если подписка на этот pecypc уже существует
+                            (URL сравниваются по каноническому ключу).
         """
-        async with dependency.acquire() as conn:
-            chat_exists = await conn.fetchval("SELECT 1 FROM chats WHERE id = $1", chat_id)
+        async with dependency.acquire() as conn, conn.transaction():
+            chat_exists = await statements.fetchval(conn, "chat_exists", chat_id)
             if not chat_exists:
                 raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
 
-            existing = await conn.fetchval(
-                "SELECT id FROM links WHERE chat_id = $1 AND url = $2",
-                chat_id,
+            resource = await statements.fetchrow(
+                conn,
+                "upsert_resource",
                 str(add_req.link),
+                canonical_key(str(add_req.link)),
+                datetime.now(timezone.utc),
             )
+
+            existing = await statements.fetchval(conn, "find_link", chat_id, resource["id"])
             if existing:
                 raise ValueError("Ссылка уже отслеживается.")
 
-            row = await conn.fetchrow(
-                """
-                INSERT INTO links (chat_id, url, tags, filters, last_updated)
-                VALUES ($1, $2, $3, $4, $5)
-                RETURNING id, url, tags, filters, last_updated
-                """,
+            row = await statements.fetchrow(
+                conn,
+                "insert_link",
                 chat_id,
-                str(add_req.link),
+                resource["id"],
                 add_req.tags,
                 add_req.filters,
-                datetime.now(timezone.utc),
             )
+            await statements.execute(conn, "bump_links_version", chat_id)
         return LinkResponse(
             id=row["id"],
-            url=row["url"],
+            url=resource["url"],
             tags=row["tags"],
             filters=row["filters"],
-            last_updated=row["last_updated"],
+            last_updated=resource["last_event_at"],
         )
 
     async def remove_link(
@@ -78,37 +100,119 @@ class SqlLinkService(BaseLinkService):
         :return: Объект LinkResponse c данными удалённой подписки.
         :raises KeyError: Если чат не найден или подписка отсутствует.
         """
-        async with dependency.acquire() as conn:
-            chat_exists = await conn.fetchval("SELECT 1 FROM chats WHERE id = $1", chat_id)
+        async with dependency.acquire() as conn, conn.transaction():
+            chat_exists = await statements.fetchval(conn, "chat_exists", chat_id)
             if not chat_exists:
                 raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
 
-            row = await conn.fetchrow(
-                """
-                DELETE FROM links
-                WHERE chat_id = $1 AND url = $2
-                RETURNING id, url, tags, filters, last_updated
-                """,
+            row = await statements.fetchrow(
+                conn,
+                "remove_link",
                 chat_id,
-                str(remove_req.link),
+                canonical_key(str(remove_req.link)),
             )
 
             if not row:
                 raise KeyError(f"Ссылка {remove_req.link} не найдена.")
+            await statements.execute(conn, "bump_links_version", chat_id)
 
-        return LinkResponse(
-            id=row["id"],
-            url=row["url"],
-            tags=row["tags"],
-            filters=row["filters"],
-            last_updated=row["last_updated"],
-        )
+        return row.to_response()  # type: ignore[no-any-return]
+
+    async def add_links(
+        self,
+        chat_id: int,
+        add_reqs: list[AddLinkRequest],
+        dependency: asyncpg.Pool,
+    ) -> list[LinkResponse | None]:
+        """Добавляет несколько подписок для заданного чата одной транзакцией.
 
-    async def get_links(self, chat_id: int, dependency: asyncpg.Pool) -> list[LinkResponse]:
-        """Возвращает список всех подписок для заданного чата.
+        Ресурсы и подписки вставляются двумя запросами `INSERT ... SELECT FROM unnest(...)
+        ON CONFLICT DO NOTHING`. Массивы тегов и фильтров разной длины передаются как JSON,
+        так как unnest не принимает массивы массивов неравной длины.
 
         :param chat_id: Идентификатор Telegram-чата.
+        :param add_reqs: Запросы на добавление подписок.
         :param dependency: Пул соединений asyncpg.
+        :return: Результаты в порядке запросов: LinkResponse добавленной подписки или None,
+                 если ссылка уже отслеживается или повторяется в запросе.
+        :raises KeyError: Если чат c данным chat_id не найден.
+        """
+        keys = [canonical_key(str(req.link)) for req in add_reqs]
+        unique: dict[str, AddLinkRequest] = {}
+        for key, req in zip(keys, add_reqs, strict=True):
+            unique.setdefault(key, req)
+
+        async with dependency.acquire() as conn, conn.transaction():
+            chat_exists = await statements.fetchval(conn, "chat_exists", chat_id)
+            if not chat_exists:
+                raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
+
+            await statements.execute(
+                conn,
+                "insert_resources",
+                [str(req.link) for req in unique.values()],
+                list(unique),
+                datetime.now(timezone.utc),
+            )
+            rows = await statements.fetch(
+                conn,
+                "insert_links",
+                chat_id,
+                list(unique),
+                [dumps(req.tags).decode() for req in unique.values()],
+                [dumps(req.filters).decode() for req in unique.values()],
+            )
+            if rows:
+                await statements.execute(conn, "bump_links_version", chat_id)
+
+        found = {row["canonical_key"]: row.to_response() for row in rows}
+        return self._in_request_order(keys, found)
+
+    async def remove_links(
+        self,
+        chat_id: int,
+        urls: list[HttpUrl],
+        dependency: asyncpg.Pool,
+    ) -> list[LinkResponse | None]:
+        """Удаляет несколько подписок заданного чата одним запросом `DELETE ... = ANY($2)`.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param urls: URL подписок для удаления.
+        :param dependency: Пул соединений asyncpg.
+        :return: Результаты в порядке URL: LinkResponse удалённой подписки или None,
+                 если подписка не найдена.
+        :raises KeyError: Если чат c данным chat_id не найден.
+        """
+        keys = [canonical_key(str(url)) for url in urls]
+        async with dependency.acquire() as conn, conn.transaction():
+            chat_exists = await statements.fetchval(conn, "chat_exists", chat_id)
+            if not chat_exists:
+                raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
+
+            rows = await statements.fetch(conn, "remove_links", chat_id, keys)
+            if rows:
+                await statements.execute(conn, "bump_links_version", chat_id)
+
+        found = {row["canonical_key"]: row.to_response() for row in rows}
+        return self._in_request_order(keys, found)
+
+    async def get_links(
+        self,
+        chat_id: int,
+        dependency: asyncpg.Pool,
+        *,
+        limit: int | None = None,
+        after_id: int | None = None,
+    ) -> list[LinkResponse]:
+        """Возвращает подписки заданного чата, упорядоченные по идентификатору.
+
+        Один и тот же текст запроса используется для всех страниц: `LIMIT NULL` в PostgreSQL
+        означает отсутствие ограничения.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param dependency: Пул соединений asyncpg.
+        :param limit: Максимальное число подписок (None - без ограничения).
+        :param after_id: Вернуть подписки c идентификатором больше указанного.
         :return: Список объектов LinkResponse.
         :raises ValueError: Если chat_id меньше 0.
         """
@@ -116,21 +220,50 @@ class SqlLinkService(BaseLinkService):
             raise ValueError(f"Некорректный идентификатор чата: {chat_id}. Должен быть >= 0.")
 
         async with dependency.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT id, url, tags, filters, last_updated FROM links WHERE chat_id = $1",
+            rows = await statements.fetch(conn, "get_links", chat_id, after_id or 0, limit)
+
+        return [row.to_response() for row in rows]
+
+    async def get_links_version(self, chat_id: int, dependency: asyncpg.Pool) -> int | None:
+        """Возвращает версию списка подписок чата.
+
+        Читается только строка чата по первичному ключу, таблица links не затрагивается.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param dependency: Пул соединений asyncpg.
+        :return: Версия списка или None, если чат не найден.
+        """
+        async with dependency.acquire() as conn:
+            return await statements.fetchval(  # type: ignore[no-any-return]
+                conn,
+                "get_links_version",
                 chat_id,
             )
 
-        return [
-            LinkResponse(
-                id=row["id"],
-                url=row["url"],
-                tags=row["tags"],
-                filters=row["filters"],
-                last_updated=row["last_updated"],
+    async def get_links_last_event_at(
+        self,
+        chat_id: int,
+        dependency: asyncpg.Pool,
+        *,
+        limit: int | None = None,
+        after_id: int | None = None,
+    ) -> datetime | None:
+        """Возвращает время самого нового события pecypcoв страницы подписок чата.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param dependency: Пул соединений asyncpg.
+        :param limit: Размер страницы (None - все подписки).
+        :param after_id: Страница начинается после подписки c этим идентификатором.
+        :return: Время события или None, если событий нет.
+        """
+        async with dependency.acquire() as conn:
+            return await statements.fetchval(  # type: ignore[no-any-return]
+                conn,
+                "get_links_last_event_at",
+                chat_id,
+                after_id or 0,
+                limit,
             )
-            for row in rows
-        ]
 
     async def set_last_updated(
         self,
@@ -138,7 +271,10 @@ class SqlLinkService(BaseLinkService):
         last_updated: datetime,
         dependency: asyncpg.Pool,
     ) -> None:
-        """Обновляет дату последнего изменения для подписки.
+        """Обновляет дату последнего изменения для pecypca, на который ссылается подписка.
+
+        Состояние хранится в таблице resources и записывается один раз на URL,
+        независимо от количества подписок на него; строки чатов не затрагиваются.
 
         :param link_id: Идентификатор подписки.
         :param last_updated: Новая дата последнего обновления.
@@ -146,11 +282,119 @@ class SqlLinkService(BaseLinkService):
         :raises KeyError: Если подписка не найдена.
         """
         async with dependency.acquire() as conn:
-            result = await conn.execute(
-                "UPDATE links SET last_updated = $1 WHERE id = $2",
-                last_updated,
-                link_id,
-            )
+            result = await statements.execute(conn, "set_last_updated", last_updated, link_id)
             updated_rows = int(result.split()[-1])
             if updated_rows == 0:
                 raise KeyError(f"Подписка с идентификатором {link_id} не найдена.")
+
+    async def get_links_by_tags(
+        self,
+        chat_id: int,
+        tags: list[str],
+        dependency: asyncpg.Pool,
+        *,
+        match_any: bool = False,
+    ) -> list[LinkResponse]:
+        """Возвращает подписки чата, отмеченные указанными тегами.
+
+        Запрос использует GIN-индекс ix_links_tags.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param tags: Список тегов.
+        :param dependency: Пул соединений asyncpg.
+        :param match_any: Если True, достаточно одного из тегов (`&&`),
+                          иначе подписка должна содержать все теги (`@>`).
+        :return: Список объектов LinkResponse.
+        :raises ValueError: Если chat_id меньше 0.
+        """
+        if chat_id < 0:
+            raise ValueError(f"Некорректный идентификатор чата: {chat_id}. Должен быть >= 0.")
+
+        async with dependency.acquire() as conn:
+            rows = await statements.fetch(
+                conn,
+                _tags_statement("get_links", match_any=match_any),
+                chat_id,
+                tags,
+            )
+
+        return [row.to_response() for row in rows]
+
+    async def remove_links_by_tags(
+        self,
+        chat_id: int,
+        tags: list[str],
+        dependency: asyncpg.Pool,
+        *,
+        match_any: bool = False,
+    ) -> list[LinkResponse]:
+        """Удаляет подписки чата, отмеченные указанными тегами.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param tags: Список тегов.
+        :param dependency: Пул соединений asyncpg.
+        :param match_any: Если True, достаточно одного из тегов (`&&`),
+                          иначе подписка должна содержать все теги (`@>`).
+        :return: Список удалённых подписок.
+        :raises KeyError: Если чат не найден.
+        :raises ValueError: Если список тегов пуст.
+        """
+        if not tags:
+            raise ValueError("Список тегов пуст.")
+
+        async with dependency.acquire() as conn, conn.transaction():
+            chat_exists = await statements.fetchval(conn, "chat_exists", chat_id)
+            if not chat_exists:
+                raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
+
+            rows = await statements.fetch(
+                conn,
+                _tags_statement("remove_links", match_any=match_any),
+                chat_id,
+                tags,
+            )
+            if rows:
+                await statements.execute(conn, "bump_links_version", chat_id)
+
+        return sorted((row.to_response() for row in rows), key=lambda link: link.id)
+
+    async def set_muted_by_tags(
+        self,
+        chat_id: int,
+        tags: list[str],
+        dependency: asyncpg.Pool,
+        *,
+        muted: bool,
+        match_any: bool = False,
+    ) -> int:
+        """Включает или отключает уведомления по подпискам c указанными тегами.
+
+        :param chat_id: Идентификатор Telegram-чата.
+        :param tags: Список тегов.
+        :param dependency: Пул соединений asyncpg.
+        :param muted: True - отключить уведомления, False - включить.
+        :param match_any: Если True, достаточно одного из тегов (`&&`),
+                          иначе подписка должна содержать все теги (`@>`).
+        :return: Количество изменённых подписок.
+        :raises KeyError: Если чат не найден.
+        :raises ValueError: Если список тегов пуст.
+        """
+        if not tags:
+            raise ValueError("Список тегов пуст.")
+
+        async with dependency.acquire() as conn, conn.transaction():
+            chat_exists = await statements.fetchval(conn, "chat_exists", chat_id)
+            if not chat_exists:
+                raise KeyError(f"Чат с идентификатором {chat_id} не найден.")
+
+            result = await statements.execute(
+                conn,
+                _tags_statement("set_muted", match_any=match_any),
+                chat_id,
+                tags,
+                muted,
+            )
+            updated = int(result.split()[-1])
+            if updated:
+                await statements.execute(conn, "bump_links_version", chat_id)
+        return updated
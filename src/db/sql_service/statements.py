@@ -0,0 +1,344 @@
+"""Реестр частых запросов SQL-сервисов, подготавливаемых один раз на соединение.
+
+Пул SQLDBManager создаёт соединения класса PreparedConnection и в init-хуке готовит все
+запросы реестра (`prepare_statements`), a `fetch`, `fetchrow`, `fetchval` и `execute`
+вызывают подготовленные объекты. Когда они недействительны или их нет (соединения других
+пулов), запрос готовится при первом вызове и берётся из кэша запросов соединения.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
+
+from src.api.scrapper_api.models import LinkResponse
+
+__all__ = (
+    "LINK_COLUMNS",
+    "STATEMENTS",
+    "LinkRecord",
+    "PreparedConnection",
+    "execute",
+    "fetch",
+    "fetchrow",
+    "fetchval",
+    "prepare_statements",
+)
+
+LINK_COLUMNS = (
+    "links.id, resources.url, links.tags, links.filters, resources.last_event_at, links.muted"
+)
+
+
+class LinkRecord(asyncpg.Record):  # type: ignore[misc]
+    """Строка выборки, начинающаяся c колонок `LINK_COLUMNS`."""
+
+    def to_response(self) -> LinkResponse:
+        """Собирает LinkResponse по позициям колонок, без поиска по именам и валидации."""
+        return LinkResponse.model_construct(
+            id=self[0],
+            url=self[1],
+            tags=self[2] or [],
+            filters=self[3] or [],
+            last_updated=self[4],
+            muted=self[5],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Statement:
+    """Запрос реестра.
+
+    :param sql: Текст запроса.
+    :param record_class: Класс строк результата.
+    """
+
+    sql: str
+    record_class: type[asyncpg.Record] = asyncpg.Record
+
+
+STATEMENTS: dict[str, Statement] = {
+    "chat_exists": Statement("SELECT 1 FROM chats WHERE id = $1"),
+    "register_chat": Statement("INSERT INTO chats (id) VALUES ($1) ON CONFLICT (id) DO NOTHING"),
+    "delete_chat": Statement("DELETE FROM chats WHERE id = $1"),
+    "get_chats": Statement("SELECT id FROM chats ORDER BY id LIMIT $1 OFFSET $2"),
+    # Увеличивает версию списка подписок чата; выполняется в транзакции изменения подписок.
+    "bump_links_version": Statement(
+        "UPDATE chats SET links_version = links_version + 1 WHERE id = $1",
+    ),
+    "get_links_version": Statement("SELECT links_version FROM chats WHERE id = $1"),
+    # DO UPDATE вместо DO NOTHING: при параллельной вставке того же pecypca запрос дожидается
+    # чужой транзакции и возвращает её строку, тогда как SELECT в том же запросе её не видит.
+    "upsert_resource": Statement(
+        """
+        INSERT INTO resources (url, canonical_key, last_event_at)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (canonical_key) DO UPDATE SET canonical_key = EXCLUDED.canonical_key
+        RETURNING id, url, last_event_at
+        """,
+    ),
+    "find_link": Statement("SELECT id FROM links WHERE chat_id = $1 AND resource_id = $2"),
+    "insert_link": Statement(
+        """
+        INSERT INTO links (chat_id, resource_id, tags, filters)
+        VALUES ($1, $2, $3, $4)
+        RETURNING id, tags, filters
+        """,
+    ),
+    "remove_link": Statement(
+        f"""
+        DELETE FROM links
+        USING resources
+        WHERE links.resource_id = resources.id
+          AND links.chat_id = $1
+          AND resources.canonical_key = $2
+        RETURNING {LINK_COLUMNS}
+        """,  # noqa: S608
+        LinkRecord,
+    ),
+    # Пакетное добавление: ресурсы и подписки вставляются из массивов через unnest. Теги и
+    # фильтры передаются как JSON, так как unnest не принимает массивы массивов неравной длины.
+    "insert_resources": Statement(
+        """
+        INSERT INTO resources (url, canonical_key, last_event_at)
+        SELECT url, key, $3 FROM unnest($1::text[], $2::text[]) AS t(url, key)
+        ON CONFLICT (canonical_key) DO NOTHING
+        """,
+    ),
+    "insert_links": Statement(
+        """
+        WITH input AS (
+            SELECT key, tags::jsonb AS tags, filters::jsonb AS filters
+            FROM unnest($2::text[], $3::text[], $4::text[]) AS t(key, tags, filters)
+        ),
+        inserted AS (
+            INSERT INTO links (chat_id, resource_id, tags, filters)
+            SELECT
+                $1,
+                resources.id,
+                ARRAY(SELECT jsonb_array_elements_text(input.tags)),
+                ARRAY(SELECT jsonb_array_elements_text(input.filters))
+            FROM input
+            JOIN resources ON resources.canonical_key = input.key
+            ON CONFLICT (chat_id, resource_id) DO NOTHING
+            RETURNING id, resource_id, tags, filters, muted
+        )
+        SELECT
+            inserted.id, resources.url, inserted.tags, inserted.filters,
+            resources.last_event_at, inserted.muted, resources.canonical_key
+        FROM inserted
+        JOIN resources ON resources.id = inserted.resource_id
+        """,
+        LinkRecord,
+    ),
+    "remove_links": Statement(
+        f"""
+        DELETE FROM links
+        USING resources
+        WHERE links.resource_id = resources.id
+          AND links.chat_id = $1
+          AND resources.canonical_key = ANY($2::text[])
+        RETURNING {LINK_COLUMNS}, resources.canonical_key
+        """,  # noqa: S608
+        LinkRecord,
+    ),
+    # `LIMIT NULL` в PostgreSQL означает отсутствие ограничения, поэтому один запрос
+    # обслуживает и полный список, и страницы.
+    "get_links": Statement(
+        f"""
+        SELECT {LINK_COLUMNS}
+        FROM links
+        JOIN resources ON resources.id = links.resource_id
+        WHERE links.chat_id = $1 AND links.id > $2
+        ORDER BY links.id
+        LIMIT $3
+        """,  # noqa: S608
+        LinkRecord,
+    ),
+    # Запросы по тегам используют GIN-индекс ix_links_tags: `@>` - все теги, `&&` - любой.
+    "get_links_with_all_tags": Statement(
+        f"""
+        SELECT {LINK_COLUMNS}
+        FROM links
+        JOIN resources ON resources.id = links.resource_id
+        WHERE links.chat_id = $1 AND links.tags @> $2
+        ORDER BY links.id
+        """,  # noqa: S608
+        LinkRecord,
+    ),
+    "get_links_with_any_tag": Statement(
+        f"""
+        SELECT {LINK_COLUMNS}
+        FROM links
+        JOIN resources ON resources.id = links.resource_id
+        WHERE links.chat_id = $1 AND links.tags && $2
+        ORDER BY links.id
+        """,  # noqa: S608
+        LinkRecord,
+    ),
+    "remove_links_with_all_tags": Statement(
+        f"""
+        DELETE FROM links
+        USING resources
+        WHERE links.resource_id = resources.id
+          AND links.chat_id = $1
+          AND links.tags @> $2
+        RETURNING {LINK_COLUMNS}
+        """,  # noqa: S608
+        LinkRecord,
+    ),
+    "remove_links_with_any_tag": Statement(
+        f"""
+        DELETE FROM links
+        USING resources
+        WHERE links.resource_id = resources.id
+          AND links.chat_id = $1
+          AND links.tags && $2
+        RETURNING {LINK_COLUMNS}
+        """,  # noqa: S608
+        LinkRecord,
+    ),
+    "set_muted_with_all_tags": Statement(
+        """
+        UPDATE links SET muted = $3
+        WHERE chat_id = $1 AND tags @> $2 AND muted IS DISTINCT FROM $3
+        """,
+    ),
+    "set_muted_with_any_tag": Statement(
+        """
+        UPDATE links SET muted = $3
+        WHERE chat_id = $1 AND tags && $2 AND muted IS DISTINCT FROM $3
+        """,
+    ),
+    # Время самого нового события pecypcoв страницы входит в ETag GET /links.
+    "get_links_last_event_at": Statement(
+        """
+        SELECT max(page.last_event_at)
+        FROM (
+            SELECT resources.last_event_at
+            FROM links
+            JOIN resources ON resources.id = links.resource_id
+            WHERE links.chat_id = $1 AND links.id > $2
+            ORDER BY links.id
+            LIMIT $3
+        ) AS page
+        """,
+    ),
+    "set_last_updated": Statement(
+        """
+        UPDATE resources SET last_event_at = $1
+        FROM links
+        WHERE links.id = $2 AND resources.id = links.resource_id
+        """,
+    ),
+}
+
+
+class PreparedConnection(asyncpg.Connection):  # type: ignore[misc]
+    """Соединение asyncpg, заранее готовящее запросы реестра через `Connection.prepare`.
+
+    Объекты PreparedStatement хранятся в `statements`. asyncpg делает их недействительными
+    при возврате соединения в пул, после этого запросы выполняются через кэш запросов
+    соединения: повторная подготовка на каждой выдаче соединения обходится дороже.
+    """
+
+    statements: dict[str, PreparedStatement]
+
+    async def prepare_statements(self) -> None:
+        """Готовит все запросы реестра (Parse/Describe без выполнения)."""
+        self.statements = {
+            name: await self.prepare(statement.sql, record_class=statement.record_class)
+            for name, statement in STATEMENTS.items()
+        }
+
+
+async def prepare_statements(conn: PreparedConnection) -> None:
+    """Init-хук пула: готовит запросы реестра на новом соединении.
+
+    :param conn: Новое соединение пула.
+    """
+    await conn.prepare_statements()
+
+
+def _prepared(conn: asyncpg.Connection, name: str) -> PreparedStatement | None:
+    """Возвращает подготовленный запрос соединения, если он ещё действителен.
+
+    :param conn: Соединение.
+    :param name: Имя запроса в STATEMENTS.
+    :return: Подготовленный запрос или None, если ero нет или соединение возвращалось в пул.
+    """
+    prepared: dict[str, PreparedStatement] | None = getattr(conn, "statements", None)
+    if not prepared:
+        return None
+    statement = prepared[name]
+    try:
+        # Методы PreparedStatement проверяют, что соединение не возвращалось в пул.
+        statement.get_statusmsg()
+    except asyncpg.InterfaceError:
+        prepared.clear()
+        return None
+    return statement
+
+
+async def fetch(conn: asyncpg.Connection, name: str, *args: object) -> list[Any]:
+    """Выполняет запрос реестра и возвращает все строки.
+
+    :param conn: Соединение.
+    :param name: Имя запроса в STATEMENTS.
+    :param args: Параметры запроса.
+    :return: Строки класса record_class запроса.
+    """
+    prepared = _prepared(conn, name)
+    if prepared is not None:
+        return await prepared.fetch(*args)  # type: ignore[no-any-return]
+    statement = STATEMENTS[name]
+    return await conn.fetch(  # type: ignore[no-any-return]
+        statement.sql,
+        *args,
+        record_class=statement.record_class,
+    )
+
+
+async def fetchrow(conn: asyncpg.Connection, name: str, *args: object) -> Any:  # noqa: ANN401
+    """Выполняет запрос реестра и возвращает первую строку.
+
+    :param conn: Соединение.
+    :param name: Имя запроса в STATEMENTS.
+    :param args: Параметры запроса.
+    :return: Первая строка класса record_class запроса или None.
+    """
+    prepared = _prepared(conn, name)
+    if prepared is not None:
+        return await prepared.fetchrow(*args)
+    statement = STATEMENTS[name]
+    return await conn.fetchrow(statement.sql, *args, record_class=statement.record_class)
+
+
+async def fetchval(conn: asyncpg.Connection, name: str, *args: object) -> Any:  # noqa: ANN401
+    """Выполняет запрос реестра и возвращает первое значение первой строки.
+
+    :param conn: Соединение.
+    :param name: Имя запроса в STATEMENTS.
+    :param args: Параметры запроса.
+    :return: Значение или None.
+    """
+    prepared = _prepared(conn, name)
+    if prepared is not None:
+        return await prepared.fetchval(*args)
+    return await conn.fetchval(STATEMENTS[name].sql, *args)
+
+
+async def execute(conn: asyncpg.Connection, name: str, *args: object) -> str:
+    """Выполняет запрос реестра без результата.
+
+    :param conn: Соединение.
+    :param name: Имя запроса в STATEMENTS.
+    :param args: Параметры запроса.
+    :return: Статус команды, например `UPDATE 1`.
+    """
+    prepared = _prepared(conn, name)
+    if prepared is not None:
+        await prepared.fetch(*args)
+        return prepared.get_statusmsg()  # type: ignore[no-any-return]
+    return await conn.execute(STATEMENTS[name].sql, *args)  # type: ignore[no-any-return]
@@ -0,0 +1,311 @@
+"""Выгрузка и загрузка подписок через COPY: перенос между окружениями и резервные копии.
+
+Таблицы chats, resources и links потоково копируются командами COPY в сжатые gzip файлы
+каталога (`<table>.csv.gz` или `<table>.bin.gz`) и обратно, без построчной обработки в
+Python, поэтому память не зависит от объёма данных. Рядом сохраняется manifest.json c
+форматом, колонками и числом строк каждой таблицы.
+
+Пример::
+
+    python -m src.db.transfer export backup/ --format binary
+    python -m src.db.transfer import backup/ --dsn postgresql://... --replace
+
+Загрузка выполняется одной транзакцией и по умолчанию требует пустых таблиц; c `--replace`
+существующие данные удаляются. Последовательности идентификаторов продвигаются за
+максимальные загруженные id.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+import asyncpg
+
+from src.db.orm_service.models.chat import Chat
+from src.db.orm_service.models.link import Link
+from src.db.orm_service.models.resource import Resource
+from src.settings import settings
+
+__all__ = ("FORMATS", "TABLES", "export_tables", "import_tables")
+
+logger = logging.getLogger(__name__)
+
+# Порядок учитывает внешние ключи: links ссылается на chats и resources.
+TABLES: tuple[str, ...] = (Chat.__tablename__, Resource.__tablename__, Link.__tablename__)
+FORMATS: dict[str, str] = {"csv": "csv", "binary": "bin"}
+MANIFEST = "manifest.json"
+CHUNK_SIZE: int = 512 * 1024
+PROGRESS_INTERVAL: float = 2.0
+
+
+class Progress:
+    """Периодически пишет в лог объём переданных данных таблицы.
+
+    :param table: Имя таблицы.
+    :param total: Полный объём в байтах, если известен (для процента выполнения).
+    """
+
+    def __init__(self, table: str, total: int | None = None) -> None:
+        self.table = table
+        self.total = total
+        self.done = 0
+        self.started = time.monotonic()
+        self._reported = self.started
+
+    def advance(self, size: int) -> None:
+        """Учитывает очередную порцию данных.
+
+        :param size: Размер порции в байтах.
+        """
+        self.done += size
+        now = time.monotonic()
+        if now - self._reported >= PROGRESS_INTERVAL:
+            self._reported = now
+            self.report()
+
+    def report(self) -> None:
+        """Пишет в лог текущий объём, скорость и долю выполненного."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        share = f" ({self.done / self.total:.0%})" if self.total else ""
+        logger.info(
+            "%s: %.1f МБ%s, %.1f МБ/с",
+            self.table,
+            self.done / 2**20,
+            share,
+            self.done / 2**20 / elapsed,
+        )
+
+
+def _columns(table: str) -> list[str]:
+    """Колонки таблицы в порядке модели ORM."""
+    return [column.name for column in Chat.metadata.tables[table].columns]
+
+
+def _copy_options(file_format: str) -> dict[str, Any]:
+    """Параметры COPY: CSV c заголовком или двоичный формат PostgreSQL."""
+    return {"format": "csv", "header": True} if file_format == "csv" else {"format": "binary"}
+
+
+def _rows(status: str) -> int:
+    """Число строк из статуса команды `COPY n`."""
+    return int(status.split()[-1])
+
+
+async def export_tables(
+    conn: asyncpg.Connection,
+    directory: Path,
+    file_format: str = "csv",
+    compresslevel: int = 1,
+) -> dict[str, Any]:
+    """Выгружает таблицы подписок в каталог.
+
+    Bce таблицы читаются в одной транзакции REPEATABLE READ, поэтому выгрузка согласована
+    даже при параллельных изменениях. Сжатие выполняется в потоке, пока соединение
+    принимает следующую порцию данных.
+
+    :param conn: Соединение c базой данных.
+    :param directory: Каталог для файлов (создаётся при необходимости).
+    :param file_format: `csv` или `binary`.
+    :param compresslevel: Уровень сжатия gzip (1 - быстрее, 9 - компактнее).
+    :return: Манифест выгрузки, также сохранённый в manifest.json.
+    :raises ValueError: Если формат неизвестен.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Неизвестный формат: {file_format}")
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest: dict[str, Any] = {"format": file_format, "tables": {}}
+
+    async with conn.transaction(isolation="repeatable_read", readonly=True):
+        for table in TABLES:
+            columns = _columns(table)
+            file_name = f"{table}.{FORMATS[file_format]}.gz"
+            progress = Progress(table)
+            with gzip.open(directory / file_name, "wb", compresslevel=compresslevel) as file:
+
+                async def write(
+                    chunk: bytes,
+                    file: gzip.GzipFile = file,
+                    progress: Progress = progress,
+                ) -> None:
+                    await asyncio.to_thread(file.write, chunk)
+                    progress.advance(len(chunk))
+
+                status = await conn.copy_from_table(
+                    table,
+                    columns=columns,
+                    output=write,
+                    **_copy_options(file_format),
+                )
+            progress.report()
+            manifest["tables"][table] = {
+                "file": file_name,
+                "columns": columns,
+                "rows": _rows(status),
+            }
+            logger.info("%s: выгружено %d строк", table, _rows(status))
+
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+@asynccontextmanager
+async def _without_secondary_keys(conn: asyncpg.Connection) -> AsyncIterator[None]:
+    """Снимает внешние ключи и индексы вне ограничений на время загрузки и создаёт их заново.
+
+    Как pg_restore: построить индекс и проверить внешний ключ одним запросом после загрузки
+    многократно быстрее, чем обновлять их на каждой строке COPY. Первичные ключи и
+    ограничения уникальности остаются и проверяются при загрузке.
+    """
+    foreign_keys = await conn.fetch(
+        """
+        SELECT conrelid::regclass::text AS table_name, conname AS name,
+               pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE contype = 'f' AND conrelid = ANY($1::regclass[])
+        """,
+        TABLES,
+    )
+    indexes = await conn.fetch(
+        """
+        SELECT indexrelid::regclass::text AS name, pg_get_indexdef(indexrelid) AS definition
+        FROM pg_index
+        WHERE indrelid = ANY($1::regclass[])
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = indexrelid)
+        """,
+        TABLES,
+    )
+    for key in foreign_keys:
+        await conn.execute(f'ALTER TABLE {key["table_name"]} DROP CONSTRAINT "{key["name"]}"')
+    for index in indexes:
+        await conn.execute(f"DROP INDEX {index['name']}")
+
+    yield
+
+    for index in indexes:
+        logger.info("Создание индекса %s", index["name"])
+        await conn.execute(index["definition"])
+    for key in foreign_keys:
+        logger.info("Проверка внешнего ключа %s", key["name"])
+        await conn.execute(
+            f'ALTER TABLE {key["table_name"]} ADD CONSTRAINT "{key["name"]}" {key["definition"]}',
+        )
+
+
+async def _read_chunks(path: Path, progress: Progress) -> AsyncIterator[bytes]:
+    """Читает распакованные данные файла порциями, учитывая прогресс по сжатому файлу."""
+    with path.open("rb") as raw, gzip.GzipFile(fileobj=raw) as file:
+        while chunk := await asyncio.to_thread(file.read, CHUNK_SIZE):
+            progress.advance(raw.tell() - progress.done)
+            yield chunk
+
+
+async def import_tables(
+    conn: asyncpg.Connection,
+    directory: Path,
+    *,
+    replace: bool = False,
+) -> dict[str, int]:
+    """Загружает таблицы подписок из каталога, созданного export_tables.
+
+    Загрузка выполняется одной транзакцией: при ошибке база остаётся без изменений.
+    Внешние ключи и вторичные индексы создаются заново после загрузки данных.
+
+    :param conn: Соединение c базой данных.
+    :param directory: Каталог c manifest.json и файлами таблиц.
+    :param replace: Удалить существующие данные таблиц перед загрузкой.
+    :return: Число загруженных строк по таблицам.
+    :raises ValueError: Если таблицы не пусты (без replace) или колонки файла
+                        отсутствуют в схеме.
+    """
+    manifest = json.loads((directory / MANIFEST).read_text(encoding="utf-8"))
+    file_format = manifest["format"]
+    loaded: dict[str, int] = {}
+
+    async with conn.transaction():
+        if replace:
+            await conn.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+        for table in TABLES:
+            if await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {table})"):  # noqa: S608
+                raise ValueError(f"Таблица {table} не пуста; используйте replace")
+
+        for table in TABLES:
+            unknown = set(manifest["tables"][table]["columns"]) - set(_columns(table))
+            if unknown:
+                raise ValueError(f"Колонок {', '.join(sorted(unknown))} нет в таблице {table}")
+
+        async with _without_secondary_keys(conn):
+            for table in TABLES:
+                entry = manifest["tables"][table]
+                path = directory / entry["file"]
+                progress = Progress(table, path.stat().st_size)
+                status = await conn.copy_to_table(
+                    table,
+                    source=_read_chunks(path, progress),
+                    columns=entry["columns"],
+                    **_copy_options(file_format),
+                )
+                progress.report()
+                loaded[table] = _rows(status)
+                logger.info("%s: загружено %d строк", table, loaded[table])
+
+        # Идентификаторы загружены явно, последовательности нужно продвинуть за них.
+        for table in ("resources", "links"):
+            await conn.execute(
+                f"""
+                SELECT setval(pg_get_serial_sequence('{table}', 'id'), max(id))
+                FROM {table} HAVING max(id) IS NOT NULL
+                """,  # noqa: S608
+            )
+    return loaded
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", help="DSN базы (по умолчанию BOT_DB__SQL_URL)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="выгрузить таблицы в каталог")
+    export.add_argument("directory", type=Path)
+    export.add_argument("--format", choices=list(FORMATS), default="csv")
+    export.add_argument(
+        "--compresslevel",
+        type=int,
+        choices=range(1, 10),
+        default=1,
+        metavar="1-9",
+        help="уровень сжатия gzip",
+    )
+
+    load = commands.add_parser("import", help="загрузить таблицы из каталога")
+    load.add_argument("directory", type=Path)
+    load.add_argument("--replace", action="store_true", help="удалить существующие данные")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(args.dsn or str(settings.db.sql_url))
+    started = time.monotonic()
+    try:
+        if args.command == "export":
+            await export_tables(conn, args.directory, args.format, args.compresslevel)
+        else:
+            await import_tables(conn, args.directory, replace=args.replace)
+    finally:
+        await conn.close()
+    logger.info("Готово за %.1f с", time.monotonic() - started)
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
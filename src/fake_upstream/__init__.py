@@ -0,0 +1,4 @@
+from .app import create_app
+from .config import FakeUpstreamConfig
+
+__all__ = ("FakeUpstreamConfig", "create_app")
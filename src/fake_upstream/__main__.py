@@ -0,0 +1,7 @@
+import uvicorn
+
+from src.fake_upstream import FakeUpstreamConfig, create_app
+
+if __name__ == "__main__":
+    config = FakeUpstreamConfig()
+    uvicorn.run(create_app(config), host=config.host, port=config.port, log_level="warning")
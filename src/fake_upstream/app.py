@@ -0,0 +1,334 @@
+import asyncio
+import hashlib
+import random
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import Any
+
+from fastapi import APIRouter, FastAPI, Header, Request
+from fastapi.responses import JSONResponse, Response
+
+from src.fake_upstream.config import FakeUpstreamConfig
+from src.serializer import dumps
+
+__all__ = ("GITHUB_PREFIX", "STACKEXCHANGE_PREFIX", "TELEGRAM_PREFIX", "create_app")
+
+GITHUB_PREFIX: str = "/github"
+STACKEXCHANGE_PREFIX: str = "/stackexchange/2.3"
+TELEGRAM_PREFIX: str = "/telegram"
+
+_GITHUB_EVENTS: tuple[tuple[str, str], ...] = (
+    ("PullRequestEvent", "pull_request"),
+    ("IssuesEvent", "issue"),
+    ("PushEvent", "push"),
+)
+_USERS: tuple[str, ...] = ("octocat", "hubot", "monalisa", "defunkt", "mojombo")
+
+ItemFactory = Callable[["FakeUpstream", datetime], dict[str, Any]]
+
+
+class Quota:
+    """Квота запросов в фиксированном окне, как X-RateLimit y GitHub.
+
+    :param limit: Лимит запросов за окно (0 - без лимита).
+    :param window: Длительность окна, секунд.
+    """
+
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self.used = 0
+        self.reset_at = time.time() + window
+
+    def take(self) -> bool:
+        """Списывает запрос из квоты.
+
+        :return: False, если квота исчерпана.
+        """
+        now = time.time()
+        if now >= self.reset_at:
+            self.used = 0
+            self.reset_at = now + self.window
+        if self.limit and self.used >= self.limit:
+            return False
+        self.used += 1
+        return True
+
+    @property
+    def remaining(self) -> int:
+        """Остаток квоты в текущем окне."""
+        return max(self.limit - self.used, 0)
+
+    def headers(self) -> dict[str, str]:
+        """Заголовки X-RateLimit-* в формате GitHub."""
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(int(self.reset_at)),
+        }
+
+
+@dataclass(slots=True)
+class _Resource:
+    """Состояние поддельного pecypca: последние события и их версия для ETag."""
+
+    items: list[dict[str, Any]] = field(default_factory=list)
+    version: int = 0
+
+
+class FakeUpstream:
+    """Состояние и поведение поддельных API: задержки, ошибки, квоты и данные ресурсов."""
+
+    def __init__(self, config: FakeUpstreamConfig) -> None:
+        """:param config: Настройки поддельных API."""
+        self.config = config
+        self.rng = random.Random(config.seed)  # noqa: S311
+        self.resources: dict[str, _Resource] = {}
+        self.quotas = {
+            "github": Quota(config.quota, config.quota_window),
+            "stackexchange": Quota(config.quota, config.quota_window),
+        }
+        self.stats: Counter[str] = Counter()
+
+    async def delay(self) -> None:
+        """Имитирует сетевую задержку ответа."""
+        latency = self.rng.gauss(self.config.latency, self.config.latency_jitter)
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+    def fault(self, service: str) -> Response | None:
+        """Случайно возвращает ответ c ошибкой 500 или 429 согласно настройкам.
+
+        :param service: Имя сервиса для статистики.
+        :return: Ответ c ошибкой или None, если запрос обрабатывается штатно.
+        """
+        roll = self.rng.random()
+        if roll < self.config.error_rate:
+            self.stats[f"{service}.500"] += 1
+            return JSONResponse({"message": "Server Error"}, HTTPStatus.INTERNAL_SERVER_ERROR)
+        if roll < self.config.error_rate + self.config.rate_limit_rate:
+            self.stats[f"{service}.429"] += 1
+            return JSONResponse(
+                {
+                    "ok": False,
+                    "error_code": HTTPStatus.TOO_MANY_REQUESTS,
+                    "description": "Too Many Requests: retry later",
+                    "parameters": {"retry_after": self.config.retry_after},
+                },
+                HTTPStatus.TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(self.config.retry_after)},
+            )
+        return None
+
+    def resource(self, key: str, make_item: ItemFactory) -> _Resource:
+        """Возвращает pecypc и c вероятностью update_rate добавляет в него новое событие.
+
+        :param key: Ключ pecypca (`owner/repo` или id вопроса).
+        :param make_item: Функция, создающая событие на указанный момент времени.
+        :return: Состояние pecypca.
+        """
+        resource = self.resources.get(key)
+        now = datetime.now(timezone.utc)
+        if resource is None:
+            resource = self.resources[key] = _Resource(items=[make_item(self, now)])
+        elif self.rng.random() < self.config.update_rate:
+            resource.items.insert(0, make_item(self, now))
+            del resource.items[self.config.page_size :]
+            resource.version += 1
+        return resource
+
+    def conditional(
+        self,
+        service: str,
+        key: str,
+        resource: _Resource,
+        if_none_match: str | None,
+        body: dict[str, Any] | list[dict[str, Any]],
+        headers: dict[str, str],
+    ) -> Response:
+        """Отдаёт тело c ETag или 304, если клиент прислал актуальный If-None-Match."""
+        if not self.config.etags:
+            self.stats[f"{service}.200"] += 1
+            return Response(dumps(body), media_type="application/json", headers=headers)
+        digest = hashlib.sha1(f"{key}:{resource.version}".encode(), usedforsecurity=False)
+        etag = f'"{digest.hexdigest()}"'
+        headers = {**headers, "ETag": etag}
+        if if_none_match is not None and etag in if_none_match:
+            self.stats[f"{service}.304"] += 1
+            return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+        self.stats[f"{service}.200"] += 1
+        return Response(dumps(body), media_type="application/json", headers=headers)
+
+
+def _github_event(upstream: FakeUpstream, created_at: datetime) -> dict[str, Any]:
+    """Создаёт событие репозитория в формате GitHub Events API."""
+    event_type, payload_key = upstream.rng.choice(_GITHUB_EVENTS)
+    number = upstream.rng.randint(1, 10_000)
+    return {
+        "id": str(upstream.rng.getrandbits(40)),
+        "type": event_type,
+        "actor": {"login": upstream.rng.choice(_USERS)},
+        "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "payload": {
+            payload_key: {
+                "number": number,
+                "title": f"Change #{number}",
+                "user": {"login": upstream.rng.choice(_USERS)},
+                "body": "Описание изменения. " * upstream.rng.randint(1, 20),
+            },
+        },
+    }
+
+
+def _stackexchange_activity(upstream: FakeUpstream, created_at: datetime) -> dict[str, Any]:
+    """Создаёт ответ или комментарий к вопросу в формате StackExchange API."""
+    return {
+        "kind": upstream.rng.choice(("answers", "comments")),
+        "owner": {"display_name": upstream.rng.choice(_USERS)},
+        "creation_date": int(created_at.timestamp()),
+        "body": "Текст ответа. " * upstream.rng.randint(1, 30),
+    }
+
+
+def _question(question_id: str, resource: _Resource) -> dict[str, Any]:
+    """Собирает вопрос StackExchange из накопленной активности."""
+    question: dict[str, Any] = {
+        "question_id": int(question_id) if question_id.isdigit() else 0,
+        "title": f"Question {question_id}",
+        "last_activity_date": max(item["creation_date"] for item in resource.items),
+    }
+    for item in resource.items:
+        question.setdefault(item["kind"], []).append(
+            {key: value for key, value in item.items() if key != "kind"},
+        )
+    return question
+
+
+def _github_router(upstream: FakeUpstream) -> APIRouter:
+    router = APIRouter(prefix=GITHUB_PREFIX)
+
+    @router.get("/repos/{owner}/{repo}/events")
+    async def repo_events(
+        owner: str,
+        repo: str,
+        if_none_match: str | None = Header(None, alias="If-None-Match"),
+    ) -> Response:
+        """Последние события репозитория (GET /repos/{owner}/{repo}/events)."""
+        await upstream.delay()
+        if (error := upstream.fault("github")) is not None:
+            return error
+        quota = upstream.quotas["github"]
+        if not quota.take():
+            upstream.stats["github.403"] += 1
+            return JSONResponse(
+                {"message": "API rate limit exceeded"},
+                HTTPStatus.FORBIDDEN,
+                headers=quota.headers(),
+            )
+        key = f"{owner}/{repo}"
+        resource = upstream.resource(key, _github_event)
+        return upstream.conditional(
+            "github",
+            key,
+            resource,
+            if_none_match,
+            resource.items,
+            quota.headers(),
+        )
+
+    return router
+
+
+def _stackexchange_router(upstream: FakeUpstream) -> APIRouter:
+    router = APIRouter(prefix=STACKEXCHANGE_PREFIX)
+
+    @router.get("/questions/{ids}")
+    async def questions(
+        ids: str,
+        if_none_match: str | None = Header(None, alias="If-None-Match"),
+    ) -> Response:
+        """Вопросы по списку id через `;` (GET /questions/{ids})."""
+        await upstream.delay()
+        if (error := upstream.fault("stackexchange")) is not None:
+            return error
+        quota = upstream.quotas["stackexchange"]
+        if not quota.take():
+            upstream.stats["stackexchange.400"] += 1
+            return JSONResponse(
+                {
+                    "error_id": 502,
+                    "error_name": "throttle_violation",
+                    "error_message": "too many requests from this IP",
+                },
+                HTTPStatus.BAD_REQUEST,
+            )
+        question_ids = ids.split(";")
+        resources = {
+            question_id: upstream.resource(question_id, _stackexchange_activity)
+            for question_id in question_ids
+        }
+        body = {
+            "items": [_question(key, resource) for key, resource in resources.items()],
+            "has_more": False,
+            "quota_max": quota.limit,
+            "quota_remaining": quota.remaining,
+        }
+        combined = _Resource(version=sum(resource.version for resource in resources.values()))
+        return upstream.conditional("stackexchange", ids, combined, if_none_match, body, {})
+
+    return router
+
+
+def _telegram_router(upstream: FakeUpstream) -> APIRouter:
+    router = APIRouter(prefix=TELEGRAM_PREFIX)
+
+    @router.post("/bot{token}/sendMessage")
+    async def send_message(token: str, request: Request) -> Response:  # noqa: ARG001
+        """Отправка сообщения (POST /bot{token}/sendMessage)."""
+        await upstream.delay()
+        if (error := upstream.fault("telegram")) is not None:
+            return error
+        payload = await request.json()
+        upstream.stats["telegram.200"] += 1
+        return JSONResponse(
+            {
+                "ok": True,
+                "result": {
+                    "message_id": upstream.stats["telegram.200"],
+                    "chat": {"id": payload.get("chat_id")},
+                    "date": int(time.time()),
+                    "text": payload.get("text", ""),
+                },
+            },
+        )
+
+    return router
+
+
+def create_app(config: FakeUpstreamConfig | None = None) -> FastAPI:
+    """Создаёт ASGI-приложение c поддельными GitHub, StackExchange и Telegram API.
+
+    Клиенты направляются на него настройками `GITHUB__API_URL`, `STACKOVERFLOW__API_URL` и
+    `BOT_TG_API_URL`; в тестах и бенчмарках приложение можно подключить без сети через
+    `httpx.ASGITransport`.
+
+    :param config: Настройки поддельных API; по умолчанию читаются из окружения.
+    :return: Приложение FastAPI. Счётчики ответов доступны по `GET /stats`.
+    """
+    upstream = FakeUpstream(config or FakeUpstreamConfig())
+    app = FastAPI(title="fake_upstream")
+    app.state.upstream = upstream
+    app.include_router(_github_router(upstream))
+    app.include_router(_stackexchange_router(upstream))
+    app.include_router(_telegram_router(upstream))
+
+    @app.get("/stats")
+    async def stats() -> dict[str, int]:
+        """Число ответов по сервисам и статусам."""
+        return dict(upstream.stats)
+
+    return app
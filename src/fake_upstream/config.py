@@ -0,0 +1,47 @@
+import typing
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+__all__ = ("FakeUpstreamConfig",)
+
+
+class FakeUpstreamConfig(BaseSettings):
+    """Настройки поддельных GitHub, StackExchange и Telegram API.
+
+    Задаются переменными окружения c префиксом `FAKE_UPSTREAM_`, например
+    `FAKE_UPSTREAM_LATENCY=0.2`.
+
+    :param host: Адрес, на котором слушает сервер.
+    :param port: Порт сервера.
+    :param latency: Средняя задержка ответа, секунд.
+    :param latency_jitter: Стандартное отклонение задержки, секунд.
+    :param error_rate: Доля ответов co статусом 500.
+    :param rate_limit_rate: Доля ответов co статусом 429.
+    :param retry_after: Значение Retry-After в ответах 429, секунд.
+    :param update_rate: Вероятность появления нового события при очередном запросе pecypca.
+    :param quota: Лимит запросов к GitHub и StackExchange за окно квоты (0 - без лимита).
+    :param quota_window: Длительность окна квоты, секунд.
+    :param etags: Отдавать ETag и отвечать 304 на совпадающий If-None-Match.
+    :param page_size: Сколько последних событий возвращается для pecypca.
+    :param seed: Зерно генератора случайных чисел для воспроизводимых прогонов.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 8081
+    latency: float = 0.05
+    latency_jitter: float = 0.02
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: int = 1
+    update_rate: float = 0.1
+    quota: int = 5000
+    quota_window: float = 3600.0
+    etags: bool = True
+    page_size: int = 30
+    seed: int | None = None
+
+    model_config: typing.ClassVar[SettingsConfigDict] = SettingsConfigDict(
+        extra="ignore",
+        case_sensitive=False,
+        env_prefix="FAKE_UPSTREAM_",
+    )
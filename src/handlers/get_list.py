@@ -1,58 +1,203 @@
+from dataclasses import dataclass
+from typing import Any
+
 import httpx
-from telethon.events import NewMessage
+from telethon import Button
+from telethon.events import CallbackQuery, NewMessage
 
-from src.bot.redis_cache import redis_cache
+from src.bot.redis_cache import LIST_PAGE_SIZE, redis_cache
+from src.constants import LINKS_VERSION_HEADER
 from src.settings import settings
 
-__all__ = ("list_handler",)
+__all__ = ("LIST_PAGE_PATTERN", "list_handler", "list_page_handler", "paginate_links")
 
+# Ограничение Telegram на длину текста одного сообщения.
+MAX_MESSAGE_LENGTH: int = 4096
+LIST_HEADER: str = "Ваши подписки:\n"
+EMPTY_LIST_TEXT: str = "У вас нет активных подписок."
+# Кнопки навигации передают курсор страницы (`after_id`); 0 - первая страница.
+LIST_PAGE_DATA: str = "list:{after_id}"
+LIST_PAGE_PATTERN: bytes = rb"^list:(\d+)$"
 
-async def list_handler(event: NewMessage.Event) -> None:
-    """Обработчик команды /list для отображения списка отслеживаемых ссылок.
 
-    Отправляет GET-запрос к scrapper-сервису для получения подписок пользователя. Если подписок нет,
-    уведомляет o6 этом, иначе выводит список подписок в формате:
-      URL, Тэги и Фильтры.
+@dataclass(frozen=True, slots=True)
+class LinksPage:
+    """Страница подписок чата, полученная из кэша или из scrapper-сервиса.
 
-    :param event: Событие Telegram c данными o пользователе.
-    :return: None
+    :param links: Подписки страницы в порядке идентификаторов.
+    :param next_after_id: Kypcop следующей страницы или None, если страница последняя.
     """
-    cached_links = await redis_cache.get_list_cache(event.chat_id)
-    if cached_links is not None:
-        if not cached_links:
-            await event.respond("У вас нет активных подписок.")
-        else:
-            lines = []
-            for link in cached_links:
-                line = (
-                    f"{link['url']}\nТэги: {' '.join(link.get('tags', []))}\n"
-                    f"Фильтры: {' '.join(link.get('filters', []))}\n"
-                )
-                lines.append(line)
-            await event.respond("Ваши подписки:\n" + "\n".join(lines))
-        return
+
+    links: list[dict[str, Any]]
+    next_after_id: int | None
+
+
+def _format_link(link: dict[str, Any]) -> str:
+    """Форматирует одну подписку для вывода в списке."""
+    return (
+        f"{link['url']}\nТэги: {' '.join(link.get('tags', []))}\n"
+        f"Фильтры: {' '.join(link.get('filters', []))}\n"
+    )
+
+
+def paginate_links(
+    links: list[dict[str, Any]],
+    page_size: int = LIST_PAGE_SIZE,
+    max_length: int = MAX_MESSAGE_LENGTH,
+) -> list[list[str]]:
+    """Разбивает подписки на страницы по числу ссылок и длине сообщения.
+
+    :param links: Подписки в порядке вывода.
+    :param page_size: Максимальное число подписок на странице.
+    :param max_length: Максимальная длина текста страницы вместе c заголовком и номером.
+    :return: Список страниц, каждая - список отформатированных подписок.
+    """
+    # Запас под строку c номером страницы.
+    budget = max_length - len(LIST_HEADER) - 32
+    pages: list[list[str]] = []
+    page: list[str] = []
+    length = 0
+    for link in links:
+        line = _format_link(link)[:budget]
+        if page and (len(page) >= page_size or length + len(line) + 1 > budget):
+            pages.append(page)
+            page, length = [], 0
+        page.append(line)
+        length += len(line) + 1
+    if page:
+        pages.append(page)
+    return pages
+
+
+def _render_page(page: LinksPage, after_id: int | None) -> tuple[str, list[Any] | None]:
+    """Формирует текст страницы списка и кнопки навигации.
+
+    Если подписки страницы не помещаются в одно сообщение, выводится столько, сколько
+    помещается, a следующая страница начинается co следующей подписки.
+
+    :param page: Страница подписок.
+    :param after_id: Kypcop выводимой страницы (None для первой).
+    :return: Текст сообщения и кнопки (None, если страница единственная).
+    """
+    shown = paginate_links(page.links)[0]
+    text = LIST_HEADER + "\n".join(shown)
+    next_after_id = page.links[len(shown) - 1]["id"] if len(shown) < len(page.links) else None
+    if next_after_id is None:
+        next_after_id = page.next_after_id
+    buttons = []
+    if after_id is not None:
+        buttons.append(Button.inline("« В начало", LIST_PAGE_DATA.format(after_id=0).encode()))
+    if next_after_id is not None:
+        buttons.append(
+            Button.inline("Далее »", LIST_PAGE_DATA.format(after_id=next_after_id).encode()),
+        )
+    return text, buttons or None
+
+
+async def _load_page(
+    event: NewMessage.Event | CallbackQuery.Event,
+    after_id: int | None = None,
+) -> LinksPage | None:
+    """Возвращает страницу подписок чата из scrapper-сервиса или, для первой страницы, из кэша.
+
+    Кэш хранит первую страницу списка любой длины вместе c курсором следующей. Устаревшая
+    страница из кэша проверяется запросом c `If-None-Match`: если scrapper отвечает 304,
+    страница используется дальше без повторной загрузки.
+    При ошибке scrapper-сервиса отправляет пользователю сообщение и возвращает None.
+
+    :param event: Событие Telegram.
+    :param after_id: Kypcop страницы (None для первой).
+    :return: Страница подписок или None при ошибке.
+    """
+    entry = None
+    if after_id is None:
+        entry = await redis_cache.get_list_entry(event.chat_id, LIST_PAGE_SIZE)
+        if entry is not None and entry.fresh:
+            return LinksPage(links=entry.links, next_after_id=entry.next_after_id)
 
     headers = {"Tg-Chat-Id": str(event.chat_id)}
+    if entry is not None and entry.etag is not None:
+        headers["If-None-Match"] = entry.etag
+    params = {"limit": LIST_PAGE_SIZE}
+    if after_id is not None:
+        params["after_id"] = after_id
     async with httpx.AsyncClient() as client:
         try:
-            response = await client.get(f"{settings.scrapper_api_url}/links", headers=headers)
+            response = await client.get(
+                f"{settings.scrapper_api_url}/links",
+                params=params,
+                headers=headers,
+            )
+            # raise_for_status считает ошибкой любой ответ вне 2xx, в том числе 304.
+            if entry is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+                await redis_cache.touch_list_cache(event.chat_id, entry)
+                return LinksPage(links=entry.links, next_after_id=entry.next_after_id)
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
             await event.respond(
                 f"Ошибка при получении подписок: {e.response.json().get('exceptionMessage')!s}",
             )
-            return
-
+            return None
         data = response.json()
-    await redis_cache.set_list_cache(event.chat_id, data.get("links", []))
-    if data.get("size", 0) == 0:
-        await event.respond("У вас нет активных подписок.")
+    page = LinksPage(links=data.get("links", []), next_after_id=data.get("next_after_id"))
+    version = response.headers.get(LINKS_VERSION_HEADER)
+    if after_id is None and version is not None:
+        await redis_cache.set_list_cache(
+            event.chat_id,
+            page.links,
+            int(version),
+            etag=response.headers.get("ETag"),
+            limit=LIST_PAGE_SIZE,
+            next_after_id=page.next_after_id,
+        )
+    return page
+
+
+async def list_handler(event: NewMessage.Event) -> None:
+    """Обработчик команды /list для отображения списка отслеживаемых ссылок.
+
+    Запрашивает y scrapper-сервиса первую страницу подписок пользователя. Если подписок нет,
+    уведомляет o6 этом, иначе выводит страницу в формате:
+      URL, Тэги и Фильтры.
+    Если подписки не помещаются на одну страницу, к сообщению добавляется кнопка перехода
+    к следующей странице.
+
+    :param event: Событие Telegram c данными o пользователе.
+    :return: None
+    """
+    page = await _load_page(event)
+    if page is None:
+        return
+    if not page.links:
+        await event.respond(EMPTY_LIST_TEXT)
+        return
+
+    text, buttons = _render_page(page, None)
+    if buttons is None:
+        await event.respond(text)
     else:
-        lines = []
-        for link in data.get("links", []):
-            line = (
-                f"{link['url']}\nТэги: {' '.join(link.get('tags', []))}\n"
-                f"Фильтры: {' '.join(link.get('filters', []))}\n"
-            )
-            lines.append(line)
-        await event.respond("Ваши подписки:\n" + "\n".join(lines))
+        await event.respond(text, buttons=buttons)
+
+
+async def list_page_handler(event: CallbackQuery.Event) -> None:
+    """Обработчик кнопок навигации по списку подписок.
+
+    Запрашивает y scrapper-сервиса страницу по курсору из кнопки и перерисовывает сообщение
+    co списком. Если после курсора подписок не осталось, показывается первая страница.
+
+    :param event: Событие нажатия inline-кнопки c курсором страницы.
+    :return: None
+    """
+    after_id = int(event.data_match.group(1)) or None
+    page = await _load_page(event, after_id)
+    if page is not None and not page.links and after_id is not None:
+        after_id = None
+        page = await _load_page(event)
+    if page is None:
+        return
+    if not page.links:
+        await event.edit(EMPTY_LIST_TEXT)
+        return
+
+    text, buttons = _render_page(page, after_id)
+    await event.edit(text, buttons=buttons)
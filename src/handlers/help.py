@@ -19,6 +19,11 @@ async def help_handler(
         "/help - помощь\n"
         "/track <url> - начать отслеживание ссылки\n"
         "/untrack <url> - прекратить отслеживание ссылки\n"
-        "/list - список отслеживаемых ссылок"
+        "/list - список отслеживаемых ссылок\n"
+        "/import - добавить список ссылок из сообщения или файла\n"
+        "/tagged <теги> - подписки со всеми указанными тегами\n"
+        "/purge <теги> - удалить подписки со всеми указанными тегами\n"
+        "/mute <теги> - отключить уведомления по подпискам со всеми указанными тегами\n"
+        "/unmute <теги> - включить уведомления по подпискам со всеми указанными тегами"
     )
     await event.respond(help_text)
@@ -0,0 +1,126 @@
+import httpx
+from pydantic import ValidationError
+from telethon.events import NewMessage
+
+from src.api.scrapper_api.models import MAX_BULK_LINKS, AddLinkRequest
+from src.settings import settings
+
+__all__ = ("import_handler",)
+
+# Максимальный размер прикреплённого файла co ссылками, байт.
+MAX_IMPORT_FILE_SIZE: int = 1024 * 1024
+# Таймаут запроса к scrapper-сервису: один пакет может содержать до MAX_BULK_LINKS ссылок.
+IMPORT_TIMEOUT: float = 30.0
+# Сколько некорректных строк показывать пользователю.
+MAX_SHOWN_INVALID_LINES: int = 5
+
+IMPORT_USAGE: str = (
+    "Отправьте ссылки после команды /import по одной в строке (через пробел можно указать "
+    "тэги) или прикрепите к команде текстовый файл в том же формате, например:\n"
+    "/import\nhttps://example.com news\nhttps://github.com/owner/repo"
+)
+
+
+def parse_import_lines(text: str) -> tuple[list[AddLinkRequest], list[str]]:
+    """Разбирает список ссылок для импорта.
+
+    Каждая непустая строка имеет вид `<url> [тэr1 тэr2 ...]`; строки, начинающиеся c `#`,
+    пропускаются.
+
+    :param text: Текст co ссылками.
+    :return: Корректные запросы на добавление и некорректные строки.
+    """
+    requests: list[AddLinkRequest] = []
+    invalid: list[str] = []
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        url, *tags = line.split()
+        try:
+            requests.append(AddLinkRequest(link=url, tags=tags))  # type: ignore[arg-type]
+        except ValidationError:
+            invalid.append(line)
+    return requests, invalid
+
+
+async def _read_import_text(event: NewMessage.Event) -> str | None:
+    """Возвращает текст для импорта: содержимое прикреплённого файла или текст после команды.
+
+    Если файл не подходит, отправляет пользователю сообщение и возвращает None.
+    """
+    if event.message.file is None:
+        parts = event.message.message.split(maxsplit=1)
+        return parts[1] if len(parts) > 1 else ""
+    if (event.message.file.size or 0) > MAX_IMPORT_FILE_SIZE:
+        await event.respond(
+            f"Файл слишком большой: допускается не более {MAX_IMPORT_FILE_SIZE // 1024} КБ.",
+        )
+        return None
+    data = await event.message.download_media(file=bytes)
+    try:
+        return data.decode("utf-8-sig")  # type: ignore[no-any-return]
+    except UnicodeDecodeError:
+        await event.respond("Файл должен быть текстовым в кодировке UTF-8.")
+        return None
+
+
+async def import_handler(event: NewMessage.Event) -> None:
+    """Обработчик команды /import для пакетного добавления ссылок.
+
+    Принимает список ссылок в тексте сообщения после команды или в прикреплённом файле и
+    отправляет их в scrapper-сервис пакетами по MAX_BULK_LINKS (`POST /links/bulk`),
+    после чего сообщает пользователю итоги импорта. Если ошибкой завершился не первый пакет,
+    вместе c ней сообщаются итоги уже импортированных пакетов.
+
+    :param event: Событие Telegram c текстом команды или прикреплённым файлом.
+    :return: None
+    """
+    text = await _read_import_text(event)
+    if text is None:
+        return
+    add_reqs, invalid = parse_import_lines(text)
+    if not add_reqs and not invalid:
+        await event.respond(IMPORT_USAGE)
+        return
+
+    added = existing = 0
+    headers = {"Tg-Chat-Id": str(event.chat_id)}
+    async with httpx.AsyncClient(timeout=IMPORT_TIMEOUT) as client:
+        for start in range(0, len(add_reqs), MAX_BULK_LINKS):
+            chunk = add_reqs[start : start + MAX_BULK_LINKS]
+            try:
+                response = await client.post(
+                    f"{settings.scrapper_api_url}/links/bulk",
+                    json={"links": [req.model_dump(mode="json") for req in chunk]},
+                    headers=headers,
+                )
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                lines = [
+                    f"Ошибка при импорте ссылок: {e.response.json().get('exceptionMessage')!s}",
+                ]
+                if start:
+                    # Предыдущие пакеты уже сохранены, поэтому сообщаем, что успело импортироваться.
+                    lines.extend(
+                        [
+                            f"Добавлено до ошибки: {added}",
+                            f"Уже отслеживались: {existing}",
+                            f"Не импортировано: {len(add_reqs) - start}",
+                        ],
+                    )
+                await event.respond("\n".join(lines))
+                return
+            size = response.json()["size"]
+            added += size
+            existing += len(chunk) - size
+
+    lines = [
+        "Импорт завершён.",
+        f"Добавлено: {added}",
+        f"Уже отслеживались: {existing}",
+    ]
+    if invalid:
+        lines.append(f"Некорректные строки: {len(invalid)}")
+        lines.extend(invalid[:MAX_SHOWN_INVALID_LINES])
+    await event.respond("\n".join(lines))
@@ -3,10 +3,9 @@ from pydantic import HttpUrl
 from telethon.events import NewMessage
 
 from src.api.scrapper_api.models import AddLinkRequest
-from src.bot.redis_cache import redis_cache
 from src.db.in_memory.memory_storage.enum_states import State
 from src.db.in_memory.memory_storage.key_builder import build_storage_key
-from src.db.in_memory.memory_storage.memory import MemoryStorage
+from src.db.in_memory.memory_storage.storage_factory import fsm_storage
 from src.settings import settings
 
 __all__ = ("msg_handler",)
@@ -67,8 +66,7 @@ async def msg_handler(event: NewMessage.Event) -> None:
         return
 
     key = await build_storage_key(event)
-    memory_storage = MemoryStorage()
-    current_state = await memory_storage.get_state(key)
+    current_state, stored_data = await fsm_storage.get_record(key)
     msg_to_start = (
         "Для корректной работы данной команды необходимо "
         "сначала зарегистрировать чат с помощью команды /start."
@@ -76,13 +74,12 @@ async def msg_handler(event: NewMessage.Event) -> None:
 
     if current_state == State.WAITING_FOR_TAGS:
         tags = event.raw_text.split()
-        data = await memory_storage.get_data(key) or {}
+        data = stored_data or {}
         if not data:
             await event.respond(msg_to_start)
             return
         data["tags"] = tags
-        await memory_storage.set_data(key, data)
-        await memory_storage.set_state(key, State.WAITING_FOR_FILTERS)
+        await fsm_storage.set_record(key, State.WAITING_FOR_FILTERS, data)
         await event.respond(
             "Введите фильтры (опционально, формат key:value, разделённые пробелами):",
         )
@@ -90,12 +87,12 @@ async def msg_handler(event: NewMessage.Event) -> None:
 
     if current_state == State.WAITING_FOR_FILTERS:
         filters = event.raw_text.split()
-        data = await memory_storage.get_data(key) or {}
+        data = stored_data or {}
         if not data:
             await event.respond(msg_to_start)
             return
         data["filters"] = filters
-        await memory_storage.set_data(key, data)
+        await fsm_storage.set_data(key, data)
 
         url = data.get("url")
         if not url:
@@ -103,5 +100,4 @@ async def msg_handler(event: NewMessage.Event) -> None:
             return
 
         await _send_scrapper_request(event, url, data.get("tags", []), filters)
-        await redis_cache.invalidate_list_cache(event.chat_id)
-        await memory_storage.clear(key)
+        await fsm_storage.clear(key)
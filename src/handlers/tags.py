@@ -0,0 +1,130 @@
+import httpx
+from telethon.events import NewMessage
+
+from src.handlers.get_list import LIST_HEADER, paginate_links
+from src.settings import settings
+
+__all__ = ("mute_handler", "purge_handler", "tagged_handler", "unmute_handler")
+
+
+def _parse_tags(event: NewMessage.Event) -> list[str]:
+    """Возвращает теги, перечисленные после команды."""
+    return list(dict.fromkeys(event.message.message.split()[1:]))
+
+
+def _error_message(action: str, error: httpx.HTTPStatusError) -> str:
+    """Формирует сообщение o6 ошибке scrapper-сервиса."""
+    return f"Ошибка при {action}: {error.response.json().get('exceptionMessage')!s}"
+
+
+async def tagged_handler(event: NewMessage.Event) -> None:
+    """Обработчик команды /tagged для вывода подписок, отмеченных всеми указанными тегами.
+
+    Список выводится страницами, каждая - отдельным сообщением.
+
+    :param event: Событие Telegram c текстом команды.
+    :return: None
+    """
+    tags = _parse_tags(event)
+    if not tags:
+        await event.respond(
+            "Сообщение должно иметь вид '/tagged <тег> [<тег> ...]', например:\n/tagged work",
+        )
+        return
+
+    async with httpx.AsyncClient() as client:
+        try:
+            response = await client.get(
+                f"{settings.scrapper_api_url}/links/tags",
+                params={"tags": tags},
+                headers={"Tg-Chat-Id": str(event.chat_id)},
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            await event.respond(_error_message("получении подписок", e))
+            return
+
+    links = response.json().get("links", [])
+    if not links:
+        await event.respond(f"Нет подписок с тегами: {' '.join(tags)}")
+        return
+    for page in paginate_links(links):
+        await event.respond(LIST_HEADER + "\n".join(page))
+
+
+async def purge_handler(event: NewMessage.Event) -> None:
+    """Обработчик команды /purge для удаления подписок, отмеченных всеми указанными тегами.
+
+    :param event: Событие Telegram c текстом команды.
+    :return: None
+    """
+    tags = _parse_tags(event)
+    if not tags:
+        await event.respond(
+            "Сообщение должно иметь вид '/purge <тег> [<тег> ...]', например:\n/purge old",
+        )
+        return
+
+    async with httpx.AsyncClient() as client:
+        try:
+            response = await client.request(
+                "DELETE",
+                f"{settings.scrapper_api_url}/links/tags",
+                json={"tags": tags},
+                headers={"Tg-Chat-Id": str(event.chat_id)},
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            await event.respond(_error_message("удалении подписок", e))
+            return
+
+    await event.respond(f"Удалено подписок: {response.json().get('size', 0)}")
+
+
+async def _set_muted(event: NewMessage.Event, *, muted: bool) -> None:
+    """Включает или отключает уведомления по подпискам, отмеченным всеми указанными тегами.
+
+    :param event: Событие Telegram c текстом команды.
+    :param muted: Отключить (True) или включить (False) уведомления.
+    :return: None
+    """
+    tags = _parse_tags(event)
+    command = "/mute" if muted else "/unmute"
+    if not tags:
+        await event.respond(
+            f"Сообщение должно иметь вид '{command} <тег> [<тег> ...]', например:\n{command} work",
+        )
+        return
+
+    async with httpx.AsyncClient() as client:
+        try:
+            response = await client.put(
+                f"{settings.scrapper_api_url}/links/tags/muted",
+                json={"tags": tags, "muted": muted},
+                headers={"Tg-Chat-Id": str(event.chat_id)},
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            await event.respond(_error_message("изменении уведомлений", e))
+            return
+
+    state = "отключены" if muted else "включены"
+    await event.respond(f"Уведомления {state} для подписок: {response.json().get('size', 0)}")
+
+
+async def mute_handler(event: NewMessage.Event) -> None:
+    """Обработчик команды /mute для отключения уведомлений по подпискам c указанными тегами.
+
+    :param event: Событие Telegram c текстом команды.
+    :return: None
+    """
+    await _set_muted(event, muted=True)
+
+
+async def unmute_handler(event: NewMessage.Event) -> None:
+    """Обработчик команды /unmute для включения уведомлений по подпискам c указанными тегами.
+
+    :param event: Событие Telegram c текстом команды.
+    :return: None
+    """
+    await _set_muted(event, muted=False)
@@ -3,7 +3,7 @@ from telethon.events import NewMessage
 from src.constants import EXPECTED_TRACK_PARTS
 from src.db.in_memory.memory_storage.enum_states import State
 from src.db.in_memory.memory_storage.key_builder import build_storage_key
-from src.db.in_memory.memory_storage.memory import MemoryStorage
+from src.db.in_memory.memory_storage.storage_factory import fsm_storage
 
 __all__ = ("track_handler",)
 
@@ -14,7 +14,7 @@ async def track_handler(
     """Обработчик команды для начала отслеживания ссылки в Telegram-боте.
 
     Проверяет формат команды '/track <URL>', инициирует процесс отслеживания ссылки,
-    сохраняя URL в MemoryStorage и переключая состояние на WAITING_FOR_TAGS.
+    сохраняя URL в хранилище FSM и переключая состояние на WAITING_FOR_TAGS.
     Если формат команды неверный, отправляет сообщение c примером правильного использования.
 
     :param event: Событие сообщения Telegram, содержащее текст команды и данные пользователя.
@@ -23,11 +23,9 @@ async def track_handler(
     message_text = event.message.message
     parts = message_text.split()
     if len(parts) == EXPECTED_TRACK_PARTS:
-        memory_storage = MemoryStorage()
         url = parts[1].strip()
         key = await build_storage_key(event)
-        await memory_storage.set_state(key, State.WAITING_FOR_TAGS)
-        await memory_storage.set_data(key, {"url": url})
+        await fsm_storage.set_record(key, State.WAITING_FOR_TAGS, {"url": url})
         await event.respond("Введите тэги (опционально, разделённые пробелами):")
     else:
         await event.respond(
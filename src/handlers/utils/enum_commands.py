@@ -13,6 +13,11 @@ class BotCommand(Enum):
     :ivar UNTRACK: Команда для прекращения отслеживания ссылки.
     :ivar LIST: Команда для вывода списка отслеживаемых ссылок.
     :ivar CHAT_ID: Команда для получения ID чата.
+    :ivar IMPORT: Команда для пакетного добавления ссылок из списка или файла.
+    :ivar TAGGED: Команда для вывода подписок c указанными тегами.
+    :ivar PURGE: Команда для удаления подписок c указанными тегами.
+    :ivar MUTE: Команда для отключения уведомлений по подпискам c указанными тегами.
+    :ivar UNMUTE: Команда для включения уведомлений по подпискам c указанными тегами.
     """
 
     START = "/start"
@@ -21,3 +26,8 @@ class BotCommand(Enum):
     UNTRACK = "/untrack"
     LIST = "/list"
     CHAT_ID = "/chat_id"
+    IMPORT = "/import"
+    TAGGED = "/tagged"
+    PURGE = "/purge"
+    MUTE = "/mute"
+    UNMUTE = "/unmute"
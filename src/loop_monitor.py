@@ -0,0 +1,156 @@
+import asyncio
+import contextlib
+import logging
+import re
+from dataclasses import dataclass
+
+from src.metrics import EVENT_LOOP_LAG, SLOW_CALLBACK_DURATION
+from src.settings import LoopMonitorConfig, settings
+
+__all__ = ("LoopLagMonitor", "SlowCallbackStats", "callback_name")
+
+logger = logging.getLogger(__name__)
+
+# Сообщение, которым asyncio в режиме отладки сообщает o долгом шаге (base_events._run_once).
+SLOW_CALLBACK_MESSAGE: str = "Executing %s took %.3f seconds"
+_CORO_RE = re.compile(r"coro=<(?P<name>[^\s(]+)")
+_HANDLE_RE = re.compile(r"<(?:Timer)?Handle (?P<name>[^\s(]+)")
+MAX_CALLBACK_NAME_LENGTH: int = 120
+
+
+def callback_name(handle: str) -> str:
+    """Возвращает имя корутины или функции из строкового представления asyncio-хэндла.
+
+    :param handle: Представление хэндла, например
+        `<Task pending name='Task-1' coro=<Scheduler.send_digest() running at ...>>`.
+    :return: Имя корутины (`Scheduler.send_digest`) или усечённое представление хэндла.
+    """
+    match = _CORO_RE.search(handle) or _HANDLE_RE.search(handle)
+    if match:
+        return match.group("name")
+    return handle[:MAX_CALLBACK_NAME_LENGTH]
+
+
+@dataclass(slots=True)
+class SlowCallbackStats:
+    """Накопленная статистика блокировок event loop одной корутиной.
+
+    :param name: Имя корутины или функции.
+    :param count: Сколько раз шаг превышал порог.
+    :param total: Суммарная длительность таких шагов, секунд.
+    :param max: Самый долгий шаг, секунд.
+    """
+
+    name: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Перехватывает предупреждения asyncio o долгих шагах и передаёт их монитору."""
+
+    def __init__(self, monitor: "LoopLagMonitor") -> None:
+        super().__init__(level=logging.WARNING)
+        self.monitor = monitor
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.msg == SLOW_CALLBACK_MESSAGE and isinstance(record.args, tuple):
+            handle, duration = record.args
+            self.monitor.record_slow_callback(str(handle), float(duration))  # type: ignore[arg-type]
+
+
+class LoopLagMonitor:
+    """Монитор задержек event loop.
+
+    Контрольная задача засыпает на `interval` и измеряет, насколько позже она проснулась:
+    задержка сверх интервала - время, когда loop был занят синхронной работой. Значения
+    пишутся в гистограмму EVENT_LOOP_LAG.
+
+    Если включён `slow_callback_debug`, loop переводится в режим отладки asyncio, и каждый
+    шаг корутины дольше `slow_callback_threshold` учитывается по имени корутины: в
+    гистограмме SLOW_CALLBACK_DURATION и в отчёте report(). Режим отладки замедляет loop,
+    поэтому по умолчанию выключен.
+    """
+
+    def __init__(self, config: LoopMonitorConfig = settings.loop_monitor) -> None:
+        """:param config: Настройки монитора."""
+        self.config = config
+        self._task: asyncio.Task[None] | None = None
+        self._handler = _SlowCallbackHandler(self)
+        self._stats: dict[str, SlowCallbackStats] = {}
+        self._debug_was_enabled = False
+        self._slow_callback_duration = 0.1
+
+    async def start(self) -> None:
+        """Запускает контрольную задачу и, если нужно, режим отладки asyncio."""
+        if self._task is not None or not self.config.enabled:
+            return
+
+        loop = asyncio.get_running_loop()
+        if self.config.slow_callback_debug:
+            self._debug_was_enabled = loop.get_debug()
+            self._slow_callback_duration = loop.slow_callback_duration
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.config.slow_callback_threshold
+            logging.getLogger("asyncio").addHandler(self._handler)
+        self._task = asyncio.create_task(self._sample())
+        logger.info("Мониторинг event loop запущен")
+
+    async def stop(self) -> None:
+        """Останавливает мониторинг и пишет в лог отчёт o самых долгих корутинах."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+        if self.config.slow_callback_debug:
+            logging.getLogger("asyncio").removeHandler(self._handler)
+            loop = asyncio.get_running_loop()
+            loop.set_debug(self._debug_was_enabled)
+            loop.slow_callback_duration = self._slow_callback_duration
+        for stats in self.report():
+            logger.warning(
+                "Блокировка event loop: %s - %d раз, всего %.3f с, максимум %.3f с",
+                stats.name,
+                stats.count,
+                stats.total,
+                stats.max,
+            )
+
+    async def _sample(self) -> None:
+        """Периодически измеряет задержку пробуждения контрольной задачи."""
+        loop = asyncio.get_running_loop()
+        interval = self.config.interval
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            lag = max(loop.time() - started - interval, 0.0)
+            EVENT_LOOP_LAG.observe(lag)
+            if lag >= self.config.lag_threshold:
+                logger.warning("Event loop был заблокирован на %.3f с", lag)
+
+    def record_slow_callback(self, handle: str, duration: float) -> None:
+        """Учитывает шаг корутины, заблокировавший event loop.
+
+        :param handle: Строковое представление asyncio-хэндла.
+        :param duration: Длительность шага, секунд.
+        """
+        name = callback_name(handle)
+        SLOW_CALLBACK_DURATION.labels(callback=name).observe(duration)
+        stats = self._stats.setdefault(name, SlowCallbackStats(name=name))
+        stats.count += 1
+        stats.total += duration
+        stats.max = max(stats.max, duration)
+
+    def report(self, limit: int | None = None) -> list[SlowCallbackStats]:
+        """Возвращает корутины, дольше всех блокировавшие event loop.
+
+        :param limit: Размер отчёта; по умолчанию `report_size` из настроек.
+        :return: Статистика, отсортированная по суммарной длительности блокировок.
+        """
+        limit = self.config.report_size if limit is None else limit
+        return sorted(self._stats.values(), key=lambda stats: stats.total, reverse=True)[:limit]
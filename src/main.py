@@ -2,11 +2,14 @@ import logging
 
 from telethon import TelegramClient, events
 
+from src.bot.redis_cache import redis_cache
 from src.handlers import chat_id_cmd_handler
-from src.handlers.get_list import list_handler
+from src.handlers.get_list import LIST_PAGE_PATTERN, list_handler, list_page_handler
 from src.handlers.help import help_handler
+from src.handlers.import_links import import_handler
 from src.handlers.message import msg_handler
 from src.handlers.start import start_handler
+from src.handlers.tags import mute_handler, purge_handler, tagged_handler, unmute_handler
 from src.handlers.track import track_handler
 from src.handlers.unknown import unknown_command_handler
 from src.handlers.untrack import untrack_handler
@@ -23,7 +26,9 @@ def main() -> None:
 
     Создаёт и настраивает TelegramClient c использованием настроек бота.
     Регистрирует обработчики событий для известных команд (определённых в BotCommand).
-    Регистрирует обработчик для неизвестных команд и общий обработчик для сообщений.
+    Регистрирует обработчик для неизвестных команд, общий обработчик для сообщений и
+    обработчик кнопок навигации по списку подписок.
+    Запускает прослушивание канала инвалидации кэша списков.
     Запускает цикл получения сообщений от пользователей до отключения клиента.
 
     :return: None
@@ -41,6 +46,11 @@ def main() -> None:
         BotCommand.TRACK.value: track_handler,
         BotCommand.UNTRACK.value: untrack_handler,
         BotCommand.LIST.value: list_handler,
+        BotCommand.IMPORT.value: import_handler,
+        BotCommand.TAGGED.value: tagged_handler,
+        BotCommand.PURGE.value: purge_handler,
+        BotCommand.MUTE.value: mute_handler,
+        BotCommand.UNMUTE.value: unmute_handler,
     }
 
     for command, handler in command_handlers.items():
@@ -53,8 +63,10 @@ def main() -> None:
     )
 
     client.add_event_handler(msg_handler, events.NewMessage(pattern=r"^[^/]"))
+    client.add_event_handler(list_page_handler, events.CallbackQuery(pattern=LIST_PAGE_PATTERN))
 
     with client:
+        client.loop.run_until_complete(redis_cache.start())
         try:
             client.run_until_disconnected()
         except KeyboardInterrupt:
@@ -64,6 +76,8 @@ def main() -> None:
                 "Main loop raised error.",
                 extra={"exc": exc},
             )
+        finally:
+            client.loop.run_until_complete(redis_cache.close())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+import functools
+from collections.abc import Awaitable, Callable
+from typing import ParamSpec, TypeVar
+
+import httpx
+from prometheus_client import Counter, Gauge, Histogram
+
+__all__ = (
+    "DB_POOL_ACQUIRE_LATENCY",
+    "DB_POOL_CONNECTIONS",
+    "DB_POOL_WAITERS",
+    "DB_QUERY_LATENCY",
+    "DIGEST_SWEEP_DURATION",
+    "EVENT_LOOP_LAG",
+    "KAFKA_CONSUME_LAG",
+    "KAFKA_DLQ_MESSAGES",
+    "KAFKA_PRODUCE_LATENCY",
+    "LINK_CHECKS",
+    "SLOW_CALLBACK_DURATION",
+    "TELEGRAM_RATE_LIMITED",
+    "TELEGRAM_SEND_LATENCY",
+    "UPDATES_FOUND",
+    "UPSTREAM_REQUEST_LATENCY",
+    "UPSTREAM_RESPONSES",
+    "observe_db_query",
+    "observe_telegram_response",
+    "observe_upstream_response",
+)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Полный проход по подпискам занимает от секунд до десятков минут.
+SWEEP_BUCKETS: tuple[float, ...] = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+# Задержка между публикацией сообщения в Kafka и ero обработкой ботом.
+LAG_BUCKETS: tuple[float, ...] = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+# Блокировки event loop: от миллисекунд до нескольких секунд.
+LOOP_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+# Ожидание соединения из пула: от долей миллисекунды до таймаута пула.
+POOL_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5, 30)
+
+UPSTREAM_REQUEST_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Длительность запросов к внешним API (GitHub, StackOverflow).",
+    ["host"],
+)
+UPSTREAM_RESPONSES = Counter(
+    "upstream_responses_total",
+    "Ответы внешних API по статусу (в том числе 304 и 429).",
+    ["host", "status"],
+)
+LINK_CHECKS = Counter(
+    "link_checks_total",
+    "Проверки ресурсов на обновления.",
+    ["client"],
+)
+UPDATES_FOUND = Counter(
+    "link_updates_found_total",
+    "Проверки, в которых найдено обновление.",
+    ["client"],
+)
+DIGEST_SWEEP_DURATION = Histogram(
+    "digest_sweep_duration_seconds",
+    "Длительность прохода планировщика по всем чатам при отправке дайджеста.",
+    buckets=SWEEP_BUCKETS,
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Длительность методов сервиса подписок.",
+    ["service", "method"],
+)
+DB_POOL_ACQUIRE_LATENCY = Histogram(
+    "db_pool_acquire_seconds",
+    "Ожидание соединения из пула БД.",
+    ["manager"],
+    buckets=POOL_BUCKETS,
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Соединения пула БД: выданные запросам (in_use) и свободные (idle).",
+    ["manager", "state"],
+)
+DB_POOL_WAITERS = Gauge(
+    "db_pool_waiters",
+    "Запросы, ожидающие соединение из пула БД.",
+    ["manager"],
+)
+KAFKA_PRODUCE_LATENCY = Histogram(
+    "kafka_produce_duration_seconds",
+    "Длительность публикации сообщения в Kafka вместе с ожиданием подтверждения.",
+    ["topic"],
+)
+KAFKA_CONSUME_LAG = Histogram(
+    "kafka_consume_lag_seconds",
+    "Задержка между публикацией сообщения в Kafka и его получением ботом.",
+    ["topic"],
+    buckets=LAG_BUCKETS,
+)
+KAFKA_DLQ_MESSAGES = Counter(
+    "kafka_dlq_messages_total",
+    "Сообщения, отправленные в Dead Letter Queue, по исходному топику.",
+    ["topic"],
+)
+TELEGRAM_SEND_LATENCY = Histogram(
+    "telegram_send_duration_seconds",
+    "Длительность запросов sendMessage к Telegram Bot API.",
+    ["source"],
+)
+TELEGRAM_RATE_LIMITED = Counter(
+    "telegram_rate_limited_total",
+    "Ответы Telegram Bot API со статусом 429 (Too Many Requests).",
+    ["source"],
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Задержка пробуждения контрольной задачи event loop сверх заданного интервала.",
+    buckets=LOOP_BUCKETS,
+)
+SLOW_CALLBACK_DURATION = Histogram(
+    "event_loop_slow_callback_seconds",
+    "Длительность шагов корутин, заблокировавших event loop (режим отладки asyncio).",
+    ["callback"],
+    buckets=LOOP_BUCKETS,
+)
+
+
+def observe_upstream_response(host: str, response: httpx.Response) -> None:
+    """Учитывает статус ответа внешнего API.
+
+    :param host: Хост внешнего API.
+    :param response: Полученный ответ.
+    """
+    UPSTREAM_RESPONSES.labels(host=host, status=str(response.status_code)).inc()
+
+
+def observe_telegram_response(source: str, response: httpx.Response) -> None:
+    """Учитывает ответ Telegram Bot API: считает ответы co статусом 429.
+
+    :param source: Источник отправки (`http` или `kafka`).
+    :param response: Полученный ответ.
+    """
+    if response.status_code == httpx.codes.TOO_MANY_REQUESTS:
+        TELEGRAM_RATE_LIMITED.labels(source=source).inc()
+
+
+def observe_db_query(
+    service: str,
+    method: str,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Декоратор, который замеряет длительность корутины сервиса в DB_QUERY_LATENCY.
+
+    :param service: Имя класса сервиса.
+    :param method: Имя метода сервиса.
+    :return: Декоратор корутины.
+    """
+    histogram = DB_QUERY_LATENCY.labels(service=service, method=method)
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with histogram.time():
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
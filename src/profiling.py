@@ -0,0 +1,224 @@
+import asyncio
+import contextlib
+import cProfile
+import logging
+import marshal
+import pstats
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from types import FrameType
+
+from src.settings import ProfilingConfig, settings
+
+__all__ = (
+    "CProfileSession",
+    "ProfileResult",
+    "ProfileSession",
+    "Profiler",
+    "StackSampler",
+    "profiler",
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileResult:
+    """Результат профилирования.
+
+    :param content: Содержимое профиля.
+    :param media_type: MIME-тип содержимого.
+    :param filename: Имя файла для скачивания.
+    """
+
+    content: bytes
+    media_type: str
+    filename: str
+
+
+class ProfileSession(ABC):
+    """Абстрактная сессия профилирования потока event loop."""
+
+    @abstractmethod
+    def start(self) -> None:
+        """Начинает c6op профиля в текущем потоке."""
+
+    @abstractmethod
+    def stop(self) -> ProfileResult:
+        """Завершает c6op профиля.
+
+        :return: Собранный профиль.
+        """
+
+
+class StackSampler(ProfileSession):
+    """Сэмплирующий профилировщик.
+
+    Фоновый поток c заданным интервалом снимает стек потока, в котором вызван start(), и
+    считает одинаковые стеки. Результат - collapsed stacks (`a;b;c <число>`), которые
+    принимают flamegraph.pl, speedscope и inferno. Накладные расходы не зависят от числа
+    вызовов функций, поэтому подходит для работающего сервиса.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """:param interval: Интервал между снимками стека, секунд."""
+        self.interval = interval
+        self._counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._target_id = 0
+
+    def start(self) -> None:
+        self._target_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> ProfileResult:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        lines = [f"{stack} {count}" for stack, count in sorted(self._counts.items())]
+        return ProfileResult(
+            content="\n".join(lines).encode(),
+            media_type="text/plain; charset=utf-8",
+            filename="profile.collapsed",
+        )
+
+    def _run(self) -> None:
+        """Снимает стеки целевого потока до вызова stop()."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_id)  # noqa: SLF001
+            if frame is not None:
+                self._counts[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame: FrameType | None) -> str:
+        """Преобразует стек в строку `модуль:функция;...` от корня к вершине."""
+        names = []
+        while frame is not None:
+            names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+
+class CProfileSession(ProfileSession):
+    """Детерминированный профилировщик cProfile.
+
+    Учитывает каждый вызов функции в потоке event loop, включая шаги корутин, и отдаёт
+    дамп pstats (`python -m pstats`, snakeviz). Накладные расходы заметно выше, чем y
+    StackSampler.
+    """
+
+    def __init__(self) -> None:
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> ProfileResult:
+        self._profile.disable()
+        stats = pstats.Stats(self._profile)
+        return ProfileResult(
+            content=marshal.dumps(stats.stats),  # type: ignore[attr-defined]
+            media_type="application/octet-stream",
+            filename="profile.pstats",
+        )
+
+
+_PROFILERS: dict[str, Callable[[ProfilingConfig], ProfileSession]] = {
+    "collapsed": lambda config: StackSampler(config.sample_interval),
+    "pstats": lambda _: CProfileSession(),
+}
+
+
+class Profiler:
+    """Профилирование работающего приложения по запросу.
+
+    Одновременно выполняется не более одной сессии. Профиль снимается либо в течение
+    заданного времени, либо на время следующего прохода планировщика (capture_sweep).
+    """
+
+    def __init__(self, config: ProfilingConfig = settings.profiling) -> None:
+        """:param config: Настройки профилирования."""
+        self.config = config
+        self._busy = False
+        self._sweep_format: str | None = None
+        self.sweep_result: ProfileResult | None = None
+
+    @property
+    def sweep_armed(self) -> bool:
+        """Ожидается ли профилирование следующего прохода планировщика."""
+        return self._sweep_format is not None
+
+    def _create_session(self, fmt: str) -> ProfileSession:
+        """Создаёт сессию профилирования нужного формата.
+
+        :raises ValueError: Если формат неизвестен.
+        :raises RuntimeError: Если уже идёт другая сессия.
+        """
+        if fmt not in _PROFILERS:
+            raise ValueError(f"Неизвестный формат профиля: {fmt}")
+        if self._busy:
+            raise RuntimeError("Профилирование уже выполняется")
+        return _PROFILERS[fmt](self.config)
+
+    async def profile_for(self, duration: float, fmt: str) -> ProfileResult:
+        """Профилирует поток event loop в течение заданного времени.
+
+        :param duration: Длительность профилирования, секунд.
+        :param fmt: Формат профиля (`collapsed` или `pstats`).
+        :return: Собранный профиль.
+        :raises ValueError: Если формат неизвестен или длительность вне допустимых пределов.
+        :raises RuntimeError: Если уже идёт другая сессия.
+        """
+        if not 0 < duration <= self.config.max_duration:
+            raise ValueError(
+                f"Длительность должна быть в пределах (0, {self.config.max_duration}] секунд",
+            )
+        session = self._create_session(fmt)
+        self._busy = True
+        try:
+            session.start()
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                result = session.stop()
+        finally:
+            self._busy = False
+        return result
+
+    def arm_sweep(self, fmt: str) -> None:
+        """Включает профилирование следующего прохода планировщика.
+
+        :param fmt: Формат профиля (`collapsed` или `pstats`).
+        :raises ValueError: Если формат неизвестен.
+        """
+        if fmt not in _PROFILERS:
+            raise ValueError(f"Неизвестный формат профиля: {fmt}")
+        self._sweep_format = fmt
+        self.sweep_result = None
+
+    @contextlib.contextmanager
+    def capture_sweep(self) -> Iterator[None]:
+        """Профилирует блок прохода планировщика, если профилирование было включено."""
+        if self._sweep_format is None or self._busy:
+            yield
+            return
+
+        session = self._create_session(self._sweep_format)
+        self._sweep_format = None
+        self._busy = True
+        session.start()
+        try:
+            yield
+        finally:
+            self.sweep_result = session.stop()
+            self._busy = False
+            logger.info("Профиль прохода планировщика готов")
+
+
+profiler = Profiler()
@@ -0,0 +1,136 @@
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from src.api.bot_api.models import UpdateEvent
+
+logger = logging.getLogger(__name__)
+
+FILTER_SEPARATOR: str = ":"
+NEGATION_PREFIX: str = "-"
+
+
+def _match_user(update: UpdateEvent, value: str) -> bool:
+    """Сравнивает автора события c ожидаемым значением без учёта регистра."""
+    return update.username.casefold() == value
+
+
+def _match_type(update: UpdateEvent, value: str) -> bool:
+    """Сравнивает тип события c ожидаемым значением без учёта регистра."""
+    return (update.event_type or "").casefold() == value
+
+
+def _match_title(update: UpdateEvent, value: str) -> bool:
+    """Проверяет, что заголовок события содержит значение без учёта регистра."""
+    return value in update.title.casefold()
+
+
+_MATCHERS: dict[str, Callable[[UpdateEvent, str], bool]] = {
+    "user": _match_user,
+    "type": _match_type,
+    "title": _match_title,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Predicate:
+    """Скомпилированное условие `key:value` над полями UpdateEvent.
+
+    :param key: Ключ фильтра (`user`, `type` или `title`).
+    :param value: Значение фильтра, приведённое к нижнему регистру.
+    :param negated: Исключающее условие (`-key:value`).
+    """
+
+    key: str
+    value: str
+    negated: bool = False
+
+    def matches(self, update: UpdateEvent) -> bool:
+        """Проверяет, выполняется ли условие для события (без учёта отрицания).
+
+        :param update: Событие обновления.
+        :return: True, если поле события соответствует значению.
+        """
+        return _MATCHERS[self.key](update, self.value)
+
+
+@dataclass(frozen=True, slots=True)
+class LinkFilter:
+    """Скомпилированные фильтры одной подписки.
+
+    Условия c одинаковым ключом объединяются через ИЛИ, c разными ключами - через И.
+    Событие отбрасывается, если выполняется хотя бы одно исключающее условие.
+    Пустой фильтр пропускает все события.
+
+    :param include: Группы включающих условий, сгруппированные по ключу.
+    :param exclude: Исключающие условия.
+    """
+
+    include: tuple[tuple[Predicate, ...], ...] = ()
+    exclude: tuple[Predicate, ...] = ()
+
+    def matches(self, update: UpdateEvent) -> bool:
+        """Проверяет, нужно ли уведомлять o событии.
+
+        :param update: Событие обновления.
+        :return: True, если событие проходит фильтр.
+        """
+        if any(predicate.matches(update) for predicate in self.exclude):
+            return False
+        return all(any(predicate.matches(update) for predicate in group) for group in self.include)
+
+    def first_match(self, updates: Iterable[UpdateEvent]) -> UpdateEvent | None:
+        """Выбирает первое событие, проходящее фильтр.
+
+        :param updates: События pecypca, от новых к старым.
+        :return: Самое новое подходящее событие или None.
+        """
+        return next((update for update in updates if self.matches(update)), None)
+
+
+def parse_filter(raw: str) -> Predicate:
+    """Разбирает один фильтр формата `key:value` или `-key:value`.
+
+    :param raw: Строка фильтра.
+    :return: Скомпилированное условие.
+    :raises ValueError: Если строка не соответствует формату или ключ не поддерживается.
+    """
+    negated = raw.startswith(NEGATION_PREFIX)
+    key, separator, value = raw.removeprefix(NEGATION_PREFIX).partition(FILTER_SEPARATOR)
+    key = key.strip().lower()
+    value = value.strip().casefold()
+    if not separator or not value:
+        raise ValueError(f"Некорректный фильтр: {raw}. Ожидается формат key:value.")
+    if key not in _MATCHERS:
+        raise ValueError(f"Неизвестный ключ фильтра: {key}")
+    return Predicate(key=key, value=value, negated=negated)
+
+
+@lru_cache(maxsize=1024)
+def compile_filters(filters: tuple[str, ...]) -> LinkFilter:
+    """Компилирует список фильтров подписки в LinkFilter.
+
+    Результат кэшируется: подписки c одинаковыми фильтрами используют один объект.
+    Некорректные фильтры пропускаются c предупреждением, чтобы не блокировать
+    уведомления по подписке.
+
+    :param filters: Фильтры подписки в виде кортежа строк.
+    :return: Скомпилированный фильтр.
+    """
+    include: dict[str, list[Predicate]] = {}
+    exclude: list[Predicate] = []
+    for raw in filters:
+        try:
+            predicate = parse_filter(raw)
+        except ValueError as e:
+            logger.warning("Фильтр пропущен: %s", e)
+            continue
+        if predicate.negated:
+            exclude.append(predicate)
+        else:
+            include.setdefault(predicate.key, []).append(predicate)
+    return LinkFilter(
+        include=tuple(tuple(group) for group in include.values()),
+        exclude=tuple(exclude),
+    )
@@ -4,7 +4,8 @@ import time
 import httpx
 
 from src.api.bot_api.models import DigestUpdate, UpdateEvent
-from src.scheduler.notification.notification_service import NotificationService
+from src.scheduler.notification.notification_service import NotificationService, format_digest
+from src.tracing import start_span, trace_headers
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +35,7 @@ class HTTPNotificationService(NotificationService):
         await self._send_notification(payload, path="/updates", chat_id=chat_id)
 
     async def send_digest(self, chat_id: int, updates: list[UpdateEvent]) -> None:
-        """Формирует и отправляет дайджест по обновлениям.
+        """Формирует и отправляет дайджест по обновлениям, сгруппированный по тегам.
 
         :param chat_id: Идентификатор чата.
         :param updates: Список событий обновлений.
@@ -42,23 +43,11 @@ class HTTPNotificationService(NotificationService):
         if not updates:
             return
 
-        updates_text = [
-            (
-                f"Описание:  {update.description}\n"
-                f"Заголовок: *{update.title}*\n"
-                f"Автор:     {update.username}\n"
-                f"Дата:      {update.created_at:%Y-%m-%d %H:%M}\n"
-                f"Описание:  {update.preview}\n"
-                f"{'=' * 50}"
-            )
-            for update in updates
-        ]
-
         payload = DigestUpdate(
             id=int(time.time()),
             description="Полученные обновления:",
             tg_chat_id=chat_id,
-            updates=updates_text,
+            updates=format_digest(updates),
         )
         await self._send_notification(payload, path="/digest", chat_id=chat_id)
 
@@ -67,14 +56,16 @@ class HTTPNotificationService(NotificationService):
 
         :param payload: Объект DigestUpdate.
         :param path: Путь запроса (например, '/digest' или '/updates').
-        :param chat_id: Идентификатор чата (для логов).
+        :param chat_id: Идентификатор чата (для логов и трассировки).
         """
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.bot_api_url}{path}",
-                    json=payload.model_dump(),
-                )
+                with start_span("notification.http", {"path": path, "chat_id": chat_id}):
+                    response = await client.post(
+                        f"{self.bot_api_url}{path}",
+                        json=payload.model_dump(),
+                        headers=trace_headers(),
+                    )
                 response.raise_for_status()
             logger.info("Уведомление успешно отправлено на %s для чата %s", path, chat_id)
         except httpx.HTTPError:
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 import time
 from typing import Any
@@ -7,8 +6,11 @@ from typing import Any
 from confluent_kafka import Producer
 
 from src.api.bot_api.models import DigestUpdate, UpdateEvent
-from src.scheduler.notification.notification_service import NotificationService
+from src.metrics import KAFKA_DLQ_MESSAGES, KAFKA_PRODUCE_LATENCY
+from src.scheduler.notification.notification_service import NotificationService, format_digest
+from src.serializer import dumps
 from src.settings import settings
+from src.tracing import kafka_headers, start_span
 
 logger = logging.getLogger(__name__)
 
@@ -40,36 +42,32 @@ class KafkaNotificationService(NotificationService):
         if not updates:
             return
 
-        updates_text = [
-            (
-                f"Описание:  {update.description}\n"
-                f"Заголовок: *{update.title}*\n"
-                f"Автор:     {update.username}\n"
-                f"Дата:      {update.created_at:%Y-%m-%d %H:%M}\n"
-                f"Описание:  {update.preview}\n"
-                f"{'=' * 50}"
-            )
-            for update in updates
-        ]
-
         payload = DigestUpdate(
             id=int(time.time()),
             description="Полученные обновления:",
             tg_chat_id=chat_id,
-            updates=updates_text,
+            updates=format_digest(updates),
         )
         await self._produce(self.topic_digest, payload.model_dump())
 
     async def _produce(self, topic: str, payload: dict[str, Any]) -> None:
-        """Асинхронно публикует сообщение в Kafka."""
+        """Асинхронно публикует сообщение в Kafka.
+
+        Контекст трассировки передаётся получателю в заголовках сообщения.
+        """
         try:
-            await asyncio.to_thread(
-                self.producer.produce,
-                topic=topic,
-                value=json.dumps(payload).encode("utf-8"),
-            )
-            # Ожидаем отправки сообщений
-            await asyncio.to_thread(self.producer.flush)
+            with (
+                KAFKA_PRODUCE_LATENCY.labels(topic=topic).time(),
+                start_span("kafka.produce", {"topic": topic}),
+            ):
+                await asyncio.to_thread(
+                    self.producer.produce,
+                    topic=topic,
+                    value=dumps(payload),
+                    headers=kafka_headers(),
+                )
+                # Ожидаем отправки сообщений
+                await asyncio.to_thread(self.producer.flush)
             logger.info("Уведомление отправлено в Kafka [%s]", topic)
         except Exception as e:
             logger.exception("Ошибка отправки сообщения в Kafka [%s]", topic)
@@ -87,9 +85,10 @@ class KafkaNotificationService(NotificationService):
             await asyncio.to_thread(
                 self.producer.produce,
                 topic=self.dlq_topic,
-                value=json.dumps(dlq_payload).encode("utf-8"),
+                value=dumps(dlq_payload),
             )
             await asyncio.to_thread(self.producer.flush)
+            KAFKA_DLQ_MESSAGES.labels(topic=original_topic).inc()
             logger.info("Сообщение отправлено в DLQ: %s", self.dlq_topic)
         except Exception:
             logger.exception("Ошибка при отправке сообщения в DLQ")
@@ -2,6 +2,56 @@ from abc import ABC, abstractmethod
 
 from src.api.bot_api.models import UpdateEvent
 
+UNTAGGED_HEADER = "Без тегов"
+
+
+def format_update(update: UpdateEvent) -> str:
+    """Формирует текст события для дайджеста.
+
+    :param update: Событие обновления.
+    :return: Текст события.
+    """
+    return (
+        f"Описание:  {update.description}\n"
+        f"Заголовок: *{update.title}*\n"
+        f"Автор:     {update.username}\n"
+        f"Дата:      {update.created_at:%Y-%m-%d %H:%M}\n"
+        f"Описание:  {update.preview}\n"
+        f"{'=' * 50}"
+    )
+
+
+def format_digest(updates: list[UpdateEvent]) -> list[str]:
+    """Формирует строки дайджеста, сгруппированные по тегам подписок.
+
+    Группы идут по алфавиту тегов, каждая начинается строкой `Ter: <тег>`; событие подписки
+    c несколькими тегами попадает в группу каждого из них. События подписок без тегов
+    собираются в последнюю группу. Если тегов нет ни y одного события, заголовки групп
+    не добавляются.
+
+    :param updates: События обновлений.
+    :return: Строки дайджеста.
+    """
+    if not any(update.tags for update in updates):
+        return [format_update(update) for update in updates]
+
+    groups: dict[str, list[UpdateEvent]] = {}
+    untagged: list[UpdateEvent] = []
+    for update in updates:
+        for tag in dict.fromkeys(update.tags):
+            groups.setdefault(tag, []).append(update)
+        if not update.tags:
+            untagged.append(update)
+
+    lines: list[str] = []
+    for tag in sorted(groups):
+        lines.append(f"Тег: {tag}")
+        lines.extend(format_update(update) for update in groups[tag])
+    if untagged:
+        lines.append(UNTAGGED_HEADER)
+        lines.extend(format_update(update) for update in untagged)
+    return lines
+
 
 class NotificationService(ABC):
     """Интерфейс для сервиса отправки уведомлений от scrapper к bot.
@@ -22,7 +72,7 @@ class NotificationService(ABC):
 
     @abstractmethod
     async def send_digest(self, chat_id: int, updates: list[UpdateEvent]) -> None:
-        """Отправляет уведомление c заданными данными.
+        """Отправляет дайджест, сгруппированный по тегам подписок (`format_digest`).
 
         :param chat_id: ID чата.
         :param updates: Список сообщений o6 обновлениях.
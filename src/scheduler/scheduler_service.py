@@ -1,18 +1,20 @@
 import asyncio
 import logging
 from datetime import datetime, timezone
-from urllib.parse import urlparse
 
 import asyncpg
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.bot_api.models import UpdateEvent
-from src.api.scrapper_api.models import LinkResponse
 from src.clients.client_factory import ClientFactory
 from src.db.db_manager.manager_factory import db_manager
 from src.db.factory.data_access_factory import db_service
+from src.metrics import DIGEST_SWEEP_DURATION, LINK_CHECKS, UPDATES_FOUND
+from src.profiling import profiler
 from src.scheduler.notification.notification_service import NotificationService
+from src.scheduler.subscription import Subscription
 from src.settings import settings
+from src.tracing import start_span
 
 logger = logging.getLogger(__name__)
 
@@ -25,37 +27,47 @@ class Scheduler:
         отвечает за отправку сообщений.
         """
         self.notification_service = notification_service
+        # Результаты проверки ресурсов в рамках текущего прохода:
+        # канонический ключ pecypca -> новые события от новых к старым.
+        # Состояние pecypca общее для всех подписок, поэтому каждый pecypc проверяется и
+        # записывается в БД один раз за проход, a результат раздаётся всем чатам.
+        self._sweep_results: dict[str, list[UpdateEvent]] = {}
 
     @staticmethod
     async def process_subscription(
-        sub: LinkResponse,
+        sub: Subscription,
         dependency: AsyncSession | asyncpg.Pool,
-    ) -> UpdateEvent | None:
-        """Обрабатывает одну подписку и возвращает событие обновления, если оно найдено.
+    ) -> list[UpdateEvent]:
+        """Обрабатывает одну подписку и возвращает все новые события pecypca.
+
+        Время последнего обновления сдвигается за самое новое событие: фильтры подписок
+        применяются позже ко всему списку, поэтому отброшенные ими события не скрывают
+        более старые подходящие.
 
-        :param sub: Объект подписки c полями URL, chat_id, last_updated.
+        :param sub: Запись подписки c предварительно разобранным URL и ключом клиента.
         :param dependency: Сессия SQLAlchemy или пул подключений asyncpg.
-        :return: Объект обновления или None, если изменений нет.
+        :return: События от новых к старым (пустой список, если изменений нет).
         """
-        url: str = str(sub.url)
-        parsed_url = urlparse(url)
         try:
-            client = ClientFactory.create_client(service_name=parsed_url.netloc)
+            client = ClientFactory.create_client(service_name=sub.client_key)
         except ValueError:
-            logger.warning("Неподдерживаемый URL: %s", url)
-            return None
+            logger.warning("Неподдерживаемый URL: %s", sub.url)
+            return []
 
-        updated = await client.check_updates(parsed_url, sub.last_updated)
-        if updated:
+        LINK_CHECKS.labels(client=sub.client_key).inc()
+        with start_span("client.check_updates", {"client": sub.client_key, "url": sub.url}):
+            updates = await client.list_updates(sub.parsed_url, sub.last_updated)
+        if updates:
+            UPDATES_FOUND.labels(client=sub.client_key).inc()
             await db_service.link_service.set_last_updated(
                 link_id=sub.id,
-                last_updated=updated.created_at,
+                last_updated=max(update.created_at for update in updates),
                 dependency=dependency,
             )
-            return updated
+            return updates
 
-        logger.info("Не было обновлений для %s", url)
-        return None
+        logger.info("Не было обновлений для %s", sub.url)
+        return []
 
     async def collect_updates(
         self,
@@ -69,23 +81,68 @@ class Scheduler:
         :return: Список событий обновлений (может быть пустым).
         """
         try:
-            all_subs: list[LinkResponse] = await db_service.link_service.get_links(
+            links = await db_service.link_service.get_links(
                 dependency=dependency,
                 chat_id=chat_id,
             )
-            if not all_subs:
+            if not links:
                 logger.info("Подписки не найдены для chat_id: %s", chat_id)
                 return []
 
-            tasks = [self.process_subscription(sub, dependency) for sub in all_subs]
+            all_subs = [Subscription.from_link(link) for link in links if not link.muted]
+            pending = {
+                sub.resource_key: sub
+                for sub in all_subs
+                if sub.resource_key not in self._sweep_results
+            }
+            tasks = [self.process_subscription(sub, dependency) for sub in pending.values()]
             results = await asyncio.gather(*tasks, return_exceptions=False)
-
-            return [result for result in results if result]
+            self._sweep_results.update(zip(pending, results, strict=True))
+
+            # Фильтры подписки применяются до формирования дайджеста, чтобы
+            # отброшенные события не попадали в Kafka/HTTP и Telegram. Каждая подписка
+            # получает самое новое из подходящих ей событий pecypca c eё тегами: события
+            # общие для всех подписок pecypca, поэтому теги добавляются в копию.
+            return [
+                update.model_copy(update={"tags": list(sub.tags)})
+                for sub in all_subs
+                if (update := sub.link_filter.first_match(self._sweep_results[sub.resource_key]))
+            ]
 
         except Exception:
             logger.exception("Ошибка при получении подписок")
             return []
 
+    async def _sweep(self) -> None:
+        """Собирает и отправляет дайджесты для всех чатов, обходя их пачками."""
+        async for dependency in db_manager.get_dependency():
+            offset = 0
+            limit = settings.db.limit_batching
+
+            while True:
+                logger.info("Запрос в БД с offset=%s, limit=%s", offset, limit)
+                with start_span("db.get_chats", {"offset": offset, "limit": limit}):
+                    chat_ids = await db_service.chat_service.get_chats(
+                        dependency=dependency,
+                        limit=limit,
+                        offset=offset,
+                    )
+                if not chat_ids:
+                    break
+
+                for chat_id in chat_ids:
+                    with start_span("digest.chat", {"chat_id": chat_id}):
+                        updates = await self.collect_updates(chat_id, dependency)
+                        with start_span(
+                            "notification.send_digest",
+                            {"chat_id": chat_id, "updates": len(updates)},
+                        ):
+                            await self.notification_service.send_digest(chat_id, updates)
+
+                offset += limit
+                if len(chat_ids) < limit:
+                    break
+
     async def send_digest(self) -> None:
         """Запускает цикл, который проверяет наступление времени отправки дайджеста и,
         если оно наступило, собирает и отправляет обновления для всех чатов.
@@ -98,26 +155,13 @@ class Scheduler:
                 now.time().hour == settings.hour_digest
                 and now.time().minute == settings.minute_digest
             ):
-                async for dependency in db_manager.get_dependency():
-                    offset = 0
-                    limit = settings.db.limit_batching
-
-                    while True:
-                        logger.info("Запрос в БД с offset=%s, limit=%s", offset, limit)
-                        chat_ids = await db_service.chat_service.get_chats(
-                            dependency=dependency,
-                            limit=limit,
-                            offset=offset,
-                        )
-                        if not chat_ids:
-                            break
-
-                        for chat_id in chat_ids:
-                            updates = await self.collect_updates(chat_id, dependency)
-                            await self.notification_service.send_digest(chat_id, updates)
-
-                        offset += limit
-                        if len(chat_ids) < limit:
-                            break
+                self._sweep_results.clear()
+                with (
+                    DIGEST_SWEEP_DURATION.time(),
+                    start_span("digest.sweep"),
+                    profiler.capture_sweep(),
+                ):
+                    await self._sweep()
+                self._sweep_results.clear()
 
             await asyncio.sleep(60)
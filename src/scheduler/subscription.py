@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import ParseResult, urlparse
+
+from src.api.scrapper_api.models import LinkResponse
+from src.clients.canonical import canonical_key, normalize_host
+from src.scheduler.filters import LinkFilter, compile_filters
+
+
+@dataclass(frozen=True, slots=True)
+class Subscription:
+    """Компактная запись подписки, используемая планировщиком при обходе ссылок.
+
+    Разбор URL выполняется один раз при загрузке строки из БД, после чего запись
+    передаётся по всему циклу проверки без повторного `urlparse` и поиска клиента.
+
+    :param id: Идентификатор подписки.
+    :param url: URL подписки в строковом виде.
+    :param parsed_url: Разобранный URL.
+    :param host: Хост в нижнем регистре, без порта.
+    :param path_parts: Непустые сегменты пути URL.
+    :param client_key: Ключ клиента в `ClientFactory` (хост без префикса `www.` и порта,
+                       как в канонических ключах).
+    :param resource_key: Канонический ключ pecypca, по которому дедуплицируются запросы.
+    :param last_updated: Время последнего обновления подписки.
+    :param link_filter: Скомпилированные фильтры подписки.
+    :param tags: Теги подписки.
+    """
+
+    id: int
+    url: str
+    parsed_url: ParseResult
+    host: str
+    path_parts: tuple[str, ...]
+    client_key: str
+    resource_key: str
+    last_updated: datetime | None
+    link_filter: LinkFilter
+    tags: tuple[str, ...] = ()
+
+    @classmethod
+    def from_link(cls, link: LinkResponse) -> "Subscription":
+        """Создаёт запись подписки из ответа сервиса ссылок.
+
+        :param link: Объект LinkResponse, загруженный из БД.
+        :return: Объект Subscription c предварительно разобранным URL.
+        """
+        url = str(link.url)
+        parsed_url = urlparse(url)
+        return cls(
+            id=link.id,
+            url=url,
+            parsed_url=parsed_url,
+            host=parsed_url.hostname or "",
+            path_parts=tuple(part for part in parsed_url.path.split("/") if part),
+            client_key=normalize_host(parsed_url),
+            resource_key=canonical_key(parsed_url),
+            last_updated=link.last_updated,
+            link_filter=compile_filters(tuple(link.filters)),
+            tags=tuple(link.tags),
+        )
@@ -0,0 +1,57 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson является опциональной зависимостью
+    orjson = None  # type: ignore[assignment]
+
+__all__ = ("ResponseClass", "dumps", "loads")
+
+ResponseClass: type[JSONResponse] = ORJSONResponse if orjson is not None else JSONResponse
+
+
+def _default(obj: Any) -> Any:  # noqa: ANN401
+    """Приводит к JSON-совместимому виду объекты, которые не сериализуются напрямую.
+
+    :param obj: Объект, который не удалось сериализовать.
+    :return: JSON-совместимое представление объекта.
+    :raises TypeError: Если тип объекта не поддерживается.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Объект типа {type(obj).__name__} не сериализуется в JSON")
+
+
+def dumps(obj: Any) -> bytes:  # noqa: ANN401
+    """Сериализует объект в JSON в виде байтов (UTF-8).
+
+    Использует orjson, если он установлен, иначе стандартный модуль json.
+
+    :param obj: Объект для сериализации.
+    :return: JSON-представление объекта в байтах.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8",
+    )
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:  # noqa: ANN401
+    """Десериализует JSON из байтов или строки.
+
+    :param data: JSON-документ.
+    :return: Десериализованный объект.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
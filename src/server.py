@@ -16,12 +16,16 @@ from starlette.responses import Response
 from telethon import TelegramClient
 from telethon.errors.rpcerrorlist import ApiIdInvalidError
 
-from src.api import router
+from src.api import metrics, router
 from src.bot.kafka.consumer import KafkaNotificationReceiver
+from src.bot.redis_cache import redis_cache
 from src.db.db_manager.manager_factory import db_manager
+from src.loop_monitor import LoopLagMonitor
 from src.scheduler.notification.factory import NotificationServiceFactory
 from src.scheduler.scheduler_service import Scheduler
+from src.serializer import ResponseClass
 from src.settings import TGBotSettings, settings
+from src.tracing import setup_tracing, shutdown_tracing
 
 logging.basicConfig()
 logging.getLogger().setLevel(logging.INFO)
@@ -36,12 +40,17 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @asynccontextmanager
 async def default_lifespan(application: FastAPI) -> AsyncIterator[None]:
     logger.debug("Running application lifespan ...")
+    setup_tracing(settings.tracing)
+    loop_monitor = LoopLagMonitor(settings.loop_monitor)
+    await loop_monitor.start()
+    application.loop_monitor = loop_monitor  # type: ignore[attr-defined]
 
     try:
         await db_manager.start()
     except Exception:
         logger.exception("Ошибка при инициализации базы данных: %s")
         raise
+    await redis_cache.connect()
 
     notification_service = NotificationServiceFactory.create()
     scheduler = Scheduler(notification_service=notification_service)
@@ -75,23 +84,28 @@ async def default_lifespan(application: FastAPI) -> AsyncIterator[None]:
             logger.info("Working without telegram client inside.")
         yield
         await db_manager.close()
+        await redis_cache.close()
         await stack.aclose()
 
         scheduler_task.cancel()
         if kafka_receiver:
             await kafka_receiver.stop()
 
+    await loop_monitor.stop()
     await loop.shutdown_default_executor()
+    shutdown_tracing()
 
 
 app = FastAPI(
     title="telegram_bot_app",
     lifespan=default_lifespan,
+    default_response_class=ResponseClass,
 )
 
 app.exception_handler(RequestValidationError)(validation_exception_handler)
 
 app.include_router(router=router, prefix="/api/v1")
+app.include_router(router=metrics.router)
 
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
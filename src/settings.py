@@ -14,7 +14,13 @@ class DatabaseConfig(BaseModel):
     echo: bool = False
     echo_pool: bool = False
     pool_size: int = 50
+    pool_min_size: int = 10
     max_overflow: int = 10
+    pool_timeout: float = 30.0
+    statement_cache_size: int = 100
+    command_timeout: float | None = 60.0
+    max_lifetime: float = 1800.0
+    idle_lifetime: float = 300.0
     limit_batching: int = 100
 
 
@@ -28,6 +34,42 @@ class KafkaConfig(BaseModel):
 class RedisConfig(BaseModel):
     url: str = "redis://localhost:6379/0"
     list_key: str = "chat_{chat_id}_list"
+    local_ttl: float = 5.0
+    local_max_size: int = 1024
+    invalidation_channel: str = "list_cache_invalidation"
+    codec: str = "msgpack"
+    max_connections: int = 32
+    pool_timeout: float = 2.0
+    socket_timeout: float = 1.0
+    socket_connect_timeout: float = 1.0
+
+
+class TracingConfig(BaseModel):
+    exporter: str = "none"
+    service_name: str = "link-tracker"
+    otlp_endpoint: str = "http://localhost:4318/v1/traces"
+
+
+class LoopMonitorConfig(BaseModel):
+    enabled: bool = True
+    interval: float = 0.5
+    lag_threshold: float = 0.1
+    slow_callback_debug: bool = False
+    slow_callback_threshold: float = 0.1
+    report_size: int = 10
+
+
+class ProfilingConfig(BaseModel):
+    enabled: bool = False
+    admin_token: str = ""
+    max_duration: float = 60.0
+    sample_interval: float = 0.005
+
+
+class FSMConfig(BaseModel):
+    storage: str = "MEMORY"
+    ttl: int = 3600
+    key_prefix: str = "fsm"
 
 
 class TGBotSettings(BaseSettings):
@@ -44,6 +86,10 @@ class TGBotSettings(BaseSettings):
     db: DatabaseConfig = DatabaseConfig()
     kafka: KafkaConfig = KafkaConfig()
     redis: RedisConfig = RedisConfig()
+    fsm: FSMConfig = FSMConfig()
+    tracing: TracingConfig = TracingConfig()
+    loop_monitor: LoopMonitorConfig = LoopMonitorConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
 
     hour_digest: int = 0
     minute_digest: int = 26
@@ -0,0 +1,188 @@
+import contextlib
+import functools
+import logging
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from typing import Any, ParamSpec, TypeVar
+
+from src.settings import TracingConfig
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # pragma: no cover - opentelemetry является опциональной зависимостью
+    propagate = None  # type: ignore[assignment]
+    trace = None  # type: ignore[assignment]
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SpanExporter,
+    )
+except ImportError:  # pragma: no cover - SDK нужен только для экспорта спанов
+    TracerProvider = None  # type: ignore[assignment,misc]
+
+__all__ = (
+    "context_from_kafka_headers",
+    "extract_context",
+    "kafka_headers",
+    "setup_tracing",
+    "shutdown_tracing",
+    "start_span",
+    "trace_headers",
+    "traced",
+)
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+TRACER_NAME: str = "link_tracker"
+
+_provider: Any = None
+
+
+def _console_exporter(_: TracingConfig) -> "SpanExporter":
+    """Создаёт экспортёр, печатающий спаны в stdout."""
+    return ConsoleSpanExporter()
+
+
+def _otlp_exporter(config: TracingConfig) -> "SpanExporter":
+    """Создаёт экспортёр спанов по протоколу OTLP/HTTP.
+
+    :raises ImportError: Если пакет opentelemetry-exporter-otlp-proto-http не установлен.
+    """
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+    return OTLPSpanExporter(endpoint=config.otlp_endpoint)
+
+
+_EXPORTERS: dict[str, Callable[[TracingConfig], "SpanExporter"] | None] = {
+    "none": None,
+    "console": _console_exporter,
+    "otlp": _otlp_exporter,
+}
+
+
+def setup_tracing(config: TracingConfig) -> None:
+    """Настраивает экспорт спанов.
+
+    По умолчанию (`none`) провайдер не устанавливается и спаны ничего не стоят. Если
+    opentelemetry не установлен, трассировка остаётся выключенной.
+
+    :param config: Настройки трассировки.
+    :raises ValueError: Если экспортёр неизвестен.
+    """
+    global _provider  # noqa: PLW0603
+    name = config.exporter.lower()
+    if name not in _EXPORTERS:
+        raise ValueError(f"Неизвестный экспортёр трассировки: {name}")
+    exporter_factory = _EXPORTERS[name]
+    if exporter_factory is None:
+        return
+    if trace is None or TracerProvider is None:
+        logger.warning("opentelemetry-sdk не установлен, трассировка выключена")
+        return
+    try:
+        exporter = exporter_factory(config)
+    except ImportError:
+        logger.warning("Экспортёр %s не установлен, трассировка выключена", name)
+        return
+
+    _provider = TracerProvider(resource=Resource.create({"service.name": config.service_name}))
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(_provider)
+
+
+def shutdown_tracing() -> None:
+    """Отправляет накопленные спаны и останавливает экспорт."""
+    global _provider  # noqa: PLW0603
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
+
+
+@contextlib.contextmanager
+def start_span(
+    name: str,
+    attributes: Mapping[str, str | int] | None = None,
+    context: object = None,
+) -> Iterator[None]:
+    """Открывает спан и делает ero текущим на время блока.
+
+    Без opentelemetry блок выполняется без трассировки.
+
+    :param name: Имя спана, например `digest.collect_updates`.
+    :param attributes: Атрибуты спана (chat_id, topic, ...).
+    :param context: Родительский контекст, извлечённый из заголовков; по умолчанию текущий.
+    """
+    if trace is None:
+        yield
+        return
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(name, context=context, attributes=attributes):  # type: ignore[arg-type]
+        yield
+
+
+def traced(name: str) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Декоратор, который выполняет корутину внутри спана c указанным именем.
+
+    :param name: Имя спана.
+    :return: Декоратор корутины.
+    """
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with start_span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_headers() -> dict[str, str]:
+    """Возвращает заголовки (W3C traceparent) c контекстом текущего спана."""
+    carrier: dict[str, str] = {}
+    if propagate is not None:
+        propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(headers: Mapping[str, str]) -> object:
+    """Извлекает родительский контекст из заголовков входящего запроса.
+
+    :param headers: Заголовки запроса или сообщения.
+    :return: Контекст для параметра `context` функции start_span.
+    """
+    if propagate is None:
+        return None
+    return propagate.extract(headers)
+
+
+KafkaHeaders = dict[str, str | bytes | None] | list[tuple[str, str | bytes | None]]
+
+
+def kafka_headers() -> list[tuple[str, str | bytes | None]]:
+    """Возвращает контекст текущего спана в формате заголовков Kafka-сообщения."""
+    return [(key, value.encode()) for key, value in trace_headers().items()]
+
+
+def context_from_kafka_headers(headers: KafkaHeaders | None) -> object:
+    """Извлекает родительский контекст из заголовков Kafka-сообщения.
+
+    :param headers: Заголовки сообщения (`Message.headers()`): список пар или словарь,
+                    могут отсутствовать.
+    :return: Контекст для параметра `context` функции start_span.
+    """
+    items = headers.items() if isinstance(headers, dict) else headers or []
+    return extract_context(
+        {
+            key: value.decode() if isinstance(value, bytes) else value
+            for key, value in items
+            if value
+        },
+    )
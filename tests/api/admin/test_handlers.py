@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from src.profiling import ProfileResult, profiler
+from src.settings import settings
+
+pytestmark = pytest.mark.asyncio
+
+ADMIN_TOKEN: str = "secret"
+
+
+@pytest.fixture
+def profiling_enabled(mocker: MockerFixture) -> None:
+    """Включает профилирование и задаёт токен администратора."""
+    mocker.patch.object(settings.profiling, "enabled", True)
+    mocker.patch.object(settings.profiling, "admin_token", ADMIN_TOKEN)
+
+
+async def test_profile_disabled_by_default(test_client: TestClient) -> None:
+    """По умолчанию эндпоинт профилирования недоступен."""
+    response = test_client.post(
+        "/api/v1/admin/profile",
+        params={"duration": 0.01},
+        headers={"X-Admin-Token": ADMIN_TOKEN},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+async def test_profile_wrong_token(test_client: TestClient) -> None:
+    """Без верного токена администратора профиль не снимается."""
+    response = test_client.post(
+        "/api/v1/admin/profile",
+        params={"duration": 0.01},
+        headers={"X-Admin-Token": "wrong"},
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+async def test_profile_collapsed(test_client: TestClient) -> None:
+    """Эндпоинт возвращает collapsed stacks за указанное время."""
+    response = test_client.post(
+        "/api/v1/admin/profile",
+        params={"duration": 0.05, "format": "collapsed"},
+        headers={"X-Admin-Token": ADMIN_TOKEN},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'filename="profile.collapsed"' in response.headers["content-disposition"]
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+async def test_profile_bad_request(test_client: TestClient) -> None:
+    """Неизвестный формат и слишком большая длительность отклоняются."""
+    headers = {"X-Admin-Token": ADMIN_TOKEN}
+
+    unknown_format = test_client.post(
+        "/api/v1/admin/profile",
+        params={"duration": 0.01, "format": "svg"},
+        headers=headers,
+    )
+    too_long = test_client.post(
+        "/api/v1/admin/profile",
+        params={"duration": settings.profiling.max_duration + 1},
+        headers=headers,
+    )
+
+    assert unknown_format.status_code == HTTPStatus.BAD_REQUEST
+    assert too_long.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+async def test_sweep_profile(mocker: MockerFixture, test_client: TestClient) -> None:
+    """Профиль прохода планировщика запрашивается заранее и забирается после прохода."""
+    mocker.patch.object(profiler, "sweep_result", None)
+    mocker.patch.object(profiler, "_sweep_format", None)
+    headers = {"X-Admin-Token": ADMIN_TOKEN}
+
+    armed = test_client.post("/api/v1/admin/profile/sweep", headers=headers)
+    pending = test_client.get("/api/v1/admin/profile/sweep", headers=headers)
+    profiler.sweep_result = ProfileResult(b"main 1", "text/plain; charset=utf-8", "p.collapsed")
+    ready = test_client.get("/api/v1/admin/profile/sweep", headers=headers)
+
+    assert armed.status_code == HTTPStatus.ACCEPTED
+    assert profiler.sweep_armed
+    assert pending.status_code == HTTPStatus.NOT_FOUND
+    assert ready.status_code == HTTPStatus.OK
+    assert ready.content == b"main 1"
@@ -1,6 +1,8 @@
-from datetime import datetime, timezone
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
 from http import HTTPStatus
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import ANY, AsyncMock, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
@@ -8,6 +10,7 @@ from pydantic import HttpUrl
 from pytest_mock import MockerFixture
 
 from src.api.scrapper_api.models import AddLinkRequest, LinkResponse, RemoveLinkRequest
+from src.bot.redis_cache import LIST_PAGE_SIZE
 from src.db.factory.data_access_factory import db_service
 from src.db.in_memory.repository import Repository
 from src.settings import settings
@@ -28,6 +31,8 @@ def mock_link_service(mocker: MockerFixture) -> MagicMock:
     """Фикстура для мокирования chat_service."""
     mock_service = mocker.patch.object(db_service, "link_service", autospec=True)
     mock_service.register_chat = AsyncMock()
+    mock_service.get_links_version.return_value = None
+    mock_service.get_links_last_event_at.return_value = None
     return mock_service
 
 
@@ -138,8 +143,13 @@ async def test_get_links_success(
         headers={"Tg-Chat-Id": str(tg_chat_id)},
     )
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {"links": [], "size": 0}
-    mock_link_service.get_links.assert_awaited_once_with(tg_chat_id, mocker.ANY)
+    assert response.json() == {"links": [], "size": 0, "next_after_id": None}
+    mock_link_service.get_links.assert_awaited_once_with(
+        tg_chat_id,
+        mocker.ANY,
+        limit=None,
+        after_id=None,
+    )
 
 
 async def test_get_links_invalid_header(
@@ -167,7 +177,12 @@ async def test_get_links_invalid_header(
     }
     assert isinstance(response.json()["stacktrace"], list)
     assert len(response.json()["stacktrace"]) > 0
-    mock_link_service.get_links.assert_awaited_once_with(tg_chat_id, mocker.ANY)
+    mock_link_service.get_links.assert_awaited_once_with(
+        tg_chat_id,
+        mocker.ANY,
+        limit=None,
+        after_id=None,
+    )
 
 
 async def test_add_link_success(
@@ -184,7 +199,7 @@ async def test_add_link_success(
     )
     mock_link_service.add_link.return_value = LinkResponse(
         id=1,
-        url=HttpUrl("https://example.com"),
+        url="https://example.com",
         tags=["tag1"],
         filters=["filter1:value1"],
         last_updated=datetime(2023, 10, 1, 12, 0, 0, tzinfo=timezone.utc),
@@ -202,6 +217,7 @@ async def test_add_link_success(
         "tags": ["tag1"],
         "filters": ["filter1:value1"],
         "last_updated": "2023-10-01T12:00:00Z",
+        "muted": False,
     }
     mock_link_service.add_link.assert_awaited_once_with(tg_chat_id, link_data, mocker.ANY)
 
@@ -269,12 +285,12 @@ async def test_remove_link_success(
     """Успешное удаления ссылки."""
     tg_chat_id = 123456789
     link_data = RemoveLinkRequest(link=HttpUrl("https://example.com"))
-    mock_link_service.remove_link.return_value = {
-        "id": 1,
-        "url": "https://example.com",
-        "tags": [],
-        "filters": [],
-    }
+    mock_link_service.remove_link.return_value = LinkResponse(
+        id=1,
+        url="https://example.com",
+        tags=[],
+        filters=[],
+    )
 
     response = test_client.request(
         "DELETE",
@@ -289,6 +305,7 @@ async def test_remove_link_success(
         "tags": [],
         "filters": [],
         "last_updated": None,
+        "muted": False,
     }
     mock_link_service.remove_link.assert_awaited_once_with(tg_chat_id, link_data, mocker.ANY)
 
@@ -347,3 +364,707 @@ async def test_remove_link_not_found(
     }
     assert isinstance(response.json()["stacktrace"], list)
     assert len(response.json()["stacktrace"]) > 0
+
+
+@pytest.fixture
+def mock_list_cache(mocker: MockerFixture) -> MagicMock:
+    """Фикстура для мокирования кэша списков ссылок."""
+    mock_cache = mocker.patch("src.api.scrapper_api.handlers.redis_cache", autospec=True)
+    mock_cache.add_to_list_cache.return_value = True
+    return mock_cache
+
+
+async def test_add_link_updates_list_cache(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    mock_list_cache: MagicMock,
+) -> None:
+    """Добавленная ссылка записывается в закэшированный список чата."""
+    tg_chat_id = 123456789
+    new_link = LinkResponse(id=1, url="https://example.com", tags=[], filters=[])
+    mock_link_service.add_link.return_value = new_link
+
+    response = test_client.post(
+        f"{settings.scrapper_api_url}/links",
+        json={"link": "https://example.com"},
+        headers={"Tg-Chat-Id": str(tg_chat_id)},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    mock_list_cache.add_to_list_cache.assert_awaited_once_with(
+        tg_chat_id,
+        new_link.model_dump(mode="json"),
+    )
+    mock_link_service.get_links.assert_not_awaited()
+
+
+async def test_add_link_warms_cold_list_cache(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    mock_list_cache: MagicMock,
+) -> None:
+    """Если список чата не закэширован, первая страница заполняется из БД."""
+    tg_chat_id = 123456789
+    links = [
+        LinkResponse(id=1, url="https://example.org", tags=[], filters=[]),
+        LinkResponse(id=2, url="https://example.com", tags=[], filters=[]),
+    ]
+    mock_link_service.add_link.return_value = links[1]
+    mock_link_service.get_links.return_value = links
+    mock_link_service.get_links_version.return_value = 5
+    mock_list_cache.add_to_list_cache.return_value = False
+
+    response = test_client.post(
+        f"{settings.scrapper_api_url}/links",
+        json={"link": "https://example.com"},
+        headers={"Tg-Chat-Id": str(tg_chat_id)},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    mock_list_cache.set_list_cache.assert_awaited_once_with(
+        tg_chat_id,
+        [link.model_dump(mode="json") for link in links],
+        5,
+        etag=f'"{tg_chat_id}.5.{LIST_PAGE_SIZE}.0.0"',
+        limit=LIST_PAGE_SIZE,
+        next_after_id=None,
+    )
+
+
+async def test_add_link_caches_first_page_of_long_list(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    mock_list_cache: MagicMock,
+) -> None:
+    """Y списка длиннее страницы /list кэшируется первая страница c курсором следующей."""
+    tg_chat_id = 123456789
+    links = [
+        LinkResponse(id=link_id, url=f"https://example.com/{link_id}", tags=[], filters=[])
+        for link_id in range(1, LIST_PAGE_SIZE + 2)
+    ]
+    mock_link_service.add_link.return_value = links[-1]
+    mock_link_service.get_links.return_value = links
+    mock_link_service.get_links_version.return_value = 5
+    mock_list_cache.add_to_list_cache.return_value = False
+
+    response = test_client.post(
+        f"{settings.scrapper_api_url}/links",
+        json={"link": "https://example.com/11"},
+        headers={"Tg-Chat-Id": str(tg_chat_id)},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    mock_link_service.get_links.assert_awaited_once_with(
+        tg_chat_id,
+        ANY,
+        limit=LIST_PAGE_SIZE + 1,
+    )
+    mock_list_cache.set_list_cache.assert_awaited_once_with(
+        tg_chat_id,
+        [link.model_dump(mode="json") for link in links[:LIST_PAGE_SIZE]],
+        5,
+        etag=f'"{tg_chat_id}.5.{LIST_PAGE_SIZE}.0.0"',
+        limit=LIST_PAGE_SIZE,
+        next_after_id=LIST_PAGE_SIZE,
+    )
+    mock_list_cache.invalidate_list_cache.assert_not_awaited()
+
+
+async def test_remove_link_updates_list_cache(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    mock_list_cache: MagicMock,
+) -> None:
+    """Удалённая ссылка убирается из закэшированного списка чата."""
+    tg_chat_id = 123456789
+    mock_link_service.remove_link.return_value = LinkResponse(
+        id=7,
+        url="https://example.com",
+        tags=[],
+        filters=[],
+    )
+
+    response = test_client.request(
+        "DELETE",
+        f"{settings.scrapper_api_url}/links",
+        json={"link": "https://example.com"},
+        headers={"Tg-Chat-Id": str(tg_chat_id)},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    mock_list_cache.remove_from_list_cache.assert_awaited_once_with(tg_chat_id, 7)
+
+
+async def test_get_links_page_returns_cursor(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Страница ссылок содержит курсор следующей страницы, если она есть."""
+    tg_chat_id = 123456789
+    mock_link_service.get_links.return_value = [
+        LinkResponse(id=link_id, url=f"https://example.com/{link_id}", tags=[], filters=[])
+        for link_id in (4, 5, 6)
+    ]
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        params={"limit": 2, "after_id": 3},
+        headers={"Tg-Chat-Id": str(tg_chat_id)},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert [link["id"] for link in body["links"]] == [4, 5]
+    assert body["size"] == len(body["links"])
+    assert body["next_after_id"] == body["links"][-1]["id"]
+    mock_link_service.get_links.assert_awaited_once_with(
+        tg_chat_id,
+        ANY,
+        limit=3,
+        after_id=3,
+    )
+
+
+async def test_get_links_last_page_has_no_cursor(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Ha последней странице курсор следующей страницы отсутствует."""
+    mock_link_service.get_links.return_value = [
+        LinkResponse(id=7, url="https://example.com/7", tags=[], filters=[]),
+    ]
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        params={"limit": 2, "after_id": 6},
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["next_after_id"] is None
+
+
+@pytest.mark.parametrize("limit", [0, 1001])
+async def test_get_links_invalid_limit(test_client: TestClient, limit: int) -> None:
+    """Размер страницы вне допустимого диапазона отклоняется валидацией."""
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        params={"limit": limit},
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+async def test_stream_links_ndjson(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Ссылки выгружаются потоком NDJSON по одной на строку."""
+    links = [
+        LinkResponse(id=link_id, url=f"https://example.com/{link_id}", tags=[], filters=[])
+        for link_id in (1, 2)
+    ]
+    mock_link_service.get_links.return_value = links
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links/stream",
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == [link.model_dump(mode="json") for link in links]
+    mock_link_service.iter_links.assert_not_called()
+
+
+async def test_stream_links_reads_remaining_pages(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    mocker: MockerFixture,
+) -> None:
+    """После полной первой страницы остальные ссылки дочитываются по курсору."""
+    mocker.patch("src.api.scrapper_api.handlers.STREAM_BATCH_SIZE", 1)
+    links = [
+        LinkResponse(id=link_id, url=f"https://example.com/{link_id}", tags=[], filters=[])
+        for link_id in (1, 2, 3)
+    ]
+    mock_link_service.get_links.return_value = links[:1]
+
+    async def iter_links(*_: object, **__: object) -> AsyncIterator[LinkResponse]:
+        for link in links[1:]:
+            yield link
+
+    mock_link_service.iter_links = MagicMock(side_effect=iter_links)
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links/stream",
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [1, 2, 3]
+    mock_link_service.iter_links.assert_called_once_with(
+        123456789,
+        ANY,
+        batch_size=1,
+        after_id=1,
+    )
+
+
+async def test_stream_links_invalid_chat_id(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Ошибка валидации chat_id возвращается до начала потока."""
+    mock_link_service.get_links.side_effect = ValueError(
+        "Некорректный идентификатор чата: -1. Должен быть >= 0.",
+    )
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links/stream",
+        headers={"Tg-Chat-Id": "-1"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()["exceptionName"] == "ValueError"
+
+
+async def test_add_links_bulk(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    mock_list_cache: MagicMock,
+) -> None:
+    """Пакетное добавление возвращает результат по каждой ссылке и обновляет кэш списка."""
+    tg_chat_id = 123456789
+    added = LinkResponse(id=1, url="https://example.com", tags=["a"], filters=[])
+    mock_link_service.add_links.return_value = [added, None]
+    mock_link_service.get_links.return_value = [added]
+    mock_link_service.get_links_version.return_value = 2
+
+    response = test_client.post(
+        f"{settings.scrapper_api_url}/links/bulk",
+        json={"links": [{"link": "https://example.com", "tags": ["a"]}, {"link": "https://a.org"}]},
+        headers={"Tg-Chat-Id": str(tg_chat_id)},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        "results": [
+            {
+                "link": "https://example.com/",
+                "status": "added",
+                "result": added.model_dump(mode="json"),
+            },
+            {"link": "https://a.org/", "status": "exists", "result": None},
+        ],
+        "size": 1,
+    }
+    add_reqs = mock_link_service.add_links.await_args.args[1]
+    assert [str(req.link) for req in add_reqs] == ["https://example.com/", "https://a.org/"]
+    mock_list_cache.set_list_cache.assert_awaited_once_with(
+        tg_chat_id,
+        [added.model_dump(mode="json")],
+        2,
+        etag=f'"{tg_chat_id}.2.{LIST_PAGE_SIZE}.0.0"',
+        limit=LIST_PAGE_SIZE,
+        next_after_id=None,
+    )
+
+
+async def test_add_links_bulk_nothing_added(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    mock_list_cache: MagicMock,
+) -> None:
+    """Если все ссылки уже отслеживаются, кэш списка не перезаписывается."""
+    mock_link_service.add_links.return_value = [None]
+
+    response = test_client.post(
+        f"{settings.scrapper_api_url}/links/bulk",
+        json={"links": [{"link": "https://example.com"}]},
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["size"] == 0
+    mock_list_cache.set_list_cache.assert_not_awaited()
+
+
+async def test_add_links_bulk_chat_not_found(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Пакетное добавление в незарегистрированный чат возвращает 400."""
+    mock_link_service.add_links.side_effect = KeyError("Чат с идентификатором 1 не найден.")
+
+    response = test_client.post(
+        f"{settings.scrapper_api_url}/links/bulk",
+        json={"links": [{"link": "https://example.com"}]},
+        headers={"Tg-Chat-Id": "1"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()["exceptionMessage"] == "Чат с идентификатором 1 не найден."
+
+
+async def test_add_links_bulk_empty(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Пустой пакет отклоняется валидацией."""
+    response = test_client.post(
+        f"{settings.scrapper_api_url}/links/bulk",
+        json={"links": []},
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    mock_link_service.add_links.assert_not_called()
+
+
+async def test_remove_links_bulk(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    mock_list_cache: MagicMock,
+) -> None:
+    """Пакетное удаление возвращает результат по каждой ссылке и убирает их из кэша."""
+    tg_chat_id = 123456789
+    removed = LinkResponse(id=7, url="https://example.com", tags=[], filters=[])
+    mock_link_service.remove_links.return_value = [removed, None]
+
+    response = test_client.request(
+        "DELETE",
+        f"{settings.scrapper_api_url}/links/bulk",
+        json={"links": ["https://example.com", "https://a.org"]},
+        headers={"Tg-Chat-Id": str(tg_chat_id)},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert [item["status"] for item in body["results"]] == ["removed", "not_found"]
+    assert body["size"] == 1
+    mock_list_cache.remove_from_list_cache.assert_awaited_once_with(tg_chat_id, 7)
+
+
+async def test_remove_links_bulk_chat_not_found(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Пакетное удаление в незарегистрированном чате возвращает 404."""
+    mock_link_service.remove_links.side_effect = KeyError("Чат с идентификатором 1 не найден.")
+
+    response = test_client.request(
+        "DELETE",
+        f"{settings.scrapper_api_url}/links/bulk",
+        json={"links": ["https://example.com"]},
+        headers={"Tg-Chat-Id": "1"},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+async def test_get_links_returns_etag(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Ответ co списком ссылок содержит ETag c версией списка чата."""
+    tg_chat_id = 123456789
+    mock_link_service.get_links_version.return_value = 5
+    mock_link_service.get_links.return_value = []
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        headers={"Tg-Chat-Id": str(tg_chat_id), "If-None-Match": f'"{tg_chat_id}.4.0.0.0"'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] == f'"{tg_chat_id}.5.0.0.0"'
+    assert response.headers["Links-Version"] == "5"
+    mock_link_service.get_links.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [
+        '"123456789.5.0.0.0"',
+        'W/"123456789.5.0.0.0"',
+        '"123456789.4.0.0.0", "123456789.5.0.0.0"',
+        "*",
+    ],
+    ids=["strong", "weak", "list", "any"],
+)
+async def test_get_links_not_modified(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    if_none_match: str,
+) -> None:
+    """Если версия списка не изменилась, возвращается 304 без чтения ссылок."""
+    mock_link_service.get_links_version.return_value = 5
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        headers={"Tg-Chat-Id": "123456789", "If-None-Match": if_none_match},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == '"123456789.5.0.0.0"'
+    assert response.content == b""
+    mock_link_service.get_links_last_event_at.assert_awaited_once_with(
+        123456789,
+        ANY,
+        limit=None,
+        after_id=None,
+    )
+    mock_link_service.get_links.assert_not_called()
+
+
+async def test_get_links_etag_depends_on_page(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """ETag одной страницы не подтверждает другую страницу того же списка."""
+    mock_link_service.get_links_version.return_value = 5
+    mock_link_service.get_links.return_value = []
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        params={"limit": 10, "after_id": 20},
+        headers={"Tg-Chat-Id": "123456789", "If-None-Match": '"123456789.5.10.0.0"'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] == '"123456789.5.10.20.0"'
+    mock_link_service.get_links.assert_awaited_once()
+
+
+async def test_get_links_etag_depends_on_resource_events(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Новое событие pecypca страницы меняет ETag без изменения версии списка."""
+    last_event_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    etag = f'"123456789.5.0.0.{int(last_event_at.timestamp()) * 1_000_000}"'
+    mock_link_service.get_links_version.return_value = 5
+    mock_link_service.get_links.return_value = [
+        LinkResponse(
+            id=1,
+            url="https://example.com",
+            tags=[],
+            filters=[],
+            last_updated=last_event_at,
+        ),
+        LinkResponse(id=2, url="https://example.org", tags=[], filters=[]),
+    ]
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] == etag
+    mock_link_service.get_links_last_event_at.assert_not_called()
+
+    mock_link_service.get_links_last_event_at.return_value = last_event_at
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        headers={"Tg-Chat-Id": "123456789", "If-None-Match": etag},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    mock_link_service.get_links_last_event_at.return_value = last_event_at + timedelta(seconds=1)
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        headers={"Tg-Chat-Id": "123456789", "If-None-Match": etag},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+async def test_get_links_first_page_of_long_list_not_modified(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Первая страница списка длиннее страницы /list проверяется по ETag и отдаёт 304."""
+    last_event_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    links = [
+        LinkResponse(
+            id=link_id,
+            url=f"https://example.com/{link_id}",
+            tags=[],
+            filters=[],
+            last_updated=last_event_at,
+        )
+        for link_id in range(1, LIST_PAGE_SIZE + 2)
+    ]
+    mock_link_service.get_links_version.return_value = 5
+    mock_link_service.get_links.return_value = links
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        params={"limit": LIST_PAGE_SIZE},
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["next_after_id"] == LIST_PAGE_SIZE
+    assert response.json()["size"] == LIST_PAGE_SIZE
+    etag = response.headers["ETag"]
+    assert etag == f'"123456789.5.{LIST_PAGE_SIZE}.0.{int(last_event_at.timestamp()) * 1_000_000}"'
+
+    mock_link_service.get_links.reset_mock()
+    mock_link_service.get_links_last_event_at.return_value = last_event_at
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links",
+        params={"limit": LIST_PAGE_SIZE},
+        headers={"Tg-Chat-Id": "123456789", "If-None-Match": etag},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    mock_link_service.get_links_last_event_at.assert_awaited_once_with(
+        123456789,
+        ANY,
+        limit=LIST_PAGE_SIZE,
+        after_id=None,
+    )
+    mock_link_service.get_links.assert_not_called()
+
+
+async def test_get_links_by_tags(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Ссылки по тегам запрашиваются c переданными тегами и режимом совпадения."""
+    link = LinkResponse(id=1, url="https://example.com", tags=["news", "tech"], filters=[])
+    mock_link_service.get_links_by_tags.return_value = [link]
+
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links/tags",
+        params={"tags": ["news", "tech"], "match_any": "true"},
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["links"] == [link.model_dump(mode="json")]
+    assert response.json()["size"] == 1
+    mock_link_service.get_links_by_tags.assert_awaited_once_with(
+        123456789,
+        ["news", "tech"],
+        ANY,
+        match_any=True,
+    )
+
+
+async def test_get_links_by_tags_requires_tags(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Запрос без тегов отклоняется валидацией."""
+    response = test_client.get(
+        f"{settings.scrapper_api_url}/links/tags",
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    mock_link_service.get_links_by_tags.assert_not_called()
+
+
+async def test_remove_links_by_tags(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    mock_list_cache: MagicMock,
+) -> None:
+    """Удалённые по тегам ссылки возвращаются и убираются из кэша списка."""
+    tg_chat_id = 123456789
+    removed = [
+        LinkResponse(id=link_id, url=f"https://example.com/{link_id}", tags=["news"], filters=[])
+        for link_id in (3, 5)
+    ]
+    mock_link_service.remove_links_by_tags.return_value = removed
+
+    response = test_client.request(
+        "DELETE",
+        f"{settings.scrapper_api_url}/links/tags",
+        json={"tags": ["news"]},
+        headers={"Tg-Chat-Id": str(tg_chat_id)},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["size"] == len(removed)
+    mock_link_service.remove_links_by_tags.assert_awaited_once_with(
+        tg_chat_id,
+        ["news"],
+        ANY,
+        match_any=False,
+    )
+    mock_list_cache.remove_from_list_cache.assert_awaited_once_with(tg_chat_id, 3, 5)
+
+
+async def test_remove_links_by_tags_chat_not_found(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Удаление по тегам в незарегистрированном чате возвращает 404."""
+    mock_link_service.remove_links_by_tags.side_effect = KeyError(
+        "Чат с идентификатором 1 не найден.",
+    )
+
+    response = test_client.request(
+        "DELETE",
+        f"{settings.scrapper_api_url}/links/tags",
+        json={"tags": ["news"]},
+        headers={"Tg-Chat-Id": "1"},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json()["exceptionMessage"] == "Чат с идентификатором 1 не найден."
+
+
+@pytest.mark.parametrize(("size", "invalidated"), [(2, True), (0, False)])
+async def test_set_muted_by_tags(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+    mock_list_cache: MagicMock,
+    size: int,
+    invalidated: bool,
+) -> None:
+    """Изменение уведомлений по тегам сбрасывает кэш списка, только если что-то изменилось."""
+    tg_chat_id = 123456789
+    mock_link_service.set_muted_by_tags.return_value = size
+
+    response = test_client.put(
+        f"{settings.scrapper_api_url}/links/tags/muted",
+        json={"tags": ["work"], "muted": True, "match_any": True},
+        headers={"Tg-Chat-Id": str(tg_chat_id)},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"size": size}
+    mock_link_service.set_muted_by_tags.assert_awaited_once_with(
+        tg_chat_id,
+        ["work"],
+        ANY,
+        muted=True,
+        match_any=True,
+    )
+    assert mock_list_cache.invalidate_list_cache.await_count == int(invalidated)
+
+
+async def test_set_muted_by_tags_chat_not_found(
+    test_client: TestClient,
+    mock_link_service: MagicMock,
+) -> None:
+    """Изменение уведомлений в незарегистрированном чате возвращает 404."""
+    mock_link_service.set_muted_by_tags.side_effect = KeyError(
+        "Чат с идентификатором 1 не найден.",
+    )
+
+    response = test_client.put(
+        f"{settings.scrapper_api_url}/links/tags/muted",
+        json={"tags": ["work"], "muted": False},
+        headers={"Tg-Chat-Id": "1"},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
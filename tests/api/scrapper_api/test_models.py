@@ -0,0 +1,47 @@
+import warnings
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import HttpUrl, ValidationError
+
+from src.api.scrapper_api.models import LinkResponse, ListLinksResponse
+
+
+def test_link_response_model_construct_serializes_without_warnings() -> None:
+    """LinkResponse, собранный из строки БД без валидации, сериализуется как валидный."""
+    trusted = LinkResponse.model_construct(
+        id=1,
+        url="https://example.com/",
+        tags=["tag1"],
+        filters=[],
+        last_updated=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    validated = LinkResponse(
+        id=1,
+        url="https://example.com",
+        tags=["tag1"],
+        filters=[],
+        last_updated=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        trusted_dump = ListLinksResponse(links=[trusted], size=1).model_dump(mode="json")
+
+    assert trusted_dump == ListLinksResponse(links=[validated], size=1).model_dump(mode="json")
+    assert trusted == validated
+
+
+@pytest.mark.parametrize("url", ["https://example.com", HttpUrl("https://example.com")])
+def test_link_response_url_is_normalized_str(url: str) -> None:
+    """URL ссылки проверяется как HttpUrl и хранится нормализованной строкой."""
+    link = LinkResponse(id=1, url=url, tags=[], filters=[])
+
+    assert link.url == "https://example.com/"
+    assert link.model_dump()["url"] == "https://example.com/"
+
+
+def test_link_response_rejects_invalid_url() -> None:
+    """Строка, не являющаяся HTTP(S) URL, не проходит валидацию."""
+    with pytest.raises(ValidationError):
+        LinkResponse(id=1, url="ftp://example.com", tags=[], filters=[])
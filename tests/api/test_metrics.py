@@ -0,0 +1,17 @@
+from fastapi import status
+from prometheus_client import CONTENT_TYPE_LATEST
+from starlette.testclient import TestClient
+
+from src.metrics import LINK_CHECKS
+
+
+def test_metrics_endpoint(test_client: TestClient) -> None:
+    """Эндпоинт /metrics отдаёт метрики в текстовом формате Prometheus."""
+    LINK_CHECKS.labels(client="github").inc()
+
+    response = test_client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == CONTENT_TYPE_LATEST
+    assert 'link_checks_total{client="github"}' in response.text
+    assert "upstream_request_duration_seconds" in response.text
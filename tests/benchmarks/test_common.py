@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.benchmarks.common import compare_results, percentile, write_results
+
+
+def test_percentile_empty() -> None:
+    """Перцентиль пустой выборки не определён."""
+    assert percentile([], 50) is None
+
+
+def test_percentile_single_value() -> None:
+    """Перцентиль выборки из одного значения равен этому значению."""
+    assert percentile([0.5], 99) == 0.5  # noqa: PLR2004
+
+
+def test_percentile() -> None:
+    """p50 и p99 вычисляются c интерполяцией."""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+
+
+def test_write_results_and_compare(tmp_path: Path) -> None:
+    """Результаты сохраняются в JSON и сравниваются c базовой версией."""
+    path = tmp_path / "baseline.json"
+    write_results(path, "scheduler", {"chats": 10}, {"summary": {"links_per_sec": 100.0}})
+
+    document = json.loads(path.read_text(encoding="utf-8"))
+    assert document["benchmark"] == "scheduler"
+    assert document["config"] == {"chats": 10}
+
+    changes = compare_results({"links_per_sec": 110.0, "digests": 3}, path)
+    assert changes == {"links_per_sec": pytest.approx(0.1)}
@@ -0,0 +1,68 @@
+from collections.abc import Generator
+
+import asyncpg
+import pytest
+from testcontainers.postgres import PostgresContainer
+
+from src.benchmarks.data_access import BACKENDS, OPERATIONS, RoundTrips, parse_args, run
+
+
+@pytest.fixture
+def postgres_url() -> Generator[str, None, None]:
+    """DSN пустой базы для бенчмарка."""
+    with PostgresContainer("postgres:15", driver=None) as postgres:
+        yield postgres.get_connection_url()
+
+
+def test_parse_args_defaults() -> None:
+    """По умолчанию замеряются все операции на обеих реализациях."""
+    args = parse_args([])
+    assert args.operations == list(OPERATIONS)
+    assert args.backends == list(BACKENDS)
+
+
+def test_parse_args_rejects_unknown_operation() -> None:
+    """Неизвестная операция отклоняется."""
+    with pytest.raises(SystemExit):
+        parse_args(["--operations", "get_links,drop_table"])
+
+
+def test_round_trips_counter() -> None:
+    """Счётчик увеличивается на каждый запрос независимо от аргументов колбэка."""
+    round_trips = RoundTrips()
+    round_trips.on_query(object())
+    round_trips.on_query("conn", "cursor", "SELECT 1", (), None, False)
+    assert round_trips.count == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_run_measures_every_operation(postgres_url: str) -> None:
+    """Каждая операция замеряется на обеих реализациях, после запуска таблицы пусты."""
+    args = parse_args(
+        [
+            "--sizes",
+            "5,10",
+            "--ops",
+            "3",
+            "--warmup",
+            "1",
+            "--alloc-samples",
+            "1",
+            "--chat-links",
+            "3",
+        ],
+    )
+
+    results = await run(args, postgres_url)
+
+    runs = results["runs"]
+    assert len(runs) == len(args.sizes) * len(OPERATIONS) * len(BACKENDS)
+    assert all(run["round_trips_per_call"] >= 1 for run in runs)
+    assert all(run["ops_per_sec"] > 0 for run in runs)
+    assert "SQL.get_links.10.ops_per_sec" in results["summary"]
+
+    conn = await asyncpg.connect(postgres_url)
+    try:
+        assert await conn.fetchval("SELECT count(*) FROM links") == 0
+    finally:
+        await conn.close()
@@ -0,0 +1,103 @@
+import argparse
+import json
+import random
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from src.benchmarks.http_load import (
+    LOAD_CHAT_ID_BASE,
+    SCENARIOS,
+    Traffic,
+    is_sustained,
+    parse_mix,
+    run_stage,
+)
+
+RATE: float = 200.0
+DURATION: float = 0.1
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    """Отвечает 200 на все запросы, кроме DELETE /links - на него 500."""
+    if request.method == "DELETE" and request.url.path.endswith("/links"):
+        return httpx.Response(HTTPStatus.INTERNAL_SERVER_ERROR)
+    return httpx.Response(HTTPStatus.OK, json={})
+
+
+def test_parse_mix() -> None:
+    """Смесь сценариев разбирается из строки, неизвестные сценарии отклоняются."""
+    assert parse_mix("get_links=3,add_link=1") == {"get_links": 3.0, "add_link": 1.0}
+    with pytest.raises(argparse.ArgumentTypeError, match="неизвестный сценарий"):
+        parse_mix("get_links=3,drop=1")
+    with pytest.raises(argparse.ArgumentTypeError, match="больше 0"):
+        parse_mix("get_links=0")
+
+
+@pytest.mark.parametrize(
+    ("throughput", "error_rate", "p99", "expected"),
+    [
+        (100.0, 0.0, 0.1, True),
+        (80.0, 0.0, 0.1, False),
+        (100.0, 0.5, 0.1, False),
+        (100.0, 0.0, 2.0, False),
+    ],
+)
+def test_is_sustained(throughput: float, error_rate: float, p99: float, expected: bool) -> None:
+    """Ступень выдержана, если темп, доля ошибок и p99 в допустимых пределах."""
+    stage = {
+        "offered_rate": 100.0,
+        "throughput": throughput,
+        "error_rate": error_rate,
+        "latency_p99": p99,
+    }
+    assert is_sustained(stage, slo_p99=0.5, max_error_rate=0.01) is expected
+
+
+@pytest.mark.asyncio
+async def test_remove_link_uses_tracked_links() -> None:
+    """DELETE /links отправляется только для ссылок, добавленных ранее."""
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append((request.method, json.loads(request.content)))
+        return httpx.Response(HTTPStatus.OK, json={})
+
+    traffic = Traffic(random.Random(1), chats=1)  # noqa: S311
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        base_url="http://app",
+    ) as client:
+        await traffic.remove_link(client)
+        await traffic.remove_link(client)
+
+    added, removed = sent
+    assert added[0] == "POST"
+    assert removed == ("DELETE", {"link": added[1]["link"]})
+    assert traffic.chat_links[LOAD_CHAT_ID_BASE] == []
+
+
+@pytest.mark.asyncio
+async def test_run_stage_counts_requests_and_errors() -> None:
+    """Ступень отправляет rate * duration запросов и считает ответы 5xx ошибками."""
+    traffic = Traffic(random.Random(1), chats=5)  # noqa: S311
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(_handler),
+        base_url="http://app",
+    ) as client:
+        stage = await run_stage(
+            client,
+            traffic,
+            {name: 1.0 for name in SCENARIOS},
+            RATE,
+            DURATION,
+            max_in_flight=100,
+        )
+
+    assert stage["sent"] == round(RATE * DURATION)
+    assert stage["dropped"] == 0
+    assert sum(stage["statuses"].values()) == stage["sent"]
+    failed = stage["statuses"].get("remove_link.500", 0)
+    assert stage["error_rate"] == pytest.approx(failed / stage["sent"])
+    assert stage["latency_p99"] is not None
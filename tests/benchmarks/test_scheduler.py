@@ -0,0 +1,88 @@
+import random
+from collections.abc import Generator
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.api.bot_api.models import UpdateEvent
+from src.benchmarks.scheduler import (
+    BENCH_CHAT_ID_BASE,
+    assign_links,
+    parse_args,
+    popularity_weights,
+    resource_urls,
+    run_sweeps,
+)
+from src.clients.client_factory import ClientFactory
+
+RESOURCES: int = 4
+SWEEPS: int = 2
+
+
+@pytest.fixture
+def mock_client() -> Generator[MagicMock, None, None]:
+    """Клиент, который находит обновление для каждого pecypca."""
+    client = MagicMock()
+    client.list_updates = AsyncMock(
+        return_value=[
+            UpdateEvent(
+                description="Новый PR",
+                title="Change",
+                username="octocat",
+                created_at=datetime.now(timezone.utc),
+                preview="...",
+            ),
+        ],
+    )
+    with patch.object(ClientFactory, "create_client", return_value=client):
+        yield client
+
+
+def test_resource_urls() -> None:
+    """Пул ресурсов делится между GitHub и StackOverflow в заданной пропорции."""
+    urls = resource_urls(RESOURCES, github_share=0.5)
+    assert len(urls) == RESOURCES
+    assert sum(url.startswith("https://github.com/") for url in urls) == RESOURCES // 2
+
+
+def test_popularity_weights() -> None:
+    """Beca Ципфа убывают c рангом, неизвестное распределение отклоняется."""
+    weights = popularity_weights(3, "zipf", 1.0)
+    assert weights == [1.0, 0.5, pytest.approx(1 / 3)]
+    assert popularity_weights(2, "uniform", 1.0) == [1.0, 1.0]
+    with pytest.raises(ValueError, match="Неизвестное распределение"):
+        popularity_weights(2, "pareto", 1.0)
+
+
+def test_assign_links_unique_per_chat() -> None:
+    """Подписки распределяются по чатам без повторов URL внутри чата."""
+    urls = resource_urls(20, github_share=0.5)
+    weights = popularity_weights(len(urls), "zipf", 1.1)
+    assignment = assign_links(3, 10, urls, weights, random.Random(1))  # noqa: S311
+
+    assert sorted(assignment) == [BENCH_CHAT_ID_BASE + i for i in range(3)]
+    assert [len(chat_urls) for chat_urls in assignment.values()] == [4, 3, 3]
+    assert all(len(set(chat_urls)) == len(chat_urls) for chat_urls in assignment.values())
+
+
+@pytest.mark.asyncio
+async def test_run_sweeps_memory_backend(mock_client: MagicMock) -> None:
+    """Проход по хранилищу в памяти проверяет каждый pecypc один раз и считает метрики."""
+    urls = resource_urls(RESOURCES, github_share=0.5)
+    assignment = {BENCH_CHAT_ID_BASE: urls[:3], BENCH_CHAT_ID_BASE + 1: urls[1:]}
+    links = sum(len(chat_urls) for chat_urls in assignment.values())
+    args = parse_args(["--backend", "memory", "--sweeps", str(SWEEPS)])
+
+    results = await run_sweeps(args, assignment)
+
+    first = results["sweeps"][0]
+    assert first["links"] == links
+    assert first["checks"] == RESOURCES
+    assert first["digests"] == len(assignment)
+    assert first["updates"] == links
+    # get_chats, get_links на каждый чат и set_last_updated на каждый pecypc.
+    assert first["db_calls"] == 1 + len(assignment) + RESOURCES
+    assert mock_client.list_updates.await_count == RESOURCES * SWEEPS
+    assert results["summary"]["checks"] == RESOURCES
+    assert results["summary"]["peak_rss_mb"] > 0
@@ -0,0 +1,52 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from src.bot import cache_codec
+from src.bot.cache_codec import CACHE_FORMAT_VERSION, get_cache_codec
+
+LINK = {
+    "id": 1,
+    "url": "https://example.com/",
+    "tags": ["тег", "tag"],
+    "filters": [],
+    "last_updated": "2023-10-01T12:00:00Z",
+    "muted": False,
+}
+
+
+@pytest.mark.parametrize("name", ["json", "msgpack"])
+def test_codec_roundtrip(name: str) -> None:
+    """Проверяет, что значение восстанавливается после кодирования."""
+    if name == "msgpack":
+        pytest.importorskip("msgpack")
+    codec = get_cache_codec(name)
+
+    data = codec.dumps(LINK)
+
+    assert isinstance(data, bytes)
+    assert codec.loads(data) == LINK
+
+
+def test_msgpack_is_more_compact_than_json() -> None:
+    """Проверяет, что msgpack даёт более компактное представление, чем JSON."""
+    pytest.importorskip("msgpack")
+
+    assert len(get_cache_codec("msgpack").dumps(LINK)) < len(get_cache_codec("json").dumps(LINK))
+
+
+def test_key_prefix_contains_codec_and_version() -> None:
+    """Проверяет, что ключи разных кодеков и версий формата не пересекаются."""
+    assert get_cache_codec("json").key_prefix == f"json.v{CACHE_FORMAT_VERSION}:"
+
+
+def test_msgpack_falls_back_to_json(mocker: MockerFixture) -> None:
+    """Проверяет использование JSON, если msgpack не установлен."""
+    mocker.patch.object(cache_codec, "msgpack", None)
+
+    assert get_cache_codec("MSGPACK").name == "json"
+
+
+def test_unknown_codec() -> None:
+    """Проверяет, что неизвестный кодек приводит к ValueError."""
+    with pytest.raises(ValueError, match="Неизвестный кодек кэша"):
+        get_cache_codec("pickle")
@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from src.bot.local_cache import LocalCache
+
+
+@pytest.fixture
+def mock_clock(mocker: MockerFixture) -> MagicMock:
+    """Фикстура для подмены time.monotonic в модуле кэша."""
+    return mocker.patch("src.bot.local_cache.time.monotonic", return_value=100.0)
+
+
+def test_get_returns_value_until_ttl_expires(mock_clock: MagicMock) -> None:
+    """Проверяет, что запись доступна до истечения TTL и удаляется после него."""
+    cache = LocalCache(max_size=10, ttl=5)
+    cache.set(1, ["a"])
+
+    mock_clock.return_value = 104.9
+    assert cache.get(1) == ["a"]
+
+    mock_clock.return_value = 105.0
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_set_evicts_least_recently_used() -> None:
+    """Проверяет вытеснение наименее востребованной записи при переполнении."""
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set(1, "first")
+    cache.set(2, "second")
+    cache.get(1)
+    cache.set(3, "third")
+
+    assert cache.get(1) == "first"
+    assert cache.get(2) is None
+    assert cache.get(3) == "third"
+
+
+def test_pop_and_clear() -> None:
+    """Проверяет удаление отдельной записи и полную очистку кэша."""
+    cache = LocalCache(max_size=10, ttl=60)
+    cache.set(1, "first")
+    cache.set(2, "second")
+
+    cache.pop(1)
+    cache.pop(42)
+    assert cache.get(1) is None
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
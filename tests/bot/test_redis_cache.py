@@ -0,0 +1,403 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from pytest_mock import MockerFixture
+
+from src.bot.cache_codec import get_cache_codec
+from src.bot.redis_cache import (
+    _REMOVE_LINKS_SCRIPT,
+    _SET_LIST_SCRIPT,
+    COMPLETE_FIELD,
+    ETAG_FIELD,
+    FRESH_UNTIL_FIELD,
+    LIMIT_FIELD,
+    LIST_CACHE_MAX_LINKS,
+    LIST_CACHE_STALE_EXPIRE,
+    LIST_PAGE_SIZE,
+    NEXT_FIELD,
+    ListCacheEntry,
+    RedisCache,
+)
+from src.settings import settings
+
+pytestmark = pytest.mark.asyncio
+
+CHAT_ID = 123
+LINKS = [
+    {"id": 2, "url": "https://example.org", "tags": [], "filters": []},
+    {"id": 10, "url": "https://example.com", "tags": ["tag"], "filters": []},
+]
+OTHER_CHAT_ID = 456
+CODEC = get_cache_codec(settings.redis.codec)
+LIST_KEY = CODEC.key_prefix + settings.redis.list_key.format(chat_id=CHAT_ID)
+OTHER_LIST_KEY = CODEC.key_prefix + settings.redis.list_key.format(chat_id=OTHER_CHAT_ID)
+
+
+def as_hash(
+    links: list[dict[str, Any]],
+    fresh_until: float | None = None,
+    etag: str | None = None,
+) -> dict[bytes, bytes]:
+    """Возвращает содержимое хэша списка в том виде, в котором ero отдаёт HGETALL.
+
+    По умолчанию список свежий ещё час.
+    """
+    if fresh_until is None:
+        fresh_until = time.time() + 3600
+    fields = {COMPLETE_FIELD.encode(): b"1", FRESH_UNTIL_FIELD.encode(): str(fresh_until).encode()}
+    if etag is not None:
+        fields[ETAG_FIELD.encode()] = etag.encode()
+    fields.update({str(link["id"]).encode(): CODEC.dumps(link) for link in reversed(links)})
+    return fields
+
+
+class FakePubSub:
+    """Подмена PubSub Redis: сообщения канала подаются через очередь."""
+
+    def __init__(self) -> None:
+        self.messages: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.subscribe = AsyncMock(side_effect=self._confirm)
+
+    async def _confirm(self, channel: str) -> None:
+        await self.messages.put({"type": "subscribe", "channel": channel, "data": 1})
+
+    async def __aenter__(self) -> "FakePubSub":
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        return None
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            yield await self.messages.get()
+
+
+@pytest.fixture
+def pubsub(mock_redis_asyncio: MagicMock) -> FakePubSub:
+    """Фикстура для подмены подписки на канал инвалидации."""
+    fake = FakePubSub()
+    mock_redis_asyncio.pubsub = MagicMock(return_value=fake)
+    mock_redis_asyncio.aclose = AsyncMock()
+    return fake
+
+
+@pytest_asyncio.fixture
+async def cache(pubsub: FakePubSub) -> AsyncGenerator[RedisCache, None]:  # noqa: ARG001
+    """Фикстура для RedisCache c активной подпиской на канал инвалидации."""
+    redis_cache = RedisCache(settings.redis.url)
+    await redis_cache.start()
+    for _ in range(10):
+        if redis_cache._local_enabled:  # noqa: SLF001
+            break
+        await asyncio.sleep(0)
+    yield redis_cache
+    await redis_cache.close()
+
+
+async def test_get_without_listener_always_reads_redis(mock_redis_asyncio: MagicMock) -> None:
+    """Проверяет, что без подписки на инвалидацию кэш первого уровня не используется."""
+    redis_cache = RedisCache(settings.redis.url)
+    mock_redis_asyncio.hgetall.return_value = as_hash(LINKS)
+
+    assert await redis_cache.get_list_cache(CHAT_ID) == LINKS
+    assert await redis_cache.get_list_cache(CHAT_ID) == LINKS
+
+    assert mock_redis_asyncio.hgetall.await_count == 2  # noqa: PLR2004
+    assert len(redis_cache.local) == 0
+
+
+async def test_repeated_get_is_served_locally(
+    cache: RedisCache,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет, что повторное чтение обслуживается кэшем первого уровня."""
+    mock_redis_asyncio.hgetall.return_value = as_hash(LINKS)
+
+    assert await cache.get_list_cache(CHAT_ID) == LINKS
+    assert await cache.get_list_cache(CHAT_ID) == LINKS
+
+    mock_redis_asyncio.hgetall.assert_awaited_once_with(LIST_KEY)
+
+
+async def test_set_populates_both_levels(
+    cache: RedisCache,
+    mock_redis_asyncio: MagicMock,
+    mocker: MockerFixture,
+) -> None:
+    """Проверяет, что запись попадает и в Redis, и в кэш первого уровня."""
+    mocker.patch("src.bot.redis_cache.time.time", return_value=1000.0)
+    script = mock_redis_asyncio.register_script.return_value
+
+    assert await cache.set_list_cache(CHAT_ID, LINKS, 4, etag='"123.4"') is True
+
+    mock_redis_asyncio.register_script.assert_called_once_with(_SET_LIST_SCRIPT)
+    script.assert_awaited_once_with(
+        keys=[LIST_KEY],
+        args=[
+            4,
+            "1300.0",
+            '"123.4"',
+            300 + LIST_CACHE_STALE_EXPIRE,
+            settings.redis.invalidation_channel,
+            CHAT_ID,
+            LIST_PAGE_SIZE,
+            "",
+            "2",
+            CODEC.dumps(LINKS[0]),
+            "10",
+            CODEC.dumps(LINKS[1]),
+        ],
+    )
+    assert await cache.get_list_cache(CHAT_ID) == LINKS
+    mock_redis_asyncio.hgetall.assert_not_awaited()
+
+
+async def test_set_first_page_of_long_list(
+    cache: RedisCache,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет, что первая страница длинного списка кэшируется c курсором следующей."""
+    script = mock_redis_asyncio.register_script.return_value
+
+    assert await cache.set_list_cache(CHAT_ID, LINKS, 4, limit=2, next_after_id=10) is True
+
+    assert script.await_args.kwargs["args"][6:8] == [2, 10]
+    assert await cache.get_list_entry(CHAT_ID, 2) == ListCacheEntry(
+        links=LINKS,
+        etag=None,
+        fresh=True,
+        next_after_id=10,
+        limit=2,
+    )
+    assert await cache.get_list_entry(CHAT_ID, 3) is None
+    mock_redis_asyncio.hgetall.assert_not_awaited()
+
+
+async def test_set_page_over_cap_is_not_cached(mock_redis_asyncio: MagicMock) -> None:
+    """Проверяет, что страница больше LIST_CACHE_MAX_LINKS не кэшируется."""
+    redis_cache = RedisCache(settings.redis.url)
+
+    assert (
+        await redis_cache.set_list_cache(CHAT_ID, LINKS, 1, limit=LIST_CACHE_MAX_LINKS + 1) is False
+    )
+
+    mock_redis_asyncio.register_script.assert_not_called()
+
+
+async def test_get_entry_with_other_limit_is_a_miss(mock_redis_asyncio: MagicMock) -> None:
+    """Проверяет, что страница, закэшированная c другим размером, не используется."""
+    redis_cache = RedisCache(settings.redis.url)
+    mock_redis_asyncio.hgetall.return_value = {
+        **as_hash(LINKS),
+        LIMIT_FIELD.encode(): b"2",
+        NEXT_FIELD.encode(): b"10",
+    }
+
+    assert await redis_cache.get_list_entry(CHAT_ID, 5) is None
+    entry = await redis_cache.get_list_entry(CHAT_ID, 2)
+    assert entry is not None
+    assert entry.next_after_id == 10  # noqa: PLR2004
+
+
+async def test_set_older_version_is_not_cached_locally(
+    cache: RedisCache,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет, что список, не записанный из-за более новой версии в Redis, не кэшируется."""
+    mock_redis_asyncio.register_script.return_value.return_value = 0
+    mock_redis_asyncio.hgetall.return_value = as_hash(LINKS[:1])
+
+    assert await cache.set_list_cache(CHAT_ID, LINKS, 3) is False
+
+    assert await cache.get_list_cache(CHAT_ID) == LINKS[:1]
+    mock_redis_asyncio.hgetall.assert_awaited_once_with(LIST_KEY)
+
+
+async def test_cached_empty_list_is_a_hit(mock_redis_asyncio: MagicMock) -> None:
+    """Проверяет, что закэшированный пустой список отличается от отсутствующего кэша."""
+    redis_cache = RedisCache(settings.redis.url)
+
+    assert await redis_cache.get_list_cache(CHAT_ID) is None
+
+    mock_redis_asyncio.hgetall.return_value = as_hash([])
+    assert await redis_cache.get_list_cache(CHAT_ID) == []
+
+
+async def test_stale_list_is_kept_for_revalidation(mock_redis_asyncio: MagicMock) -> None:
+    """Проверяет, что устаревший список не отдаётся как свежий, но доступен вместе c ETag."""
+    redis_cache = RedisCache(settings.redis.url)
+    mock_redis_asyncio.hgetall.return_value = as_hash(LINKS, fresh_until=0.0, etag='"1.2"')
+
+    assert await redis_cache.get_list_cache(CHAT_ID) is None
+    assert await redis_cache.get_list_entry(CHAT_ID) == ListCacheEntry(
+        links=LINKS,
+        etag='"1.2"',
+        fresh=False,
+    )
+
+
+async def test_partial_hash_is_a_miss(mock_redis_asyncio: MagicMock) -> None:
+    """Проверяет, что хэш без признака полного списка не считается списком."""
+    redis_cache = RedisCache(settings.redis.url)
+    mock_redis_asyncio.hgetall.return_value = {FRESH_UNTIL_FIELD.encode(): b"9999999999"}
+
+    assert await redis_cache.get_list_entry(CHAT_ID) is None
+
+
+async def test_touch_extends_freshness(
+    cache: RedisCache,
+    mock_redis_asyncio: MagicMock,
+    mocker: MockerFixture,
+) -> None:
+    """Проверяет, что подтверждённый список снова становится свежим без перезаписи ссылок."""
+    mocker.patch("src.bot.redis_cache.time.time", return_value=1000.0)
+    entry = ListCacheEntry(links=LINKS, etag='"1.2"', fresh=False)
+
+    await cache.touch_list_cache(CHAT_ID, entry)
+
+    pipe = mock_redis_asyncio.pipeline.return_value
+    pipe.hset.assert_called_once_with(LIST_KEY, FRESH_UNTIL_FIELD, "1300.0")
+    pipe.expire.assert_called_once_with(LIST_KEY, 300 + LIST_CACHE_STALE_EXPIRE)
+    pipe.delete.assert_not_called()
+    assert await cache.get_list_cache(CHAT_ID) == LINKS
+    mock_redis_asyncio.hgetall.assert_not_awaited()
+
+
+async def test_add_to_list_cache_runs_conditional_script(mock_redis_asyncio: MagicMock) -> None:
+    """Проверяет, что ссылка добавляется в хэш одним вызовом скрипта."""
+    redis_cache = RedisCache(settings.redis.url)
+    script = mock_redis_asyncio.register_script.return_value
+    script.return_value = 0
+
+    assert await redis_cache.add_to_list_cache(CHAT_ID, LINKS[0]) is False
+
+    script.assert_awaited_once_with(
+        keys=[LIST_KEY],
+        args=[
+            "2",
+            CODEC.dumps(LINKS[0]),
+            300 + LIST_CACHE_STALE_EXPIRE,
+            settings.redis.invalidation_channel,
+            CHAT_ID,
+        ],
+    )
+
+
+async def test_remove_from_list_cache(
+    cache: RedisCache,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет удаление ссылки скриптом и c6poc кэша первого уровня."""
+    await cache.set_list_cache(CHAT_ID, LINKS, 1)
+    mock_redis_asyncio.register_script.reset_mock()
+
+    await cache.remove_from_list_cache(CHAT_ID, 10)
+
+    mock_redis_asyncio.register_script.assert_called_once_with(_REMOVE_LINKS_SCRIPT)
+    mock_redis_asyncio.register_script.return_value.assert_awaited_with(
+        keys=[LIST_KEY],
+        args=[settings.redis.invalidation_channel, CHAT_ID, "10"],
+    )
+    assert cache.local.get(CHAT_ID) is None
+
+
+async def test_remove_many_from_list_cache(
+    cache: RedisCache,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет удаление нескольких ссылок одним вызовом скрипта."""
+    await cache.remove_from_list_cache(CHAT_ID, 10, 11)
+
+    mock_redis_asyncio.register_script.return_value.assert_awaited_once_with(
+        keys=[LIST_KEY],
+        args=[settings.redis.invalidation_channel, CHAT_ID, "10", "11"],
+    )
+
+
+async def test_remove_from_list_cache_without_ids(
+    cache: RedisCache,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет, что без идентификаторов Redis не вызывается."""
+    await cache.remove_from_list_cache(CHAT_ID)
+
+    mock_redis_asyncio.register_script.assert_not_called()
+
+
+async def test_invalidate_publishes_chat_id(
+    cache: RedisCache,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет удаление записи на обоих уровнях и публикацию в канал инвалидации."""
+    await cache.set_list_cache(CHAT_ID, LINKS, 1)
+
+    await cache.invalidate_list_cache(CHAT_ID)
+
+    assert cache.local.get(CHAT_ID) is None
+    pipe = mock_redis_asyncio.pipeline.return_value
+    pipe.delete.assert_called_with(LIST_KEY)
+    pipe.publish.assert_called_with(settings.redis.invalidation_channel, CHAT_ID)
+
+
+async def test_invalidation_message_drops_local_entry(
+    cache: RedisCache,
+    pubsub: FakePubSub,
+) -> None:
+    """Проверяет, что сообщение от другой реплики удаляет запись из кэша первого уровня."""
+    await cache.set_list_cache(CHAT_ID, LINKS, 1)
+
+    await pubsub.messages.put({"type": "message", "data": str(CHAT_ID).encode()})
+    for _ in range(10):
+        if cache.local.get(CHAT_ID) is None:
+            break
+        await asyncio.sleep(0)
+
+    assert cache.local.get(CHAT_ID) is None
+
+
+async def test_close_disables_local_cache(cache: RedisCache, mock_redis_asyncio: MagicMock) -> None:
+    """Проверяет, что после остановки подписки кэш первого уровня очищается и отключается."""
+    await cache.set_list_cache(CHAT_ID, LINKS, 1)
+
+    await cache.close()
+
+    assert len(cache.local) == 0
+    mock_redis_asyncio.aclose.assert_awaited()
+
+
+async def test_get_many_reads_misses_in_one_pipeline(
+    cache: RedisCache,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет, что списки, отсутствующие в кэше первого уровня, читаются одним конвейером."""
+    other_links = [{"id": 3, "url": "https://example.net", "tags": [], "filters": []}]
+    await cache.set_list_cache(CHAT_ID, LINKS, 1)
+    pipe = mock_redis_asyncio.pipeline.return_value
+    pipe.reset_mock()
+    pipe.execute.return_value = [as_hash(other_links), {}]
+
+    result = await cache.get_many([CHAT_ID, OTHER_CHAT_ID, 789, OTHER_CHAT_ID])
+
+    assert result == {CHAT_ID: LINKS, OTHER_CHAT_ID: other_links, 789: None}
+    assert pipe.hgetall.call_count == 2  # noqa: PLR2004
+    pipe.hgetall.assert_any_call(OTHER_LIST_KEY)
+    pipe.execute.assert_awaited_once()
+
+
+async def test_invalidate_many_deletes_keys_with_one_command(
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет, что несколько списков удаляются одной командой DEL в конвейере."""
+    redis_cache = RedisCache(settings.redis.url)
+
+    await redis_cache.invalidate_many([CHAT_ID, OTHER_CHAT_ID, CHAT_ID])
+
+    pipe = mock_redis_asyncio.pipeline.return_value
+    pipe.delete.assert_called_once_with(LIST_KEY, OTHER_LIST_KEY)
+    assert pipe.publish.call_count == 2  # noqa: PLR2004
+    pipe.execute.assert_awaited_once()
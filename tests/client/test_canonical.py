@@ -0,0 +1,47 @@
+from urllib.parse import urlparse
+
+import pytest
+
+from src.clients.canonical import CANONICALIZERS, canonical_key
+from src.clients.client_factory import ClientFactory
+
+
+@pytest.mark.parametrize(
+    ("url", "expected_key"),
+    [
+        ("https://github.com/owner/repo", "github.com/owner/repo"),
+        ("https://github.com/owner/repo/", "github.com/owner/repo"),
+        ("https://WWW.GitHub.com/Owner/Repo/pulls?state=open#top", "github.com/owner/repo"),
+        ("https://github.com/owner/repo.git", "github.com/owner/repo"),
+        ("https://github.com/owner", "github.com/owner"),
+        ("https://stackoverflow.com/questions/123/some-title", "stackoverflow.com/questions/123"),
+        ("https://stackoverflow.com/questions/123?tab=votes", "stackoverflow.com/questions/123"),
+        ("https://stackoverflow.com/users/42/name", "stackoverflow.com/users/42/name"),
+        ("https://Example.com/Some/Path/?q=1", "example.com/Some/Path"),
+    ],
+    ids=[
+        "github",
+        "github_trailing_slash",
+        "github_case_subpath_query",
+        "github_git_suffix",
+        "github_owner_only",
+        "stackoverflow_slug",
+        "stackoverflow_query",
+        "stackoverflow_not_question",
+        "unknown_service",
+    ],
+)
+def test_canonical_key(url: str, expected_key: str) -> None:
+    """Проверяет, что разные написания одного pecypca дают один канонический ключ."""
+    assert canonical_key(url) == expected_key
+
+
+def test_canonical_key_accepts_parsed_url() -> None:
+    """Проверяет, что канонический ключ можно получить из уже разобранного URL."""
+    url = "https://github.com/owner/repo/issues/1"
+    assert canonical_key(urlparse(url)) == canonical_key(url)
+
+
+def test_canonicalizers_match_clients() -> None:
+    """Проверяет, что для каждого клиента фабрики зарегистрированы правила канонизации."""
+    assert CANONICALIZERS.keys() == ClientFactory._clients.keys()  # noqa: SLF001
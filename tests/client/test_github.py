@@ -9,6 +9,7 @@ from pytest_mock import MockerFixture
 from src.api.bot_api.models import UpdateEvent
 from src.clients.client_settings import ClientSettings
 from src.clients.github import GitHubClient
+from src.serializer import dumps
 
 pytestmark = pytest.mark.asyncio
 
@@ -24,8 +25,8 @@ def mock_http_client_ok(mocker: MockerFixture) -> AsyncMock:
     """Фикстура для успешного ответа HTTP-клиента."""
     mock_response = Mock()
     mock_response.status_code = httpx.codes.OK
-    mock_response.json = Mock(
-        return_value=[
+    mock_response.content = dumps(
+        [
             {
                 "type": "PullRequestEvent",
                 "created_at": "2024-01-02T12:00:00Z",
@@ -164,6 +165,7 @@ async def test_create_update_event_pull_request(settings: ClientSettings) -> Non
         username="octocat",
         created_at=datetime(2024, 1, 2, 12, 0, 0, tzinfo=timezone.utc),
         preview="This is a pull request",
+        event_type="pull_request",
     )
 
 
@@ -190,6 +192,7 @@ async def test_create_update_event_issue(settings: ClientSettings) -> None:
         username="octocat",
         created_at=datetime(2024, 1, 2, 12, 0, 0, tzinfo=timezone.utc),
         preview="This is an issue",
+        event_type="issue",
     )
 
 
@@ -220,6 +223,7 @@ async def test_check_updates_true(mock_http_client_ok: AsyncMock, settings: Clie
         username="octocat",
         created_at=datetime(2024, 1, 2, 12, 0, 0, tzinfo=timezone.utc),
         preview="This is a pull request",
+        event_type="pull_request",
     )
     mock_http_client_ok.assert_awaited_once_with(
         f"{client.base_url}/repos/octocat/Hello-World/events",
@@ -227,6 +231,42 @@ async def test_check_updates_true(mock_http_client_ok: AsyncMock, settings: Clie
     )
 
 
+async def test_list_updates_returns_all_new_events(
+    mocker: MockerFixture,
+    settings: ClientSettings,
+) -> None:
+    """Возвращает все новые события репозитория от новых к старым."""
+
+    def event(event_type: str, key: str, login: str, created_at: str) -> dict[str, object]:
+        return {
+            "type": event_type,
+            "created_at": created_at,
+            "payload": {key: {"title": "Title", "user": {"login": login}, "body": ""}},
+        }
+
+    mock_response = Mock()
+    mock_response.content = dumps(
+        [
+            event("IssuesEvent", "issue", "octocat", "2024-01-02T10:00:00Z"),
+            event("PullRequestEvent", "pull_request", "dependabot", "2024-01-03T12:00:00Z"),
+            event("PushEvent", "push", "octocat", "2024-01-04T12:00:00Z"),
+            event("IssuesEvent", "issue", "old", "2023-12-31T12:00:00Z"),
+        ],
+    )
+    mocker.patch.object(httpx.AsyncClient, "get", new=AsyncMock(return_value=mock_response))
+    client = GitHubClient(settings)
+
+    updates = await client.list_updates(
+        urlparse("https://github.com/octocat/Hello-World"),
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+    assert [(update.username, update.event_type) for update in updates] == [
+        ("dependabot", "pull_request"),
+        ("octocat", "issue"),
+    ]
+
+
 async def test_check_updates_false(
     mock_http_client_ok: AsyncMock,
     settings: ClientSettings,
@@ -273,7 +313,7 @@ async def test_check_updates_empty_events(mocker: MockerFixture, settings: Clien
 
     mock_response = Mock()
     mock_response.status_code = httpx.codes.OK
-    mock_response.json = Mock(return_value=[])
+    mock_response.content = dumps([])
     mock_get = mocker.patch.object(
         httpx.AsyncClient,
         "get",
@@ -9,6 +9,7 @@ from pytest_mock import MockerFixture
 from src.api.bot_api.models import UpdateEvent
 from src.clients.client_settings import ClientSettings
 from src.clients.stack_overflow import StackOverflowClient
+from src.serializer import dumps
 
 pytestmark = pytest.mark.asyncio
 
@@ -30,8 +31,8 @@ def mock_http_client_ok(mocker: MockerFixture) -> AsyncMock:
     """Фикстура для успешного HTTP-запроса."""
     mock_response = Mock()
     mock_response.status_code = httpx.codes.OK
-    mock_response.json = Mock(
-        return_value={
+    mock_response.content = dumps(
+        {
             "items": [
                 {
                     "question_id": 123,
@@ -110,7 +111,7 @@ async def test_get_question_no_items(
     question_id = "456"
     mock_response = Mock()
     mock_response.status_code = httpx.codes.OK
-    mock_response.json = Mock(return_value={"items": []})
+    mock_response.content = dumps({"items": []})
     mock_response.raise_for_status = Mock()
     mock_get = mocker.patch.object(
         httpx.AsyncClient,
@@ -215,6 +216,7 @@ async def test_create_update_event_with_answer(stackoverflow_client: StackOverfl
         username="test_user",
         created_at=last_activity_date,
         preview="This is an answer",
+        event_type="answer",
     )
 
 
@@ -244,6 +246,7 @@ async def test_create_update_event_with_comment(stackoverflow_client: StackOverf
         username="commenter",
         created_at=last_activity_date,
         preview="This is a comment",
+        event_type="comment",
     )
 
 
@@ -276,6 +279,7 @@ async def test_check_updates_true(
         username="test_user",
         created_at=datetime(2024, 3, 3, 13, 0, 0, tzinfo=timezone.utc),
         preview="This is an answer",
+        event_type="answer",
     )
     mock_http_client_ok.assert_awaited_once_with(
         f"{stackoverflow_client.base_url}/questions/123",
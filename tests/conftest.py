@@ -14,7 +14,8 @@ from telethon import TelegramClient
 from telethon.events import NewMessage
 from testcontainers.postgres import PostgresContainer
 
-from src.api import router
+from src.api import metrics, router
+from src.bot.redis_cache import redis_cache
 from src.db.orm_service.models.base import Base
 from src.server import default_lifespan
 
@@ -48,6 +49,8 @@ def mock_memory_storage(mocker: MockerFixture) -> Mock:
     storage.get_data = mocker.AsyncMock(return_value={})
     storage.set_data = mocker.AsyncMock()
     storage.clear = mocker.AsyncMock()
+    storage.get_record = mocker.AsyncMock(return_value=(None, None))
+    storage.set_record = mocker.AsyncMock()
     return storage
 
 
@@ -58,6 +61,7 @@ def fast_api_application() -> FastAPI:
         lifespan=default_lifespan,
     )
     app.include_router(router=router, prefix="/api/v1")
+    app.include_router(router=metrics.router)
     return app
 
 
@@ -114,5 +118,18 @@ def mock_redis_asyncio(mocker: MockerFixture) -> MagicMock:
     mock_redis.get = AsyncMock(return_value=None)
     mock_redis.set = AsyncMock()
     mock_redis.delete = AsyncMock()
+    mock_redis.publish = AsyncMock()
+    mock_redis.hgetall = AsyncMock(return_value={})
+    mock_redis.register_script = MagicMock(return_value=AsyncMock(return_value=1))
+    mock_pipeline = MagicMock()
+    mock_pipeline.execute = AsyncMock(return_value=[])
+    mock_pipeline.__aenter__.return_value = mock_pipeline
+    mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
+    mock_redis.aclose = AsyncMock()
     mocker.patch("redis.asyncio.from_url", AsyncMock(return_value=mock_redis))
+    mocker.patch("redis.asyncio.Redis.from_pool", return_value=mock_redis)
+    # Пул общего кэша мог быть создан в lifespan сессионного test_client до подмены Redis.
+    mocker.patch.object(redis_cache, "_redis", None)
+    mocker.patch.object(redis_cache, "_put_link_script", None)
+    mocker.patch.object(redis_cache, "_set_list_script", None)
     return mock_redis
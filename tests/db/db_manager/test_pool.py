@@ -0,0 +1,211 @@
+import asyncio
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import Gauge
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from testcontainers.postgres import PostgresContainer
+
+from src.db.db_manager.base import AcquireTracker, PoolStats
+from src.db.db_manager.orm_manager import ORMDBManager
+from src.db.db_manager.sql_manager import SQLDBManager
+from src.db.orm_service.models.base import Base
+from src.metrics import DB_POOL_ACQUIRE_LATENCY, DB_POOL_CONNECTIONS, DB_POOL_WAITERS
+from src.settings import settings
+
+
+async def _create_schema(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def postgres_url() -> Iterator[str]:
+    with PostgresContainer("postgres:15", driver="asyncpg") as postgres:
+        url = postgres.get_connection_url()
+        asyncio.run(_create_schema(url))
+        yield url
+
+
+@pytest.fixture
+def db_settings(postgres_url: str) -> Iterator[None]:
+    with (
+        patch.object(settings.db, "orm_url", postgres_url),
+        patch.object(
+            settings.db,
+            "sql_url",
+            postgres_url.replace("postgresql+asyncpg://", "postgresql://"),
+        ),
+        patch.object(settings.db, "pool_size", 2),
+        patch.object(settings.db, "pool_min_size", 1),
+        patch.object(settings.db, "max_overflow", 0),
+    ):
+        yield
+
+
+def _acquire_count(manager: str) -> float:
+    for metric in DB_POOL_ACQUIRE_LATENCY.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels == {"manager": manager}:
+                return sample.value
+    return 0.0
+
+
+def _gauge(gauge: Gauge, **labels: str) -> float:
+    for metric in gauge.collect():
+        for sample in metric.samples:
+            if sample.labels == labels:
+                return sample.value
+    raise AssertionError(f"Нет значения метрики с метками {labels}")
+
+
+def test_acquire_tracker_counts_waiters() -> None:
+    """Проверяет учёт ожидающих внутри acquiring и запись времени ожидания."""
+    tracker = AcquireTracker("test")
+    before = _acquire_count("test")
+
+    with tracker.acquiring():
+        assert tracker.waiters == 1
+        with tracker.acquiring():
+            assert tracker.waiters == 2  # noqa: PLR2004
+
+    assert tracker.waiters == 0
+    assert _acquire_count("test") == before + 2
+
+
+def test_acquire_tracker_releases_waiter_on_error() -> None:
+    """Проверяет, что ошибка ожидания соединения не оставляет ожидающего в счётчике."""
+    tracker = AcquireTracker("test")
+
+    with pytest.raises(TimeoutError), tracker.acquiring():
+        raise TimeoutError
+
+    assert tracker.waiters == 0
+
+
+def test_sql_pool_stats_before_start() -> None:
+    """Проверяет, что до start пул считается пустым."""
+    manager = SQLDBManager()
+
+    assert manager.pool_stats() == PoolStats(
+        size=0,
+        max_size=settings.db.pool_size,
+        in_use=0,
+        idle=0,
+        waiters=0,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("db_settings")
+async def test_sql_manager_pool_stats() -> None:
+    """Проверяет размеры пула asyncpg, учёт занятых соединений и ожидающих."""
+    manager = SQLDBManager()
+    await manager.start()
+    try:
+        assert manager.pool is not None
+        assert manager.pool_stats().max_size == 2  # noqa: PLR2004
+
+        async with manager.pool.acquire(), manager.pool.acquire():
+            stats = manager.pool_stats()
+            assert stats.in_use == 2  # noqa: PLR2004
+            assert stats.idle == 0
+            assert _gauge(DB_POOL_CONNECTIONS, manager="sql", state="in_use") == 2  # noqa: PLR2004
+
+            waiter = asyncio.create_task(manager.pool.fetchval("SELECT 1"))
+            await asyncio.sleep(0.05)
+            assert manager.pool_stats().waiters == 1
+            assert _gauge(DB_POOL_WAITERS, manager="sql") == 1
+
+        assert await waiter == 1
+        assert manager.pool_stats().in_use == 0
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("db_settings")
+async def test_sql_manager_acquire_timeout() -> None:
+    """Проверяет, что ожидание соединения ограничено pool_timeout."""
+    manager = SQLDBManager()
+    with patch.object(settings.db, "pool_timeout", 0.05):
+        await manager.start()
+        try:
+            assert manager.pool is not None
+            async with manager.pool.acquire(), manager.pool.acquire():
+                with pytest.raises(asyncio.TimeoutError):
+                    await manager.pool.fetchval("SELECT 1")
+            assert manager.pool_stats().waiters == 0
+        finally:
+            await manager.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("db_settings")
+async def test_sql_manager_tracks_acquire() -> None:
+    """Проверяет учёт времени выдачи соединения при await, async with и методах пула."""
+    manager = SQLDBManager()
+    await manager.start()
+    try:
+        assert manager.pool is not None
+        before = _acquire_count("sql")
+
+        conn = await manager.pool.acquire()
+        await manager.pool.release(conn)
+        async with manager.pool.acquire() as conn:
+            assert await conn.fetchval("SELECT 1") == 1
+        assert await manager.pool.fetchval("SELECT 1") == 1
+
+        assert _acquire_count("sql") == before + 3
+        assert manager.pool_stats().waiters == 0
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("db_settings")
+async def test_sql_manager_expires_connections() -> None:
+    """Проверяет, что соединения переоткрываются по истечении max_lifetime."""
+    manager = SQLDBManager()
+    with patch.object(settings.db, "max_lifetime", 0.05):
+        await manager.start()
+        try:
+            assert manager.pool is not None
+            first = await manager.pool.fetchval("SELECT pg_backend_pid()")
+            await asyncio.sleep(0.1)
+            second = await manager.pool.fetchval("SELECT pg_backend_pid()")
+            assert first != second
+        finally:
+            await manager.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("db_settings")
+async def test_orm_manager_pool_stats() -> None:
+    """Проверяет учёт соединений и ожидающих в пуле SQLAlchemy."""
+    manager = ORMDBManager()
+    before = _acquire_count("orm")
+    try:
+        async with manager.engine.connect(), manager.engine.connect():
+            stats = manager.pool_stats()
+            assert stats.in_use == 2  # noqa: PLR2004
+            assert stats.max_size == 2  # noqa: PLR2004
+
+            async def query() -> int:
+                async with manager.session_factory() as session:
+                    return (await session.execute(text("SELECT 1"))).scalar_one()
+
+            waiter = asyncio.create_task(query())
+            await asyncio.sleep(0.05)
+            assert manager.pool_stats().waiters == 1
+
+        assert await waiter == 1
+        stats = manager.pool_stats()
+        assert (stats.in_use, stats.idle, stats.waiters) == (0, 2, 0)
+        assert _acquire_count("orm") == before + 3
+    finally:
+        await manager.close()
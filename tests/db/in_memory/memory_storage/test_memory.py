@@ -1,9 +1,12 @@
 from typing import Any, Generator
+from unittest.mock import MagicMock
 
 import pytest
+from pytest_mock import MockerFixture
 
+from src.db.in_memory.memory_storage.base import StorageKey
 from src.db.in_memory.memory_storage.enum_states import State
-from src.db.in_memory.memory_storage.memory import MemoryStorage, StorageKey
+from src.db.in_memory.memory_storage.memory import MemoryStorage
 
 pytestmark = pytest.mark.asyncio
 
@@ -66,9 +69,9 @@ async def test_set_and_get_data(
 @pytest.mark.parametrize(
     ("chat_id", "user_id", "initial_state", "initial_data", "expected_state", "expected_data"),
     [
-        (1, 123, State.WAITING_FOR_TAGS, {"key": "value"}, None, {}),
-        (2, 456, State.WAITING_FOR_FILTERS, {"a": 1}, None, {}),
-        (3, 789, None, {"a": 1, "b": 2}, None, {}),
+        (1, 123, State.WAITING_FOR_TAGS, {"key": "value"}, None, None),
+        (2, 456, State.WAITING_FOR_FILTERS, {"a": 1}, None, None),
+        (3, 789, None, {"a": 1, "b": 2}, None, None),
     ],
     ids=["clear_active", "clear_inactive", "clear_with_data"],
 )
@@ -78,9 +81,9 @@ async def test_clear(
     initial_state: State,
     initial_data: dict[str, Any],
     expected_state: State,
-    expected_data: dict[str, Any],
+    expected_data: dict[str, Any] | None,
 ) -> None:
-    """Проверяет метод clear, который сбрасывает состояние в None и очищает данные."""
+    """Проверяет метод clear, который удаляет запись вместе c состоянием и данными."""
     storage = MemoryStorage()
     key = StorageKey(chat_id=chat_id, user_id=user_id)
     await storage.set_state(key, initial_state)
@@ -90,6 +93,7 @@ async def test_clear(
     result_data = await storage.get_data(key)
     assert result_state == expected_state
     assert result_data == expected_data
+    assert key not in storage.storage
 
 
 async def test_multiple_keys() -> None:
@@ -111,3 +115,56 @@ async def test_multiple_keys() -> None:
     assert data1 == {"url": "https://example1.com"}
     assert state2 == State.WAITING_FOR_FILTERS
     assert data2 == {"url": "https://example2.com"}
+
+
+@pytest.fixture
+def mock_clock(mocker: MockerFixture) -> MagicMock:
+    """Фикстура для подмены time.monotonic в модуле хранилища."""
+    return mocker.patch(
+        "src.db.in_memory.memory_storage.memory.time.monotonic",
+        return_value=1000.0,
+    )
+
+
+async def test_record_expires_after_ttl(mock_clock: MagicMock) -> None:
+    """Проверяет, что запись недоступна и удаляется после истечения TTL."""
+    storage = MemoryStorage(ttl=60)
+    key = StorageKey(chat_id=1, user_id=123)
+    await storage.set_record(key, State.WAITING_FOR_TAGS, {"url": "https://example.com"})
+
+    mock_clock.return_value = 1059.0
+    assert await storage.get_record(key) == (
+        State.WAITING_FOR_TAGS,
+        {"url": "https://example.com"},
+    )
+
+    mock_clock.return_value = 1060.0
+    assert await storage.get_record(key) == (None, None)
+    assert key not in storage.storage
+
+
+async def test_write_extends_ttl(mock_clock: MagicMock) -> None:
+    """Проверяет, что запись продлевает срок жизни существующей записи."""
+    storage = MemoryStorage(ttl=60)
+    key = StorageKey(chat_id=1, user_id=123)
+    await storage.set_state(key, State.WAITING_FOR_TAGS)
+
+    mock_clock.return_value = 1050.0
+    await storage.set_data(key, {"tags": ["a"]})
+
+    mock_clock.return_value = 1100.0
+    assert await storage.get_state(key) == State.WAITING_FOR_TAGS
+
+
+async def test_write_evicts_expired_records(mock_clock: MagicMock) -> None:
+    """Проверяет, что периодическая очистка удаляет просроченные записи других ключей."""
+    storage = MemoryStorage(ttl=60)
+    stale = StorageKey(chat_id=1, user_id=123)
+    fresh = StorageKey(chat_id=2, user_id=456)
+    await storage.set_state(stale, State.WAITING_FOR_TAGS)
+
+    mock_clock.return_value = 1120.0
+    await storage.set_state(fresh, State.WAITING_FOR_FILTERS)
+
+    assert stale not in storage.storage
+    assert fresh in storage.storage
@@ -0,0 +1,106 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import redis.asyncio as redis
+
+from src.bot.redis_cache import redis_cache
+from src.db.in_memory.memory_storage.base import StorageKey
+from src.db.in_memory.memory_storage.enum_states import State
+from src.db.in_memory.memory_storage.redis_storage import RedisStorage
+from src.serializer import dumps
+
+pytestmark = pytest.mark.asyncio
+
+KEY = StorageKey(chat_id=1, user_id=123)
+REDIS_KEY = "fsm:1:123"
+
+
+@pytest.fixture
+def mock_pipeline(mock_redis_asyncio: MagicMock) -> MagicMock:
+    """Фикстура для конвейера Redis, используемого при записи."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    mock_redis_asyncio.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    mock_redis_asyncio.pipeline.return_value.__aexit__ = AsyncMock(return_value=None)
+    return pipe
+
+
+@pytest.fixture
+def storage() -> RedisStorage:
+    """Фикстура для создания RedisStorage c TTL 60 секунд."""
+    return RedisStorage(redis_cache.client, ttl=60)
+
+
+async def test_set_record_writes_hash_and_ttl_in_one_pipeline(
+    storage: RedisStorage,
+    mock_redis_asyncio: MagicMock,
+    mock_pipeline: MagicMock,
+) -> None:
+    """Проверяет, что состояние, данные и TTL записываются одним конвейером."""
+    await storage.set_record(KEY, State.WAITING_FOR_TAGS, {"url": "https://example.com"})
+
+    mock_redis_asyncio.pipeline.assert_called_once_with(transaction=True)
+    mock_pipeline.hset.assert_called_once_with(
+        REDIS_KEY,
+        mapping={"state": "WAITING_FOR_TAGS", "data": dumps({"url": "https://example.com"})},
+    )
+    mock_pipeline.expire.assert_called_once_with(REDIS_KEY, 60)
+    mock_pipeline.execute.assert_awaited_once()
+
+
+async def test_get_record_decodes_hash(
+    storage: RedisStorage,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет чтение состояния и данных одной командой HMGET."""
+    mock_redis_asyncio.hmget = AsyncMock(
+        return_value=[b"WAITING_FOR_FILTERS", dumps({"tags": ["a"]})],
+    )
+
+    result = await storage.get_record(KEY)
+
+    assert result == (State.WAITING_FOR_FILTERS, {"tags": ["a"]})
+    mock_redis_asyncio.hmget.assert_awaited_once_with(REDIS_KEY, ["state", "data"])
+
+
+async def test_get_record_missing_key(
+    storage: RedisStorage,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет, что для отсутствующего ключа возвращаются None."""
+    mock_redis_asyncio.hmget = AsyncMock(return_value=[None, None])
+
+    assert await storage.get_record(KEY) == (None, None)
+
+
+async def test_set_state_none_is_stored_as_empty(
+    storage: RedisStorage,
+    mock_redis_asyncio: MagicMock,
+    mock_pipeline: MagicMock,
+) -> None:
+    """Проверяет, что сброшенное состояние читается как None."""
+    await storage.set_state(KEY, None)
+    mock_pipeline.hset.assert_called_once_with(REDIS_KEY, mapping={"state": ""})
+
+    mock_redis_asyncio.hget = AsyncMock(return_value=b"")
+    assert await storage.get_state(KEY) is None
+
+
+async def test_clear_deletes_key(storage: RedisStorage, mock_redis_asyncio: MagicMock) -> None:
+    """Проверяет, что clear удаляет хэш записи."""
+    await storage.clear(KEY)
+
+    mock_redis_asyncio.delete.assert_awaited_once_with(REDIS_KEY)
+
+
+async def test_storage_uses_shared_pool(
+    storage: RedisStorage,
+    mock_redis_asyncio: MagicMock,
+) -> None:
+    """Проверяет, что хранилище работает через общий пул кэша, не создавая своих соединений."""
+    mock_redis_asyncio.hget = AsyncMock(return_value=None)
+
+    await storage.get_state(KEY)
+
+    assert await redis_cache.client() is mock_redis_asyncio
+    redis.from_url.assert_not_called()  # type: ignore[attr-defined]
@@ -0,0 +1,24 @@
+import pytest
+
+from src.db.in_memory.memory_storage.memory import MemoryStorage
+from src.db.in_memory.memory_storage.redis_storage import RedisStorage
+from src.db.in_memory.memory_storage.storage_factory import get_fsm_storage
+
+
+@pytest.mark.parametrize(
+    ("storage_type", "expected_class"),
+    [
+        ("MEMORY", MemoryStorage),
+        ("redis", RedisStorage),
+    ],
+    ids=["memory", "redis_lowercase"],
+)
+def test_get_fsm_storage(storage_type: str, expected_class: type) -> None:
+    """Проверяет выбор реализации хранилища FSM по типу из настроек."""
+    assert isinstance(get_fsm_storage(storage_type), expected_class)
+
+
+def test_get_fsm_storage_unknown_type() -> None:
+    """Проверяет, что неизвестный тип хранилища приводит к ValueError."""
+    with pytest.raises(ValueError, match="Неизвестный тип хранилища FSM"):
+        get_fsm_storage("FILE")
@@ -137,7 +137,7 @@ async def test_delete_chat_nonexistent(repository: Repository) -> None:
                 123: [
                     LinkResponse(
                         id=1,
-                        url=HttpUrl("https://another.com"),
+                        url="https://another.com",
                         tags=["tag"],
                         filters=["filter"],
                         last_updated=None,
@@ -204,7 +204,7 @@ async def test_add_link_duplicate(repository: Repository) -> None:
         123: [
             LinkResponse(
                 id=1,
-                url=HttpUrl("https://example.com"),
+                url="https://example.com",
                 tags=[],
                 filters=[],
                 last_updated=None,
@@ -223,7 +223,7 @@ async def test_add_link_duplicate(repository: Repository) -> None:
         123: [
             LinkResponse(
                 id=1,
-                url=HttpUrl("https://example.com"),
+                url="https://example.com",
                 tags=[],
                 filters=[],
                 last_updated=None,
@@ -270,7 +270,7 @@ async def test_add_link_duplicate(repository: Repository) -> None:
                 123: [
                     LinkResponse(
                         id=2,
-                        url=HttpUrl("https://another.com"),
+                        url="https://another.com",
                         tags=[],
                         filters=[],
                         last_updated=None,
@@ -1,13 +1,19 @@
+import asyncio
 from datetime import datetime, timezone
 
+import asyncpg
 import pytest
+import pytest_asyncio
 from pydantic import HttpUrl
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.scrapper_api.models import AddLinkRequest, LinkResponse, RemoveLinkRequest
+from src.clients.canonical import canonical_key
 from src.db.orm_service.link_service import OrmLinkService
 from src.db.orm_service.models.chat import Chat
 from src.db.orm_service.models.link import Link
+from src.db.orm_service.models.resource import Resource
 
 pytestmark = pytest.mark.asyncio
 
@@ -48,7 +54,7 @@ async def test_add_link_success(
     response = await link_service.add_link(chat_id, sample_add_request, db_session)
 
     assert isinstance(response, LinkResponse)
-    assert response.url == sample_add_request.link
+    assert response.url == str(sample_add_request.link)
     assert response.tags == sample_add_request.tags
     assert response.filters == sample_add_request.filters
     assert response.last_updated is not None
@@ -56,7 +62,66 @@ async def test_add_link_success(
     link = await db_session.get(Link, response.id)
     assert link is not None
     assert link.chat_id == chat_id
-    assert link.url == str(sample_add_request.link)
+    resource = await db_session.get(Resource, link.resource_id)
+    assert resource is not None
+    assert resource.url == str(sample_add_request.link)
+
+
+async def test_add_link_shares_resource(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+    sample_add_request: AddLinkRequest,
+) -> None:
+    """Проверяет, что подписки разных чатов на один URL ссылаются на один pecypc."""
+    chat_ids = (123, 456)
+    for chat_id in chat_ids:
+        db_session.add(Chat(id=chat_id))
+    await db_session.commit()
+
+    for chat_id in chat_ids:
+        await link_service.add_link(chat_id, sample_add_request, db_session)
+
+    resources = await db_session.scalar(select(func.count()).select_from(Resource))
+    resource_ids = await db_session.scalar(select(func.count(func.distinct(Link.resource_id))))
+    assert resources == 1
+    assert resource_ids == 1
+
+
+async def test_add_link_concurrent_resource_insert(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+    db_pool: asyncpg.Pool,
+    sample_add_request: AddLinkRequest,
+) -> None:
+    """Проверяет добавление, пока тот же pecypc вставляется параллельной транзакцией."""
+    url = str(sample_add_request.link)
+    db_session.add(Chat(id=2))
+    await db_session.commit()
+
+    async with db_pool.acquire() as conn:
+        transaction = conn.transaction()
+        await transaction.start()
+        resource_id = await conn.fetchval(
+            "INSERT INTO resources (url, canonical_key) VALUES ($1, $2) RETURNING id",
+            url,
+            canonical_key(url),
+        )
+        adding = asyncio.create_task(link_service.add_link(2, sample_add_request, db_session))
+        # Ждём, пока add_link заблокируется на незафиксированной строке pecypca.
+        for _ in range(500):
+            if await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM pg_stat_activity WHERE wait_event_type = 'Lock')",
+            ):
+                break
+            await asyncio.sleep(0.01)
+        await transaction.commit()
+
+    response = await adding
+
+    assert response.url == url
+    link = await db_session.get(Link, response.id)
+    assert link is not None
+    assert link.resource_id == resource_id
 
 
 async def test_add_link_chat_not_found(
@@ -82,8 +147,11 @@ async def test_add_link_duplicate(
     db_session.add(chat)
     link = Link(
         chat_id=chat_id,
-        url=str(sample_add_request.link),
-        last_updated=datetime.now(timezone.utc),
+        resource=Resource(
+            url=str(sample_add_request.link),
+            canonical_key=canonical_key(str(sample_add_request.link)),
+            last_event_at=datetime.now(timezone.utc),
+        ),
     )
     db_session.add(link)
     await db_session.commit()
@@ -92,6 +160,43 @@ async def test_add_link_duplicate(
         await link_service.add_link(chat_id, sample_add_request, db_session)
 
 
+async def test_add_link_duplicate_url_variant(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет, что другое написание URL того же pecypca считается дубликатом."""
+    chat_id = 123
+    db_session.add(Chat(id=chat_id))
+    await db_session.commit()
+    await link_service.add_link(
+        chat_id,
+        AddLinkRequest(link=HttpUrl("https://github.com/owner/repo")),
+        db_session,
+    )
+
+    variant = AddLinkRequest(link=HttpUrl("https://GitHub.com/Owner/Repo/pulls?state=open"))
+    with pytest.raises(ValueError, match="уже отслеживается"):
+        await link_service.add_link(chat_id, variant, db_session)
+
+
+async def test_remove_link_by_url_variant(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет удаление подписки по другому написанию того же URL."""
+    chat_id = 123
+    link_url = "https://stackoverflow.com/questions/123/some-title"
+    db_session.add(Chat(id=chat_id))
+    await db_session.commit()
+    await link_service.add_link(chat_id, AddLinkRequest(link=HttpUrl(link_url)), db_session)
+
+    remove_req = RemoveLinkRequest(link=HttpUrl("https://stackoverflow.com/questions/123"))
+    response = await link_service.remove_link(chat_id, remove_req, db_session)
+
+    assert str(response.url) == link_url
+    assert await db_session.scalar(select(func.count()).select_from(Link)) == 0
+
+
 async def test_remove_link_success(
     link_service: OrmLinkService,
     db_session: AsyncSession,
@@ -102,8 +207,11 @@ async def test_remove_link_success(
     chat = Chat(id=chat_id)
     link = Link(
         chat_id=chat_id,
-        url=str(sample_remove_request.link),
-        last_updated=datetime.now(timezone.utc),
+        resource=Resource(
+            url=str(sample_remove_request.link),
+            canonical_key=canonical_key(str(sample_remove_request.link)),
+            last_event_at=datetime.now(timezone.utc),
+        ),
         tags=["tag1"],
         filters=["key1:value1", "key2:value2"],
     )
@@ -114,7 +222,7 @@ async def test_remove_link_success(
     response = await link_service.remove_link(chat_id, sample_remove_request, db_session)
 
     assert isinstance(response, LinkResponse)
-    assert response.url == sample_remove_request.link
+    assert response.url == str(sample_remove_request.link)
     assert await db_session.get(Link, response.id) is None
 
 
@@ -145,6 +253,92 @@ async def test_remove_link_not_found(
         await link_service.remove_link(chat_id, sample_remove_request, db_session)
 
 
+async def test_add_links_bulk(link_service: OrmLinkService, db_session: AsyncSession) -> None:
+    """Проверяет пакетное добавление: новые, уже отслеживаемые и повторяющиеся ссылки."""
+    chat_id = 123
+    db_session.add(Chat(id=chat_id))
+    db_session.add(
+        Link(
+            chat_id=chat_id,
+            resource=Resource(
+                url="https://example.org/",
+                canonical_key=canonical_key("https://example.org/"),
+                last_event_at=datetime.now(timezone.utc),
+            ),
+        ),
+    )
+    await db_session.commit()
+
+    add_reqs = [
+        AddLinkRequest(link=HttpUrl("https://example.com"), tags=["a", "b"], filters=["x:1"]),
+        AddLinkRequest(link=HttpUrl("https://example.org")),
+        AddLinkRequest(link=HttpUrl("https://github.com/owner/repo")),
+        AddLinkRequest(link=HttpUrl("https://GitHub.com/Owner/Repo/pulls")),
+    ]
+
+    results = await link_service.add_links(chat_id, add_reqs, db_session)
+
+    added, existing, github, github_variant = results
+    assert added is not None
+    assert str(added.url) == "https://example.com/"
+    assert added.tags == ["a", "b"]
+    assert added.filters == ["x:1"]
+    assert existing is None
+    assert github is not None
+    assert github_variant is None
+    assert await db_session.scalar(select(func.count()).select_from(Link)) == len(add_reqs) - 1
+
+
+async def test_add_links_chat_not_found(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет выброс KeyError при пакетном добавлении в несуществующий чат."""
+    with pytest.raises(KeyError, match="Чат с идентификатором 123 не найден"):
+        await link_service.add_links(
+            123,
+            [AddLinkRequest(link=HttpUrl("https://example.com"))],
+            db_session,
+        )
+
+
+async def test_remove_links_bulk(link_service: OrmLinkService, db_session: AsyncSession) -> None:
+    """Проверяет пакетное удаление: найденные и отсутствующие ссылки."""
+    chat_id = 123
+    db_session.add(Chat(id=chat_id))
+    await db_session.commit()
+    await link_service.add_links(
+        chat_id,
+        [
+            AddLinkRequest(link=HttpUrl("https://example.com"), tags=["a"]),
+            AddLinkRequest(link=HttpUrl("https://example.org")),
+        ],
+        db_session,
+    )
+
+    results = await link_service.remove_links(
+        chat_id,
+        [HttpUrl("https://example.com"), HttpUrl("https://example.net")],
+        db_session,
+    )
+
+    removed, missing = results
+    assert removed is not None
+    assert str(removed.url) == "https://example.com/"
+    assert removed.tags == ["a"]
+    assert missing is None
+    assert await db_session.scalar(select(func.count()).select_from(Link)) == 1
+
+
+async def test_remove_links_chat_not_found(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет выброс KeyError при пакетном удалении в несуществующем чате."""
+    with pytest.raises(KeyError, match="Чат с идентификатором 123 не найден"):
+        await link_service.remove_links(123, [HttpUrl("https://example.com")], db_session)
+
+
 async def test_get_links_success(
     link_service: OrmLinkService,
     db_session: AsyncSession,
@@ -156,8 +350,11 @@ async def test_get_links_success(
     links = [
         Link(
             chat_id=chat_id,
-            url=f"https://example.com/{i}",
-            last_updated=datetime.now(timezone.utc),
+            resource=Resource(
+                url=f"https://example.com/{i}",
+                canonical_key=canonical_key(f"https://example.com/{i}"),
+                last_event_at=datetime.now(timezone.utc),
+            ),
             tags=["tag1"],
             filters=["key1:value1", "key2:value2"],
         )
@@ -172,7 +369,7 @@ async def test_get_links_success(
 
     assert len(result) == n_links
     assert all(isinstance(link, LinkResponse) for link in result)
-    assert [str(link.url) for link in result] == [link.url for link in links]
+    assert [str(link.url) for link in result] == [link.resource.url for link in links]
 
 
 async def test_get_links_empty(
@@ -189,6 +386,70 @@ async def test_get_links_empty(
     assert result == []
 
 
+async def test_get_links_paginated(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет постраничную выборку по курсору after_id."""
+    chat_id = 123
+    n_links = 5
+    page_size = 2
+    db_session.add(Chat(id=chat_id))
+    links = [
+        Link(
+            chat_id=chat_id,
+            resource=Resource(
+                url=f"https://example.com/{i}",
+                canonical_key=canonical_key(f"https://example.com/{i}"),
+            ),
+        )
+        for i in range(n_links)
+    ]
+    db_session.add_all(links)
+    await db_session.commit()
+    link_ids = [link.id for link in links]
+
+    first = await link_service.get_links(chat_id, db_session, limit=page_size)
+    second = await link_service.get_links(
+        chat_id,
+        db_session,
+        limit=page_size,
+        after_id=first[-1].id,
+    )
+    rest = await link_service.get_links(chat_id, db_session, after_id=second[-1].id)
+
+    assert [link.id for link in first] == link_ids[0:2]
+    assert [link.id for link in second] == link_ids[2:4]
+    assert [link.id for link in rest] == link_ids[4:5]
+
+
+async def test_iter_links_streams_all_pages(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет, что iter_links выдаёт все подписки чата по страницам."""
+    chat_id = 123
+    n_links = 5
+    db_session.add(Chat(id=chat_id))
+    db_session.add_all(
+        Link(
+            chat_id=chat_id,
+            resource=Resource(
+                url=f"https://example.com/{i}",
+                canonical_key=canonical_key(f"https://example.com/{i}"),
+            ),
+        )
+        for i in range(n_links)
+    )
+    await db_session.commit()
+
+    urls = [
+        str(link.url) async for link in link_service.iter_links(chat_id, db_session, batch_size=2)
+    ]
+
+    assert urls == [f"https://example.com/{i}" for i in range(n_links)]
+
+
 async def test_get_links_negative_chat_id(
     link_service: OrmLinkService,
     db_session: AsyncSession,
@@ -200,33 +461,101 @@ async def test_get_links_negative_chat_id(
         await link_service.get_links(chat_id, db_session)
 
 
+async def test_links_version_tracks_changes(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+    sample_add_request: AddLinkRequest,
+    sample_remove_request: RemoveLinkRequest,
+) -> None:
+    """Проверяет, что версия списка меняется только при изменении подписок чата."""
+    chat_id = 123
+    db_session.add(Chat(id=chat_id))
+    await db_session.commit()
+
+    assert await link_service.get_links_version(chat_id, db_session) == 0
+    await link_service.add_link(chat_id, sample_add_request, db_session)
+    assert await link_service.get_links_version(chat_id, db_session) == 1
+
+    with pytest.raises(ValueError, match="уже отслеживается"):
+        await link_service.add_link(chat_id, sample_add_request, db_session)
+    await link_service.add_links(chat_id, [sample_add_request], db_session)
+    assert await link_service.get_links_version(chat_id, db_session) == 1
+
+    await link_service.remove_link(chat_id, sample_remove_request, db_session)
+    assert await link_service.get_links_version(chat_id, db_session) == 2  # noqa: PLR2004
+
+
+async def test_links_version_chat_not_found(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет, что для незарегистрированного чата версия отсутствует."""
+    assert await link_service.get_links_version(123, db_session) is None
+
+
 async def test_set_last_updated_success(
     link_service: OrmLinkService,
     db_session: AsyncSession,
 ) -> None:
     """Проверяет успешное обновление last_updated."""
-    chat_id = 123
-    link_id = 1
-    chat = Chat(id=chat_id)
+    chat_ids = (123, 456)
     old_date = datetime(2023, 1, 1, tzinfo=timezone.utc)
     new_date = datetime(2023, 1, 2, tzinfo=timezone.utc)
-    link = Link(
-        id=link_id,
-        chat_id=chat_id,
+    resource = Resource(
         url="https://example.com",
-        last_updated=old_date,
-        tags=["tag1"],
-        filters=["key1:value1", "key2:value2"],
+        canonical_key="example.com",
+        last_event_at=old_date,
     )
-    db_session.add(chat)
-    db_session.add(link)
+    links = [
+        Link(
+            chat_id=chat_id,
+            resource=resource,
+            tags=["tag1"],
+            filters=["key1:value1", "key2:value2"],
+        )
+        for chat_id in chat_ids
+    ]
+    db_session.add_all([Chat(id=chat_id) for chat_id in chat_ids])
+    db_session.add_all(links)
+    await db_session.commit()
+
+    await link_service.set_last_updated(links[0].id, new_date, db_session)
+
+    for chat_id in chat_ids:
+        result = await link_service.get_links(chat_id, db_session)
+        assert result[0].last_updated == new_date
+
+
+async def test_set_last_updated_keeps_links_version(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет, что событие pecypca меняет время событий страниц, но не версии списков."""
+    old_date = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    new_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    resources = {
+        key: Resource(url=f"https://{key}", canonical_key=key, last_event_at=old_date)
+        for key in ("example.com", "example.org")
+    }
+    links = [
+        Link(chat_id=chat_id, resource=resources[key])
+        for chat_id, key in ((123, "example.com"), (123, "example.org"), (456, "example.com"))
+    ]
+    db_session.add_all([Chat(id=chat_id) for chat_id in (123, 456)])
+    db_session.add_all(links)
     await db_session.commit()
 
-    await link_service.set_last_updated(link_id, new_date, db_session)
+    await link_service.set_last_updated(links[0].id, new_date, db_session)
 
-    updated_link = await db_session.get(Link, link_id)
-    assert updated_link is not None
-    assert updated_link.last_updated == new_date
+    assert await link_service.get_links_version(123, db_session) == 0
+    assert await link_service.get_links_version(456, db_session) == 0
+    assert await link_service.get_links_last_event_at(123, db_session) == new_date
+    assert await link_service.get_links_last_event_at(456, db_session) == new_date
+    assert (
+        await link_service.get_links_last_event_at(123, db_session, after_id=links[0].id)
+        == old_date
+    )
+    assert await link_service.get_links_last_event_at(789, db_session) is None
 
 
 async def test_set_last_updated_not_found(
@@ -239,3 +568,143 @@ async def test_set_last_updated_not_found(
 
     with pytest.raises(KeyError, match=f"Подписка с идентификатором {link_id} не найдена"):
         await link_service.set_last_updated(link_id, new_date, db_session)
+
+
+@pytest_asyncio.fixture
+async def tagged_links(db_session: AsyncSession) -> dict[str, int]:
+    """Фикстура c подписками чата 123, отмеченными разными наборами тегов."""
+    chat_id = 123
+    tags = {"work": ["work"], "work_news": ["work", "news"], "news": ["news"], "untagged": None}
+    links = {
+        name: Link(
+            chat_id=chat_id,
+            resource=Resource(
+                url=f"https://example.com/{i}",
+                canonical_key=f"example.com/{i}",
+                last_event_at=datetime.now(timezone.utc),
+            ),
+            tags=link_tags,
+        )
+        for i, (name, link_tags) in enumerate(tags.items())
+    }
+    db_session.add(Chat(id=chat_id))
+    db_session.add_all(links.values())
+    await db_session.commit()
+    return {name: link.id for name, link in links.items()}
+
+
+@pytest.mark.parametrize(
+    ("tags", "match_any", "expected"),
+    [
+        (["work"], False, ["work", "work_news"]),
+        (["work", "news"], False, ["work_news"]),
+        (["work", "news"], True, ["work", "work_news", "news"]),
+        (["other"], True, []),
+    ],
+    ids=["single_tag", "all_tags", "any_tag", "no_match"],
+)
+async def test_get_links_by_tags(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+    tagged_links: dict[str, int],
+    tags: list[str],
+    *,
+    match_any: bool,
+    expected: list[str],
+) -> None:
+    """Проверяет выборку подписок по тегам (@> и &&)."""
+    result = await link_service.get_links_by_tags(123, tags, db_session, match_any=match_any)
+
+    assert [link.id for link in result] == [tagged_links[name] for name in expected]
+
+
+@pytest.mark.parametrize(
+    ("tags", "match_any", "expected_removed", "expected_remaining"),
+    [
+        (["news"], False, ["work_news", "news"], ["work", "untagged"]),
+        (["work", "news"], False, ["work_news"], ["work", "news", "untagged"]),
+        (["work", "news"], True, ["work", "work_news", "news"], ["untagged"]),
+    ],
+    ids=["single_tag", "all_tags", "any_tag"],
+)
+async def test_remove_links_by_tags(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+    tagged_links: dict[str, int],
+    tags: list[str],
+    *,
+    match_any: bool,
+    expected_removed: list[str],
+    expected_remaining: list[str],
+) -> None:
+    """Проверяет удаление подписок по тегам: по умолчанию подписка должна иметь все теги."""
+    removed = await link_service.remove_links_by_tags(123, tags, db_session, match_any=match_any)
+
+    assert [link.id for link in removed] == [tagged_links[name] for name in expected_removed]
+    remaining = await link_service.get_links(123, db_session)
+    assert [link.id for link in remaining] == [tagged_links[name] for name in expected_remaining]
+
+
+async def test_remove_links_by_tags_chat_not_found(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет выброс KeyError, если чат не найден."""
+    with pytest.raises(KeyError, match="Чат с идентификатором 123 не найден"):
+        await link_service.remove_links_by_tags(123, ["news"], db_session)
+
+
+async def test_set_muted_by_tags(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+    tagged_links: dict[str, int],
+) -> None:
+    """Проверяет отключение и включение уведомлений по тегу."""
+    work_links = 2
+    assert await link_service.set_muted_by_tags(123, ["work"], db_session, muted=True) == work_links
+    assert await link_service.set_muted_by_tags(123, ["work"], db_session, muted=True) == 0
+
+    links = {link.id: link.muted for link in await link_service.get_links(123, db_session)}
+    assert links == {
+        tagged_links["work"]: True,
+        tagged_links["work_news"]: True,
+        tagged_links["news"]: False,
+        tagged_links["untagged"]: False,
+    }
+
+    assert await link_service.set_muted_by_tags(123, ["news"], db_session, muted=False) == 1
+
+
+async def test_set_muted_by_tags_match(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+    tagged_links: dict[str, int],
+) -> None:
+    """Проверяет, что по умолчанию затрагиваются подписки co всеми тегами, c match_any - c любым."""
+    tags = ["work", "news"]
+    assert await link_service.set_muted_by_tags(123, tags, db_session, muted=True) == 1
+    assert (
+        await link_service.set_muted_by_tags(123, tags, db_session, muted=True, match_any=True)
+        == 2  # noqa: PLR2004
+    )
+
+    links = {link.id: link.muted for link in await link_service.get_links(123, db_session)}
+    assert links[tagged_links["untagged"]] is False
+
+
+async def test_set_muted_by_tags_empty(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет выброс ValueError при пустом списке тегов."""
+    with pytest.raises(ValueError, match="Список тегов пуст"):
+        await link_service.set_muted_by_tags(123, [], db_session, muted=True)
+
+
+async def test_set_muted_by_tags_chat_not_found(
+    link_service: OrmLinkService,
+    db_session: AsyncSession,
+) -> None:
+    """Проверяет выброс KeyError, если чат не найден."""
+    with pytest.raises(KeyError, match="Чат с идентификатором 123 не найден"):
+        await link_service.set_muted_by_tags(123, ["news"], db_session, muted=True)
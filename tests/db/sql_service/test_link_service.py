@@ -1,10 +1,13 @@
+import asyncio
 from datetime import datetime, timezone
 
 import asyncpg
 import pytest
+import pytest_asyncio
 from pydantic import HttpUrl
 
 from src.api.scrapper_api.models import AddLinkRequest, LinkResponse, RemoveLinkRequest
+from src.clients.canonical import canonical_key
 from src.db.sql_service.link_service import SqlLinkService
 
 pytestmark = pytest.mark.asyncio
@@ -32,6 +35,36 @@ def sample_remove_request() -> RemoveLinkRequest:
     return RemoveLinkRequest(link=HttpUrl("https://example.com"))
 
 
+async def _insert_link(
+    conn: asyncpg.Connection,
+    chat_id: int,
+    url: str,
+    last_updated: datetime,
+    tags: list[str] | None = None,
+    filters: list[str] | None = None,
+) -> int:
+    """Создаёт pecypc (если ero нет) и подписку на него, возвращает id подписки."""
+    resource_id: int = await conn.fetchval(
+        """
+        INSERT INTO resources (url, canonical_key, last_event_at) VALUES ($1, $2, $3)
+        ON CONFLICT (canonical_key) DO UPDATE SET url = resources.url
+        RETURNING id
+        """,
+        url,
+        canonical_key(url),
+        last_updated,
+    )
+    link_id: int = await conn.fetchval(
+        "INSERT INTO links (chat_id, resource_id, tags, filters) "
+        "VALUES ($1, $2, $3, $4) RETURNING id",
+        chat_id,
+        resource_id,
+        tags,
+        filters,
+    )
+    return link_id
+
+
 async def test_add_link_success(
     link_service: SqlLinkService,
     db_pool: asyncpg.Pool,
@@ -46,17 +79,78 @@ async def test_add_link_success(
     response = await link_service.add_link(chat_id, sample_add_request, db_pool)
 
     assert isinstance(response, LinkResponse)
-    assert response.url == sample_add_request.link
+    assert response.url == str(sample_add_request.link)
     assert response.tags == sample_add_request.tags
     assert response.filters == sample_add_request.filters
     assert response.last_updated is not None
 
     async with db_pool.acquire() as conn:
-        row = await conn.fetchrow("SELECT * FROM links WHERE id = $1", response.id)
+        row = await conn.fetchrow(
+            "SELECT links.chat_id, resources.url FROM links "
+            "JOIN resources ON resources.id = links.resource_id WHERE links.id = $1",
+            response.id,
+        )
     assert row["chat_id"] == chat_id
     assert row["url"] == str(sample_add_request.link)
 
 
+async def test_add_link_shares_resource(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+    sample_add_request: AddLinkRequest,
+) -> None:
+    """Проверяет, что подписки разных чатов на один URL ссылаются на один pecypc."""
+    chat_ids = (123, 456)
+
+    async with db_pool.acquire() as conn:
+        for chat_id in chat_ids:
+            await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+
+    for chat_id in chat_ids:
+        await link_service.add_link(chat_id, sample_add_request, db_pool)
+
+    async with db_pool.acquire() as conn:
+        resources = await conn.fetchval("SELECT COUNT(*) FROM resources")
+        resource_ids = await conn.fetchval("SELECT COUNT(DISTINCT resource_id) FROM links")
+    assert resources == 1
+    assert resource_ids == 1
+
+
+async def test_add_link_concurrent_resource_insert(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+    sample_add_request: AddLinkRequest,
+) -> None:
+    """Проверяет добавление, пока тот же pecypc вставляется параллельной транзакцией."""
+    url = str(sample_add_request.link)
+    async with db_pool.acquire() as conn:
+        await conn.execute("INSERT INTO chats (id) VALUES (1), (2)")
+
+    async with db_pool.acquire() as conn:
+        transaction = conn.transaction()
+        await transaction.start()
+        resource_id = await conn.fetchval(
+            "INSERT INTO resources (url, canonical_key) VALUES ($1, $2) RETURNING id",
+            url,
+            canonical_key(url),
+        )
+        adding = asyncio.create_task(link_service.add_link(2, sample_add_request, db_pool))
+        # Ждём, пока add_link заблокируется на незафиксированной строке pecypca.
+        for _ in range(500):
+            if await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM pg_stat_activity WHERE wait_event_type = 'Lock')",
+            ):
+                break
+            await asyncio.sleep(0.01)
+        await transaction.commit()
+
+    response = await adding
+
+    assert response.url == url
+    async with db_pool.acquire() as conn:
+        assert await conn.fetchval("SELECT resource_id FROM links WHERE chat_id = 2") == resource_id
+
+
 async def test_add_link_chat_not_found(
     link_service: SqlLinkService,
     db_pool: asyncpg.Pool,
@@ -79,8 +173,8 @@ async def test_add_link_duplicate(
 
     async with db_pool.acquire() as conn:
         await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
-        await conn.execute(
-            "INSERT INTO links (chat_id, url, last_updated) VALUES ($1, $2, $3)",
+        await _insert_link(
+            conn,
             chat_id,
             str(sample_add_request.link),
             datetime.now(timezone.utc),
@@ -90,6 +184,67 @@ async def test_add_link_duplicate(
         await link_service.add_link(chat_id, sample_add_request, db_pool)
 
 
+async def test_add_link_duplicate_url_variant(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет, что другое написание URL того же pecypca считается дубликатом."""
+    chat_id = 123
+
+    async with db_pool.acquire() as conn:
+        await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+        await _insert_link(
+            conn,
+            chat_id,
+            "https://github.com/owner/repo",
+            datetime.now(timezone.utc),
+        )
+
+    variant = AddLinkRequest(link=HttpUrl("https://GitHub.com/Owner/Repo/pulls?state=open"))
+    with pytest.raises(ValueError, match="Ссылка уже отслеживается"):
+        await link_service.add_link(chat_id, variant, db_pool)
+
+
+async def test_add_link_url_variants_share_resource(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет, что разные написания одного URL в разных чатах дают один pecypc."""
+    urls = ("https://github.com/owner/repo", "https://www.github.com/owner/repo/")
+
+    async with db_pool.acquire() as conn:
+        for chat_id in range(len(urls)):
+            await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+
+    responses = [
+        await link_service.add_link(chat_id, AddLinkRequest(link=HttpUrl(url)), db_pool)
+        for chat_id, url in enumerate(urls)
+    ]
+
+    async with db_pool.acquire() as conn:
+        resources = await conn.fetchval("SELECT COUNT(*) FROM resources")
+    assert resources == 1
+    assert {str(response.url) for response in responses} == {urls[0]}
+
+
+async def test_remove_link_by_url_variant(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет удаление подписки по другому написанию того же URL."""
+    chat_id = 123
+    link_url = "https://stackoverflow.com/questions/123/some-title"
+
+    async with db_pool.acquire() as conn:
+        await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+        await _insert_link(conn, chat_id, link_url, datetime.now(timezone.utc))
+
+    remove_req = RemoveLinkRequest(link=HttpUrl("https://stackoverflow.com/questions/123"))
+    response = await link_service.remove_link(chat_id, remove_req, db_pool)
+
+    assert str(response.url) == link_url
+
+
 async def test_remove_link_success(
     link_service: SqlLinkService,
     db_pool: asyncpg.Pool,
@@ -101,14 +256,13 @@ async def test_remove_link_success(
 
     async with db_pool.acquire() as conn:
         await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
-        await conn.execute(
-            "INSERT INTO links (chat_id, url, tags, filters, last_updated) "
-            "VALUES ($1, $2, $3, $4, $5)",
+        await _insert_link(
+            conn,
             chat_id,
             link_url,
+            datetime.now(timezone.utc),
             ["tag1"],
             ["key1:value1"],
-            datetime.now(timezone.utc),
         )
 
     response = await link_service.remove_link(chat_id, sample_remove_request, db_pool)
@@ -117,7 +271,7 @@ async def test_remove_link_success(
     assert str(response.url) == link_url
 
     async with db_pool.acquire() as conn:
-        result = await conn.fetchval("SELECT COUNT(*) FROM links WHERE url = $1", link_url)
+        result = await conn.fetchval("SELECT COUNT(*) FROM links WHERE chat_id = $1", chat_id)
     assert result == 0
 
 
@@ -148,6 +302,86 @@ async def test_remove_link_not_found(
         await link_service.remove_link(chat_id, sample_remove_request, db_pool)
 
 
+async def test_add_links_bulk(link_service: SqlLinkService, db_pool: asyncpg.Pool) -> None:
+    """Проверяет пакетное добавление: новые, уже отслеживаемые и повторяющиеся ссылки."""
+    chat_id = 123
+    async with db_pool.acquire() as conn:
+        await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+        await _insert_link(conn, chat_id, "https://example.org", datetime.now(timezone.utc))
+
+    add_reqs = [
+        AddLinkRequest(link=HttpUrl("https://example.com"), tags=["a", "b"], filters=["x:1"]),
+        AddLinkRequest(link=HttpUrl("https://example.org")),
+        AddLinkRequest(link=HttpUrl("https://github.com/owner/repo")),
+        AddLinkRequest(link=HttpUrl("https://GitHub.com/Owner/Repo/pulls")),
+    ]
+
+    results = await link_service.add_links(chat_id, add_reqs, db_pool)
+
+    added, existing, github, github_variant = results
+    assert added is not None
+    assert str(added.url) == "https://example.com/"
+    assert added.tags == ["a", "b"]
+    assert added.filters == ["x:1"]
+    assert existing is None
+    assert github is not None
+    assert github_variant is None
+    async with db_pool.acquire() as conn:
+        count = await conn.fetchval("SELECT count(*) FROM links WHERE chat_id = $1", chat_id)
+    assert count == len(add_reqs) - 1
+
+
+async def test_add_links_chat_not_found(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет выброс KeyError при пакетном добавлении в несуществующий чат."""
+    with pytest.raises(KeyError, match="Чат с идентификатором 123 не найден"):
+        await link_service.add_links(
+            123,
+            [AddLinkRequest(link=HttpUrl("https://example.com"))],
+            db_pool,
+        )
+
+
+async def test_remove_links_bulk(link_service: SqlLinkService, db_pool: asyncpg.Pool) -> None:
+    """Проверяет пакетное удаление: найденные и отсутствующие ссылки."""
+    chat_id = 123
+    async with db_pool.acquire() as conn:
+        await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+        link_id = await _insert_link(
+            conn,
+            chat_id,
+            "https://example.com",
+            datetime.now(timezone.utc),
+            tags=["a"],
+        )
+        await _insert_link(conn, chat_id, "https://example.org", datetime.now(timezone.utc))
+
+    results = await link_service.remove_links(
+        chat_id,
+        [HttpUrl("https://example.com"), HttpUrl("https://example.net")],
+        db_pool,
+    )
+
+    removed, missing = results
+    assert removed is not None
+    assert removed.id == link_id
+    assert removed.tags == ["a"]
+    assert missing is None
+    async with db_pool.acquire() as conn:
+        assert await conn.fetchval("SELECT count(*) FROM links WHERE chat_id = $1", chat_id) == 1
+
+
+async def test_remove_links_chat_not_found(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет выброс KeyError при пакетном удалении в несуществующем чате."""
+    with pytest.raises(KeyError, match="Чат с идентификатором 123 не найден"):
+        await link_service.remove_links(123, [HttpUrl("https://example.com")], db_pool)
+
+
 async def test_get_links_success(
     link_service: SqlLinkService,
     db_pool: asyncpg.Pool,
@@ -155,34 +389,18 @@ async def test_get_links_success(
     """Проверяет успешное получение списка ссылок."""
     chat_id = 123
     n_links = 3
-    links_data = [
-        {
-            "url": f"https://example.com/{i}",
-            "tags": ["tag"],
-            "filters": [],
-            "last_updated": datetime.now(timezone.utc),
-        }
-        for i in range(n_links)
-    ]
+    urls = [f"https://example.com/{i}" for i in range(n_links)]
 
     async with db_pool.acquire() as conn:
         await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
-        for link in links_data:
-            await conn.execute(
-                "INSERT INTO links (chat_id, url, tags, filters, last_updated) "
-                "VALUES ($1, $2, $3, $4, $5)",
-                chat_id,
-                link["url"],
-                link["tags"],
-                link["filters"],
-                link["last_updated"],
-            )
+        for url in urls:
+            await _insert_link(conn, chat_id, url, datetime.now(timezone.utc), ["tag"], [])
 
     result = await link_service.get_links(chat_id, db_pool)
 
     assert len(result) == n_links
     assert all(isinstance(link, LinkResponse) for link in result)
-    assert [str(link.url) for link in result] == [link["url"] for link in links_data]
+    assert [link.url for link in result] == urls
 
 
 async def test_get_links_empty(
@@ -199,6 +417,67 @@ async def test_get_links_empty(
     assert result == []
 
 
+async def test_get_links_paginated(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет постраничную выборку по курсору after_id."""
+    chat_id = 123
+    n_links = 5
+    page_size = 2
+
+    async with db_pool.acquire() as conn:
+        await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+        link_ids = [
+            await _insert_link(
+                conn,
+                chat_id,
+                f"https://example.com/{i}",
+                datetime.now(timezone.utc),
+            )
+            for i in range(n_links)
+        ]
+
+    pages: list[list[int]] = []
+    after_id: int | None = None
+    while True:
+        page = await link_service.get_links(
+            chat_id,
+            db_pool,
+            limit=page_size,
+            after_id=after_id,
+        )
+        if not page:
+            break
+        pages.append([link.id for link in page])
+        after_id = page[-1].id
+
+    assert pages == [link_ids[0:2], link_ids[2:4], link_ids[4:5]]
+
+
+async def test_iter_links_streams_all_pages(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет, что iter_links выдаёт все подписки чата по страницам."""
+    chat_id = 123
+    n_links = 5
+
+    async with db_pool.acquire() as conn:
+        await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+        for i in range(n_links):
+            await _insert_link(
+                conn,
+                chat_id,
+                f"https://example.com/{i}",
+                datetime.now(timezone.utc),
+            )
+
+    urls = [str(link.url) async for link in link_service.iter_links(chat_id, db_pool, batch_size=2)]
+
+    assert urls == [f"https://example.com/{i}" for i in range(n_links)]
+
+
 async def test_get_links_negative_chat_id(
     link_service: SqlLinkService,
     db_pool: asyncpg.Pool,
@@ -210,31 +489,90 @@ async def test_get_links_negative_chat_id(
         await link_service.get_links(chat_id, db_pool)
 
 
+async def test_links_version_tracks_changes(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+    sample_add_request: AddLinkRequest,
+    sample_remove_request: RemoveLinkRequest,
+) -> None:
+    """Проверяет, что версия списка меняется только при изменении подписок чата."""
+    chat_id = 123
+    async with db_pool.acquire() as conn:
+        await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+
+    assert await link_service.get_links_version(chat_id, db_pool) == 0
+    await link_service.add_link(chat_id, sample_add_request, db_pool)
+    assert await link_service.get_links_version(chat_id, db_pool) == 1
+
+    with pytest.raises(ValueError, match="уже отслеживается"):
+        await link_service.add_link(chat_id, sample_add_request, db_pool)
+    await link_service.add_links(chat_id, [sample_add_request], db_pool)
+    assert await link_service.get_links_version(chat_id, db_pool) == 1
+
+    await link_service.remove_link(chat_id, sample_remove_request, db_pool)
+    assert await link_service.get_links_version(chat_id, db_pool) == 2  # noqa: PLR2004
+
+
+async def test_links_version_chat_not_found(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет, что для незарегистрированного чата версия отсутствует."""
+    assert await link_service.get_links_version(123, db_pool) is None
+
+
 async def test_set_last_updated_success(
     link_service: SqlLinkService,
     db_pool: asyncpg.Pool,
 ) -> None:
     """Проверяет успешное обновление last_updated."""
-    chat_id = 123
-    link_id = 1
+    chat_ids = (123, 456)
     old_date = datetime(2023, 1, 1, tzinfo=timezone.utc)
     new_date = datetime(2023, 1, 2, tzinfo=timezone.utc)
 
     async with db_pool.acquire() as conn:
-        await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
-        await conn.execute(
-            "INSERT INTO links (id, chat_id, url, last_updated) VALUES ($1, $2, $3, $4)",
-            link_id,
-            chat_id,
-            "https://example.com",
-            old_date,
-        )
+        link_ids = []
+        for chat_id in chat_ids:
+            await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+            link_ids.append(await _insert_link(conn, chat_id, "https://example.com", old_date))
+
+    await link_service.set_last_updated(link_ids[0], new_date, db_pool)
 
-    await link_service.set_last_updated(link_id, new_date, db_pool)
+    for chat_id in chat_ids:
+        links = await link_service.get_links(chat_id, db_pool)
+        assert links[0].last_updated == new_date
 
+
+async def test_set_last_updated_keeps_links_version(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет, что событие pecypca меняет время событий страниц, но не версии списков."""
+    old_date = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    new_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
     async with db_pool.acquire() as conn:
-        updated_date = await conn.fetchval("SELECT last_updated FROM links WHERE id = $1", link_id)
-    assert updated_date == new_date
+        for chat_id in (123, 456):
+            await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+        link_ids = [
+            await _insert_link(conn, chat_id, url, old_date)
+            for chat_id, url in (
+                (123, "https://example.com"),
+                (123, "https://example.org"),
+                (456, "https://example.com"),
+            )
+        ]
+
+    await link_service.set_last_updated(link_ids[0], new_date, db_pool)
+
+    assert await link_service.get_links_version(123, db_pool) == 0
+    assert await link_service.get_links_version(456, db_pool) == 0
+    assert await link_service.get_links_last_event_at(123, db_pool) == new_date
+    assert await link_service.get_links_last_event_at(456, db_pool) == new_date
+    assert (
+        await link_service.get_links_last_event_at(123, db_pool, after_id=link_ids[0]) == old_date
+    )
+    assert await link_service.get_links_last_event_at(123, db_pool, limit=1) == new_date
+    assert await link_service.get_links_last_event_at(789, db_pool) is None
 
 
 async def test_set_last_updated_not_found(
@@ -247,3 +585,141 @@ async def test_set_last_updated_not_found(
 
     with pytest.raises(KeyError, match=f"Подписка с идентификатором {link_id} не найдена"):
         await link_service.set_last_updated(link_id, new_date, db_pool)
+
+
+@pytest_asyncio.fixture
+async def tagged_links(db_pool: asyncpg.Pool) -> dict[str, int]:
+    """Фикстура c подписками чата 123, отмеченными разными наборами тегов."""
+    chat_id = 123
+    now = datetime.now(timezone.utc)
+    async with db_pool.acquire() as conn:
+        await conn.execute("INSERT INTO chats (id) VALUES ($1)", chat_id)
+        return {
+            "work": await _insert_link(conn, chat_id, "https://example.com/1", now, ["work"]),
+            "work_news": await _insert_link(
+                conn,
+                chat_id,
+                "https://example.com/2",
+                now,
+                ["work", "news"],
+            ),
+            "news": await _insert_link(conn, chat_id, "https://example.com/3", now, ["news"]),
+            "untagged": await _insert_link(conn, chat_id, "https://example.com/4", now),
+        }
+
+
+@pytest.mark.parametrize(
+    ("tags", "match_any", "expected"),
+    [
+        (["work"], False, ["work", "work_news"]),
+        (["work", "news"], False, ["work_news"]),
+        (["work", "news"], True, ["work", "work_news", "news"]),
+        (["other"], True, []),
+    ],
+    ids=["single_tag", "all_tags", "any_tag", "no_match"],
+)
+async def test_get_links_by_tags(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+    tagged_links: dict[str, int],
+    tags: list[str],
+    *,
+    match_any: bool,
+    expected: list[str],
+) -> None:
+    """Проверяет выборку подписок по тегам (@> и &&)."""
+    result = await link_service.get_links_by_tags(123, tags, db_pool, match_any=match_any)
+
+    assert [link.id for link in result] == [tagged_links[name] for name in expected]
+
+
+@pytest.mark.parametrize(
+    ("tags", "match_any", "expected_removed", "expected_remaining"),
+    [
+        (["news"], False, ["work_news", "news"], ["work", "untagged"]),
+        (["work", "news"], False, ["work_news"], ["work", "news", "untagged"]),
+        (["work", "news"], True, ["work", "work_news", "news"], ["untagged"]),
+    ],
+    ids=["single_tag", "all_tags", "any_tag"],
+)
+async def test_remove_links_by_tags(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+    tagged_links: dict[str, int],
+    tags: list[str],
+    *,
+    match_any: bool,
+    expected_removed: list[str],
+    expected_remaining: list[str],
+) -> None:
+    """Проверяет удаление подписок по тегам: по умолчанию подписка должна иметь все теги."""
+    removed = await link_service.remove_links_by_tags(123, tags, db_pool, match_any=match_any)
+
+    assert [link.id for link in removed] == [tagged_links[name] for name in expected_removed]
+    remaining = await link_service.get_links(123, db_pool)
+    assert [link.id for link in remaining] == [tagged_links[name] for name in expected_remaining]
+
+
+async def test_remove_links_by_tags_chat_not_found(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет выброс KeyError, если чат не найден."""
+    with pytest.raises(KeyError, match="Чат с идентификатором 123 не найден"):
+        await link_service.remove_links_by_tags(123, ["news"], db_pool)
+
+
+async def test_set_muted_by_tags(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+    tagged_links: dict[str, int],
+) -> None:
+    """Проверяет отключение и включение уведомлений по тегу."""
+    work_links = 2
+    assert await link_service.set_muted_by_tags(123, ["work"], db_pool, muted=True) == work_links
+    assert await link_service.set_muted_by_tags(123, ["work"], db_pool, muted=True) == 0
+
+    links = {link.id: link.muted for link in await link_service.get_links(123, db_pool)}
+    assert links == {
+        tagged_links["work"]: True,
+        tagged_links["work_news"]: True,
+        tagged_links["news"]: False,
+        tagged_links["untagged"]: False,
+    }
+
+    assert await link_service.set_muted_by_tags(123, ["news"], db_pool, muted=False) == 1
+
+
+async def test_set_muted_by_tags_match(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+    tagged_links: dict[str, int],
+) -> None:
+    """Проверяет, что по умолчанию затрагиваются подписки co всеми тегами, c match_any - c любым."""
+    tags = ["work", "news"]
+    assert await link_service.set_muted_by_tags(123, tags, db_pool, muted=True) == 1
+    assert (
+        await link_service.set_muted_by_tags(123, tags, db_pool, muted=True, match_any=True)
+        == 2  # noqa: PLR2004
+    )
+
+    links = {link.id: link.muted for link in await link_service.get_links(123, db_pool)}
+    assert links[tagged_links["untagged"]] is False
+
+
+async def test_set_muted_by_tags_empty(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет выброс ValueError при пустом списке тегов."""
+    with pytest.raises(ValueError, match="Список тегов пуст"):
+        await link_service.set_muted_by_tags(123, [], db_pool, muted=True)
+
+
+async def test_set_muted_by_tags_chat_not_found(
+    link_service: SqlLinkService,
+    db_pool: asyncpg.Pool,
+) -> None:
+    """Проверяет выброс KeyError, если чат не найден."""
+    with pytest.raises(KeyError, match="Чат с идентификатором 123 не найден"):
+        await link_service.set_muted_by_tags(123, ["news"], db_pool, muted=True)
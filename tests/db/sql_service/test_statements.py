@@ -0,0 +1,189 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime, timezone
+
+import asyncpg
+import pytest
+import pytest_asyncio
+from pydantic import HttpUrl
+from sqlalchemy.ext.asyncio import create_async_engine
+from testcontainers.postgres import PostgresContainer
+
+from src.api.scrapper_api.models import AddLinkRequest, LinkResponse, RemoveLinkRequest
+from src.db.orm_service.models.base import Base
+from src.db.sql_service import statements
+from src.db.sql_service.chat_service import SqlChatService
+from src.db.sql_service.link_service import SqlLinkService
+from src.db.sql_service.statements import (
+    STATEMENTS,
+    LinkRecord,
+    PreparedConnection,
+    prepare_statements,
+)
+
+CHAT_ID = 42
+_COUNT_PREPARED = "SELECT count(*) FROM pg_prepared_statements"
+_COUNT_REGISTRY = "SELECT count(*) FROM pg_prepared_statements WHERE statement = ANY($1::text[])"
+_REGISTRY_SQL = [statement.sql for statement in STATEMENTS.values()]
+
+
+async def _create_schema(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def sql_url() -> Iterator[str]:
+    with PostgresContainer("postgres:15", driver="asyncpg") as postgres:
+        url = postgres.get_connection_url()
+        asyncio.run(_create_schema(url))
+        yield url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+@pytest_asyncio.fixture
+async def prepared_pool(sql_url: str) -> AsyncIterator[asyncpg.Pool]:
+    pool = await asyncpg.create_pool(
+        sql_url,
+        min_size=1,
+        max_size=1,
+        connection_class=PreparedConnection,
+        init=prepare_statements,
+    )
+    yield pool
+    async with pool.acquire() as conn:
+        await conn.execute("TRUNCATE links, chats, resources RESTART IDENTITY CASCADE")
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_init_prepares_all_statements(prepared_pool: asyncpg.Pool) -> None:
+    """Проверяет, что init-хук готовит весь реестр на соединении."""
+    async with prepared_pool.acquire() as conn:
+        prepared = await conn.fetch("SELECT statement FROM pg_prepared_statements")
+
+    assert {statement.sql for statement in STATEMENTS.values()} <= {
+        row["statement"] for row in prepared
+    }
+
+
+@pytest.mark.asyncio
+async def test_first_checkout_runs_prepared_statements(prepared_pool: asyncpg.Pool) -> None:
+    """Проверяет, что до возврата в пул запросы выполняются подготовленными объектами."""
+    async with prepared_pool.acquire() as conn:
+        await conn.fetchval(_COUNT_PREPARED)
+        prepared = await conn.fetchval(_COUNT_PREPARED)
+
+        assert await statements.execute(conn, "register_chat", CHAT_ID) == "INSERT 0 1"
+        assert await statements.fetchval(conn, "chat_exists", CHAT_ID) == 1
+        assert await statements.fetchrow(conn, "get_links_version", CHAT_ID) == (0,)
+        assert await statements.fetch(conn, "get_links", CHAT_ID, 0, None) == []
+        assert await conn.fetchval(_COUNT_PREPARED) == prepared
+        assert conn.statements.keys() == STATEMENTS.keys()
+
+
+@pytest.mark.asyncio
+async def test_released_connection_uses_statement_cache(prepared_pool: asyncpg.Pool) -> None:
+    """Проверяет, что после возврата в пул запросы выполняются через кэш соединения."""
+    async with prepared_pool.acquire() as conn:
+        await statements.execute(conn, "register_chat", CHAT_ID)
+
+    async with prepared_pool.acquire() as conn:
+        assert await statements.fetchval(conn, "chat_exists", CHAT_ID) == 1
+        assert conn.statements == {}
+
+
+async def _use_services(pool: asyncpg.Pool) -> None:
+    await SqlChatService().register_chat(CHAT_ID, pool)
+    link_service = SqlLinkService()
+    added = await link_service.add_link(
+        CHAT_ID,
+        AddLinkRequest(link=HttpUrl("https://github.com/a/b"), tags=["t"], filters=[]),
+        pool,
+    )
+    await link_service.set_last_updated(added.id, datetime.now(timezone.utc), pool)
+    links = await link_service.get_links(CHAT_ID, pool)
+    removed = await link_service.remove_link(
+        CHAT_ID,
+        RemoveLinkRequest(link=HttpUrl("https://github.com/a/b")),
+        pool,
+    )
+    bulk_added = await link_service.add_links(
+        CHAT_ID,
+        [AddLinkRequest(link=HttpUrl("https://github.com/c/d"), tags=["t"], filters=[])],
+        pool,
+    )
+    tagged = await link_service.get_links_by_tags(CHAT_ID, ["t"], pool)
+    any_tagged = await link_service.get_links_by_tags(CHAT_ID, ["t", "x"], pool, match_any=True)
+    muted = await link_service.set_muted_by_tags(CHAT_ID, ["t"], pool, muted=True)
+    bulk_removed = await link_service.remove_links(
+        CHAT_ID,
+        [HttpUrl("https://github.com/c/d")],
+        pool,
+    )
+    purged = await link_service.remove_links_by_tags(CHAT_ID, ["t"], pool)
+
+    assert [link.id for link in links] == [added.id]
+    assert removed.id == added.id
+    assert bulk_added[0] is not None
+    assert [link.id for link in tagged] == [link.id for link in any_tagged] == [bulk_added[0].id]
+    assert muted == 1
+    assert bulk_removed[0] is not None
+    assert purged == []
+    assert await SqlChatService().get_chats(pool, limit=10) == [CHAT_ID]
+
+
+@pytest.mark.asyncio
+async def test_services_reuse_prepared_statements(prepared_pool: asyncpg.Pool) -> None:
+    """Проверяет, что повторные вызовы сервисов не готовят запросы заново."""
+    # Запросы первой выдачи соединения выполнены объектами init-хука и попадут в кэш позже.
+    await _use_services(prepared_pool)
+    await _use_services(prepared_pool)
+    async with prepared_pool.acquire() as conn:
+        prepared = await conn.fetchval(_COUNT_REGISTRY, _REGISTRY_SQL)
+
+    await _use_services(prepared_pool)
+
+    async with prepared_pool.acquire() as conn:
+        assert await conn.fetchval(_COUNT_REGISTRY, _REGISTRY_SQL) == prepared
+
+
+@pytest.mark.asyncio
+async def test_link_record_to_response(prepared_pool: asyncpg.Pool) -> None:
+    """Проверяет, что строки подписок возвращаются как LinkRecord и собираются по позициям."""
+    last_updated = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    async with prepared_pool.acquire() as conn:
+        await statements.execute(conn, "register_chat", CHAT_ID)
+        resource = await statements.fetchrow(
+            conn,
+            "upsert_resource",
+            "https://github.com/a/b",
+            "github.com/a/b",
+            last_updated,
+        )
+        await statements.fetchrow(conn, "insert_link", CHAT_ID, resource["id"], ["t"], None)
+        rows = await statements.fetch(conn, "get_links", CHAT_ID, 0, None)
+
+    assert isinstance(rows[0], LinkRecord)
+    assert rows[0].to_response() == LinkResponse.model_construct(
+        id=rows[0]["id"],
+        url="https://github.com/a/b",
+        tags=["t"],
+        filters=[],
+        last_updated=last_updated,
+        muted=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_plain_connection_runs_statement_text(db_pool: asyncpg.Pool) -> None:
+    """Проверяет запросы реестра на соединениях пула без init-хука."""
+    async with db_pool.acquire() as conn:
+        assert await statements.execute(conn, "register_chat", CHAT_ID) == "INSERT 0 1"
+        assert await statements.fetchval(conn, "chat_exists", CHAT_ID) == 1
+        rows = await statements.fetch(conn, "get_links", CHAT_ID, 0, None)
+        remove = await statements.fetchrow(conn, "remove_link", CHAT_ID, "missing")
+
+    assert rows == []
+    assert remove is None
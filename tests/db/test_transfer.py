@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+import asyncpg
+import pytest
+
+from src.db.transfer import FORMATS, TABLES, export_tables, import_tables, parse_args
+
+_SNAPSHOT = {
+    "chats": "SELECT id, links_version FROM chats ORDER BY id",
+    "resources": "SELECT id, url, canonical_key, last_event_at FROM resources ORDER BY id",
+    "links": "SELECT id, chat_id, resource_id, tags, filters, muted FROM links ORDER BY id",
+}
+_SECONDARY_KEYS = """
+    SELECT (SELECT count(*) FROM pg_indexes WHERE tablename = ANY($1::text[])),
+           (SELECT count(*) FROM pg_constraint WHERE contype = 'f')
+"""
+
+
+async def _seed(conn: asyncpg.Connection) -> None:
+    await conn.execute("INSERT INTO chats (id, links_version) VALUES (1, 3), (2, 0)")
+    await conn.execute(
+        """
+        INSERT INTO resources (url, canonical_key, last_event_at) VALUES
+            ('https://github.com/a/b', 'github:a/b', '2024-01-01T00:00:00+00'),
+            ('https://stackoverflow.com/q/1', 'so:1', NULL)
+        """,
+    )
+    await conn.execute(
+        """
+        INSERT INTO links (chat_id, resource_id, tags, filters, muted) VALUES
+            (1, 1, ARRAY['a,b', 'c"d'], NULL, false),
+            (1, 2, NULL, ARRAY['user=x'], true),
+            (2, 1, ARRAY[]::varchar[], ARRAY[]::varchar[], false)
+        """,
+    )
+
+
+async def _snapshot(conn: asyncpg.Connection) -> dict[str, list[asyncpg.Record]]:
+    return {table: await conn.fetch(query) for table, query in _SNAPSHOT.items()}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_format", list(FORMATS))
+async def test_export_import_roundtrip(
+    db_pool: asyncpg.Pool,
+    tmp_path: Path,
+    file_format: str,
+) -> None:
+    """Проверяет, что выгруженные данные загружаются обратно без изменений."""
+    async with db_pool.acquire() as conn:
+        await _seed(conn)
+        before = await _snapshot(conn)
+        secondary_keys = await conn.fetchrow(_SECONDARY_KEYS, list(TABLES))
+
+        manifest = await export_tables(conn, tmp_path, file_format)
+        loaded = await import_tables(conn, tmp_path, replace=True)
+
+        assert await _snapshot(conn) == before
+        assert await conn.fetchrow(_SECONDARY_KEYS, list(TABLES)) == secondary_keys
+        new_link = await conn.fetchval(
+            "INSERT INTO links (chat_id, resource_id) VALUES (2, 2) RETURNING id",
+        )
+
+    assert loaded == {"chats": 2, "resources": 2, "links": 3}
+    assert {table: entry["rows"] for table, entry in manifest["tables"].items()} == loaded
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    assert new_link == 4  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_import_refuses_non_empty_tables(db_pool: asyncpg.Pool, tmp_path: Path) -> None:
+    """Проверяет, что без replace загрузка в непустые таблицы отклоняется целиком."""
+    async with db_pool.acquire() as conn:
+        await _seed(conn)
+        await export_tables(conn, tmp_path)
+        before = await _snapshot(conn)
+
+        with pytest.raises(ValueError, match="chats не пуста"):
+            await import_tables(conn, tmp_path)
+
+        assert await _snapshot(conn) == before
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_unknown_columns(db_pool: asyncpg.Pool, tmp_path: Path) -> None:
+    """Проверяет отказ при колонках выгрузки, которых нет в схеме."""
+    async with db_pool.acquire() as conn:
+        await export_tables(conn, tmp_path)
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        manifest["tables"]["links"]["columns"].append("priority")
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+
+        with pytest.raises(ValueError, match="priority"):
+            await import_tables(conn, tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_format(db_pool: asyncpg.Pool, tmp_path: Path) -> None:
+    """Проверяет ValueError для неизвестного формата файлов."""
+    async with db_pool.acquire() as conn:
+        with pytest.raises(ValueError, match="parquet"):
+            await export_tables(conn, tmp_path, "parquet")
+
+
+def test_parse_args() -> None:
+    """Проверяет разбор команд export и import."""
+    export = parse_args(["export", "backup", "--format", "binary", "--compresslevel", "6"])
+    load = parse_args(["--dsn", "postgresql://db", "import", "backup", "--replace"])
+
+    assert (export.command, export.directory, export.format) == ("export", Path("backup"), "binary")
+    assert export.compresslevel == 6  # noqa: PLR2004
+    assert (load.command, load.dsn, load.replace) == ("import", "postgresql://db", True)
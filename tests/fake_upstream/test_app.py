@@ -0,0 +1,101 @@
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from http import HTTPStatus
+from urllib.parse import urlparse
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from src.clients.stack_overflow import StackOverflowClient
+from src.fake_upstream import FakeUpstreamConfig, create_app
+
+pytestmark = pytest.mark.asyncio
+
+
+def _client(quota: int = 5000, rate_limit_rate: float = 0.0) -> httpx.AsyncClient:
+    config = FakeUpstreamConfig(
+        latency=0,
+        latency_jitter=0,
+        update_rate=0,
+        seed=1,
+        quota=quota,
+        rate_limit_rate=rate_limit_rate,
+    )
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(config)),
+        base_url="http://fake",
+    )
+
+
+@pytest_asyncio.fixture
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    """HTTP-клиент к поддельным API без задержек и новых событий."""
+    async with _client() as client:
+        yield client
+
+
+async def test_github_events_with_etag(client: httpx.AsyncClient) -> None:
+    """События отдаются в формате GitHub, повторный запрос c ETag получает 304."""
+    response = await client.get("/github/repos/owner/repo/events")
+
+    events = response.json()
+    assert response.status_code == HTTPStatus.OK
+    assert events[0]["type"] in {"PullRequestEvent", "IssuesEvent", "PushEvent"}
+    assert datetime.fromisoformat(events[0]["created_at"]).tzinfo is not None
+    assert response.headers["X-RateLimit-Remaining"] == "4999"
+
+    cached = await client.get(
+        "/github/repos/owner/repo/events",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+
+
+async def test_github_quota_exceeded() -> None:
+    """После исчерпания квоты GitHub отвечает 403 c нулевым остатком."""
+    async with _client(quota=1) as client:
+        await client.get("/github/repos/owner/repo/events")
+        response = await client.get("/github/repos/owner/repo/events")
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+
+
+async def test_rate_limited_responses() -> None:
+    """При rate_limit_rate=1 каждый ответ - 429 c Retry-After."""
+    async with _client(rate_limit_rate=1) as client:
+        response = await client.post("/telegram/bottoken/sendMessage", json={"chat_id": 1})
+        stats = (await client.get("/stats")).json()
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["parameters"]["retry_after"] == 1
+    assert stats == {"telegram.429": 1}
+
+
+async def test_stackexchange_question_is_parsed_by_client(client: httpx.AsyncClient) -> None:
+    """Вопрос в ответе поддельного StackExchange разбирается клиентом StackOverflow."""
+    response = await client.get("/stackexchange/2.3/questions/42", params={"site": "stackoverflow"})
+    question = response.json()["items"][0]
+
+    update = await StackOverflowClient._create_update_event(  # noqa: SLF001
+        question,
+        urlparse("https://stackoverflow.com/questions/42/title"),
+        datetime.fromtimestamp(question["last_activity_date"], tz=timezone.utc),
+    )
+
+    assert update is not None
+    assert update.title == "Question 42"
+
+
+async def test_telegram_send_message(client: httpx.AsyncClient) -> None:
+    """SendMessage отвечает в формате Telegram Bot API."""
+    response = await client.post(
+        "/telegram/bottoken/sendMessage",
+        json={"chat_id": 7, "text": "hi"},
+    )
+
+    body = response.json()
+    assert body["ok"] is True
+    assert body["result"]["chat"]["id"] == 7  # noqa: PLR2004
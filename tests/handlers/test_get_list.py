@@ -1,10 +1,20 @@
+import re
 from typing import Any
 from unittest.mock import AsyncMock, Mock
 
 import httpx
 import pytest
+from pytest_mock import MockerFixture
+from telethon.events import CallbackQuery
 
-from src.handlers.get_list import list_handler
+from src.bot.redis_cache import LIST_PAGE_SIZE, ListCacheEntry
+from src.handlers.get_list import (
+    LIST_PAGE_PATTERN,
+    MAX_MESSAGE_LENGTH,
+    list_handler,
+    list_page_handler,
+    paginate_links,
+)
 from src.settings import settings
 
 pytestmark = pytest.mark.asyncio
@@ -20,11 +30,12 @@ pytestmark = pytest.mark.asyncio
                 "size": 2,
                 "links": [
                     {
+                        "id": 1,
                         "url": "https://example.com",
                         "tags": ["tag1", "tag2"],
                         "filters": ["filter1"],
                     },
-                    {"url": "https://example.org", "tags": [], "filters": []},
+                    {"id": 2, "url": "https://example.org", "tags": [], "filters": []},
                 ],
             },
             "Ваши подписки:\n"
@@ -42,6 +53,7 @@ async def test_list_handler_success(
 ) -> None:
     """Успешное получение списка подписок."""
     mock_response = Mock(spec=httpx.Response)
+    mock_response.headers = {}
     mock_response.json.return_value = mock_response_data
     mock_httpx_client.get.return_value = mock_response
 
@@ -49,6 +61,7 @@ async def test_list_handler_success(
 
     mock_httpx_client.get.assert_called_once_with(
         f"{settings.scrapper_api_url}/links",
+        params={"limit": LIST_PAGE_SIZE},
         headers={"Tg-Chat-Id": "123456789"},
     )
     mock_event.respond.assert_called_once_with(expected_response)
@@ -70,6 +83,7 @@ async def test_list_handler_http_error(
 ) -> None:
     """Обработка HTTP-ошибок при получении подписок."""
     mock_response = Mock(spec=httpx.Response)
+    mock_response.headers = {}
     mock_response.json.return_value = {"exceptionMessage": error_detail}
     mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
         message=f"{status_code} Error",
@@ -83,6 +97,313 @@ async def test_list_handler_http_error(
 
     mock_httpx_client.get.assert_called_once_with(
         f"{settings.scrapper_api_url}/links",
+        params={"limit": LIST_PAGE_SIZE},
         headers={"Tg-Chat-Id": "123456789"},
     )
     mock_event.respond.assert_called_once_with(expected_response)
+
+
+def _links(count: int, url_length: int = 20) -> list[dict[str, Any]]:
+    return [
+        {"id": i, "url": f"https://{'x' * url_length}/{i}", "tags": [], "filters": []}
+        for i in range(1, count + 1)
+    ]
+
+
+def _links_response(
+    links: list[dict[str, Any]],
+    next_after_id: int | None = None,
+    headers: dict[str, str] | None = None,
+) -> Mock:
+    response = Mock(spec=httpx.Response)
+    response.status_code = httpx.codes.OK
+    response.headers = headers or {}
+    response.json.return_value = {
+        "size": len(links),
+        "links": links,
+        "next_after_id": next_after_id,
+    }
+    return response
+
+
+def _page_event(after_id: int) -> Mock:
+    event = Mock(spec=CallbackQuery.Event)
+    event.chat_id = 123456789
+    event.data_match = re.match(LIST_PAGE_PATTERN, f"list:{after_id}".encode())
+    event.respond = AsyncMock()
+    event.edit = AsyncMock()
+    return event
+
+
+async def test_paginate_links_by_count() -> None:
+    """Подписки разбиваются на страницы не более чем по 10 ссылок."""
+    pages = paginate_links(_links(25))
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+
+
+async def test_paginate_links_by_length() -> None:
+    """Длинные ссылки переносятся на следующую страницу, не превышая лимит Telegram."""
+    pages = paginate_links(_links(5, url_length=1500))
+
+    assert len(pages) > 1
+    assert all(len("\n".join(page)) < MAX_MESSAGE_LENGTH for page in pages)
+    assert sum(len(page) for page in pages) == 5  # noqa: PLR2004
+
+
+async def test_list_handler_adds_page_buttons(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """Если y scrapper есть следующая страница, к сообщению добавляется кнопка «Далее»."""
+    mock_httpx_client.get.return_value = _links_response(_links(LIST_PAGE_SIZE), next_after_id=10)
+
+    await list_handler(mock_event)
+
+    text = mock_event.respond.call_args.args[0]
+    buttons = mock_event.respond.call_args.kwargs["buttons"]
+    assert "https://xxxxxxxxxxxxxxxxxxxx/10\n" in text
+    assert [button.type.data for button in buttons] == [b"list:10"]
+
+
+async def test_list_handler_splits_long_page(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """Подписки, не поместившиеся в сообщение, переходят на следующую страницу."""
+    mock_httpx_client.get.return_value = _links_response(_links(5, url_length=1500))
+
+    await list_handler(mock_event)
+
+    text = mock_event.respond.call_args.args[0]
+    buttons = mock_event.respond.call_args.kwargs["buttons"]
+    assert len(text) < MAX_MESSAGE_LENGTH
+    shown = text.count("https://")
+    assert 0 < shown < 5  # noqa: PLR2004
+    assert [button.type.data for button in buttons] == [f"list:{shown}".encode()]
+
+
+@pytest.mark.parametrize(
+    ("next_after_id", "expected_data"),
+    [
+        (20, [b"list:0", b"list:20"]),
+        (None, [b"list:0"]),
+    ],
+    ids=["middle_page", "last_page"],
+)
+async def test_list_page_handler(
+    mock_httpx_client: AsyncMock,
+    next_after_id: int | None,
+    expected_data: list[bytes],
+) -> None:
+    """Нажатие кнопки запрашивает страницу по курсору и перерисовывает сообщение."""
+    mock_httpx_client.get.return_value = _links_response(_links(20)[10:], next_after_id)
+    event = _page_event(10)
+
+    await list_page_handler(event)
+
+    mock_httpx_client.get.assert_called_once_with(
+        f"{settings.scrapper_api_url}/links",
+        params={"limit": LIST_PAGE_SIZE, "after_id": 10},
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+    text = event.edit.call_args.args[0]
+    buttons = event.edit.call_args.kwargs["buttons"]
+    assert "https://xxxxxxxxxxxxxxxxxxxx/11\n" in text
+    assert [button.type.data for button in buttons] == expected_data
+    event.respond.assert_not_called()
+
+
+async def test_list_page_handler_cursor_out_of_range(mock_httpx_client: AsyncMock) -> None:
+    """Если после курсора подписок не осталось, показывается первая страница."""
+    mock_httpx_client.get.side_effect = [
+        _links_response([]),
+        _links_response(_links(LIST_PAGE_SIZE), next_after_id=10),
+    ]
+    event = _page_event(30)
+
+    await list_page_handler(event)
+
+    assert mock_httpx_client.get.await_args_list[1].kwargs["params"] == {"limit": LIST_PAGE_SIZE}
+    text = event.edit.call_args.args[0]
+    buttons = event.edit.call_args.kwargs["buttons"]
+    assert "https://xxxxxxxxxxxxxxxxxxxx/1\n" in text
+    assert [button.type.data for button in buttons] == [b"list:10"]
+
+
+async def test_list_page_handler_empty_list(mock_httpx_client: AsyncMock) -> None:
+    """Если подписок не осталось, сообщение co списком заменяется уведомлением."""
+    mock_httpx_client.get.return_value = _links_response([])
+    event = _page_event(1)
+
+    await list_page_handler(event)
+
+    event.edit.assert_awaited_once_with("У вас нет активных подписок.")
+
+
+@pytest.fixture
+def mock_list_cache(mocker: MockerFixture) -> Mock:
+    """Фикстура для мокирования кэша списков ссылок."""
+    return mocker.patch("src.handlers.get_list.redis_cache", autospec=True)
+
+
+async def test_list_handler_uses_fresh_cache(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+    mock_list_cache: Mock,
+) -> None:
+    """Свежий список из кэша выводится без обращения к scrapper-сервису."""
+    mock_list_cache.get_list_entry.return_value = ListCacheEntry(
+        links=_links(1),
+        etag='"1.1"',
+        fresh=True,
+    )
+
+    await list_handler(mock_event)
+
+    mock_httpx_client.get.assert_not_called()
+    mock_event.respond.assert_called_once()
+
+
+async def test_list_handler_revalidates_stale_cache(
+    mock_event: Mock,
+    mock_list_cache: Mock,
+    mocker: MockerFixture,
+) -> None:
+    """Устаревший список проверяется по ETag и при ответе 304 используется повторно."""
+    entry = ListCacheEntry(links=_links(1), etag='"123456789.3.10.0"', fresh=False)
+    mock_list_cache.get_list_entry.return_value = entry
+    requests: list[httpx.Request] = []
+
+    def scrapper(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(httpx.codes.NOT_MODIFIED, headers={"ETag": '"123456789.3.10.0"'})
+
+    transport = httpx.MockTransport(scrapper)
+    client_class = httpx.AsyncClient
+    mocker.patch("httpx.AsyncClient", side_effect=lambda: client_class(transport=transport))
+
+    await list_handler(mock_event)
+
+    assert len(requests) == 1
+    assert requests[0].url == httpx.URL(
+        f"{settings.scrapper_api_url}/links",
+        params={"limit": LIST_PAGE_SIZE},
+    )
+    assert requests[0].headers["Tg-Chat-Id"] == "123456789"
+    assert requests[0].headers["If-None-Match"] == '"123456789.3.10.0"'
+    mock_list_cache.touch_list_cache.assert_awaited_once_with(123456789, entry)
+    mock_list_cache.set_list_cache.assert_not_called()
+    mock_event.respond.assert_called_once()
+    assert "https://xxxxxxxxxxxxxxxxxxxx/1" in mock_event.respond.call_args.args[0]
+
+
+async def test_list_handler_replaces_changed_list(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+    mock_list_cache: Mock,
+) -> None:
+    """Если список изменился, он загружается заново и кэшируется вместе c новым ETag."""
+    mock_list_cache.get_list_entry.return_value = ListCacheEntry(
+        links=_links(1),
+        etag='"123456789.3.10.0"',
+        fresh=False,
+    )
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.status_code = httpx.codes.OK
+    mock_response.headers = {"ETag": '"123456789.4.10.0"', "Links-Version": "4"}
+    mock_response.json.return_value = {"size": 2, "links": _links(2)}
+    mock_httpx_client.get.return_value = mock_response
+
+    await list_handler(mock_event)
+
+    mock_list_cache.set_list_cache.assert_awaited_once_with(
+        123456789,
+        _links(2),
+        4,
+        etag='"123456789.4.10.0"',
+        limit=LIST_PAGE_SIZE,
+        next_after_id=None,
+    )
+    mock_list_cache.touch_list_cache.assert_not_called()
+
+
+async def test_list_handler_caches_first_page_of_long_list(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+    mock_list_cache: Mock,
+) -> None:
+    """Первая страница списка, продолжающегося дальше, кэшируется вместе c курсором."""
+    mock_list_cache.get_list_entry.return_value = None
+    mock_httpx_client.get.return_value = _links_response(
+        _links(LIST_PAGE_SIZE),
+        next_after_id=LIST_PAGE_SIZE,
+        headers={"ETag": '"123456789.4.10.0"', "Links-Version": "4"},
+    )
+
+    await list_handler(mock_event)
+
+    mock_list_cache.get_list_entry.assert_awaited_once_with(123456789, LIST_PAGE_SIZE)
+    mock_list_cache.set_list_cache.assert_awaited_once_with(
+        123456789,
+        _links(LIST_PAGE_SIZE),
+        4,
+        etag='"123456789.4.10.0"',
+        limit=LIST_PAGE_SIZE,
+        next_after_id=LIST_PAGE_SIZE,
+    )
+
+
+async def test_list_handler_uses_cached_first_page_of_long_list(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+    mock_list_cache: Mock,
+) -> None:
+    """Первая страница длинного списка выводится из кэша c кнопкой следующей страницы."""
+    mock_list_cache.get_list_entry.return_value = ListCacheEntry(
+        links=_links(LIST_PAGE_SIZE),
+        etag='"123456789.3.10.0"',
+        fresh=True,
+        next_after_id=LIST_PAGE_SIZE,
+        limit=LIST_PAGE_SIZE,
+    )
+
+    await list_handler(mock_event)
+
+    mock_httpx_client.get.assert_not_called()
+    buttons = mock_event.respond.call_args.kwargs["buttons"]
+    assert [button.type.data for button in buttons] == [f"list:{LIST_PAGE_SIZE}".encode()]
+
+
+async def test_list_handler_revalidates_stale_first_page_of_long_list(
+    mock_event: Mock,
+    mock_list_cache: Mock,
+    mocker: MockerFixture,
+) -> None:
+    """Устаревшая первая страница длинного списка проверяется по ETag и при 304 выводится."""
+    entry = ListCacheEntry(
+        links=_links(LIST_PAGE_SIZE),
+        etag='"123456789.3.10.0.0"',
+        fresh=False,
+        next_after_id=LIST_PAGE_SIZE,
+        limit=LIST_PAGE_SIZE,
+    )
+    mock_list_cache.get_list_entry.return_value = entry
+    requests: list[httpx.Request] = []
+
+    def scrapper(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(httpx.codes.NOT_MODIFIED, headers={"ETag": '"123456789.3.10.0.0"'})
+
+    transport = httpx.MockTransport(scrapper)
+    client_class = httpx.AsyncClient
+    mocker.patch("httpx.AsyncClient", side_effect=lambda: client_class(transport=transport))
+
+    await list_handler(mock_event)
+
+    assert len(requests) == 1
+    assert requests[0].headers["If-None-Match"] == '"123456789.3.10.0.0"'
+    mock_list_cache.touch_list_cache.assert_awaited_once_with(123456789, entry)
+    mock_list_cache.set_list_cache.assert_not_called()
+    buttons = mock_event.respond.call_args.kwargs["buttons"]
+    assert [button.type.data for button in buttons] == [f"list:{LIST_PAGE_SIZE}".encode()]
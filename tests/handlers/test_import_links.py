@@ -0,0 +1,154 @@
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+from src.api.scrapper_api.models import MAX_BULK_LINKS
+from src.handlers.import_links import (
+    IMPORT_USAGE,
+    MAX_IMPORT_FILE_SIZE,
+    import_handler,
+    parse_import_lines,
+)
+from src.settings import settings
+
+pytestmark = pytest.mark.asyncio
+
+
+def _bulk_response(size: int) -> Mock:
+    response = Mock(spec=httpx.Response)
+    response.json.return_value = {"results": [], "size": size}
+    return response
+
+
+async def test_parse_import_lines() -> None:
+    """Строки разбираются на URL и тэги; комментарии и пустые строки пропускаются."""
+    requests, invalid = parse_import_lines(
+        "https://example.com news tech\n\n# комментарий\nnot a url\nhttps://example.org\n",
+    )
+
+    assert [str(req.link) for req in requests] == ["https://example.com/", "https://example.org/"]
+    assert requests[0].tags == ["news", "tech"]
+    assert invalid == ["not a url"]
+
+
+async def test_import_handler_from_message(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """Ссылки из текста сообщения отправляются одним пакетным запросом."""
+    mock_event.message.file = None
+    mock_event.message.message = "/import\nhttps://example.com news\nhttps://example.org\nbad"
+    mock_httpx_client.post.return_value = _bulk_response(1)
+
+    await import_handler(mock_event)
+
+    mock_httpx_client.post.assert_called_once_with(
+        f"{settings.scrapper_api_url}/links/bulk",
+        json={
+            "links": [
+                {"link": "https://example.com/", "tags": ["news"], "filters": []},
+                {"link": "https://example.org/", "tags": [], "filters": []},
+            ],
+        },
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+    mock_event.respond.assert_called_once_with(
+        "Импорт завершён.\nДобавлено: 1\nУже отслеживались: 1\nНекорректные строки: 1\nbad",
+    )
+
+
+async def test_import_handler_from_file(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """Ссылки читаются из прикреплённого файла."""
+    mock_event.message.message = "/import"
+    mock_event.message.file = Mock(size=64)
+    mock_event.message.download_media = AsyncMock(
+        return_value="\ufeffhttps://example.com\nhttps://example.org\n".encode(),
+    )
+    mock_httpx_client.post.return_value = _bulk_response(2)
+
+    await import_handler(mock_event)
+
+    links = mock_httpx_client.post.call_args.kwargs["json"]["links"]
+    assert [link["link"] for link in links] == ["https://example.com/", "https://example.org/"]
+    mock_event.respond.assert_called_once_with(
+        "Импорт завершён.\nДобавлено: 2\nУже отслеживались: 0",
+    )
+
+
+async def test_import_handler_file_too_large(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """Слишком большой файл не скачивается."""
+    mock_event.message.message = "/import"
+    mock_event.message.file = Mock(size=MAX_IMPORT_FILE_SIZE + 1)
+    mock_event.message.download_media = AsyncMock()
+
+    await import_handler(mock_event)
+
+    mock_event.message.download_media.assert_not_called()
+    mock_httpx_client.post.assert_not_called()
+    mock_event.respond.assert_called_once()
+
+
+async def test_import_handler_empty(mock_event: Mock, mock_httpx_client: AsyncMock) -> None:
+    """Без ссылок пользователь получает подсказку по формату команды."""
+    mock_event.message.file = None
+    mock_event.message.message = "/import"
+
+    await import_handler(mock_event)
+
+    mock_event.respond.assert_called_once_with(IMPORT_USAGE)
+    mock_httpx_client.post.assert_not_called()
+
+
+async def test_import_handler_http_error(mock_event: Mock, mock_httpx_client: AsyncMock) -> None:
+    """Ошибка scrapper-сервиса передаётся пользователю."""
+    mock_event.message.file = None
+    mock_event.message.message = "/import https://example.com"
+    mock_response = Mock(spec=httpx.Response)
+    mock_response.json.return_value = {"exceptionMessage": "Чат не найден"}
+    mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+        message="400 Error",
+        request=Mock(),
+        response=mock_response,
+    )
+    mock_httpx_client.post.return_value = mock_response
+
+    await import_handler(mock_event)
+
+    mock_event.respond.assert_called_once_with("Ошибка при импорте ссылок: Чат не найден")
+
+
+async def test_import_handler_http_error_after_first_batch(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """При ошибке в следующем пакете вместе c ней сообщаются итоги уже импортированных."""
+    mock_event.message.file = None
+    mock_event.message.message = "/import\n" + "\n".join(
+        f"https://example.com/{index}" for index in range(MAX_BULK_LINKS + 5)
+    )
+    error_response = Mock(spec=httpx.Response)
+    error_response.json.return_value = {"exceptionMessage": "Чат не найден"}
+    error_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+        message="404 Error",
+        request=Mock(),
+        response=error_response,
+    )
+    mock_httpx_client.post.side_effect = [_bulk_response(MAX_BULK_LINKS - 1), error_response]
+
+    await import_handler(mock_event)
+
+    second_batch = mock_httpx_client.post.call_args.kwargs["json"]["links"]
+    assert len(second_batch) == 5  # noqa: PLR2004
+    mock_event.respond.assert_called_once_with(
+        "Ошибка при импорте ссылок: Чат не найден\n"
+        f"Добавлено до ошибки: {MAX_BULK_LINKS - 1}\n"
+        "Уже отслеживались: 1\n"
+        "Не импортировано: 5",
+    )
@@ -13,7 +13,7 @@ pytestmark = pytest.mark.asyncio
 
 @pytest.fixture
 def mock_message_memory_storage(mock_memory_storage: Mock, mocker: MockerFixture) -> Mock:
-    return mocker.patch("src.handlers.message.MemoryStorage", return_value=mock_memory_storage)
+    return mocker.patch("src.handlers.message.fsm_storage", mock_memory_storage)
 
 
 @pytest.fixture
@@ -40,18 +40,17 @@ async def test_waiting_for_tags(
 ) -> None:
     """Обработка состояния WAITING_FOR_TAGS."""
     mock_event.raw_text = "tag1 tag2"
-    mock_message_memory_storage.return_value.get_state.return_value = State.WAITING_FOR_TAGS
-    mock_message_memory_storage.return_value.get_data.return_value = {"url": "http://example.com"}
+    mock_message_memory_storage.get_record.return_value = (
+        State.WAITING_FOR_TAGS,
+        {"url": "http://example.com"},
+    )
 
     await msg_handler(mock_event)
 
-    mock_message_memory_storage.return_value.set_data.assert_called_with(
-        "key_123",
-        {"url": "http://example.com", "tags": ["tag1", "tag2"]},
-    )
-    mock_message_memory_storage.return_value.set_state.assert_called_with(
+    mock_message_memory_storage.set_record.assert_called_with(
         "key_123",
         State.WAITING_FOR_FILTERS,
+        {"url": "http://example.com", "tags": ["tag1", "tag2"]},
     )
     mock_event.respond.assert_called_with(
         "Введите фильтры (опционально, формат key:value, разделённые пробелами):",
@@ -66,17 +65,16 @@ async def test_waiting_for_filters_success(
 ) -> None:
     """Обработка состояния WAITING_FOR_FILTERS c разными входными данными."""
     mock_event.raw_text = "key1:value1 key2:value2"
-    mock_message_memory_storage.return_value.get_state.return_value = State.WAITING_FOR_FILTERS
-    mock_message_memory_storage.return_value.get_data.return_value = {
-        "url": "http://example.com",
-        "tags": ["tag1"],
-    }
+    mock_message_memory_storage.get_record.return_value = (
+        State.WAITING_FOR_FILTERS,
+        {"url": "http://example.com", "tags": ["tag1"]},
+    )
     mock_response = Mock(spec=httpx.Response)
     mock_httpx_client.post.return_value = mock_response
 
     await msg_handler(mock_event)
 
-    mock_message_memory_storage.return_value.set_data.assert_called_with(
+    mock_message_memory_storage.set_data.assert_called_with(
         "key_123",
         {"url": "http://example.com", "tags": ["tag1"], "filters": ["key1:value1", "key2:value2"]},
     )
@@ -90,7 +88,7 @@ async def test_waiting_for_filters_success(
         headers={"Tg-Chat-Id": "123456789"},
     )
     mock_event.respond.assert_called_with("Ссылка http://example.com добавлена для отслеживания.")
-    mock_message_memory_storage.return_value.clear.assert_called_with("key_123")
+    mock_message_memory_storage.clear.assert_called_with("key_123")
 
 
 @pytest.mark.parametrize(
@@ -117,11 +115,10 @@ async def test_waiting_for_filters_invalid_link(
 ) -> None:
     """Обработка состояния WAITING_FOR_FILTERS c ошибкой 422 (некорректная ссылка)."""
     mock_event.raw_text = "key1:value1 key2:value2"
-    mock_message_memory_storage.return_value.get_state.return_value = State.WAITING_FOR_FILTERS
-    mock_message_memory_storage.return_value.get_data.return_value = {
-        "url": "http://example.com",
-        "tags": ["tag1"],
-    }
+    mock_message_memory_storage.get_record.return_value = (
+        State.WAITING_FOR_FILTERS,
+        {"url": "http://example.com", "tags": ["tag1"]},
+    )
     mock_response = Mock(spec=httpx.Response)
     mock_response.status_code = status_code
     mock_response.json.return_value = {"exceptionMessage": error_detail}
@@ -135,7 +132,7 @@ async def test_waiting_for_filters_invalid_link(
     await msg_handler(mock_event)
 
     mock_event.respond.assert_called_with(expected_response)
-    mock_message_memory_storage.clear.assert_not_called()
+    mock_message_memory_storage.clear.assert_awaited_once()
 
 
 async def test_no_state(
@@ -144,10 +141,10 @@ async def test_no_state(
 ) -> None:
     """Отсутствие состояния."""
     mock_event.raw_text = "some message"
-    mock_message_memory_storage.return_value.get_state.return_value = None
+    mock_message_memory_storage.get_record.return_value = (None, None)
 
     await msg_handler(mock_event)
 
-    mock_message_memory_storage.return_value.set_data.assert_not_called()
-    mock_message_memory_storage.return_value.set_state.assert_not_called()
+    mock_message_memory_storage.set_data.assert_not_called()
+    mock_message_memory_storage.set_record.assert_not_called()
     mock_event.respond.assert_not_called()
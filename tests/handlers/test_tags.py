@@ -0,0 +1,151 @@
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+from src.handlers.get_list import LIST_HEADER
+from src.handlers.tags import mute_handler, purge_handler, tagged_handler, unmute_handler
+from src.settings import settings
+
+pytestmark = pytest.mark.asyncio
+
+
+def _response(payload: dict[str, object]) -> Mock:
+    response = Mock(spec=httpx.Response)
+    response.json.return_value = payload
+    return response
+
+
+def _error_response(status_code: int, error_detail: str) -> Mock:
+    response = Mock(spec=httpx.Response)
+    response.status_code = status_code
+    response.json.return_value = {"exceptionMessage": error_detail}
+    response.raise_for_status.side_effect = httpx.HTTPStatusError(
+        message=f"{status_code} Error",
+        request=Mock(),
+        response=response,
+    )
+    return response
+
+
+async def test_tagged_handler_success(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """Команда /tagged выводит подписки c указанными тегами."""
+    mock_event.message.message = "/tagged work news work"
+    mock_httpx_client.get.return_value = _response(
+        {"links": [{"url": "https://example.com", "tags": ["work", "news"], "filters": []}]},
+    )
+
+    await tagged_handler(mock_event)
+
+    mock_httpx_client.get.assert_called_once_with(
+        f"{settings.scrapper_api_url}/links/tags",
+        params={"tags": ["work", "news"]},
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+    mock_event.respond.assert_called_once_with(
+        LIST_HEADER + "https://example.com\nТэги: work news\nФильтры: \n",
+    )
+
+
+async def test_tagged_handler_no_links(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """Команда /tagged сообщает, что подписок c тегами нет."""
+    mock_event.message.message = "/tagged work"
+    mock_httpx_client.get.return_value = _response({"links": [], "size": 0})
+
+    await tagged_handler(mock_event)
+
+    mock_event.respond.assert_called_once_with("Нет подписок с тегами: work")
+
+
+@pytest.mark.parametrize(
+    ("handler", "command"),
+    [
+        (tagged_handler, "/tagged"),
+        (purge_handler, "/purge"),
+        (mute_handler, "/mute"),
+        (unmute_handler, "/unmute"),
+    ],
+)
+async def test_tags_handlers_without_tags(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+    handler: AsyncMock,
+    command: str,
+) -> None:
+    """Команда без тегов не обращается к scrapper-сервису и подсказывает формат."""
+    mock_event.message.message = f"{command}   "
+
+    await handler(mock_event)
+
+    mock_event.respond.assert_called_once()
+    assert f"'{command} <тег> [<тег> ...]'" in mock_event.respond.call_args.args[0]
+    mock_httpx_client.get.assert_not_called()
+    mock_httpx_client.put.assert_not_called()
+    mock_httpx_client.request.assert_not_called()
+
+
+async def test_purge_handler_success(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """Команда /purge удаляет подписки c тегами и сообщает их число."""
+    mock_event.message.message = "/purge old"
+    mock_httpx_client.request.return_value = _response({"links": [], "size": 3})
+
+    await purge_handler(mock_event)
+
+    mock_httpx_client.request.assert_called_once_with(
+        "DELETE",
+        f"{settings.scrapper_api_url}/links/tags",
+        json={"tags": ["old"]},
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+    mock_event.respond.assert_called_once_with("Удалено подписок: 3")
+
+
+@pytest.mark.parametrize(
+    ("handler", "muted", "expected_response"),
+    [
+        (mute_handler, True, "Уведомления отключены для подписок: 2"),
+        (unmute_handler, False, "Уведомления включены для подписок: 2"),
+    ],
+    ids=["mute", "unmute"],
+)
+async def test_mute_handlers_success(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+    handler: AsyncMock,
+    muted: bool,
+    expected_response: str,
+) -> None:
+    """Команды /mute и /unmute меняют уведомления по подпискам c тегами."""
+    mock_event.message.message = "/mute work"
+    mock_httpx_client.put.return_value = _response({"size": 2})
+
+    await handler(mock_event)
+
+    mock_httpx_client.put.assert_called_once_with(
+        f"{settings.scrapper_api_url}/links/tags/muted",
+        json={"tags": ["work"], "muted": muted},
+        headers={"Tg-Chat-Id": "123456789"},
+    )
+    mock_event.respond.assert_called_once_with(expected_response)
+
+
+async def test_tags_handlers_http_error(
+    mock_event: Mock,
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """Ошибка scrapper-сервиса передаётся пользователю."""
+    mock_event.message.message = "/purge old"
+    mock_httpx_client.request.return_value = _error_response(404, "Чат не найден.")
+
+    await purge_handler(mock_event)
+
+    mock_event.respond.assert_called_once_with("Ошибка при удалении подписок: Чат не найден.")
@@ -11,7 +11,7 @@ pytestmark = pytest.mark.asyncio
 
 @pytest.fixture
 def mock_track_memory_storage(mock_memory_storage: Mock, mocker: MockerFixture) -> Mock:
-    return mocker.patch("src.handlers.track.MemoryStorage", return_value=mock_memory_storage)
+    return mocker.patch("src.handlers.track.fsm_storage", mock_memory_storage)
 
 
 @pytest.fixture
@@ -45,12 +45,9 @@ async def test_track_handler_positive(
     await track_handler(mock_event)
 
     mock_event.respond.assert_called_once_with(expected_response)
-    mock_track_memory_storage.return_value.set_state.assert_awaited_once_with(
+    mock_track_memory_storage.set_record.assert_awaited_once_with(
         "key_123",
         State.WAITING_FOR_TAGS,
-    )
-    mock_track_memory_storage.return_value.set_data.assert_awaited_once_with(
-        "key_123",
         {"url": expected_url},
     )
 
@@ -80,5 +77,5 @@ async def test_track_handler_negative(
     await track_handler(mock_event)
 
     mock_event.respond.assert_called_once_with(expected_response)
-    mock_track_memory_storage.return_value.set_state.assert_not_called()
-    mock_track_memory_storage.return_value.set_data.assert_not_called()
+    mock_track_memory_storage.set_state.assert_not_called()
+    mock_track_memory_storage.set_data.assert_not_called()
@@ -60,6 +60,7 @@ async def test_send_digest_success(
     mock_httpx_client.post.assert_awaited_once_with(
         "http://test-bot-api.com/digest",
         json=expected_payload,
+        headers={},
     )
 
 
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from src.api.bot_api.models import UpdateEvent
+from src.scheduler.notification.notification_service import (
+    UNTAGGED_HEADER,
+    format_digest,
+    format_update,
+)
+
+
+def _update(title: str, tags: list[str]) -> UpdateEvent:
+    return UpdateEvent(
+        description="Обновление",
+        title=title,
+        username="User",
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        preview="Превью",
+        tags=tags,
+    )
+
+
+def test_format_digest_without_tags() -> None:
+    """Без тегов дайджест состоит из событий без заголовков групп."""
+    updates = [_update("a", []), _update("b", [])]
+
+    assert format_digest(updates) == [format_update(update) for update in updates]
+
+
+def test_format_digest_groups_by_tag() -> None:
+    """События группируются по тегам по алфавиту, события без тегов идут последними."""
+    news = _update("news", ["news"])
+    both = _update("both", ["work", "news"])
+    untagged = _update("untagged", [])
+
+    assert format_digest([untagged, both, news]) == [
+        "Тег: news",
+        format_update(both),
+        format_update(news),
+        "Тег: work",
+        format_update(both),
+        UNTAGGED_HEADER,
+        format_update(untagged),
+    ]
@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.api.bot_api.models import UpdateEvent
+from src.scheduler.filters import LinkFilter, Predicate, compile_filters, parse_filter
+
+
+@pytest.fixture
+def update_event() -> UpdateEvent:
+    """Фикстура тестового события обновления."""
+    return UpdateEvent(
+        description="Новый Issue в https://github.com/user/repo",
+        title="Fix memory leak in parser",
+        username="JaneDev",
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        preview="Превью",
+        event_type="issue",
+    )
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("user:JaneDev", Predicate(key="user", value="janedev")),
+        ("-user:bot", Predicate(key="user", value="bot", negated=True)),
+        ("TYPE:Issue", Predicate(key="type", value="issue")),
+        ("title:memory leak", Predicate(key="title", value="memory leak")),
+    ],
+    ids=["user", "negated", "case", "title"],
+)
+def test_parse_filter(raw: str, expected: Predicate) -> None:
+    """Проверяет разбор фильтра в условие."""
+    assert parse_filter(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["user", "user:", "unknown:value"])
+def test_parse_filter_invalid(raw: str) -> None:
+    """Проверяет, что некорректный фильтр приводит к ValueError."""
+    with pytest.raises(ValueError, match="фильтр"):
+        parse_filter(raw)
+
+
+@pytest.mark.parametrize(
+    ("filters", "expected"),
+    [
+        ((), True),
+        (("user:janedev",), True),
+        (("user:bot",), False),
+        (("user:bot", "user:JaneDev"), True),
+        (("user:JaneDev", "type:pull_request"), False),
+        (("type:issue", "title:leak"), True),
+        (("-user:janedev",), False),
+        (("type:issue", "-title:memory"), False),
+        (("key1:value1", "malformed"), True),
+    ],
+    ids=[
+        "empty",
+        "user_match",
+        "user_mismatch",
+        "same_key_or",
+        "different_keys_and",
+        "type_and_title",
+        "exclude",
+        "include_and_exclude",
+        "invalid_ignored",
+    ],
+)
+def test_compile_filters_matches(
+    update_event: UpdateEvent,
+    filters: tuple[str, ...],
+    *,
+    expected: bool,
+) -> None:
+    """Проверяет применение скомпилированных фильтров к событию."""
+    assert compile_filters(filters).matches(update_event) is expected
+
+
+def test_compile_filters_cached() -> None:
+    """Проверяет, что одинаковые наборы фильтров компилируются один раз."""
+    first = compile_filters(("user:bot", "-type:issue"))
+    second = compile_filters(("user:bot", "-type:issue"))
+
+    assert first is second
+    assert first == LinkFilter(
+        include=((Predicate(key="user", value="bot"),),),
+        exclude=(Predicate(key="type", value="issue", negated=True),),
+    )
@@ -3,7 +3,6 @@ from typing import Generator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from pydantic import HttpUrl
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.bot_api.models import UpdateEvent
@@ -12,6 +11,7 @@ from src.clients.client_factory import ClientFactory
 from src.db.factory.data_access_factory import db_service
 from src.scheduler.notification.notification_service import NotificationService
 from src.scheduler.scheduler_service import Scheduler
+from src.scheduler.subscription import Subscription
 
 pytestmark = pytest.mark.asyncio
 
@@ -68,16 +68,22 @@ def sample_link_response() -> LinkResponse:
     """Фикстура тестовой подписки."""
     return LinkResponse(
         id=1,
-        url=HttpUrl("https://github.com/user/repo"),
+        url="https://github.com/user/repo",
         tags=["tag1"],
         filters=["key1:value1"],
         last_updated=datetime.now(timezone.utc),
     )
 
 
+@pytest.fixture
+def sample_subscription(sample_link_response: LinkResponse) -> Subscription:
+    """Фикстура тестовой записи подписки для планировщика."""
+    return Subscription.from_link(sample_link_response)
+
+
 async def test_process_subscription_success(
     mock_client_factory: MagicMock,
-    sample_link_response: LinkResponse,
+    sample_subscription: Subscription,
     mock_dependency: AsyncMock,
     mock_db_service: AsyncMock,
 ) -> None:
@@ -90,14 +96,22 @@ async def test_process_subscription_success(
         created_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
         preview="Превью описания тестового PR."[:200],
     )
-    mock_client.check_updates.return_value = update_event
+    older_event = update_event.model_copy(
+        update={"created_at": datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc)},
+    )
+    mock_client.list_updates.return_value = [update_event, older_event]
     mock_client_factory.return_value = mock_client
 
-    result = await Scheduler.process_subscription(sample_link_response, mock_dependency)
+    result = await Scheduler.process_subscription(sample_subscription, mock_dependency)
 
-    assert result == update_event
+    assert result == [update_event, older_event]
+    mock_client_factory.assert_called_once_with(service_name="github.com")
+    mock_client.list_updates.assert_awaited_once_with(
+        sample_subscription.parsed_url,
+        sample_subscription.last_updated,
+    )
     mock_db_service.set_last_updated.assert_awaited_once_with(
-        link_id=sample_link_response.id,
+        link_id=sample_subscription.id,
         last_updated=update_event.created_at,
         dependency=mock_dependency,
     )
@@ -105,18 +119,18 @@ async def test_process_subscription_success(
 
 async def test_process_subscription_no_updates(
     mock_client_factory: MagicMock,
-    sample_link_response: LinkResponse,
+    sample_subscription: Subscription,
     mock_dependency: AsyncMock,
     mock_db_service: AsyncMock,
 ) -> None:
     """Проверяет обработку подписки без обновлений."""
     mock_client = AsyncMock()
-    mock_client.check_updates.return_value = None
+    mock_client.list_updates.return_value = []
     mock_client_factory.return_value = mock_client
 
-    result = await Scheduler.process_subscription(sample_link_response, mock_dependency)
+    result = await Scheduler.process_subscription(sample_subscription, mock_dependency)
 
-    assert result is None
+    assert result == []
     mock_db_service.assert_not_awaited()
 
 
@@ -126,12 +140,15 @@ async def test_process_subscription_invalid_url(
     mock_dependency: AsyncMock,
 ) -> None:
     """Проверяет случай неподдерживаемого URL."""
-    sample_link_response.url = HttpUrl("https://unsupported.com/repo")
+    sample_link_response.url = "https://unsupported.com/repo"
     mock_client_factory.side_effect = ValueError("Неподдерживаемый URL")
 
-    result = await Scheduler.process_subscription(sample_link_response, mock_dependency)
+    result = await Scheduler.process_subscription(
+        Subscription.from_link(sample_link_response),
+        mock_dependency,
+    )
 
-    assert result is None
+    assert result == []
 
 
 async def test_collect_updates_success(
@@ -141,7 +158,7 @@ async def test_collect_updates_success(
     sample_link_response: LinkResponse,
     mock_dependency: AsyncMock,
 ) -> None:
-    """Проверяет успешное добавление обновлений в хранилище."""
+    """Проверяет c6op обновлений: события получают теги подписки, общий объект не меняется."""
     mock_db_service.get_links.return_value = [sample_link_response]
     new_update = UpdateEvent(
         description="Обновление на https://example.com",
@@ -150,11 +167,131 @@ async def test_collect_updates_success(
         created_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
         preview="Превью",
     )
-    mock_process_subscription.return_value = new_update
+    mock_process_subscription.return_value = [new_update]
+
+    updates = await scheduler.collect_updates(123, mock_dependency)
+
+    assert updates == [new_update.model_copy(update={"tags": ["tag1"]})]
+    assert new_update.tags == []
+
+
+async def test_collect_updates_checks_shared_resource_once(
+    scheduler: Scheduler,
+    mock_db_service: AsyncMock,
+    mock_process_subscription: AsyncMock,
+    sample_link_response: LinkResponse,
+    mock_dependency: AsyncMock,
+) -> None:
+    """Проверяет, что pecypc, общий для нескольких чатов, проверяется один раз за проход."""
+    mock_db_service.get_links.return_value = [sample_link_response]
+    new_update = UpdateEvent(
+        description="Обновление на https://example.com",
+        title="Обновление",
+        username="TestUser",
+        created_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+        preview="Превью",
+    )
+    mock_process_subscription.return_value = [new_update]
+
+    first_chat_updates = await scheduler.collect_updates(123, mock_dependency)
+    second_chat_updates = await scheduler.collect_updates(456, mock_dependency)
+
+    assert (
+        first_chat_updates
+        == second_chat_updates
+        == [
+            new_update.model_copy(update={"tags": ["tag1"]}),
+        ]
+    )
+    mock_process_subscription.assert_awaited_once()
+
+
+async def test_collect_updates_applies_link_filters(
+    scheduler: Scheduler,
+    mock_db_service: AsyncMock,
+    mock_process_subscription: AsyncMock,
+    mock_dependency: AsyncMock,
+) -> None:
+    """Проверяет, что событие отбрасывается фильтрами подписки одного чата, но не другого."""
+    url = "https://github.com/user/repo"
+    update = UpdateEvent(
+        description="Новый Issue",
+        title="Bump dependency",
+        username="dependabot",
+        created_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+        preview="Превью",
+        event_type="issue",
+    )
+    mock_process_subscription.return_value = [update]
+
+    mock_db_service.get_links.return_value = [
+        LinkResponse(id=1, url=url, tags=[], filters=["-user:dependabot"]),
+    ]
+    filtered_updates = await scheduler.collect_updates(123, mock_dependency)
+
+    mock_db_service.get_links.return_value = [
+        LinkResponse(id=2, url=url, tags=[], filters=["type:issue"]),
+    ]
+    passed_updates = await scheduler.collect_updates(456, mock_dependency)
+
+    assert filtered_updates == []
+    assert passed_updates == [update]
+    mock_process_subscription.assert_awaited_once()
+
+
+async def test_collect_updates_picks_older_matching_event(
+    scheduler: Scheduler,
+    mock_db_service: AsyncMock,
+    mock_process_subscription: AsyncMock,
+    mock_dependency: AsyncMock,
+) -> None:
+    """Проверяет, что отфильтрованное новое событие не скрывает подходящее более старое."""
+    url = "https://github.com/user/repo"
+    bot_update = UpdateEvent(
+        description="Новый Pull Request",
+        title="Bump dependency",
+        username="dependabot",
+        created_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+        preview="Превью",
+        event_type="pull_request",
+    )
+    user_update = bot_update.model_copy(
+        update={
+            "username": "octocat",
+            "created_at": datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc),
+        },
+    )
+    mock_process_subscription.return_value = [bot_update, user_update]
+    mock_db_service.get_links.return_value = [
+        LinkResponse(id=1, url=url, tags=[], filters=["-user:dependabot"]),
+    ]
 
     updates = await scheduler.collect_updates(123, mock_dependency)
 
-    assert updates == [new_update]
+    assert updates == [user_update]
+
+
+async def test_collect_updates_skips_muted_links(
+    scheduler: Scheduler,
+    mock_db_service: AsyncMock,
+    mock_process_subscription: AsyncMock,
+    mock_dependency: AsyncMock,
+) -> None:
+    """Проверяет, что подписки c отключёнными уведомлениями не проверяются."""
+    mock_db_service.get_links.return_value = [
+        LinkResponse(
+            id=1,
+            url="https://github.com/user/repo",
+            tags=["work"],
+            filters=[],
+            muted=True,
+        ),
+    ]
+
+    updates = await scheduler.collect_updates(123, mock_dependency)
+
+    assert updates == []
+    mock_process_subscription.assert_not_awaited()
 
 
 async def test_collect_updates_no_subscriptions(
@@ -179,7 +316,7 @@ async def test_collect_updates_no_updates(
 ) -> None:
     """Проверяет случай, когда в подписках нет обновлений."""
     mock_db_service.get_links.return_value = [sample_link_response]
-    mock_process_subscription.return_value = None
+    mock_process_subscription.return_value = []
 
     updates = await scheduler.collect_updates(123, mock_dependency)
 
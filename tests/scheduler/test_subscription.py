@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.api.scrapper_api.models import LinkResponse
+from src.scheduler.subscription import Subscription
+
+
+@pytest.mark.parametrize(
+    ("url", "expected_host", "expected_parts", "expected_key", "expected_resource_key"),
+    [
+        (
+            "https://github.com/user/repo",
+            "github.com",
+            ("user", "repo"),
+            "github.com",
+            "github.com/user/repo",
+        ),
+        (
+            "https://WWW.GitHub.com/user/repo/",
+            "www.github.com",
+            ("user", "repo"),
+            "github.com",
+            "github.com/user/repo",
+        ),
+        (
+            "https://stackoverflow.com/questions/123/title",
+            "stackoverflow.com",
+            ("questions", "123", "title"),
+            "stackoverflow.com",
+            "stackoverflow.com/questions/123",
+        ),
+        (
+            "https://www.github.com:443/user/repo",
+            "www.github.com",
+            ("user", "repo"),
+            "github.com",
+            "github.com/user/repo",
+        ),
+    ],
+    ids=["github", "www_prefix_and_case", "stackoverflow", "port"],
+)
+def test_subscription_from_link(
+    url: str,
+    expected_host: str,
+    expected_parts: tuple[str, ...],
+    expected_key: str,
+    expected_resource_key: str,
+) -> None:
+    """URL разбирается один раз при создании записи подписки."""
+    last_updated = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    link = LinkResponse(id=7, url=url, tags=[], filters=[], last_updated=last_updated)
+
+    sub = Subscription.from_link(link)
+
+    assert sub.id == link.id
+    assert sub.url == str(link.url)
+    assert sub.host == expected_host
+    assert sub.path_parts == expected_parts
+    assert sub.client_key == expected_key
+    assert sub.resource_key == expected_resource_key
+    assert sub.last_updated == last_updated
+    assert not hasattr(sub, "__dict__")
@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.loop_monitor import LoopLagMonitor, callback_name
+from src.settings import LoopMonitorConfig
+
+pytestmark = pytest.mark.asyncio
+
+BLOCK_SECONDS: float = 0.05
+
+
+def _lag_count() -> float:
+    return REGISTRY.get_sample_value("event_loop_lag_seconds_count") or 0.0
+
+
+async def _blocking_step() -> None:
+    """Корутина, блокирующая event loop синхронным вызовом."""
+    time.sleep(BLOCK_SECONDS)  # noqa: ASYNC251
+
+
+async def test_callback_name() -> None:
+    """Из представления хэндла извлекается имя корутины или функции."""
+    task = "<Task pending name='Task-7' coro=<Scheduler.send_digest() running at /app/s.py:1>>"
+    handle = "<Handle BaseSelectorEventLoop._read_from_self()>"
+
+    assert callback_name(task) == "Scheduler.send_digest"
+    assert callback_name(handle) == "BaseSelectorEventLoop._read_from_self"
+    assert callback_name("<unknown>") == "<unknown>"
+
+
+async def test_report_sorted_by_total() -> None:
+    """Отчёт упорядочен по суммарному времени блокировок и ограничен по размеру."""
+    monitor = LoopLagMonitor(LoopMonitorConfig(report_size=2))
+    monitor.record_slow_callback("<Handle a()>", 0.2)
+    monitor.record_slow_callback("<Handle b()>", 0.15)
+    monitor.record_slow_callback("<Handle b()>", 0.15)
+    monitor.record_slow_callback("<Handle c()>", 0.1)
+
+    report = monitor.report()
+
+    assert [stats.name for stats in report] == ["b", "a"]
+    assert report[0].count == 2  # noqa: PLR2004
+    assert report[0].max == pytest.approx(0.15)
+
+
+async def test_monitor_measures_lag_and_slow_callbacks() -> None:
+    """Блокирующая корутина видна и в задержке loop, и в отчёте o долгих шагах."""
+    monitor = LoopLagMonitor(
+        LoopMonitorConfig(interval=0.01, slow_callback_debug=True, slow_callback_threshold=0.02),
+    )
+    loop = asyncio.get_running_loop()
+    debug = loop.get_debug()
+    before = _lag_count()
+
+    await monitor.start()
+    await asyncio.sleep(0.02)
+    await asyncio.create_task(_blocking_step())
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+
+    assert _lag_count() > before
+    assert "_blocking_step" in [stats.name for stats in monitor.report()]
+    assert loop.get_debug() == debug
+
+
+async def test_monitor_disabled() -> None:
+    """Выключенный монитор не запускает контрольную задачу."""
+    monitor = LoopLagMonitor(LoopMonitorConfig(enabled=False))
+
+    await monitor.start()
+
+    assert monitor._task is None  # noqa: SLF001
@@ -0,0 +1,47 @@
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from src.db.sql_service.link_service import SqlLinkService
+from src.metrics import observe_db_query, observe_telegram_response
+
+pytestmark = pytest.mark.asyncio
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_observe_db_query_records_latency() -> None:
+    """Декоратор учитывает вызов корутины, в том числе завершившийся ошибкой."""
+    labels = {"service": "TestService", "method": "fail"}
+    before = _sample("db_query_duration_seconds_count", labels)
+
+    @observe_db_query("TestService", "fail")
+    async def fail() -> None:
+        raise ValueError
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        await fail()
+
+    assert _sample("db_query_duration_seconds_count", labels) == before + 1
+
+
+async def test_link_service_methods_are_observed() -> None:
+    """Публичные корутины реализаций сервиса подписок обёрнуты в замер длительности."""
+    assert hasattr(SqlLinkService.get_links, "__wrapped__")
+    assert hasattr(SqlLinkService.add_link, "__wrapped__")
+    assert not hasattr(SqlLinkService.iter_links, "__wrapped__")
+
+
+async def test_observe_telegram_response_counts_429() -> None:
+    """Ответы Telegram co статусом 429 учитываются отдельно."""
+    labels = {"source": "http"}
+    before = _sample("telegram_rate_limited_total", labels)
+
+    observe_telegram_response("http", Mock(status_code=httpx.codes.OK))
+    observe_telegram_response("http", Mock(status_code=httpx.codes.TOO_MANY_REQUESTS))
+
+    assert _sample("telegram_rate_limited_total", labels) == before + 1
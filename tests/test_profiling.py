@@ -0,0 +1,70 @@
+import asyncio
+import marshal
+import time
+
+import pytest
+
+from src.profiling import CProfileSession, Profiler, StackSampler
+from src.settings import ProfilingConfig
+
+pytestmark = pytest.mark.asyncio
+
+
+def _busy_function() -> None:
+    time.sleep(0.05)
+
+
+async def test_stack_sampler_collapsed_stacks() -> None:
+    """Сэмплер записывает стеки текущего потока в формате collapsed stacks."""
+    sampler = StackSampler(interval=0.001)
+
+    sampler.start()
+    _busy_function()
+    result = sampler.stop()
+
+    lines = result.content.decode().splitlines()
+    assert lines
+    assert any("tests.test_profiling:_busy_function" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+async def test_cprofile_session_pstats_dump() -> None:
+    """Сессия cProfile отдаёт дамп, совместимый c pstats."""
+    session = CProfileSession()
+
+    session.start()
+    _busy_function()
+    result = session.stop()
+
+    stats = marshal.loads(result.content)  # noqa: S302
+    assert any(name == "_busy_function" for _, _, name in stats)
+
+
+async def test_profile_for_rejects_concurrent_sessions() -> None:
+    """Одновременно выполняется только одна сессия профилирования."""
+    profiler = Profiler(ProfilingConfig(max_duration=1.0))
+
+    first = asyncio.create_task(profiler.profile_for(0.05, "collapsed"))
+    await asyncio.sleep(0)
+    with pytest.raises(RuntimeError):
+        await profiler.profile_for(0.05, "pstats")
+    await first
+
+    with pytest.raises(ValueError, match="Длительность"):
+        await profiler.profile_for(2.0, "collapsed")
+
+
+async def test_capture_sweep_only_when_armed() -> None:
+    """Проход планировщика профилируется один раз и только после arm_sweep."""
+    profiler = Profiler(ProfilingConfig(sample_interval=0.001))
+
+    with profiler.capture_sweep():
+        _busy_function()
+    assert profiler.sweep_result is None
+
+    profiler.arm_sweep("collapsed")
+    with profiler.capture_sweep():
+        _busy_function()
+
+    assert profiler.sweep_result is not None
+    assert not profiler.sweep_armed
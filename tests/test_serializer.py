@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+import pytest
+from pytest_mock import MockerFixture
+
+from src import serializer
+from src.api.scrapper_api.models import LinkResponse
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request: pytest.FixtureRequest, mocker: MockerFixture) -> str:
+    """Прогоняет тест и c orjson, и c резервной реализацией на стандартном json."""
+    if request.param == "json":
+        mocker.patch.object(serializer, "orjson", None)
+    return str(request.param)
+
+
+@pytest.mark.usefixtures("backend")
+def test_dumps_returns_bytes_roundtrip() -> None:
+    """Функция dumps возвращает байты, a loads восстанавливает исходный объект."""
+    payload = {"chat_id": 1, "updates": ["Обновление", "Ещё одно"]}
+
+    data = serializer.dumps(payload)
+
+    assert isinstance(data, bytes)
+    assert serializer.loads(data) == payload
+    assert serializer.loads(data.decode("utf-8")) == payload
+
+
+@pytest.mark.usefixtures("backend")
+def test_dumps_pydantic_model_and_datetime() -> None:
+    """Модели pydantic и даты сериализуются в JSON-совместимый вид."""
+    link = LinkResponse(
+        id=1,
+        url="https://example.com",
+        tags=[],
+        filters=[],
+        last_updated=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+    result = serializer.loads(serializer.dumps({"link": link}))
+
+    assert result["link"]["url"] == "https://example.com/"
+    assert result["link"]["last_updated"].startswith("2024-01-01T00:00:00")
+
+
+@pytest.mark.usefixtures("backend")
+def test_dumps_unsupported_type() -> None:
+    """Неподдерживаемые типы приводят к TypeError."""
+    with pytest.raises(TypeError):
+        serializer.dumps({"value": object()})
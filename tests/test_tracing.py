@@ -0,0 +1,89 @@
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from src import tracing
+from src.settings import TracingConfig
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def span_exporter(mocker: MockerFixture) -> Iterator[Any]:
+    """Собирает спаны в памяти, не меняя глобальный провайдер трассировки."""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    mocker.patch.object(trace, "get_tracer", provider.get_tracer)
+    yield exporter
+    provider.shutdown()
+
+
+async def test_setup_tracing_unknown_exporter() -> None:
+    """Неизвестный экспортёр приводит к ValueError."""
+    with pytest.raises(ValueError, match="Неизвестный экспортёр"):
+        tracing.setup_tracing(TracingConfig(exporter="zipkin"))
+
+
+async def test_setup_tracing_none_is_noop(mocker: MockerFixture) -> None:
+    """Экспортёр по умолчанию не устанавливает провайдер."""
+    trace = pytest.importorskip("opentelemetry.trace")
+    set_provider = mocker.patch.object(trace, "set_tracer_provider")
+
+    tracing.setup_tracing(TracingConfig())
+
+    set_provider.assert_not_called()
+
+
+async def test_start_span_nests_spans(span_exporter: Any) -> None:  # noqa: ANN401
+    """Вложенный спан становится дочерним для текущего."""
+    with tracing.start_span("digest.chat", {"chat_id": 1}), tracing.start_span("db.get_links"):
+        pass
+
+    child, parent = span_exporter.get_finished_spans()
+    assert child.name == "db.get_links"
+    assert child.parent.span_id == parent.context.span_id
+    assert parent.attributes["chat_id"] == 1
+
+
+async def test_context_propagates_through_kafka_headers(span_exporter: Any) -> None:  # noqa: ANN401
+    """Контекст, переданный в заголовках Kafka-сообщения, продолжает исходную трассу."""
+    with tracing.start_span("kafka.produce"):
+        headers = tracing.kafka_headers()
+
+    assert [key for key, _ in headers] == ["traceparent"]
+
+    with tracing.start_span("kafka.consume", context=tracing.context_from_kafka_headers(headers)):
+        pass
+
+    produce, consume = span_exporter.get_finished_spans()
+    assert consume.context.trace_id == produce.context.trace_id
+    assert consume.parent.span_id == produce.context.span_id
+
+
+async def test_context_from_kafka_headers_dict(span_exporter: Any) -> None:  # noqa: ANN401
+    """Заголовки в виде словаря co строковыми значениями тоже продолжают трассу."""
+    with tracing.start_span("kafka.produce"):
+        headers = tracing.trace_headers()
+
+    with tracing.start_span(
+        "kafka.consume",
+        context=tracing.context_from_kafka_headers({**headers, "empty": None}),
+    ):
+        pass
+
+    produce, consume = span_exporter.get_finished_spans()
+    assert consume.parent.span_id == produce.context.span_id
+
+
+async def test_trace_headers_without_span() -> None:
+    """Вне спана заголовки трассировки не добавляются."""
+    assert tracing.trace_headers() == {}